@@ -1,4 +1,4 @@
-from flask import Flask, request, redirect
+from flask import Flask, Response, request, redirect
 from flask_cors import CORS
 from app.routes.project_delay import project_delay_bp
 try:
@@ -51,6 +51,30 @@ import sys
 import logging
 from pathlib import Path
 
+from app.phase9_outputs_cache import CachedResponse, ReportVersion, phase9_outputs_cache
+
+try:
+    from scripts.phase9.risk import compact_breakdown
+    PHASE9_RISK_AVAILABLE = True
+except ImportError:
+    PHASE9_RISK_AVAILABLE = False
+try:
+    from scripts.phase9 import output_reader as phase9_reader
+    PHASE9_NDJSON_AVAILABLE = True
+except ImportError:
+    PHASE9_NDJSON_AVAILABLE = False
+try:
+    from scripts.phase9 import columnar as phase9_columnar
+    PHASE9_COLUMNAR_AVAILABLE = phase9_columnar.np is not None
+except ImportError:
+    PHASE9_COLUMNAR_AVAILABLE = False
+
+try:
+    from app.phase14_performance import PROMETHEUS_CONTENT_TYPE, install_request_metrics, render_metrics, resource_sampler
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
 # Phase 15: Setup logging and environment validation
 try:
     from app.phase14_logging import setup_logging, get_logger
@@ -66,6 +90,11 @@ except ImportError:
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})
+if METRICS_AVAILABLE:
+    install_request_metrics(app)
+    # CPU/RSS gauges come from a background thread in each worker (with
+    # gunicorn --preload, start it from a post_fork hook instead)
+    resource_sampler.start()
 
 # Load configuration from .env/.env.example into environment and app.config
 try:
@@ -135,6 +164,14 @@ if startup_issues:
 DEBUG = os.environ.get('FLASK_DEBUG', 'false').lower() == 'true'
 DEMO_MODE = os.environ.get('DEMO_MODE', 'false').lower() == 'true'
 LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+# Risk factors per project served by /phase9/outputs ("all", or N = top N plus an "other" bucket)
+PHASE9_OUTPUTS_TOP_FACTORS = os.environ.get('PHASE9_OUTPUTS_TOP_FACTORS', 'all')
+# Where /phase9/outputs looks for reports; the first existing file wins
+PHASE9_REPORTS_DIR = Path(__file__).resolve().parents[2] / 'reports'
+PHASE9_REPORT_FILES = ('phase9_outputs.p9col', 'phase9_outputs.ndjson.gz', 'phase9_outputs.ndjson', 'phase9_outputs.json')
+PHASE9_MOCK_PATH = Path(__file__).resolve().parents[2] / 'frontend_phase10' / 'src' / 'mock' / 'phase9_sample.json'
+# NDJSON pages up to this many projects are cached like JSON responses; larger ones are streamed
+PHASE9_CACHE_MAX_PAGE = int(os.environ.get('PHASE9_CACHE_MAX_PAGE', '1000'))
 
 # Register blueprints
 app.register_blueprint(project_delay_bp)
@@ -223,51 +260,204 @@ def favicon():
     return ('', 204)
 
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Request and operation metrics in the Prometheus text format (all workers under gunicorn)"""
+    if not METRICS_AVAILABLE:
+        return _json_error("Metrics not available", 503)
+    return Response(render_metrics(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def _json_error(message, status):
+    return (json.dumps({"error": message}), status, {'Content-Type': 'application/json'})
+
+
+def _phase9_source():
+    """Path of the Phase 9 report to serve: the first of PHASE9_REPORT_FILES that exists, else the mock"""
+    for name in PHASE9_REPORT_FILES:
+        path = PHASE9_REPORTS_DIR / name
+        if not path.exists():
+            continue
+        if path.suffix == '.p9col':
+            if PHASE9_COLUMNAR_AVAILABLE:
+                return path
+        elif path.suffix == '.json' or PHASE9_NDJSON_AVAILABLE:
+            return path
+    return PHASE9_MOCK_PATH
+
+
+def _load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _phase9_transform(obj, variant, top_factors):
+    """Apply the `variant` and `factors` request options to a copy of one project output (obj itself is cached)"""
+    if variant == 'live' or top_factors is not None:
+        obj = dict(obj)
+    if variant == 'live':
+        obj['project_name'] = f"{obj.get('project_name','')} (LIVE)"
+        if isinstance(obj.get('risk_score'), (int, float)):
+            obj['risk_score'] = min(1.0, round(obj['risk_score'] + 0.13, 2))
+        if isinstance(obj.get('delay_probability'), (int, float)):
+            obj['delay_probability'] = min(1.0, round(obj['delay_probability'] + 0.1, 2))
+        if isinstance(obj.get('predicted_delay_days'), (int, float)):
+            obj['predicted_delay_days'] = int(obj.get('predicted_delay_days', 0)) + 8
+
+    if top_factors is not None and isinstance(obj.get('primary_risk_factors'), list):
+        obj['primary_risk_factors'] = compact_breakdown(obj['primary_risk_factors'], top_factors)
+    return obj
+
+
+def _stream_phase9(items, ndjson):
+    """Encode an iterable of outputs (dicts or already-encoded JSON bytes) as NDJSON lines or one JSON array"""
+    first = True
+    if not ndjson:
+        yield b'['
+    for item in items:
+        data = item if isinstance(item, bytes) else json.dumps(item).encode('utf-8')
+        if ndjson:
+            yield data + b'\n'
+        else:
+            yield data if first else b',' + data
+        first = False
+    if not ndjson:
+        yield b']'
+
+
 @app.route('/phase9/outputs', methods=['GET'])
 def get_phase9_outputs():
     """Serve Phase 9 outputs for local development.
 
-    Prefers `reports/phase9_outputs.json` if present, otherwise falls back
-    to `frontend_phase10/src/mock/phase9_sample.json`.
+    Serves the first of `reports/phase9_outputs.ndjson.gz`,
+    `reports/phase9_outputs.ndjson` and `reports/phase9_outputs.json` that
+    exists, otherwise falls back to
+    `frontend_phase10/src/mock/phase9_sample.json`. NDJSON reports are
+    streamed a project at a time, using their sidecar index to skip to the
+    requested page.
+
+    `?factors=N` keeps each project's top N primary_risk_factors and folds
+    the rest into an "other" entry; `?factors=all` returns them all. The
+    default comes from PHASE9_OUTPUTS_TOP_FACTORS.
+
+    `?risk_level=` keeps only projects at that level; `?offset=` and
+    `?limit=` page through the (filtered) list. X-Total-Count carries the
+    filtered total when it is known without reading the whole report.
+    The body is a JSON array, NDJSON (`?format=ndjson` or `Accept:
+    application/x-ndjson`) or the typed-array columnar encoding from
+    scripts.phase9.columnar (`?format=columnar` or `Accept:
+    application/vnd.phase9.columnar`). A `reports/phase9_outputs.p9col`
+    report takes precedence over the others; it is memory-mapped and
+    filtered/sliced column-wise, so only the requested page is decoded.
+
+    Responses carry an ETag and Last-Modified derived from the report file
+    version and answer matching conditional GETs with 304. Apart from
+    large NDJSON pages, which stay streamed, each response body (and its
+    gzip encoding) is built once per report version by
+    phase9_outputs_cache.
     """
-    # Get project root: __file__ is /backend/app/main.py, so parents[2] = /project_root
-    project_root = Path(__file__).resolve().parents[2]
-    
-    # Try reports path first
-    reports_path = project_root / 'reports' / 'phase9_outputs.json'
-    if reports_path.exists():
-        try:
-            with open(reports_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading reports file: {e}")
-            return (json.dumps({"error": str(e)}), 500, {'Content-Type': 'application/json'})
+    factors = request.args.get('factors', PHASE9_OUTPUTS_TOP_FACTORS).lower()
+    if factors == 'all' or not PHASE9_RISK_AVAILABLE:
+        top_factors = None
+    elif factors.isdigit():
+        top_factors = int(factors)
     else:
-        # Fall back to mock data
-        mock_path = project_root / 'frontend_phase10' / 'src' / 'mock' / 'phase9_sample.json'
-        if not mock_path.exists():
-            logger.error(f"Neither reports nor mock file found. Tried: {reports_path} and {mock_path}")
-            return (json.dumps({"error": "phase9 data not found"}), 500, {'Content-Type': 'application/json'})
-        try:
-            with open(mock_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading mock file: {e}")
-            return (json.dumps({"error": str(e)}), 500, {'Content-Type': 'application/json'})
+        return _json_error(f"factors must be 'all' or a non-negative integer, got '{factors}'", 400)
 
+    paging = {}
+    for name in ('offset', 'limit'):
+        value = request.args.get(name)
+        if value is not None:
+            if not value.isdigit():
+                return _json_error(f"{name} must be a non-negative integer, got '{value}'", 400)
+            paging[name] = int(value)
+    offset, limit = paging.get('offset', 0), paging.get('limit')
+    risk_level = request.args.get('risk_level')
     variant = request.args.get('variant')
 
-    if variant == 'live':
-        for obj in data:
-            obj['project_name'] = f"{obj.get('project_name','')} (LIVE)"
-            if isinstance(obj.get('risk_score'), (int, float)):
-                obj['risk_score'] = min(1.0, round(obj['risk_score'] + 0.13, 2))
-            if isinstance(obj.get('delay_probability'), (int, float)):
-                obj['delay_probability'] = min(1.0, round(obj['delay_probability'] + 0.1, 2))
-            if isinstance(obj.get('predicted_delay_days'), (int, float)):
-                obj['predicted_delay_days'] = int(obj.get('predicted_delay_days', 0)) + 8
+    mimetypes = {'json': 'application/json', 'ndjson': 'application/x-ndjson'}
+    if PHASE9_COLUMNAR_AVAILABLE:
+        mimetypes['columnar'] = phase9_columnar.MIMETYPE
+    fmt = request.args.get('format')
+    if fmt is None:
+        best = request.accept_mimetypes.best_match(list(mimetypes.values()))
+        fmt = next((name for name, mimetype in mimetypes.items() if mimetype == best), 'json')
+    elif fmt not in mimetypes:
+        return _json_error(f"format must be one of {', '.join(mimetypes)}, got '{fmt}'", 400)
+    ndjson = fmt == 'ndjson'
+
+    source = _phase9_source()
+    try:
+        version = ReportVersion.of(source)
+    except OSError:
+        logger.error(f"Neither reports nor mock file found. Tried: {PHASE9_REPORTS_DIR} and {source}")
+        return _json_error("phase9 data not found", 500)
+
+    key = (variant, top_factors, risk_level, offset, limit, fmt)
+    mimetype = mimetypes[fmt]
+    streamed = PHASE9_NDJSON_AVAILABLE and phase9_reader.is_ndjson(source)
+    mapped = PHASE9_COLUMNAR_AVAILABLE and phase9_columnar.is_columnar(source)
+    unmodified = variant != 'live' and top_factors is None
 
-    return (json.dumps(data), 200, {'Content-Type': 'application/json'})
+    def build():
+        if streamed:
+            total = phase9_reader.count_outputs(source, risk_level)
+            # Pass encoded lines straight through unless a project has to be modified
+            raw = unmodified and fmt != 'columnar'
+            items = phase9_reader.iter_outputs(source, offset=offset, limit=limit, risk_level=risk_level, raw=raw)
+            if not raw:
+                items = (_phase9_transform(obj, variant, top_factors) for obj in items)
+        elif mapped:
+            # Filter and slice on the memory-mapped columns; only the page is decoded
+            outputs = phase9_outputs_cache.data(version, lambda: phase9_columnar.ColumnarOutputs(source))
+            total = len(outputs.select(risk_level=risk_level))
+            page = outputs.rows(outputs.select(risk_level=risk_level, offset=offset, limit=limit))
+            items = (_phase9_transform(obj, variant, top_factors) for obj in page)
+        else:
+            data = phase9_outputs_cache.data(version, lambda: _load_json(source))
+            if risk_level is not None:
+                data = [obj for obj in data if obj.get('risk_level') == risk_level]
+            total = len(data)
+            data = data[offset:] if limit is None else data[offset:offset + limit]
+            items = (_phase9_transform(obj, variant, top_factors) for obj in data)
+        headers = {} if total is None else {'X-Total-Count': str(total)}
+        return items, headers
+
+    # Whole-report NDJSON responses stay streamed (memory flat); everything else is encoded once per version
+    if streamed and fmt != 'columnar' and (limit is None or limit > PHASE9_CACHE_MAX_PAGE):
+        items, headers = build()
+        response = Response(_stream_phase9(items, ndjson), 200, headers=headers, mimetype=mimetype)
+        response.set_etag(version.etag(key))
+    else:
+        def encode():
+            if mapped and fmt == 'columnar' and unmodified and risk_level is None and not offset and limit is None:
+                # The report itself is the response
+                outputs = phase9_outputs_cache.data(version, lambda: phase9_columnar.ColumnarOutputs(source))
+                body, headers = source.read_bytes(), {'X-Total-Count': str(len(outputs))}
+            else:
+                items, headers = build()
+                if fmt == 'columnar':
+                    body = phase9_columnar.encode(list(items))
+                else:
+                    body = b''.join(_stream_phase9(items, ndjson))
+            return CachedResponse(body, version.etag(key), mimetype, headers)
+
+        try:
+            cached = phase9_outputs_cache.response(version, key, encode)
+        except Exception as e:
+            logger.error(f"Error loading {source}: {e}")
+            return _json_error(str(e), 500)
+        headers = dict(cached.headers, Vary='Accept-Encoding')
+        if cached.compressible and request.accept_encodings.quality('gzip') > 0:
+            response = Response(cached.gzipped(), 200, headers=headers, mimetype=cached.mimetype)
+            response.headers['Content-Encoding'] = 'gzip'
+            response.set_etag(cached.etag + '-gzip')
+        else:
+            response = Response(cached.body, 200, headers=headers, mimetype=cached.mimetype)
+            response.set_etag(cached.etag)
+    response.last_modified = version.last_modified
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
 
 
 if __name__ == "__main__":
@@ -295,6 +485,7 @@ if __name__ == "__main__":
     print("  Endpoints:")
     print("    • Health Check: http://localhost:5000/health")
     print("    • Phase 9 Outputs: http://localhost:5000/phase9/outputs")
+    print("    • Metrics: http://localhost:5000/metrics")
     print()
     print(f"  Logs: {Path('logs').resolve()}")
     print("=" * 70 + "\n")
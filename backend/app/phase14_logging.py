@@ -7,15 +7,64 @@ Unified logging across all phases:
 - Error categorization (user/system/AI)
 - Persistent storage (file-based)
 - Easy diagnosis without guessing
+- Optional asynchronous mode: request threads only enqueue records on a
+  bounded queue; a listener thread formats them and writes in batches
+- Sampling and per-event-type rate limiting for hot-path events, with
+  counts of what was suppressed
 """
 
+import atexit
+import copy
 import logging
 import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 import json
 
+# main.py imports this module as app.phase14_logging while the phase 14/16
+# modules (with backend/app on sys.path) import phase14_logging: register it
+# under both names so there is a single event_limiter, listener and atexit hook
+for _name in ('phase14_logging', 'app.phase14_logging'):
+    sys.modules.setdefault(_name, sys.modules[__name__])
+
+try:
+    import orjson
+except ImportError:  # optional; StructuredFormatter(fast=True) falls back to json
+    orjson = None
+
+# Asynchronous logging defaults (setup_logging(async_mode=None) reads LOG_ASYNC)
+DEFAULT_LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', '10000'))
+DEFAULT_LOG_OVERFLOW = os.environ.get('LOG_QUEUE_OVERFLOW', 'drop')
+DEFAULT_LOG_BATCH_SIZE = 256
+OVERFLOW_POLICIES = ('drop', 'drop_oldest', 'sample')
+
+# Hot-path event limits (per event_type, see EventRateLimiter)
+DEFAULT_EVENT_RATE = float(os.environ.get('LOG_EVENT_RATE', '10'))     # events/second
+DEFAULT_EVENT_BURST = int(os.environ.get('LOG_EVENT_BURST', '100'))
+
+# Record attributes StructuredFormatter copies into the entry when present (passed via extra=)
+EXTRA_FIELDS = ('details', 'request_id', 'error_code', 'error', 'traceback')
+_EXTRA_FIELD_SET = frozenset(EXTRA_FIELDS)
+
+# Compact encoder reused by the fast formatter when orjson is not installed
+_json_encoder = json.JSONEncoder(separators=(',', ':'), default=str)
+
+
+def _encode_json(entry: Dict[str, Any]) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(entry, default=str, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except TypeError:  # orjson.JSONEncodeError, e.g. integers beyond 64 bits
+            pass
+    return _json_encoder.encode(entry)
+
 
 class StructuredFormatter(logging.Formatter):
     """
@@ -32,10 +81,31 @@ class StructuredFormatter(logging.Formatter):
         "error": "ValueError: ...",
         "traceback": "..."
     }
+    
+    With fast=True (LOG_FAST_FORMAT=true in setup_logging) the same entry is
+    built at a lower per-record cost:
+    - the timestamp is the record's creation time at millisecond precision,
+      rendered once per millisecond and reused for every record in it
+    - extra fields are found with one set check against the record's
+      attributes instead of a hasattr probe per field
+    - the entry is encoded with orjson when installed, otherwise with a
+      reused compact json encoder
+    orjson renders a few non-JSON types differently from str() (datetime
+    and UUID values in details, for example); anything it rejects falls
+    back to the json encoder.
     """
     
+    def __init__(self, *args, fast: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fast = fast
+        # (millisecond, text) and (second, 'YYYY-MM-DDTHH:MM:SS'); replaced, never mutated
+        self._ms_cache = (None, '')
+        self._second_cache = (None, '')
+    
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON"""
+        if self.fast:
+            return self._format_fast(record)
         
         log_entry = {
             'timestamp': datetime.utcnow().isoformat() + 'Z',
@@ -70,12 +140,309 @@ class StructuredFormatter(logging.Formatter):
             }
         
         return json.dumps(log_entry, separators=(',', ':'), default=str)
+    
+    def _format_fast(self, record: logging.LogRecord) -> str:
+        log_entry = {
+            'timestamp': self._timestamp(record.created),
+            'level': record.levelname,
+            'module': record.module,
+            'function': record.funcName,
+            'line': record.lineno,
+            'message': record.getMessage(),
+        }
+        
+        attributes = record.__dict__
+        if not _EXTRA_FIELD_SET.isdisjoint(attributes):
+            for name in EXTRA_FIELDS:
+                if name in attributes:
+                    log_entry[name] = attributes[name]
+        
+        if record.exc_info:
+            log_entry['exception'] = {
+                'type': record.exc_info[0].__name__,
+                'message': str(record.exc_info[1]),
+            }
+        
+        return _encode_json(log_entry)
+    
+    def _timestamp(self, created: float) -> str:
+        """ISO-8601 UTC timestamp with milliseconds, cached per millisecond"""
+        millis = int(created * 1000)
+        cached = self._ms_cache
+        if cached[0] == millis:
+            return cached[1]
+        seconds, ms = divmod(millis, 1000)
+        prefix = self._second_cache
+        if prefix[0] != seconds:
+            prefix = (seconds, time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(seconds)))
+            self._second_cache = prefix
+        text = f'{prefix[1]}.{ms:03d}Z'
+        self._ms_cache = (millis, text)
+        return text
+
+
+class QueueStats:
+    """Counters shared by a BoundedQueueHandler and its listener"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self.evicted = 0
+        self.reported = 0  # drops + evictions already announced in the log
+
+    def count(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def unreported(self) -> int:
+        """Drops and evictions since the last call"""
+        with self._lock:
+            lost = self.dropped + self.evicted
+            pending, self.reported = lost - self.reported, lost
+            return pending
+
+    def to_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return {'enqueued': self.enqueued, 'dropped': self.dropped, 'evicted': self.evicted}
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueue records on a bounded queue without ever blocking the caller.
+
+    prepare() only merges the message arguments (and renders a traceback
+    when there is one); all formatting happens on the listener thread.
+    When the queue is full:
+        drop          the new record is discarded
+        drop_oldest   the oldest queued record is discarded to make room
+        sample        one in `sample_every` overflowing records is kept,
+                      displacing the oldest queued record; the rest are
+                      discarded
+    Records at `keep_level` or above always displace the oldest queued
+    record instead of being discarded. Every loss is counted in `stats`
+    and announced by the listener.
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow: str = 'drop', sample_every: int = 100,
+                 keep_level: int = logging.ERROR):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.sample_every = max(1, sample_every)
+        self.keep_level = keep_level
+        self.stats = QueueStats()
+        self._overflowed = 0
+        self.listener: Optional['BatchingQueueListener'] = None
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = ''.join(traceback.format_exception(*record.exc_info)).rstrip('\n')
+            # keep type and value for StructuredFormatter; frames stay on this thread
+            record.exc_info = (record.exc_info[0], record.exc_info[1], None)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            self.stats.count('enqueued')
+            return
+        except queue.Full:
+            pass
+        if record.levelno < self.keep_level:
+            if self.overflow == 'drop':
+                self.stats.count('dropped')
+                return
+            if self.overflow == 'sample':
+                self._overflowed += 1
+                if (self._overflowed - 1) % self.sample_every:
+                    self.stats.count('dropped')
+                    return
+        # make room by discarding the oldest queued record
+        try:
+            oldest = self.queue.get_nowait()
+        except queue.Empty:
+            oldest = False
+        if oldest is None:
+            # the listener's stop sentinel: put it back and give up on this record
+            self._requeue_sentinel()
+            self.stats.count('dropped')
+            return
+        if oldest is not False:
+            self.stats.count('evicted')
+        try:
+            self.queue.put_nowait(record)
+            self.stats.count('enqueued')
+        except queue.Full:
+            self.stats.count('dropped')
+
+    def _requeue_sentinel(self) -> None:
+        """
+        Put the stop sentinel back without blocking. If other threads refilled
+        the queue meanwhile, evict their records: they were queued after stop
+        was requested and would not be written anyway.
+        """
+        while True:
+            try:
+                self.queue.put_nowait(None)
+                return
+            except queue.Full:
+                pass
+            try:
+                self.queue.get_nowait()
+                self.stats.count('evicted')
+            except queue.Empty:
+                pass
+
+    @property
+    def target_handlers(self):
+        """Handlers the listener writes to (for checks that look for a file handler)"""
+        return self.listener.handlers if self.listener is not None else ()
+
+
+def _emit_batch(handler: logging.Handler, records: List[logging.LogRecord]) -> None:
+    """
+    Write records through one handler, with one write and one flush for
+    stream and file handlers (honouring rotation) instead of one per record.
+    """
+    if not isinstance(handler, logging.StreamHandler):
+        for record in records:
+            handler.handle(record)
+        return
+    rotating = isinstance(handler, logging.handlers.BaseRotatingHandler)
+    handler.acquire()
+    try:
+        if isinstance(handler, logging.FileHandler) and handler.stream is None:
+            handler.stream = handler._open()
+        pending: List[str] = []
+        size = 0
+        for record in records:
+            if record.levelno < handler.level or not handler.filter(record):
+                continue
+            try:
+                text = handler.format(record) + handler.terminator
+            except Exception:
+                handler.handleError(record)
+                continue
+            if rotating and _needs_rollover(handler, record, size + len(text)):
+                if pending:
+                    handler.stream.write(''.join(pending))
+                    pending, size = [], 0
+                handler.doRollover()
+            pending.append(text)
+            size += len(text)
+        if pending:
+            handler.stream.write(''.join(pending))
+        handler.flush()
+    except Exception:
+        handler.handleError(records[-1])
+    finally:
+        handler.release()
+
+
+def _needs_rollover(handler: logging.handlers.BaseRotatingHandler, record: logging.LogRecord, pending_size: int) -> bool:
+    if isinstance(handler, logging.handlers.RotatingFileHandler):
+        if handler.maxBytes <= 0 or handler.stream is None:
+            return False
+        return handler.stream.tell() + pending_size >= handler.maxBytes
+    return bool(handler.shouldRollover(record))
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener that drains up to `batch_size` records at a time and
+    writes each batch with _emit_batch. Losses counted by the handler's
+    QueueStats are reported as a WARNING record. stop() drains whatever is
+    still queued before returning, so a clean shutdown loses nothing.
+    """
+
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler,
+                 batch_size: int = DEFAULT_LOG_BATCH_SIZE, stats: Optional[QueueStats] = None):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        self.stats = stats
+
+    def enqueue_sentinel(self) -> None:
+        # block rather than raise when the queue is full; this thread drains it
+        self.queue.put(self._sentinel)
+
+    def _monitor(self) -> None:
+        has_task_done = hasattr(self.queue, 'task_done')
+        while True:
+            batch = []
+            stop = False
+            record = self.dequeue(True)
+            while True:
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    batch.append(record)
+                if has_task_done:
+                    self.queue.task_done()
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    record = self.dequeue(False)
+                except queue.Empty:
+                    break
+            self._handle_batch(batch)
+            if stop:
+                return
+
+    def _handle_batch(self, batch: List[logging.LogRecord]) -> None:
+        lost = self.stats.unreported() if self.stats is not None else 0
+        if lost:
+            batch.append(logging.LogRecord(
+                __name__, logging.WARNING, __file__, 0,
+                f"Log queue full: dropped {lost} log records", None, None, func='_handle_batch',
+            ))
+        if not batch:
+            return
+        for handler in self.handlers:
+            _emit_batch(handler, batch)
+
+
+# Active asynchronous pipeline (set by setup_logging(async_mode=True))
+_queue_listener: Optional[BatchingQueueListener] = None
+
+
+def shutdown_logging() -> None:
+    """
+    Stop the asynchronous listener (if running) after it has written every
+    queued record, then flush and close its handlers. Registered with
+    atexit; safe to call more than once.
+    """
+    global _queue_listener
+    event_limiter.report_suppressed()
+    listener, _queue_listener = _queue_listener, None
+    if listener is None:
+        return
+    if listener._thread is not None:
+        listener.stop()
+    for handler in listener.handlers:
+        try:
+            handler.flush()
+            handler.close()
+        except Exception:
+            pass
+
+
+atexit.register(shutdown_logging)
 
 
 def setup_logging(
     app_name: str = 'construction-ai-suite',
     log_dir: Optional[Path] = None,
-    level: int = logging.INFO
+    level: int = logging.INFO,
+    async_mode: Optional[bool] = None,
+    queue_size: int = DEFAULT_LOG_QUEUE_SIZE,
+    overflow: str = DEFAULT_LOG_OVERFLOW,
+    fast_format: Optional[bool] = None,
 ) -> None:
     """
     Set up standardized logging for the application.
@@ -84,7 +451,21 @@ def setup_logging(
         app_name: Application name
         log_dir: Directory for log files (defaults to ./logs)
         level: Logging level (INFO, DEBUG, ERROR, etc.)
+        async_mode: Attach a BoundedQueueHandler to the root logger and run
+            the file and console handlers on a BatchingQueueListener thread
+            (defaults to the LOG_ASYNC environment variable: on for 1/true/yes,
+            off if unset)
+        queue_size: Capacity of the asynchronous queue
+        overflow: What to do when the queue is full ('drop', 'drop_oldest'
+            or 'sample', see BoundedQueueHandler)
+        fast_format: Use StructuredFormatter(fast=True) for the log file
+            (defaults to the LOG_FAST_FORMAT environment variable, off if unset)
     """
+    global _queue_listener
+    if async_mode is None:
+        async_mode = os.environ.get('LOG_ASYNC', 'false').strip().lower() in ('1', 'true', 'yes')
+    if fast_format is None:
+        fast_format = os.environ.get('LOG_FAST_FORMAT', 'false').lower() == 'true'
     
     if log_dir is None:
         log_dir = Path(__file__).parent.parent.parent / 'logs'
@@ -95,12 +476,13 @@ def setup_logging(
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
     
-    # Remove existing handlers to avoid duplication
+    # Remove existing handlers to avoid duplication (stopping a previous listener first)
+    shutdown_logging()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
     
     # Formatter
-    formatter = StructuredFormatter()
+    formatter = StructuredFormatter(fast=fast_format)
     
     # File handler (rotating)
     file_path = log_dir / f'{app_name}.log'
@@ -111,7 +493,6 @@ def setup_logging(
     )
     file_handler.setFormatter(formatter)
     file_handler.setLevel(level)
-    root_logger.addHandler(file_handler)
     
     # Console handler (simplified, human-readable)
     console_handler = logging.StreamHandler()
@@ -120,7 +501,20 @@ def setup_logging(
     )
     console_handler.setFormatter(console_formatter)
     console_handler.setLevel(level)
-    root_logger.addHandler(console_handler)
+
+    if async_mode:
+        log_queue = queue.Queue(maxsize=queue_size)
+        queue_handler = BoundedQueueHandler(log_queue, overflow=overflow)
+        queue_handler.setLevel(level)
+        _queue_listener = BatchingQueueListener(
+            log_queue, file_handler, console_handler, stats=queue_handler.stats
+        )
+        queue_handler.listener = _queue_listener
+        root_logger.addHandler(queue_handler)
+        _queue_listener.start()
+    else:
+        root_logger.addHandler(file_handler)
+        root_logger.addHandler(console_handler)
     
     # Log startup
     logger = logging.getLogger(__name__)
@@ -130,12 +524,160 @@ def setup_logging(
             'details': {
                 'app_name': app_name,
                 'log_dir': str(log_dir),
-                'log_level': logging.getLevelName(level)
+                'log_level': logging.getLevelName(level),
+                'async': bool(async_mode),
+                'fast_format': bool(fast_format),
             }
         }
     )
 
 
+class _EventState:
+    __slots__ = ('rate', 'burst', 'sample_every', 'tokens', 'updated',
+                 'seen', 'logged', 'suppressed', 'pending', 'logger', 'level')
+
+    def __init__(self, rate: Optional[float], burst: int, sample_every: int, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.sample_every = sample_every
+        self.tokens = float(burst)
+        self.updated = now
+        self.seen = 0
+        self.logged = 0
+        self.suppressed = 0
+        self.pending = 0      # suppressed since the last admitted event or report
+        self.logger = None
+        self.level = logging.INFO
+
+
+class EventRateLimiter:
+    """
+    Sampling and token-bucket rate limiting of log events, keyed by event_type.
+    
+    Each event type has a bucket of `burst` tokens refilled at `rate` per
+    second (rate None: unlimited) and, optionally, keeps only every
+    `sample_every`-th event before the bucket is consulted. Events that do
+    not pass are counted, not formatted; the next admitted event (or
+    report_suppressed) logs "Suppressed N <EVENT_TYPE> events".
+    """
+    
+    def __init__(self, rate: Optional[float] = DEFAULT_EVENT_RATE, burst: int = DEFAULT_EVENT_BURST,
+                 sample_every: int = 1, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.sample_every = sample_every
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._states: Dict[str, _EventState] = {}
+        self._overrides: Dict[str, Dict[str, Any]] = {}
+    
+    def configure(self, event_type: str, rate: Optional[float] = None, burst: Optional[int] = None,
+                  sample_every: Optional[int] = None, unlimited: bool = False) -> None:
+        """Override the limits for one event type (unlimited=True disables the bucket)"""
+        settings = {'rate': None if unlimited else (self.rate if rate is None else rate),
+                    'burst': self.burst if burst is None else burst,
+                    'sample_every': self.sample_every if sample_every is None else max(1, sample_every)}
+        with self._lock:
+            self._overrides[event_type] = settings
+            self._states.pop(event_type, None)
+    
+    def _state(self, event_type: str) -> _EventState:
+        state = self._states.get(event_type)
+        if state is None:
+            settings = self._overrides.get(event_type) or {
+                'rate': self.rate, 'burst': self.burst, 'sample_every': self.sample_every}
+            state = self._states[event_type] = _EventState(now=self._clock(), **settings)
+        return state
+    
+    def acquire(self, event_type: str) -> Optional[int]:
+        """
+        None if this event should be suppressed, otherwise the number of
+        events of this type suppressed since the last one admitted
+        """
+        with self._lock:
+            state = self._state(event_type)
+            state.seen += 1
+            admitted = state.sample_every == 1 or (state.seen - 1) % state.sample_every == 0
+            if admitted and state.rate is not None:
+                now = self._clock()
+                state.tokens = min(state.burst, state.tokens + (now - state.updated) * state.rate)
+                state.updated = now
+                if state.tokens >= 1:
+                    state.tokens -= 1
+                else:
+                    admitted = False
+            if not admitted:
+                state.suppressed += 1
+                state.pending += 1
+                return None
+            state.logged += 1
+            pending, state.pending = state.pending, 0
+            return pending
+    
+    def log(self, logger: logging.Logger, level: int, event_type: str, msg: str, *args,
+            extra: Optional[Dict[str, Any]] = None, stacklevel: int = 1) -> bool:
+        """Log `msg % args` unless the level is disabled or the event is suppressed; True if logged"""
+        if not logger.isEnabledFor(level):
+            return False
+        pending = self.acquire(event_type)
+        if pending is None:
+            self._remember(event_type, logger, level)
+            return False
+        if pending:
+            self._log_suppressed(logger, level, event_type, pending, stacklevel + 1)
+        logger.log(level, msg, *args, extra=extra, stacklevel=stacklevel + 1)
+        return True
+    
+    def _remember(self, event_type: str, logger: logging.Logger, level: int) -> None:
+        state = self._states.get(event_type)
+        if state is not None and state.logger is None:
+            state.logger = logger
+            state.level = level
+    
+    @staticmethod
+    def _log_suppressed(logger: logging.Logger, level: int, event_type: str, count: int, stacklevel: int) -> None:
+        logger.log(level, "Suppressed %s %s events", f"{count:,}", event_type, stacklevel=stacklevel + 1,
+                   extra={'details': {'event_type': event_type, 'suppressed': count}})
+    
+    def report_suppressed(self, event_type: Optional[str] = None) -> Dict[str, int]:
+        """Log and reset the pending suppressed counts (of one event type, or all); returns what was reported"""
+        with self._lock:
+            states = [(k, v) for k, v in self._states.items() if event_type is None or k == event_type]
+            reported = []
+            for key, state in states:
+                if state.pending and state.logger is not None:
+                    reported.append((key, state.pending, state.logger, state.level))
+                    state.pending = 0
+        for key, count, logger, level in reported:
+            self._log_suppressed(logger, level, key, count, 2)
+        return {key: count for key, count, _, _ in reported}
+    
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Cumulative seen/logged/suppressed counters per event type"""
+        with self._lock:
+            return {key: {'seen': s.seen, 'logged': s.logged, 'suppressed': s.suppressed}
+                    for key, s in self._states.items()}
+    
+    def reset(self) -> None:
+        with self._lock:
+            self._states.clear()
+
+
+# Process-wide limiter used by log_rate_limited and the hot-path helpers below
+event_limiter = EventRateLimiter()
+
+
+def log_rate_limited(logger: logging.Logger, level: int, event_type: str, msg: str, *args,
+                     extra: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    Log a hot-path event through the process-wide EventRateLimiter.
+    
+    Pass %-style args rather than an f-string so nothing is formatted for
+    events that are filtered or suppressed.
+    """
+    return event_limiter.log(logger, level, event_type, msg, *args, extra=extra, stacklevel=2)
+
+
 def get_logger(name: str) -> logging.Logger:
     """Get a logger for a specific module"""
     return logging.getLogger(name)
@@ -185,19 +727,21 @@ def log_inference(
     success: bool,
     details: Optional[Dict] = None
 ):
-    """Log model inference event"""
-    logger.info(
-        f"{phase} inference",
-        extra={
-            'event_type': 'INFERENCE',
-            'phase': phase,
-            'model_name': model_name,
-            'input_size': input_size,
-            'duration_ms': duration_ms,
-            'success': success,
-            'details': details or {}
-        }
-    )
+    """Log model inference event (successful calls are rate limited as INFERENCE events)"""
+    extra = {
+        'event_type': 'INFERENCE',
+        'phase': phase,
+        'model_name': model_name,
+        'input_size': input_size,
+        'duration_ms': duration_ms,
+        'success': success,
+        'details': details or {}
+    }
+    if not success:
+        # failures are never suppressed
+        logger.info("%s inference", phase, extra=extra, stacklevel=2)
+        return
+    event_limiter.log(logger, logging.INFO, 'INFERENCE', "%s inference", phase, extra=extra, stacklevel=2)
 
 
 def log_data_validation(
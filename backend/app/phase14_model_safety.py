@@ -15,6 +15,8 @@ from pathlib import Path
 import json
 import logging
 
+from phase14_logging import event_limiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -266,19 +268,21 @@ class ModelInferenceGuard:
         success: bool,
         error: Optional[str] = None
     ):
-        """Log model inference call"""
-        logger.info(
-            f"Model inference: {model_name}:{model_version}",
-            extra={
-                'event_type': 'MODEL_INFERENCE',
-                'model_name': model_name,
-                'model_version': model_version,
-                'input_size': input_size,
-                'duration_ms': duration_ms,
-                'success': success,
-                'error': error,
-            }
-        )
+        """Log model inference call (successful calls are rate limited as MODEL_INFERENCE events)"""
+        extra = {
+            'event_type': 'MODEL_INFERENCE',
+            'model_name': model_name,
+            'model_version': model_version,
+            'input_size': input_size,
+            'duration_ms': duration_ms,
+            'success': success,
+            'error': error,
+        }
+        if not success:
+            logger.info("Model inference: %s:%s", model_name, model_version, extra=extra)
+            return
+        event_limiter.log(logger, logging.INFO, 'MODEL_INFERENCE', "Model inference: %s:%s",
+                          model_name, model_version, extra=extra)
 
 
 class RetrainingGuard:
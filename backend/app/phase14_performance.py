@@ -4,13 +4,23 @@ Phase 14: Performance & Resource Stability
 Monitors memory usage, execution time, and resource constraints.
 Prevents system degradation under load.
 Adds timeouts for long-running operations.
+Keeps in-process metrics (latency histograms, counters, gauges) per
+endpoint and per operation, exposed in the Prometheus text format.
+Samples CPU and memory on a background thread so request paths never
+wait on resource measurements.
 """
 
+import atexit
+import json
 import logging
+import os
 import psutil
+import threading
 import time
+import tracemalloc
 from functools import wraps
-from typing import Callable, Optional, Dict, Any
+from pathlib import Path
+from typing import Callable, Optional, Dict, Any, Iterable, List, Tuple
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
@@ -41,10 +51,14 @@ class ResourceMonitor:
     
     @staticmethod
     def get_cpu_usage() -> Dict[str, float]:
-        """Get current CPU usage"""
+        """
+        Get current CPU usage without blocking: the resource sampler's latest
+        reading when it is running, otherwise utilization since the previous call
+        """
         try:
+            sample = resource_sampler.latest()
             return {
-                'percent': psutil.cpu_percent(interval=1),
+                'percent': sample['system_cpu_percent'] if sample else psutil.cpu_percent(interval=None),
                 'core_count': psutil.cpu_count(),
             }
         except Exception as e:
@@ -85,6 +99,546 @@ class ResourceMonitor:
         )
 
 
+# Latency histograms: values are recorded in microseconds into log-linear
+# buckets with 2**HISTOGRAM_SIGNIFICANT_BITS sub-buckets per power of two
+# (HdrHistogram-style), i.e. within ~1.6% of the true value at any scale
+HISTOGRAM_SIGNIFICANT_BITS = 6
+# Bucket bounds (seconds) of the Prometheus histograms rendered from them
+PROMETHEUS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Quantiles rendered as summaries next to each histogram
+PROMETHEUS_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Under gunicorn, each worker writes its metrics to this directory and
+# /metrics merges them (unset: single process, render the local registry)
+METRICS_MULTIPROC_DIR = os.environ.get('METRICS_MULTIPROC_DIR')
+METRICS_WRITE_INTERVAL_SECONDS = float(os.environ.get('METRICS_WRITE_INTERVAL', '5'))
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class LatencyHistogram:
+    """
+    Sparse log-linear histogram of durations.
+    
+    Values below 2**bits microseconds have exact buckets; above that each
+    power of two is split into 2**(bits - 1) equal buckets, so percentiles
+    keep a bounded relative error from microseconds to hours. Histograms
+    from several processes merge by adding bucket counts.
+    """
+    
+    __slots__ = ('bits', 'counts', 'count', 'sum')
+    
+    def __init__(self, bits: int = HISTOGRAM_SIGNIFICANT_BITS):
+        self.bits = bits
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0          # seconds
+    
+    def bucket(self, micros: int) -> int:
+        shift = micros.bit_length() - self.bits
+        if shift <= 0:
+            return micros
+        return shift * (1 << (self.bits - 1)) + (micros >> shift)
+    
+    def bucket_bounds(self, index: int) -> Tuple[int, int]:
+        """[lower, upper) in microseconds of a bucket"""
+        half = 1 << (self.bits - 1)
+        if index < 2 * half:
+            return index, index + 1
+        shift = index // half - 1
+        mantissa = index - shift * half
+        return mantissa << shift, (mantissa + 1) << shift
+    
+    def record(self, seconds: float) -> None:
+        micros = int(seconds * 1_000_000 + 0.5) if seconds > 0 else 0
+        index = self.bucket(micros)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.sum += seconds
+    
+    def merge(self, counts: Dict[int, int], count: int, total: float) -> None:
+        for index, n in counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.count += count
+        self.sum += total
+    
+    def _value(self, index: int) -> float:
+        lower, upper = self.bucket_bounds(index)
+        return (lower + upper - 1) / 2 / 1_000_000
+    
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile in seconds (0.0 when empty)"""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return self._value(index)
+        return self._value(max(self.counts))
+    
+    def cumulative(self, bounds: Iterable[float]) -> List[int]:
+        """Number of values <= each bound (in seconds, ascending), by bucket midpoint"""
+        result = []
+        ordered = sorted(self.counts)
+        position = seen = 0
+        for bound in bounds:
+            while position < len(ordered) and self._value(ordered[position]) <= bound:
+                seen += self.counts[ordered[position]]
+                position += 1
+            result.append(seen)
+        return result
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {'counts': {str(k): v for k, v in self.counts.items()}, 'count': self.count, 'sum': self.sum}
+
+
+class MetricsRegistry:
+    """
+    Thread-safe in-process counters, gauges and latency histograms.
+    
+    Series are identified by metric name and labels. snapshot() produces
+    a JSON-able copy that another registry can merge(), which is how
+    per-worker registries are combined under gunicorn (see
+    MultiProcessMetrics). render() writes the Prometheus text format.
+    """
+    
+    def __init__(self, bits: int = HISTOGRAM_SIGNIFICANT_BITS):
+        self.bits = bits
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._gauges: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], LatencyHistogram] = {}
+        self._help: Dict[str, str] = {}
+        self._gauge_merge: Dict[str, str] = {}
+    
+    @staticmethod
+    def _labels(labels: Optional[Dict[str, Any]]) -> Labels:
+        return tuple(sorted((k, str(v)) for k, v in labels.items())) if labels else ()
+    
+    def describe(self, name: str, help_text: str, gauge_merge: str = 'sum') -> None:
+        """Set a metric's help text; gauge_merge='max' combines a gauge across processes by maximum"""
+        self._help[name] = help_text
+        if gauge_merge != 'sum':
+            self._gauge_merge[name] = gauge_merge
+    
+    def inc(self, name: str, value: float = 1, labels: Optional[Dict[str, Any]] = None) -> None:
+        key = (name, self._labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+    
+    def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        key = (name, self._labels(labels))
+        with self._lock:
+            self._gauges[key] = value
+    
+    def add_gauge(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        key = (name, self._labels(labels))
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0) + value
+    
+    def observe(self, name: str, seconds: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        key = (name, self._labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram(self.bits)
+            histogram.record(seconds)
+    
+    def counter_value(self, name: str, labels: Optional[Dict[str, Any]] = None) -> float:
+        with self._lock:
+            return self._counters.get((name, self._labels(labels)), 0)
+    
+    def gauge_value(self, name: str, labels: Optional[Dict[str, Any]] = None) -> Optional[float]:
+        with self._lock:
+            return self._gauges.get((name, self._labels(labels)))
+    
+    def histogram(self, name: str, labels: Optional[Dict[str, Any]] = None) -> Optional[LatencyHistogram]:
+        with self._lock:
+            return self._histograms.get((name, self._labels(labels)))
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                'gauges': [[name, list(labels), value] for (name, labels), value in self._gauges.items()],
+                'histograms': [[name, list(labels), h.to_dict()] for (name, labels), h in self._histograms.items()],
+                'help': dict(self._help),
+                'gauge_merge': dict(self._gauge_merge),
+            }
+    
+    def merge(self, snapshot: Dict[str, Any], gauges: bool = True) -> None:
+        """
+        Add another registry's snapshot to this one. Gauges are summed, or
+        maxed when described with gauge_merge='max' (e.g. system-wide
+        values every worker reports); gauges=False skips them.
+        """
+        with self._lock:
+            for name, mode in snapshot.get('gauge_merge', {}).items():
+                self._gauge_merge.setdefault(name, mode)
+            for name, labels, value in snapshot.get('counters', []):
+                key = (name, tuple(map(tuple, labels)))
+                self._counters[key] = self._counters.get(key, 0) + value
+            if gauges:
+                for name, labels, value in snapshot.get('gauges', []):
+                    key = (name, tuple(map(tuple, labels)))
+                    if key in self._gauges and self._gauge_merge.get(name) == 'max':
+                        self._gauges[key] = max(self._gauges[key], value)
+                    else:
+                        self._gauges[key] = self._gauges.get(key, 0) + value
+            for name, labels, data in snapshot.get('histograms', []):
+                key = (name, tuple(map(tuple, labels)))
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = LatencyHistogram(self.bits)
+                histogram.merge({int(k): v for k, v in data['counts'].items()}, data['count'], data['sum'])
+            for name, help_text in snapshot.get('help', {}).items():
+                self._help.setdefault(name, help_text)
+    
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+    
+    def render(self) -> str:
+        """All series in the Prometheus text exposition format"""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+            help_texts = dict(self._help)
+        lines: List[str] = []
+        
+        def header(name: str, kind: str) -> None:
+            if name in help_texts:
+                lines.append(f"# HELP {name} {help_texts[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+        
+        for kind, series in (('counter', counters), ('gauge', gauges)):
+            current = None
+            for (name, labels), value in series:
+                if name != current:
+                    header(name, kind)
+                    current = name
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        
+        current = None
+        for (name, labels), histogram in histograms:
+            if name != current:
+                header(name, 'histogram')
+                current = name
+            for bound, count in zip(PROMETHEUS_BUCKETS, histogram.cumulative(PROMETHEUS_BUCKETS)):
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', _format_value(bound)),))} {count}")
+            lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        
+        # Percentiles from the full-resolution (merged) histograms
+        current = None
+        for (name, labels), histogram in histograms:
+            summary = f"{name}_quantiles"
+            if summary != current:
+                lines.append(f"# HELP {summary} Percentiles of {name}")
+                lines.append(f"# TYPE {summary} summary")
+                current = summary
+            for q in PROMETHEUS_QUANTILES:
+                lines.append(f"{summary}{_format_labels(labels + (('quantile', str(q)),))} "
+                             f"{_format_value(histogram.quantile(q))}")
+            lines.append(f"{summary}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+            lines.append(f"{summary}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape_label(v)}"' for k, v in labels) + '}'
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MultiProcessMetrics:
+    """
+    Combines the registries of several worker processes (gunicorn).
+    
+    Each worker writes its registry snapshot to
+    `<directory>/metrics-<pid>-<start time in ms>.json` (at most every
+    `interval` seconds from the request hooks, on demand before rendering,
+    and at exit); the start time keeps a restarted worker that reuses a pid
+    from overwriting its predecessor's file. collect() merges every file:
+    counters and histograms of exited workers are kept so totals never go
+    backwards; gauges only count workers that are still running. Clear the
+    directory when the service is (re)deployed.
+    """
+    
+    def __init__(self, directory: Path, interval: float = METRICS_WRITE_INTERVAL_SECONDS):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.interval = interval
+        self._last_write = 0.0
+        self._write_lock = threading.Lock()
+    
+    def write(self, registry: MetricsRegistry) -> None:
+        process = current_process()
+        snapshot = registry.snapshot()
+        snapshot['pid'] = process.pid
+        snapshot['started'] = process.create_time()
+        path = self.directory / f"metrics-{process.pid}-{int(snapshot['started'] * 1000)}.json"
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with self._write_lock:
+            tmp.write_text(json.dumps(snapshot), encoding='utf-8')
+            os.replace(tmp, path)
+            self._last_write = time.monotonic()
+    
+    def maybe_write(self, registry: MetricsRegistry) -> None:
+        if time.monotonic() - self._last_write >= self.interval:
+            self.write(registry)
+    
+    def collect(self) -> MetricsRegistry:
+        merged = MetricsRegistry()
+        for path in sorted(self.directory.glob('metrics-*.json')):
+            try:
+                snapshot = json.loads(path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                continue  # replaced or removed while listing
+            merged.merge(snapshot, gauges=_process_alive(snapshot.get('pid'), snapshot.get('started')))
+        return merged
+
+
+def _process_alive(pid: Optional[int], started: Optional[float] = None) -> bool:
+    """Whether `pid` is running and, given its start time, is still the same process"""
+    if not pid:
+        return False
+    if pid == os.getpid() and started is None:
+        return True
+    if started is not None:
+        try:
+            return psutil.Process(pid).create_time() == started
+        except psutil.NoSuchProcess:
+            return False
+        except psutil.AccessDenied:
+            return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# Process-wide registry fed by the request hooks, PerformanceTracker and operation_timer
+metrics_registry = MetricsRegistry()
+metrics_registry.describe('http_requests_total', 'HTTP requests by method, endpoint and status')
+metrics_registry.describe('http_request_duration_seconds', 'HTTP request latency by method and endpoint')
+metrics_registry.describe('http_requests_in_progress', 'HTTP requests being handled')
+metrics_registry.describe('operations_total', 'Tracked operations by outcome')
+metrics_registry.describe('operation_duration_seconds', 'Tracked operation latency')
+metrics_registry.describe('process_resident_memory_bytes', 'Resident memory of the worker processes')
+metrics_registry.describe('process_cpu_percent', 'CPU use of the worker processes (percent of one core)')
+metrics_registry.describe('system_cpu_percent', 'Host CPU use', gauge_merge='max')
+metrics_registry.describe('system_memory_percent', 'Host memory use', gauge_merge='max')
+
+multiprocess_metrics = MultiProcessMetrics(Path(METRICS_MULTIPROC_DIR)) if METRICS_MULTIPROC_DIR else None
+if multiprocess_metrics is not None:
+    atexit.register(lambda: multiprocess_metrics.write(metrics_registry))
+
+
+def record_operation(name: str, duration_ms: float, success: bool) -> None:
+    """Feed one tracked operation into the metrics registry"""
+    metrics_registry.observe('operation_duration_seconds', duration_ms / 1000, {'operation': name})
+    metrics_registry.inc('operations_total', labels={'operation': name, 'outcome': 'success' if success else 'failure'})
+
+
+def render_metrics() -> str:
+    """Prometheus text for this process, or for all workers in multiprocess mode"""
+    if multiprocess_metrics is None:
+        return metrics_registry.render()
+    multiprocess_metrics.write(metrics_registry)
+    return multiprocess_metrics.collect().render()
+
+
+# Memory accounting for PerformanceTracker / operation_timer:
+#   rss          RSS before and after every call (cached process handle)
+#   tracemalloc  Python allocation delta for 1 in TRACEMALLOC_SAMPLE_EVERY calls
+#                (tracing runs only while a sampled call is in progress)
+#   off          no memory accounting
+MEMORY_ACCOUNTING = os.environ.get('PERF_MEMORY_ACCOUNTING', 'rss')
+MEMORY_ACCOUNTING_MODES = ('rss', 'tracemalloc', 'off')
+TRACEMALLOC_SAMPLE_EVERY = int(os.environ.get('PERF_TRACEMALLOC_SAMPLE_EVERY', '100'))
+RESOURCE_SAMPLE_INTERVAL_SECONDS = float(os.environ.get('PERF_SAMPLE_INTERVAL', '15'))
+
+_process_handle: Optional[Tuple[int, Any]] = None
+
+
+def current_process():
+    """psutil.Process for this process, created once per pid (so it stays valid after fork)"""
+    global _process_handle
+    handle = _process_handle
+    pid = os.getpid()
+    if handle is None or handle[0] != pid:
+        handle = _process_handle = (pid, psutil.Process(pid))
+    return handle[1]
+
+
+def _rss_mb() -> Optional[float]:
+    try:
+        return current_process().memory_info().rss / (1024 * 1024)
+    except Exception:
+        return None
+
+
+class MemoryProbe:
+    """
+    Measures the memory change across a call according to MEMORY_ACCOUNTING.
+    
+    start() returns a token for stop(), which returns the delta in MB (None
+    when the call was not measured). In tracemalloc mode the first of
+    concurrent sampled calls (across all probes) starts tracing and the
+    last one stops it, unless tracing was already on; deltas then include
+    allocations made by other threads meanwhile.
+    """
+    
+    # tracemalloc is process-wide, so its users are counted across probes
+    _tracing_lock = threading.Lock()
+    _tracing_users = 0
+    _owns_tracing = False
+    
+    def __init__(self, mode: str = MEMORY_ACCOUNTING, sample_every: int = TRACEMALLOC_SAMPLE_EVERY):
+        if mode not in MEMORY_ACCOUNTING_MODES:
+            raise ValueError(f"Unknown memory accounting mode: {mode} (expected one of {MEMORY_ACCOUNTING_MODES})")
+        self.mode = mode
+        self.sample_every = max(1, sample_every)
+        self._calls = 0
+    
+    def start(self) -> Optional[Tuple[str, float]]:
+        if self.mode == 'rss':
+            rss = _rss_mb()
+            return None if rss is None else ('rss', rss)
+        if self.mode == 'tracemalloc':
+            cls = MemoryProbe
+            with cls._tracing_lock:
+                self._calls += 1
+                if (self._calls - 1) % self.sample_every:
+                    return None
+                if cls._tracing_users == 0 and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    cls._owns_tracing = True
+                cls._tracing_users += 1
+                return 'tracemalloc', tracemalloc.get_traced_memory()[0] / (1024 * 1024)
+        return None
+    
+    def stop(self, token: Optional[Tuple[str, float]]) -> Optional[float]:
+        if token is None:
+            return None
+        kind, start = token
+        if kind == 'rss':
+            end = _rss_mb()
+            return None if end is None else end - start
+        cls = MemoryProbe
+        with cls._tracing_lock:
+            end = tracemalloc.get_traced_memory()[0] / (1024 * 1024) if tracemalloc.is_tracing() else start
+            cls._tracing_users -= 1
+            if cls._tracing_users == 0 and cls._owns_tracing:
+                tracemalloc.stop()
+                cls._owns_tracing = False
+        return end - start
+
+
+memory_probe = MemoryProbe()
+
+
+class ResourceSampler:
+    """
+    Background thread that samples process and system CPU / memory every
+    `interval` seconds and publishes them as gauges in metrics_registry:
+    process_resident_memory_bytes, process_cpu_percent, system_cpu_percent
+    and system_memory_percent.
+    
+    CPU percentages are utilization since the previous sample, so readings
+    never block. latest() returns the last sample (None before the first).
+    """
+    
+    def __init__(self, interval: float = RESOURCE_SAMPLE_INTERVAL_SECONDS, registry: Optional['MetricsRegistry'] = None):
+        self.interval = interval
+        self.registry = registry
+        self._latest: Optional[Dict[str, float]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+    
+    def sample(self) -> Dict[str, float]:
+        """Take one sample now and publish it"""
+        process = current_process()
+        with process.oneshot():
+            rss = process.memory_info().rss
+            process_cpu = process.cpu_percent(interval=None)
+        sample = {
+            'timestamp': time.time(),
+            'process_resident_memory_bytes': rss,
+            'process_cpu_percent': process_cpu,
+            'system_cpu_percent': psutil.cpu_percent(interval=None),
+            'system_memory_percent': psutil.virtual_memory().percent,
+        }
+        self._latest = sample
+        registry = self.registry if self.registry is not None else metrics_registry
+        for name, value in sample.items():
+            if name != 'timestamp':
+                registry.set_gauge(name, value)
+        return sample
+    
+    def latest(self) -> Optional[Dict[str, float]]:
+        sample = self._latest
+        if sample is None or self._pid != os.getpid():
+            return None
+        return sample
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning(f"Resource sampling failed: {e}")
+    
+    def start(self) -> None:
+        """Start sampling in this process (again after a fork); no-op if already running"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._latest = None
+            self._stop.clear()
+            try:
+                self.sample()  # primes the CPU counters
+            except Exception as e:
+                logger.warning(f"Resource sampling failed: {e}")
+            self._thread = threading.Thread(target=self._run, name='resource-sampler', daemon=True)
+            self._thread.start()
+    
+    def stop(self) -> None:
+        with self._lock:
+            self._stop.set()
+            thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.interval + 1)
+
+
+# Process-wide sampler; started by the app (main.py), one per worker process
+resource_sampler = ResourceSampler()
+
+
 class PerformanceTracker:
     """Tracks performance metrics"""
     
@@ -95,24 +649,16 @@ class PerformanceTracker:
     
     def __enter__(self):
         self.start_time = time.time()
-        try:
-            process = psutil.Process()
-            self.start_memory = process.memory_info().rss / (1024 * 1024)  # MB
-        except Exception:
-            self.start_memory = None
+        self.start_memory = memory_probe.start()  # see MEMORY_ACCOUNTING
         
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         duration_ms = (time.time() - self.start_time) * 1000
         
-        memory_delta_mb = None
-        try:
-            process = psutil.Process()
-            end_memory = process.memory_info().rss / (1024 * 1024)  # MB
-            memory_delta_mb = end_memory - self.start_memory
-        except Exception:
-            pass
+        memory_delta_mb = memory_probe.stop(self.start_memory)
+        
+        record_operation(self.name, duration_ms, exc_type is None)
         
         if exc_type is None:
             logger.info(
@@ -200,26 +746,16 @@ def operation_timer(operation_name: str):
             data = load_data()
     """
     start_time = time.time()
-    start_memory = None
-    
-    try:
-        process = psutil.Process()
-        start_memory = process.memory_info().rss / (1024 * 1024)
-    except Exception:
-        pass
+    start_memory = memory_probe.start()
     
+    success = False
     try:
         yield
+        success = True
     finally:
         duration_ms = (time.time() - start_time) * 1000
-        
-        memory_delta_mb = None
-        try:
-            process = psutil.Process()
-            end_memory = process.memory_info().rss / (1024 * 1024)
-            memory_delta_mb = end_memory - start_memory
-        except Exception:
-            pass
+        record_operation(operation_name, duration_ms, success)
+        memory_delta_mb = memory_probe.stop(start_memory)
         
         logger.info(
             f"Operation timed: {operation_name}",
@@ -324,3 +860,40 @@ class PerformanceBudget:
             msg = message or f"{self.operation} exceeded {self.budget_ms}ms budget"
             logger.error(msg)
             raise TimeoutError(msg)
+
+
+def install_request_metrics(app, skip_paths: Iterable[str] = ('/metrics',)) -> None:
+    """
+    Record per-request metrics for a Flask app: http_requests_total,
+    http_request_duration_seconds and http_requests_in_progress, labelled
+    by the matched route rule (not the raw path, to bound cardinality).
+    
+    Streamed responses are timed until the response object is returned.
+    """
+    from flask import g, request
+    skip = frozenset(skip_paths)
+    
+    @app.before_request
+    def _start_request_metrics():
+        if request.path in skip:
+            return
+        g._metrics_start = time.perf_counter()
+        metrics_registry.add_gauge('http_requests_in_progress', 1)
+    
+    @app.after_request
+    def _record_request_metrics(response):
+        start = g.get('_metrics_start')
+        if start is not None:
+            rule = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            metrics_registry.observe('http_request_duration_seconds', time.perf_counter() - start,
+                                     {'method': request.method, 'endpoint': rule})
+            metrics_registry.inc('http_requests_total',
+                                 labels={'method': request.method, 'endpoint': rule, 'status': response.status_code})
+            if multiprocess_metrics is not None:
+                multiprocess_metrics.maybe_write(metrics_registry)
+        return response
+    
+    @app.teardown_request
+    def _finish_request_metrics(exc):
+        if g.pop('_metrics_start', None) is not None:
+            metrics_registry.add_gauge('http_requests_in_progress', -1)
@@ -83,9 +83,11 @@ class StartupVerifier:
             if not root_logger.handlers:
                 return False, "No logging handlers configured"
             
+            # In asynchronous mode the file handler sits behind the queue handler
             has_file_handler = any(
                 isinstance(h, logging.FileHandler)
-                for h in root_logger.handlers
+                for handler in root_logger.handlers
+                for h in (handler, *getattr(handler, 'target_handlers', ()))
             )
             
             if not has_file_handler:
@@ -5,19 +5,44 @@ REST API endpoints for accessing schedule intelligence.
 Integrates with Feature 1 (Phase 15) for project risk scoring.
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from phase16_schedule_dependencies import ScheduleDependencyAnalyzer
 from phase16_delay_propagation import DelayPropagationEngine
-from phase16_types import (
-    Task, TaskDependency, DependencyType, TaskStatus
-)
+from phase16_cycles import ScheduleCycleError
+from phase16_schedule_frame import ScheduleFrame
+from phase16_schedule_stream import NDJSON_MIMETYPES, read_json_schedule, read_ndjson_schedule
+from phase16_schedule_store import CachedSchedule, schedule_content_hash, schedule_etag, schedule_store
+from phase16_types import TaskStatus, CycleMode, ScenarioAction, ScenarioChange, WhatIfScenario
+import json
 import logging
+import os
+
+try:
+    from phase16_cpm_engine import CompiledScheduleGraph, VectorizedCPMEngine
+    from phase16_monte_carlo import MonteCarloScheduleSimulator
+    from phase16_what_if import WhatIfScenarioEngine
+    VECTORIZED_CPM_AVAILABLE = True
+except ImportError:
+    VECTORIZED_CPM_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+CPM_ENGINES = ('dict', 'vectorized')
+CYCLE_MODES = tuple(mode.value for mode in CycleMode)
+MAX_MONTE_CARLO_ITERATIONS = 100000
+MAX_WHAT_IF_SCENARIOS = 500
+MAX_REPORTED_ROW_ERRORS = 1000
+# Largest process pool a request may ask for (larger values are clamped)
+MAX_WORKERS = os.cpu_count() or 1
+
 schedule_bp = Blueprint('schedule', __name__, url_prefix='/api/schedule')
 
 
+def _build_analyzer(tasks_data, deps_data) -> ScheduleDependencyAnalyzer:
+    """Load task and dependency rows from a request body into an analyzer"""
+    return ScheduleDependencyAnalyzer.from_frame(ScheduleFrame.from_rows(tasks_data, deps_data))
+
+
 @schedule_bp.route('/analyze', methods=['POST'])
 def analyze_schedule():
     """
@@ -27,6 +52,8 @@ def analyze_schedule():
     {
         "project_id": "PROJ_001",
         "project_name": "Project Name",
+        "engine": "dict",            # optional: "dict" (default) or "vectorized"
+        "cycle_mode": "exclude",     # optional: "exclude" (default), "condense" or "fail"
         "tasks": [
             {
                 "task_id": "task1",
@@ -50,10 +77,29 @@ def analyze_schedule():
         ]
     }
     
+    Large schedules can be streamed instead (rows go straight into the
+    schedule builder without holding the parsed body): send the same JSON with
+    ?stream=1, or NDJSON (Content-Type: application/x-ndjson) with one task,
+    dependency or {"project_id": ...} header object per line. Malformed rows
+    are skipped and listed in "row_errors" ({"section", "row", "error"}).
+    
+    Dependency cycles are listed in "cycles" ({"task_ids", "dependency_ids"}).
+    cycle_mode "exclude" analyzes the schedule without the cyclic tasks (listed
+    in "excluded_tasks"), "condense" gives each cycle's tasks a shared start,
+    and "fail" rejects the schedule with a 400 listing the cycles.
+    
     Response JSON:
     {
         "success": true,
         "project_id": "PROJ_001",
+        "content_hash": "9f2c...",   # hash of the submitted tasks and dependencies
+        "etag": "41ab...",           # ETag of the GET endpoints (content hash + analysis options)
+        "cached": false,             # true when an identical schedule was already stored
+        "engine": "dict",            # engine that ran (vectorized falls back to dict on cycles)
+        "requested_engine": "vectorized",
+        "warnings": [...],           # e.g. the engine fallback
+        "cycles": [],
+        "excluded_tasks": [],
         "schedule_intelligence": {
             "critical_path": [...],
             "project_duration_days": 120,
@@ -66,47 +112,79 @@ def analyze_schedule():
     }
     """
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "No JSON data provided"}), 400
+        streamed = None
+        if request.mimetype in NDJSON_MIMETYPES:
+            streamed = read_ndjson_schedule(request.stream)
+        elif request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+            streamed = read_json_schedule(request.stream)
+        
+        if streamed is not None:
+            data = streamed.fields
+            frame = streamed.frame
+            content_hash = streamed.content_hash
+            if frame.num_tasks == 0:
+                return jsonify({"error": "No tasks provided", "row_errors": _row_errors(streamed)}), 400
+        else:
+            data = request.get_json()
+            if not data:
+                return jsonify({"error": "No JSON data provided"}), 400
+            tasks_data = data.get('tasks', [])
+            deps_data = data.get('dependencies', [])
+            if not tasks_data:
+                return jsonify({"error": "No tasks provided"}), 400
+            frame = None
+            content_hash = schedule_content_hash(tasks_data, deps_data)
         
         project_id = data.get('project_id', 'UNKNOWN')
         project_name = data.get('project_name', 'Unknown Project')
-        tasks_data = data.get('tasks', [])
-        deps_data = data.get('dependencies', [])
         
-        if not tasks_data:
-            return jsonify({"error": "No tasks provided"}), 400
+        engine_name = (request.args.get('engine') or data.get('engine') or 'dict').lower()
+        if engine_name not in CPM_ENGINES:
+            return jsonify({"error": f"Unknown engine '{engine_name}', expected one of {list(CPM_ENGINES)}"}), 400
+        if engine_name == 'vectorized' and not VECTORIZED_CPM_AVAILABLE:
+            return jsonify({"error": "Vectorized engine unavailable (numpy not installed)"}), 400
+        
+        cycle_mode_name = (request.args.get('cycle_mode') or data.get('cycle_mode') or CycleMode.EXCLUDE.value).lower()
+        if cycle_mode_name not in CYCLE_MODES:
+            return jsonify({"error": f"Unknown cycle_mode '{cycle_mode_name}', expected one of {list(CYCLE_MODES)}"}), 400
+        cycle_mode = CycleMode(cycle_mode_name)
+        
+        stream_report = {}
+        if streamed is not None:
+            stream_report = {
+                "rows_read": {"tasks": streamed.task_rows, "dependencies": streamed.dependency_rows},
+                "row_error_count": len(streamed.errors),
+                "row_errors": _row_errors(streamed)
+            }
+        
+        # Identical resubmission: serve the stored analysis
+        cached = schedule_store.get(project_id, content_hash)
+        if (cached is not None and cached.intelligence.project_name == project_name
+                and cached.analysis_response['requested_engine'] == engine_name
+                and cached.analysis_response['cycle_mode'] == cycle_mode.value):
+            return jsonify(dict(cached.analysis_response, cached=True, **stream_report)), 200
         
         # Build schedule
-        analyzer = ScheduleDependencyAnalyzer()
-        
-        for task_dict in tasks_data:
-            task = Task(
-                task_id=task_dict['task_id'],
-                name=task_dict.get('name', 'Unknown'),
-                duration_days=int(task_dict['duration_days']),
-                complexity_factor=float(task_dict.get('complexity_factor', 1.0)),
-                weather_dependency=bool(task_dict.get('weather_dependency', False)),
-                resource_constrained=bool(task_dict.get('resource_constrained', False))
-            )
-            analyzer.add_task(task)
-        
-        for dep_dict in deps_data:
-            dep_type_str = dep_dict.get('dependency_type', 'finish_to_start').lower()
-            dep_type = DependencyType[dep_type_str.upper()] if hasattr(DependencyType, dep_type_str.upper()) else DependencyType.FINISH_TO_START
-            
-            dep = TaskDependency(
-                dependency_id=dep_dict['dependency_id'],
-                predecessor_task_id=dep_dict['predecessor_task_id'],
-                successor_task_id=dep_dict['successor_task_id'],
-                dependency_type=dep_type,
-                lag_days=int(dep_dict.get('lag_days', 0))
-            )
-            analyzer.add_dependency(dep)
+        if frame is None:
+            frame = ScheduleFrame.from_rows(tasks_data, deps_data)
+        analyzer = ScheduleDependencyAnalyzer.from_frame(frame)
         
         # Analyze
-        cp = analyzer.calculate_critical_path()
+        compiled_graph = None
+        engine_used = engine_name
+        warnings = []
+        if engine_name == 'vectorized':
+            try:
+                compiled_graph = CompiledScheduleGraph.from_frame(frame)
+            except ScheduleCycleError:
+                # The dict engine analyzes around the cycles
+                engine_used = 'dict'
+                warnings.append("Vectorized engine cannot order a schedule with dependency cycles; "
+                                "analyzed with the dict engine")
+        if compiled_graph is not None:
+            cp = VectorizedCPMEngine(analyzer, compiled_graph).calculate_critical_path()
+        else:
+            cp = analyzer.calculate_critical_path(cycle_mode)
         
         # Calculate risk factors for all tasks
         risk_factors = {}
@@ -138,13 +216,33 @@ def analyze_schedule():
             "integration_risk_score": round(intelligence.integration_risk_score, 3),
             "recommended_buffer_days": intelligence.recommended_buffer_days,
             "high_risk_task_count": len(intelligence.high_risk_dependencies),
-            "scenarios_generated": len(scenarios)
+            "scenarios_generated": len(scenarios),
+            "engine": engine_used,
+            "requested_engine": engine_name,
+            "warnings": warnings,
+            "cycle_mode": cycle_mode.value,
+            "cycles": [cycle.to_dict() for cycle in cp.cycles],
+            "excluded_tasks": cp.excluded_tasks,
+            "content_hash": content_hash,
+            "etag": schedule_etag(content_hash, project_name, engine_used, cycle_mode.value)
         }
         
+        schedule_store.put(CachedSchedule(
+            project_id=project_id,
+            content_hash=content_hash,
+            analyzer=analyzer,
+            intelligence=intelligence,
+            analysis_response=response,
+            compiled_graph=compiled_graph
+        ))
+        response = dict(response, cached=False, **stream_report)
+        
         logger.info(f"Schedule analyzed: {project_name} (resilience={intelligence.schedule_resilience_score:.2f})")
         
         return jsonify(response), 200
     
+    except ScheduleCycleError as e:
+        return jsonify({"error": str(e), "cycles": [cycle.to_dict() for cycle in e.cycles]}), 400
     except KeyError as e:
         return jsonify({"error": f"Missing required field: {str(e)}"}), 400
     except ValueError as e:
@@ -154,16 +252,87 @@ def analyze_schedule():
         return jsonify({"error": f"Analysis failed: {str(e)}"}), 500
 
 
-@schedule_bp.route('/critical-path/<project_id>', methods=['GET'])
-def get_critical_path(project_id):
+def _workers(value) -> int:
+    """Requested process pool size clamped to 1..MAX_WORKERS; ValueError unless an integer"""
+    try:
+        workers = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"workers must be an integer, got {value!r}")
+    return max(1, min(workers, MAX_WORKERS))
+
+
+def _row_errors(streamed) -> list:
+    """First MAX_REPORTED_ROW_ERRORS row errors of a streamed schedule"""
+    return [error.to_dict() for error in streamed.errors[:MAX_REPORTED_ROW_ERRORS]]
+
+
+def _cached_json(entry: CachedSchedule, name: str, build) -> Response:
     """
-    Get critical path for a cached project (placeholder for Monday.com integration).
+    Serve a stored schedule view with the entry's ETag.
+
+    The body is serialized once per stored schedule; conditional requests
+    carrying a matching If-None-Match get an empty 304.
     """
-    # TODO: Implement with database/cache lookup
+    body = entry.payloads.get(name)
+    if body is None:
+        body = json.dumps(build(entry)).encode('utf-8')
+        entry.payloads[name] = body
+    response = Response(body, mimetype='application/json')
+    response.set_etag(entry.etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+
+def _not_analyzed(project_id):
     return jsonify({
-        "message": "Critical path endpoint - integration with data store pending",
+        "error": f"No analyzed schedule for project '{project_id}'; POST it to /api/schedule/analyze first",
         "project_id": project_id
-    }), 200
+    }), 404
+
+
+def _critical_path_view(entry: CachedSchedule):
+    cp = entry.intelligence.critical_path_analysis
+    return {
+        "success": True,
+        "project_id": entry.project_id,
+        "project_name": entry.intelligence.project_name,
+        "critical_path": cp.critical_path,
+        "project_duration_days": cp.project_duration_days,
+        "critical_tasks": sorted(cp.critical_tasks),
+        "bottleneck_tasks": cp.bottleneck_tasks,
+        "slack_by_task": cp.slack_by_task,
+        "cycles": [cycle.to_dict() for cycle in cp.cycles],
+        "excluded_tasks": cp.excluded_tasks,
+        "content_hash": entry.content_hash,
+        "analyzed_at": entry.stored_at
+    }
+
+
+def _integration_risk_view(entry: CachedSchedule):
+    intelligence = entry.intelligence
+    return {
+        "success": True,
+        "project_id": entry.project_id,
+        "integration_risk_score": round(intelligence.integration_risk_score, 3),
+        "schedule_resilience_score": round(intelligence.schedule_resilience_score, 3),
+        "recommended_buffer_days": intelligence.recommended_buffer_days,
+        "high_risk_task_count": len(intelligence.high_risk_dependencies),
+        "content_hash": entry.content_hash,
+        "analyzed_at": entry.stored_at
+    }
+
+
+@schedule_bp.route('/critical-path/<project_id>', methods=['GET'])
+def get_critical_path(project_id):
+    """
+    Get critical path for a project analyzed via /analyze (served from the schedule store).
+    
+    Supports If-None-Match: returns 304 while the stored schedule is unchanged.
+    """
+    entry = schedule_store.get(project_id)
+    if entry is None:
+        return _not_analyzed(project_id)
+    return _cached_json(entry, 'critical_path', _critical_path_view)
 
 
 @schedule_bp.route('/integration-risk/<project_id>', methods=['GET'])
@@ -172,9 +341,266 @@ def get_integration_risk(project_id):
     Get schedule integration risk score for Feature 1 risk engine.
     
     Returns risk contribution to add to project's overall risk score.
+    Supports If-None-Match: returns 304 while the stored schedule is unchanged.
     """
-    # TODO: Implement with database lookup
-    return jsonify({
-        "message": "Integration risk endpoint - data store integration pending",
-        "project_id": project_id
-    }), 200
+    entry = schedule_store.get(project_id)
+    if entry is None:
+        return _not_analyzed(project_id)
+    return _cached_json(entry, 'integration_risk', _integration_risk_view)
+
+
+def _impact_view(entry: CachedSchedule):
+    return {
+        "success": True,
+        "project_id": entry.project_id,
+        "downstream_counts": entry.analyzer.get_downstream_counts(),
+        "content_hash": entry.content_hash,
+        "analyzed_at": entry.stored_at
+    }
+
+
+@schedule_bp.route('/impact/<project_id>', methods=['GET'])
+def get_impact(project_id):
+    """
+    Delay blast radius for a project analyzed via /analyze.
+    
+    Without query params: downstream task count for every task (heatmap),
+    served with the schedule's ETag. With ?task_id=X: X's impact scope
+    ({affected_task_id: distance}) and count; add &downstream_task_id=Y to
+    also check whether Y is downstream of X.
+    """
+    entry = schedule_store.get(project_id)
+    if entry is None:
+        return _not_analyzed(project_id)
+    
+    task_id = request.args.get('task_id')
+    if task_id is None:
+        return _cached_json(entry, 'impact', _impact_view)
+    
+    analyzer = entry.analyzer
+    if task_id not in analyzer.tasks:
+        return jsonify({"error": f"Unknown task {task_id}"}), 404
+    response = {
+        "success": True,
+        "project_id": project_id,
+        "task_id": task_id,
+        "impact_scope": analyzer.get_task_impact_scope(task_id),
+        "downstream_count": analyzer.get_downstream_count(task_id)
+    }
+    downstream_task_id = request.args.get('downstream_task_id')
+    if downstream_task_id is not None:
+        response["downstream_task_id"] = downstream_task_id
+        response["is_upstream"] = analyzer.is_upstream(task_id, downstream_task_id)
+    return jsonify(response), 200
+
+
+@schedule_bp.route('/monte-carlo/<project_id>', methods=['GET'])
+def get_monte_carlo(project_id):
+    """
+    Monte Carlo completion-date distribution for a project analyzed via /analyze.
+    
+    Query params: iterations (default 10000), seed (optional, for reproducible
+    results), top_k (tornado entries, default 10, capped at the task count),
+    workers (process pool size, at most MAX_WORKERS).
+    
+    Response JSON:
+    {
+        "success": true,
+        "monte_carlo": {
+            "p50_duration_days": 131.4,
+            "p80_duration_days": 138.0,
+            "p95_duration_days": 143.2,
+            "criticality_index": {"task1": 0.98, ...},
+            "tornado": [{"task_id": "task3", "correlation": 0.61, ...}, ...],
+            ...
+        }
+    }
+    """
+    if not VECTORIZED_CPM_AVAILABLE:
+        return jsonify({"error": "Monte Carlo simulation unavailable (numpy not installed)"}), 400
+    entry = schedule_store.get(project_id)
+    if entry is None:
+        return _not_analyzed(project_id)
+    
+    try:
+        iterations = int(request.args.get('iterations', 10000))
+        seed = request.args.get('seed')
+        seed = int(seed) if seed is not None else None
+        top_k = int(request.args.get('top_k', 10))
+        workers = _workers(request.args.get('workers', 1))
+    except ValueError as e:
+        return jsonify({"error": f"Invalid query parameter: {str(e)}"}), 400
+    if not 0 < iterations <= MAX_MONTE_CARLO_ITERATIONS:
+        return jsonify({"error": f"iterations must be between 1 and {MAX_MONTE_CARLO_ITERATIONS}"}), 400
+    if top_k < 1:
+        return jsonify({"error": "top_k must be at least 1"}), 400
+    
+    try:
+        if entry.compiled_graph is None:
+            entry.compiled_graph = CompiledScheduleGraph.from_analyzer(entry.analyzer)
+        simulator = MonteCarloScheduleSimulator(
+            entry.analyzer, entry.compiled_graph, entry.intelligence.task_risk_factors
+        )
+        result = simulator.simulate(
+            iterations=iterations, seed=seed, top_k=top_k, workers=workers, project_id=project_id
+        )
+        return jsonify({"success": True, "content_hash": entry.content_hash, "monte_carlo": result.to_dict()}), 200
+    except ValueError as e:
+        return jsonify({"error": f"Invalid data: {str(e)}"}), 400
+    except Exception as e:
+        logger.error(f"Error running Monte Carlo simulation: {e}")
+        return jsonify({"error": f"Simulation failed: {str(e)}"}), 500
+
+
+@schedule_bp.route('/propagate/<project_id>', methods=['POST'])
+def propagate_delays(project_id):
+    """
+    Apply a batch of reported task overruns to a stored schedule.
+    
+    Request JSON:
+    {
+        "delays": [
+            {"task_id": "task3", "delay_days": 4},
+            {"task_id": "task9", "delay_days": 2},
+            ...
+        ]
+    }
+    
+    Response JSON:
+    {
+        "success": true,
+        "propagation": {
+            "finish_slippage": {"task3": 4, "task5": 2, ...},
+            "float_exceeded": {"task5": 2},
+            "project_delay_days": 2,
+            ...
+        }
+    }
+    """
+    entry = schedule_store.get(project_id)
+    if entry is None:
+        return _not_analyzed(project_id)
+    
+    try:
+        data = request.get_json()
+        if not data or not data.get('delays'):
+            return jsonify({"error": "No delays provided"}), 400
+        
+        delays = [(d['task_id'], int(d['delay_days'])) for d in data['delays']]
+        result = DelayPropagationEngine(entry.analyzer).propagate_delays(delays)
+        
+        return jsonify({
+            "success": True,
+            "project_id": project_id,
+            "content_hash": entry.content_hash,
+            "propagation": result.to_dict()
+        }), 200
+    
+    except KeyError as e:
+        return jsonify({"error": f"Missing required field: {str(e)}"}), 400
+    except ValueError as e:
+        return jsonify({"error": f"Invalid data: {str(e)}"}), 400
+    except Exception as e:
+        logger.error(f"Error propagating delays: {e}")
+        return jsonify({"error": f"Propagation failed: {str(e)}"}), 500
+
+
+@schedule_bp.route('/what-if', methods=['POST'])
+def evaluate_what_if():
+    """
+    Compare recovery options side by side against one base schedule.
+    
+    The base schedule is either sent inline ("tasks"/"dependencies", same
+    shape as /analyze) or taken from the schedule store by project_id.
+    
+    Request JSON:
+    {
+        "project_id": "PROJ_001",
+        "tasks": [...], "dependencies": [...],     # optional when the project is stored
+        "workers": 1,                               # optional process pool size (at most MAX_WORKERS)
+        "scenarios": [
+            {
+                "scenario_id": "crash_framing",
+                "changes": [
+                    {"action": "crash", "task_id": "task2", "days": 3},
+                    {"action": "add_lag", "dependency_id": "dep4", "days": 2}
+                ]
+            },
+            ...
+        ]
+    }
+    
+    Actions: set_duration, crash, delay (task_id) and set_lag, add_lag (dependency_id).
+    
+    Response JSON:
+    {
+        "success": true,
+        "base": {"project_duration_days": 120, "critical_path": [...]},
+        "scenarios": [
+            {
+                "scenario_id": "crash_framing",
+                "project_duration_days": 117,
+                "finish_delta_days": -3,
+                "critical_path_added": [...],
+                "critical_path_removed": [...],
+                "affected_tasks": {"task2": -3, "task4": -3, ...},
+                ...
+            },
+            ...
+        ]
+    }
+    """
+    if not VECTORIZED_CPM_AVAILABLE:
+        return jsonify({"error": "What-if evaluation unavailable (numpy not installed)"}), 400
+    
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "No JSON data provided"}), 400
+        
+        project_id = data.get('project_id', 'UNKNOWN')
+        scenarios_data = data.get('scenarios', [])
+        if not scenarios_data:
+            return jsonify({"error": "No scenarios provided"}), 400
+        if len(scenarios_data) > MAX_WHAT_IF_SCENARIOS:
+            return jsonify({"error": f"At most {MAX_WHAT_IF_SCENARIOS} scenarios per request"}), 400
+        workers = _workers(data.get('workers', 1))
+        
+        scenarios = []
+        for i, scenario_dict in enumerate(scenarios_data):
+            changes = []
+            for change in scenario_dict.get('changes', []):
+                action = ScenarioAction(change['action'].lower())
+                key = 'dependency_id' if action in (ScenarioAction.SET_LAG, ScenarioAction.ADD_LAG) else 'task_id'
+                changes.append(ScenarioChange(action, change[key], int(change['days'])))
+            scenarios.append(WhatIfScenario(str(scenario_dict.get('scenario_id', f"scenario_{i + 1}")), changes))
+        
+        if data.get('tasks'):
+            engine = WhatIfScenarioEngine(_build_analyzer(data['tasks'], data.get('dependencies', [])))
+        else:
+            entry = schedule_store.get(project_id)
+            if entry is None:
+                return _not_analyzed(project_id)
+            if entry.compiled_graph is None:
+                entry.compiled_graph = CompiledScheduleGraph.from_analyzer(entry.analyzer)
+            engine = WhatIfScenarioEngine(entry.analyzer, entry.compiled_graph)
+        
+        outcomes = engine.evaluate(scenarios, workers=workers)
+        
+        return jsonify({
+            "success": True,
+            "project_id": project_id,
+            "base": {
+                "project_duration_days": engine.base_duration,
+                "critical_path": engine.base_critical_path
+            },
+            "scenarios": [outcome.to_dict() for outcome in outcomes]
+        }), 200
+    
+    except KeyError as e:
+        return jsonify({"error": f"Missing required field: {str(e)}"}), 400
+    except ValueError as e:
+        return jsonify({"error": f"Invalid data: {str(e)}"}), 400
+    except Exception as e:
+        logger.error(f"Error evaluating what-if scenarios: {e}")
+        return jsonify({"error": f"What-if evaluation failed: {str(e)}"}), 500
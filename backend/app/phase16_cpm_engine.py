@@ -0,0 +1,371 @@
+"""
+Phase 16: Vectorized CPM Engine - Array-Backed Critical Path
+
+Compiles the task graph once into integer-indexed NumPy arrays (CSR adjacency,
+duration and lag vectors, topological levels) and runs the CPM forward and
+backward passes level by level with vectorized max/min reductions.
+
+Produces the same CriticalPathAnalysis as
+ScheduleDependencyAnalyzer.calculate_critical_path, but without a per-task
+dict entry for every intermediate date.
+"""
+
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from phase16_types import CriticalPathAnalysis, DependencyType, DEPENDENCY_ANCHORS, DEPENDENCY_TYPES
+from phase16_cycles import ScheduleCycleError
+
+logger = logging.getLogger(__name__)
+
+_MAX_RANK_SLICES = 16  # fan-in handled by elementwise merges before falling back to reduceat
+
+# (predecessor finish?, successor finish?) by dependency type code
+_TYPE_ANCHORS = np.array([DEPENDENCY_ANCHORS[t] for t in DEPENDENCY_TYPES], dtype=np.int8)
+
+
+def _csr(keys: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Build a CSR (indptr, order) grouping of positions by integer key"""
+    order = np.argsort(keys, kind='stable')
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=size), out=indptr[1:])
+    return indptr, order
+
+
+def _gather(indptr: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """Positions of every CSR entry that belongs to one of `nodes`"""
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return offsets + np.arange(total, dtype=np.int64)
+
+
+def _as_numeric(values) -> np.ndarray:
+    """Integer array unless the values are genuinely fractional"""
+    arr = np.asarray(values)
+    return arr if arr.size else arr.astype(np.int64)
+
+
+def _segments(keys: np.ndarray) -> np.ndarray:
+    """Start offsets of runs of equal values in a sorted key array"""
+    if keys.size == 0:
+        return np.empty(0, dtype=np.int64)
+    return np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+
+
+class CompiledScheduleGraph:
+    """
+    Integer-indexed, array-backed view of a schedule.
+
+    Tasks are numbered 0..N-1 in insertion order. Edges are stored as parallel
+    arrays (pred, succ, lag, anchor flags) with CSR indexes for successors and
+    predecessors, and tasks are grouped into topological levels (longest path
+    depth) so each pass is one vectorized reduction per level.
+
+    Every dependency type reduces to a start-to-start offset:
+        ES[succ] >= ES[pred] + pred_finish * dur[pred] + lag - succ_finish * dur[succ]
+    """
+
+    def __init__(
+        self,
+        task_ids: List[str],
+        durations,
+        edge_pred,
+        edge_succ,
+        edge_lag,
+        dependency_ids: Optional[List[str]] = None,
+        edge_types: Optional[List[DependencyType]] = None
+    ):
+        self.task_ids = list(task_ids)
+        self.index = {task_id: i for i, task_id in enumerate(self.task_ids)}
+        self.num_tasks = len(self.task_ids)
+        self.durations = _as_numeric(durations)
+        self.edge_pred = np.asarray(edge_pred, dtype=np.int64)
+        self.edge_succ = np.asarray(edge_succ, dtype=np.int64)
+        self.edge_lag = _as_numeric(edge_lag)
+        self.dependency_ids = list(dependency_ids) if dependency_ids is not None else []
+        self.num_edges = int(self.edge_pred.size)
+        if edge_types is None:
+            edge_types = [DependencyType.FINISH_TO_START] * self.num_edges
+        if isinstance(edge_types, np.ndarray):
+            # Integer type codes (see DEPENDENCY_TYPES)
+            anchors = _TYPE_ANCHORS[edge_types]
+        else:
+            anchors = np.array([DEPENDENCY_ANCHORS[t] for t in edge_types], dtype=np.int8).reshape(-1, 2)
+        self.edge_pred_finish = anchors[:, 0]
+        self.edge_succ_finish = anchors[:, 1]
+        self.dtype = np.result_type(self.durations.dtype, self.edge_lag.dtype, np.int64)
+
+        n = self.num_tasks
+        self.succ_indptr, self.succ_edges = _csr(self.edge_pred, n)  # out-edges by predecessor
+        self.pred_indptr, self.pred_edges = _csr(self.edge_succ, n)  # in-edges by successor
+
+        self._compute_levels()
+        self._group_edges_by_level()
+
+    @classmethod
+    def from_analyzer(cls, analyzer) -> 'CompiledScheduleGraph':
+        """Compile the tasks and dependencies registered on a ScheduleDependencyAnalyzer"""
+        task_ids = list(analyzer.tasks)
+        index = {task_id: i for i, task_id in enumerate(task_ids)}
+        deps = list(analyzer.dependencies.values())
+        return cls(
+            task_ids=task_ids,
+            durations=[task.duration_days for task in analyzer.tasks.values()],
+            edge_pred=np.fromiter((index[d.predecessor_task_id] for d in deps), dtype=np.int64, count=len(deps)),
+            edge_succ=np.fromiter((index[d.successor_task_id] for d in deps), dtype=np.int64, count=len(deps)),
+            edge_lag=[d.lag_days for d in deps],
+            dependency_ids=[d.dependency_id for d in deps],
+            edge_types=[d.dependency_type for d in deps],
+        )
+
+    @classmethod
+    def from_frame(cls, frame) -> 'CompiledScheduleGraph':
+        """Compile a ScheduleFrame straight from its column buffers (copied, so the frame stays appendable)"""
+        return cls(
+            task_ids=frame.task_ids,
+            durations=np.array(frame.durations, dtype=np.int64),
+            edge_pred=np.array(frame.predecessors, dtype=np.int64),
+            edge_succ=np.array(frame.successors, dtype=np.int64),
+            edge_lag=np.array(frame.lags, dtype=np.int64),
+            dependency_ids=frame.dependency_ids,
+            edge_types=np.array(frame.type_codes, dtype=np.uint8),
+        )
+
+    def _compute_levels(self) -> None:
+        """Kahn's algorithm, one frontier (topological level) at a time"""
+        n = self.num_tasks
+        in_degree = np.bincount(self.edge_succ, minlength=n)
+        self.level = np.full(n, -1, dtype=np.int64)
+        self.level_nodes: List[np.ndarray] = []
+
+        frontier = np.flatnonzero(in_degree == 0)
+        while frontier.size:
+            self.level[frontier] = len(self.level_nodes)
+            self.level_nodes.append(frontier)
+            succs = self.edge_succ[self.succ_edges[_gather(self.succ_indptr, frontier)]]
+            if succs.size == 0:
+                break
+            targets, counts = np.unique(succs, return_counts=True)
+            in_degree[targets] -= counts
+            frontier = targets[in_degree[targets] == 0]
+
+        self.topo_order = np.concatenate(self.level_nodes) if self.level_nodes else np.empty(0, dtype=np.int64)
+        if self.topo_order.size < n:
+            raise ScheduleCycleError(
+                message=f"Schedule contains dependency cycles: {n - self.topo_order.size} tasks cannot be ordered"
+            )
+
+    def _group_edges_by_level(self) -> None:
+        """
+        Pre-sort edges for the level-by-level passes.
+
+        Forward: edges sorted by (level of successor, successor), segmented by successor.
+        Backward: edges sorted by (level of predecessor, predecessor), segmented by predecessor.
+        Each ordering keeps its own permuted copy of the edge arrays so a level's
+        edges (and their offsets) are a contiguous slice.
+        """
+        num_levels = len(self.level_nodes)
+        self._forward = self._level_groups(self.edge_succ, num_levels)
+        self._backward = self._level_groups(self.edge_pred, num_levels)
+
+    def _level_groups(self, endpoint: np.ndarray, num_levels: int) -> dict:
+        """
+        Edge order for one pass plus, per level, its reduction plan (or None).
+
+        Within a level, edges are ranked within their endpoint's segment and
+        ordered by (rank, endpoint): rank 0 holds exactly one edge per endpoint
+        task and each further rank is a contiguous slice merged into it with an
+        elementwise max/min. ufunc.reduceat pays a per-segment cost that
+        dominates on batched (num_edges, batch) arrays where most segments hold
+        one or two edges, so it is only used for the tail of unusually wide
+        fan-ins (rank >= _MAX_RANK_SLICES).
+        """
+        edge_levels = self.level[endpoint]
+        by_target = np.lexsort((endpoint, edge_levels))
+        bounds = np.searchsorted(edge_levels[by_target], np.arange(num_levels + 1))
+
+        order = np.empty_like(by_target)
+        groups: List[Optional[Tuple]] = []
+        for lvl in range(num_levels):
+            lo, hi = int(bounds[lvl]), int(bounds[lvl + 1])
+            if lo == hi:
+                groups.append(None)
+                continue
+            edges = by_target[lo:hi]
+            keys = endpoint[edges]
+            starts = _segments(keys)
+            rank = np.arange(keys.size) - np.repeat(starts, np.diff(np.append(starts, keys.size)))
+            capped = np.minimum(rank, _MAX_RANK_SLICES)
+            level_order = np.lexsort((keys, capped))
+            order[lo:hi] = edges[level_order]
+
+            sorted_rank = capped[level_order]
+            sorted_keys = keys[level_order]
+            rank_bounds = np.searchsorted(sorted_rank, np.arange(_MAX_RANK_SLICES + 2))
+            targets = sorted_keys[:rank_bounds[1]]
+            merges = []
+            for r in range(1, _MAX_RANK_SLICES):
+                a, b = int(rank_bounds[r]), int(rank_bounds[r + 1])
+                if a < b:
+                    merges.append((a, b, np.searchsorted(targets, sorted_keys[a:b])))
+            tail = None
+            a = int(rank_bounds[_MAX_RANK_SLICES])
+            if a < keys.size:
+                tail_keys = sorted_keys[a:]
+                tail_starts = _segments(tail_keys)
+                tail = (a, tail_starts, np.searchsorted(targets, tail_keys[tail_starts]))
+            groups.append((lo, hi, targets, merges, tail))
+
+        return {
+            'order': order,
+            'pred': self.edge_pred[order],
+            'succ': self.edge_succ[order],
+            'lag': self.edge_lag[order],
+            'pred_finish': self.edge_pred_finish[order],
+            'succ_finish': self.edge_succ_finish[order],
+            'groups': groups,
+        }
+
+    @staticmethod
+    def _reduce_level(values: np.ndarray, group: Tuple, ufunc: np.ufunc) -> np.ndarray:
+        """Reduce a level's per-edge values onto its endpoint tasks (ordered as group targets)"""
+        _, _, targets, merges, tail = group
+        acc = values[:targets.size]
+        for a, b, positions in merges:
+            acc[positions] = ufunc(acc[positions], values[a:b])
+        if tail is not None:
+            a, starts, positions = tail
+            acc[positions] = ufunc(acc[positions], ufunc.reduceat(values[a:], starts))
+        return acc
+
+    @staticmethod
+    def _offsets(dur: np.ndarray, edges: dict, lags: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Start-to-start offsets for an edge table, skipping anchor terms that are uniformly 0/1.
+
+        `lags` overrides the compiled lags; it is given in dependency order
+        (num_edges[, batch]) and permuted into the table's order here.
+        """
+        pred_finish, succ_finish = edges['pred_finish'], edges['succ_finish']
+        lag = edges['lag'] if lags is None else np.asarray(lags)[edges['order']]
+        if dur.ndim == 2:
+            pred_finish, succ_finish = pred_finish[:, None], succ_finish[:, None]
+            if lag.ndim == 1:
+                lag = lag[:, None]
+
+        offsets = dur[edges['pred']]
+        if not edges['pred_finish'].all():
+            offsets *= pred_finish
+        if np.can_cast(lag.dtype, offsets.dtype):
+            offsets += lag
+        else:
+            offsets = offsets + lag
+        if edges['succ_finish'].any():
+            offsets -= succ_finish * dur[edges['succ']]
+        return offsets
+
+    def start_offsets(self, durations: Optional[np.ndarray] = None, lags: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Per-edge minimum gap between predecessor start and successor start.
+
+        `durations` may be a (num_tasks,) vector or a (num_tasks, batch) matrix
+        of sampled durations; the result has a matching (num_edges[, batch]) shape.
+        `lags` optionally replaces the dependency lags, as a (num_edges,) vector
+        or, together with batched durations, a (num_edges, batch) matrix.
+        """
+        dur = self.durations if durations is None else durations
+        edges = {
+            'order': np.arange(self.num_edges), 'pred': self.edge_pred, 'succ': self.edge_succ,
+            'lag': self.edge_lag, 'pred_finish': self.edge_pred_finish, 'succ_finish': self.edge_succ_finish,
+        }
+        return self._offsets(dur, edges, lags)
+
+    def forward_pass(
+        self,
+        durations: Optional[np.ndarray] = None,
+        lags: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Earliest start/finish for every task.
+
+        Earliest start = max(0, max over predecessors of earliest start + offset).
+        With a (num_tasks, batch) duration matrix every column is an independent
+        schedule and the dates come back with the same shape. `lags` overrides
+        the dependency lags as in start_offsets.
+        """
+        dur = self.durations if durations is None else durations
+        edges = self._forward
+        offsets = self._offsets(dur, edges, lags)
+        pred = edges['pred']
+        earliest_start = np.zeros(dur.shape, dtype=np.result_type(self.dtype, dur.dtype, offsets.dtype))
+
+        for group in edges['groups']:
+            if group is not None:
+                lo, hi, targets = group[:3]
+                arrivals = earliest_start[pred[lo:hi]] + offsets[lo:hi]
+                earliest_start[targets] = np.maximum(self._reduce_level(arrivals, group, np.maximum), 0)
+
+        return earliest_start, earliest_start + dur
+
+    def backward_pass(
+        self,
+        project_duration,
+        durations: Optional[np.ndarray] = None,
+        lags: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Latest start/finish for every task.
+
+        Latest start = min over successors of latest start - offset, and never
+        later than finishing on the project end date. For batched durations,
+        `project_duration` is a per-column (batch,) vector.
+        """
+        dur = self.durations if durations is None else durations
+        edges = self._backward
+        offsets = self._offsets(dur, edges, lags)
+        succ = edges['succ']
+        latest_start = project_duration - dur.astype(np.result_type(self.dtype, dur.dtype, offsets.dtype))
+
+        for group in reversed(edges['groups']):
+            if group is not None:
+                lo, hi, sources = group[:3]
+                departures = latest_start[succ[lo:hi]] - offsets[lo:hi]
+                latest_start[sources] = np.minimum(latest_start[sources], self._reduce_level(departures, group, np.minimum))
+
+        return latest_start, latest_start + dur
+
+
+class VectorizedCPMEngine:
+    """Array-backed drop-in for ScheduleDependencyAnalyzer.calculate_critical_path"""
+
+    def __init__(self, analyzer, graph: Optional[CompiledScheduleGraph] = None):
+        """
+        Args:
+            analyzer: ScheduleDependencyAnalyzer instance
+            graph: Pre-compiled graph for the analyzer (compiled on demand if omitted)
+        """
+        self.analyzer = analyzer
+        self.graph = graph if graph is not None else CompiledScheduleGraph.from_analyzer(analyzer)
+
+    def calculate_critical_path(self) -> CriticalPathAnalysis:
+        """
+        Calculate critical path using vectorized forward/backward passes.
+
+        Returns:
+            CriticalPathAnalysis identical to the dict-based implementation
+        """
+        logger.info("Calculating critical path (vectorized)...")
+        graph = self.graph
+
+        earliest_start, earliest_finish = graph.forward_pass()
+        project_duration = earliest_finish.max().item() if graph.num_tasks else 0
+        latest_start, _ = graph.backward_pass(project_duration)
+
+        slack = dict(zip(graph.task_ids, (latest_start - earliest_start).tolist()))
+        return self.analyzer.summarize_critical_path(slack, project_duration)
@@ -0,0 +1,103 @@
+"""
+Phase 16: Dependency Cycle Detection
+
+Strongly connected components of the dependency graph (iterative Tarjan,
+linear in tasks + dependencies). Every component with more than one task, or
+a task depending on itself, is a dependency loop that CPM cannot order.
+"""
+
+from typing import Iterable, List, Mapping, Optional, Sequence
+
+from phase16_types import DependencyCycle, TaskDependency
+
+
+class ScheduleCycleError(ValueError):
+    """Schedule contains dependency cycles (`cycles` lists them when known)"""
+
+    def __init__(self, cycles: Sequence[DependencyCycle] = (), message: Optional[str] = None):
+        self.cycles = list(cycles)
+        if message is None:
+            task_count = sum(len(cycle.task_ids) for cycle in self.cycles)
+            message = (f"Schedule contains {len(self.cycles)} dependency cycle(s) "
+                       f"involving {task_count} tasks")
+        super().__init__(message)
+
+
+def find_dependency_cycles(
+    task_ids: Iterable[str],
+    out_edges: Mapping[str, List[TaskDependency]]
+) -> List[DependencyCycle]:
+    """
+    Find every dependency loop reachable from `task_ids`.
+
+    Args:
+        task_ids: Tasks to start the search from (all tasks, or any
+                  successor-closed subset such as the tasks Kahn's algorithm
+                  could not order)
+        out_edges: Task ID -> outgoing dependencies
+
+    Returns:
+        One DependencyCycle per strongly connected component that contains a
+        loop, with its tasks in discovery order and the ids of the
+        dependencies between them
+    """
+    index = {}
+    low = {}
+    on_stack = set()
+    stack: List[str] = []
+    cycles: List[DependencyCycle] = []
+
+    for root in task_ids:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(out_edges.get(root, ())))]
+
+        while work:
+            node, deps = work[-1]
+            for dep in deps:
+                succ = dep.successor_task_id
+                if succ not in index:
+                    index[succ] = low[succ] = len(index)
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(out_edges.get(succ, ()))))
+                    break
+                if succ in on_stack and index[succ] < low[node]:
+                    low[node] = index[succ]
+            else:
+                # All successors explored: hand the low-link up, close the component
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+                if low[node] == index[node]:
+                    position = len(stack) - 1
+                    while stack[position] != node:
+                        position -= 1
+                    members = stack[position:]
+                    del stack[position:]
+                    on_stack.difference_update(members)
+                    cycle = _component_cycle(members, out_edges)
+                    if cycle is not None:
+                        cycles.append(cycle)
+
+    cycles.sort(key=lambda cycle: index[cycle.task_ids[0]])
+    return cycles
+
+
+def _component_cycle(members: List[str], out_edges: Mapping[str, List[TaskDependency]]) -> Optional[DependencyCycle]:
+    """DependencyCycle for a strongly connected component, or None if it has no loop"""
+    member_set = set(members)
+    dependency_ids = [
+        dep.dependency_id
+        for task_id in members
+        for dep in out_edges.get(task_id, ())
+        if dep.successor_task_id in member_set
+    ]
+    if not dependency_ids:
+        return None
+    return DependencyCycle(task_ids=members, dependency_ids=dependency_ids)
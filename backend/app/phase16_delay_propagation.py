@@ -4,12 +4,16 @@ Phase 16: Delay Propagation Engine - Cascading Delay Modeling
 Models how delays cascade through task dependencies and integrates with Feature 1 risk scoring.
 """
 
+import heapq
 import logging
-from typing import Dict, List, Optional, Set
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
 from phase16_types import (
-    DelayPropagation, ProjectScheduleIntelligence, Task, TaskDependency,
-    CriticalPathAnalysis, ScheduleRiskFactors, DependencyType
+    DelayPropagation, MultiDelayPropagation, ProjectScheduleIntelligence, Task, TaskDependency,
+    CriticalPathAnalysis, ScheduleRiskFactors, DependencyType, DEPENDENCY_ANCHORS
 )
+from phase16_schedule_dependencies import start_offset
+from phase14_logging import log_rate_limited
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +37,10 @@ class DelayPropagationEngine:
         """
         Simulate impact of delaying a task and track propagation.
         
+        The delayed task overruns its finish, so only finish-anchored
+        dependencies (FS/FF) carry the delay out of it. Downstream tasks that
+        get pushed shift as a whole and propagate through every dependency type.
+        
         Args:
             task_id: Task to delay
             delay_days: Number of days to delay
@@ -45,42 +53,29 @@ class DelayPropagationEngine:
             logger.error(f"Task {task_id} not found")
             return None
         
-        logger.info(f"Simulating {delay_days}-day delay on task {task_id}")
-        
-        affected_tasks = {}
-        propagation_path = [task_id]
-        
-        # BFS to track delay propagation
-        visited = set()
-        queue = [(task_id, delay_days)]
+        log_rate_limited(logger, logging.INFO, 'DELAY_SIMULATION', "Simulating %s-day delay on task %s",
+                         delay_days, task_id)
         
-        while queue:
-            current_task, current_delay = queue.pop(0)
-            
-            if current_task in visited:
+        # Max-merge over the downstream cone in topological order, so a larger
+        # delay arriving along a longer path is never dropped
+        delays = {task_id: delay_days}
+        propagation_path = []
+        for current_task in self._downstream_order(task_id):
+            current_delay = delays.get(current_task, 0)
+            if current_delay <= 0:
                 continue
-            visited.add(current_task)
-            
-            if current_task != task_id:
-                affected_tasks[current_task] = current_delay
+            propagation_path.append(current_task)
             
             # Propagate to successors
-            successors = self.analyzer.adjacency_list[current_task]
-            for succ_id in successors:
-                if succ_id not in visited:
-                    # Find the dependency relationship
-                    lag = 0
-                    for dep in self.analyzer.dependencies.values():
-                        if dep.predecessor_task_id == current_task and dep.successor_task_id == succ_id:
-                            lag = dep.lag_days
-                            break
-                    
-                    # Delay propagates if lag < current_delay
-                    propagated_delay = max(0, current_delay - lag)
-                    
-                    if propagated_delay > 0:
-                        queue.append((succ_id, propagated_delay))
-                        propagation_path.append(succ_id)
+            for dep in self.analyzer.edges.out_edges.get(current_task, ()):
+                if current_task == task_id and not DEPENDENCY_ANCHORS[dep.dependency_type][0]:
+                    continue  # SS/SF: the delayed task's start did not move
+                # Delay propagates if lag < current_delay
+                propagated_delay = current_delay - dep.lag_days
+                if propagated_delay > delays.get(dep.successor_task_id, 0):
+                    delays[dep.successor_task_id] = propagated_delay
+        
+        affected_tasks = {t: delays[t] for t in propagation_path if t != task_id}
         
         # Calculate total project delay
         # This is the maximum propagation to any task on critical path
@@ -110,6 +105,124 @@ class DelayPropagationEngine:
             explanation=explanation
         )
     
+    def _downstream_order(self, task_id: str) -> List[str]:
+        """Task and everything reachable from it, in topological order (Kahn over the cone)"""
+        adjacency = self.analyzer.adjacency_list
+        cone = {task_id}
+        stack = [task_id]
+        while stack:
+            for succ_id in adjacency[stack.pop()]:
+                if succ_id not in cone:
+                    cone.add(succ_id)
+                    stack.append(succ_id)
+        
+        in_degree = dict.fromkeys(cone, 0)
+        for current in cone:
+            for succ_id in adjacency[current]:
+                in_degree[succ_id] += 1
+        
+        order = []
+        queue = deque(t for t in cone if in_degree[t] == 0)
+        while queue:
+            current = queue.popleft()
+            order.append(current)
+            for succ_id in adjacency[current]:
+                in_degree[succ_id] -= 1
+                if in_degree[succ_id] == 0:
+                    queue.append(succ_id)
+        if len(order) < len(cone):
+            logger.warning(f"Dependency cycle downstream of {task_id}: {len(cone) - len(order)} tasks skipped")
+        return order
+    
+    def propagate_delays(
+        self,
+        delays: Union[Mapping[str, int], Iterable[Tuple[str, int]]]
+    ) -> MultiDelayPropagation:
+        """
+        Exact slippage from several simultaneous task overruns.
+        
+        Each delay extends its task's finish. Pushed tasks are processed once,
+        in topological order, and every dependency leaving a moved task is
+        checked against the float its successor already has: the successor
+        only moves by the part of the push that exceeds that edge's gap in the
+        current CPM dates. The work is proportional to the tasks that actually
+        move and their outgoing dependencies.
+        
+        Args:
+            delays: Task ID -> overrun days, or (task_id, days) pairs; repeated
+                    tasks keep their largest delay, non-positive delays are ignored
+        
+        Returns:
+            MultiDelayPropagation with per-task start/finish slippage and project delta
+        """
+        items = delays.items() if isinstance(delays, Mapping) else delays
+        shocks: Dict[str, int] = {}
+        for task_id, delay in items:
+            if delay > 0:
+                shocks[task_id] = max(delay, shocks.get(task_id, 0))
+        unknown = [t for t in shocks if t not in self.analyzer.tasks]
+        if unknown:
+            raise ValueError(f"Unknown task(s): {', '.join(sorted(unknown))}")
+        
+        analyzer = self.analyzer
+        # read-only: the analyzer may be shared through the schedule store
+        dates = analyzer.cpm_dates()
+        if dates is None:
+            raise ValueError("Schedule contains dependency cycles; delays cannot be propagated")
+        earliest_start = dates.earliest_start
+        position = dates.topo_position
+        project_duration = dates.project_duration_days
+        
+        # Largest start increase required of each task by its moved predecessors
+        required: Dict[str, int] = {}
+        heap = [(position[t], t) for t in shocks]
+        heapq.heapify(heap)
+        queued = set(shocks)
+        start_slippage: Dict[str, int] = {}
+        finish_slippage: Dict[str, int] = {}
+        new_finish = project_duration
+        
+        while heap:
+            _, task_id = heapq.heappop(heap)
+            start_slip = max(0, required.get(task_id, 0))
+            finish_slip = start_slip + shocks.get(task_id, 0)
+            if finish_slip == 0:
+                continue
+            if start_slip:
+                start_slippage[task_id] = start_slip
+            finish_slippage[task_id] = finish_slip
+            
+            duration = analyzer.tasks[task_id].duration_days
+            new_start = earliest_start[task_id] + start_slip
+            new_finish = max(new_finish, new_start + duration + shocks.get(task_id, 0))
+            
+            for dep in analyzer.edges.out_edges.get(task_id, ()):
+                succ_id = dep.successor_task_id
+                succ_duration = analyzer.tasks[succ_id].duration_days + shocks.get(succ_id, 0)
+                arrival = new_start + start_offset(dep, duration + shocks.get(task_id, 0), succ_duration)
+                push = arrival - earliest_start[succ_id]
+                if push > required.get(succ_id, 0):
+                    required[succ_id] = push
+                    if succ_id not in queued:
+                        queued.add(succ_id)
+                        heapq.heappush(heap, (position[succ_id], succ_id))
+        
+        slack = dates.slack_by_task
+        float_exceeded = {
+            t: slip - slack[t] for t, slip in finish_slippage.items() if slip > slack[t]
+        }
+        
+        log_rate_limited(logger, logging.INFO, 'DELAY_SIMULATION', "Propagated %d delays: %d tasks slip, project +%s days",
+                         len(shocks), len(finish_slippage), new_finish - project_duration)
+        return MultiDelayPropagation(
+            delays=shocks,
+            start_slippage=start_slippage,
+            finish_slippage=finish_slippage,
+            float_exceeded=float_exceeded,
+            baseline_duration_days=project_duration,
+            project_delay_days=new_finish - project_duration
+        )
+    
     def generate_delay_scenarios(
         self,
         critical_path: List[str],
@@ -132,14 +245,14 @@ class DelayPropagationEngine:
             task = critical_path[0]
             scenario = self.simulate_task_delay(task, 5, critical_path)
             scenarios.append(scenario)
-            logger.info(f"Scenario 1: 5-day delay on {task}")
+            log_rate_limited(logger, logging.INFO, 'DELAY_SCENARIO', "Scenario 1: 5-day delay on %s", task)
         
         # Scenario 2: Major delay on bottleneck task
         if len(critical_path) > len(critical_path) // 2:
             task = critical_path[len(critical_path) // 2]
             scenario = self.simulate_task_delay(task, 15, critical_path)
             scenarios.append(scenario)
-            logger.info(f"Scenario 2: 15-day delay on {task}")
+            log_rate_limited(logger, logging.INFO, 'DELAY_SCENARIO', "Scenario 2: 15-day delay on %s", task)
         
         # Scenario 3: Weather/resource impact
         if len(critical_path) > 0:
@@ -147,7 +260,8 @@ class DelayPropagationEngine:
                 if self.analyzer.tasks[task_id].weather_dependency:
                     scenario = self.simulate_task_delay(task_id, 10, critical_path)
                     scenarios.append(scenario)
-                    logger.info(f"Scenario 3: 10-day weather delay on {task_id}")
+                    log_rate_limited(logger, logging.INFO, 'DELAY_SCENARIO', "Scenario 3: 10-day weather delay on %s",
+                                     task_id)
                     break
         
         return scenarios
@@ -231,9 +345,10 @@ class DelayPropagationEngine:
         high_risk_deps = []
         for dep in self.analyzer.dependencies.values():
             # Risk = if predecessor is delayed, successor is heavily impacted
-            if dep.successor_task_id in self.analyzer.adjacency_list:
+            successor_edges = self.analyzer.edges.out_edges.get(dep.successor_task_id)
+            if successor_edges:
                 # More successors = higher risk
-                num_affected = len(self.analyzer.adjacency_list[dep.successor_task_id])
+                num_affected = len(successor_edges)
                 if num_affected > 0 and dep.lag_days == 0:  # No buffer = high risk
                     dep.criticality_score = min(1.0, num_affected * 0.2)
                     high_risk_deps.append(dep)
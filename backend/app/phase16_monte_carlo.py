@@ -0,0 +1,262 @@
+"""
+Phase 16: Monte Carlo Schedule Risk - Vectorized Completion-Date Simulation
+
+Samples task-duration matrices from each task's ScheduleRiskFactors and runs
+batched CPM passes over a CompiledScheduleGraph, one column per iteration.
+
+Reports P50/P80/P95 completion, the probability of finishing on the
+deterministic date, a per-task criticality index (share of iterations in which
+the task had zero float) and a tornado ranking of tasks by the correlation
+between their sampled duration and the project finish.
+
+Iterations are simulated in fixed-size chunks, each with its own child of one
+SeedSequence, so a given seed gives identical results whether the chunks run
+in-process or across a process pool.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from phase16_cpm_engine import CompiledScheduleGraph
+from phase16_types import MonteCarloScheduleRisk, ScheduleRiskFactors, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+CRITICAL_TOLERANCE_DAYS = 1e-6  # float slack at or below this counts as critical
+
+# Per-worker state installed by the pool initializer (graph, sampling params)
+_WORKER_STATE: Optional[Tuple[CompiledScheduleGraph, Dict[str, np.ndarray]]] = None
+
+
+def delay_distribution(
+    durations: np.ndarray,
+    probabilities: np.ndarray,
+    expected_delays: np.ndarray,
+    worst_case_delays: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Per-task sampling parameters for the delay model.
+
+    A task is delayed with its combined_delay_probability; given a delay, the
+    overrun is triangular on [0, high] with the mode chosen so the mean delay
+    equals expected_delay_days. `high` is the worst case, widened or narrowed
+    as far as needed for that mean to be reachable.
+    """
+    probabilities = np.clip(probabilities, 0.0, 1.0)
+    slips = probabilities > 0
+    conditional_mean = np.divide(expected_delays, probabilities,
+                                 out=np.zeros(probabilities.shape), where=slips)
+    high = np.clip(worst_case_delays, 1.5 * conditional_mean, 3.0 * conditional_mean)
+    mode = 3.0 * conditional_mean - high
+    return {
+        'base': durations.astype(np.float64),
+        'probability': probabilities,
+        'inverse_probability': np.divide(1.0, probabilities, out=np.full(probabilities.shape, np.inf), where=slips),
+        'high': high,
+        'mode_fraction': np.divide(mode, high, out=np.ones(high.shape), where=high > 0),
+        'rising_scale': high * mode,
+        'falling_scale': high * (high - mode),
+    }
+
+
+def sample_delays(params: Dict[str, np.ndarray], rng: np.random.Generator, size: int) -> np.ndarray:
+    """
+    Draw a (num_tasks, size) matrix of task overruns in days.
+
+    One uniform per task and iteration decides both whether the task slips
+    (u < p) and, rescaled to u / p, where on the triangular overrun it lands.
+    """
+    col = lambda key: params[key][:, None]  # noqa: E731
+    v = rng.random((params['base'].size, size))
+    # Tasks that cannot slip have an infinite 1/p; the nan/inf their entries
+    # produce below are discarded by the final mask
+    with np.errstate(invalid='ignore'):
+        v *= col('inverse_probability')
+        slipped = v < 1.0
+        rising = v < col('mode_fraction')
+
+        # Inverse CDF of Triangular(0, mode, high): sqrt(v * high * mode) on the
+        # rising side, high - sqrt((1 - v) * high * (high - mode)) on the falling side
+        falling = np.subtract(1.0, v)
+        falling *= col('falling_scale')
+        v *= col('rising_scale')
+        delay = np.where(rising, v, falling)
+        np.sqrt(delay, out=delay)
+        np.subtract(col('high'), delay, out=delay, where=~rising)
+    delay[~slipped] = 0.0
+    return delay
+
+
+def simulate_chunk(
+    graph: CompiledScheduleGraph,
+    params: Dict[str, np.ndarray],
+    seed: np.random.SeedSequence,
+    size: int
+) -> Dict[str, np.ndarray]:
+    """
+    Simulate one chunk of iterations with batched forward/backward passes.
+
+    Returns the per-iteration finish dates plus per-task sufficient statistics
+    (criticality counts and delay/finish moments) that merge across chunks by
+    summation.
+    """
+    rng = np.random.default_rng(seed)
+    delay = sample_delays(params, rng, size)
+    durations = delay + params['base'][:, None]
+    earliest_start, earliest_finish = graph.forward_pass(durations)
+    finish = earliest_finish.max(axis=0)
+    latest_start, _ = graph.backward_pass(finish, durations)
+    latest_start -= earliest_start
+
+    return {
+        'finish': finish,
+        'critical': np.count_nonzero(latest_start <= CRITICAL_TOLERANCE_DAYS, axis=1),
+        'delay_sum': delay.sum(axis=1),
+        'delay_sq_sum': np.einsum('ij,ij->i', delay, delay),
+        'delay_finish_sum': delay @ finish,
+    }
+
+
+def _init_worker(graph: CompiledScheduleGraph, params: Dict[str, np.ndarray]) -> None:
+    global _WORKER_STATE
+    _WORKER_STATE = (graph, params)
+
+
+def _simulate_chunk_in_worker(seed: np.random.SeedSequence, size: int) -> Dict[str, np.ndarray]:
+    graph, params = _WORKER_STATE
+    return simulate_chunk(graph, params, seed, size)
+
+
+class MonteCarloScheduleSimulator:
+    """Monte Carlo completion-date simulation over a compiled schedule graph"""
+
+    def __init__(
+        self,
+        analyzer,
+        graph: Optional[CompiledScheduleGraph] = None,
+        risk_factors: Optional[Dict[str, ScheduleRiskFactors]] = None
+    ):
+        """
+        Args:
+            analyzer: ScheduleDependencyAnalyzer instance
+            graph: Pre-compiled graph for the analyzer (compiled on demand if omitted)
+            risk_factors: Task ID -> ScheduleRiskFactors (computed from the analyzer if omitted)
+        """
+        self.analyzer = analyzer
+        self.graph = graph if graph is not None else CompiledScheduleGraph.from_analyzer(analyzer)
+        if risk_factors is None:
+            risk_factors = {task_id: analyzer.calculate_risk_factors(task_id) for task_id in analyzer.tasks}
+        self.params = self._sampling_params(risk_factors)
+
+    def _sampling_params(self, risk_factors: Dict[str, ScheduleRiskFactors]) -> Dict[str, np.ndarray]:
+        """Delay model arrays in graph task order; completed tasks never slip"""
+        n = self.graph.num_tasks
+        probabilities = np.zeros(n)
+        expected = np.zeros(n)
+        worst = np.zeros(n)
+        for i, task_id in enumerate(self.graph.task_ids):
+            factors = risk_factors.get(task_id)
+            if factors is None or self.analyzer.tasks[task_id].status == TaskStatus.COMPLETED:
+                continue
+            probabilities[i] = factors.combined_delay_probability
+            expected[i] = factors.expected_delay_days
+            worst[i] = factors.worst_case_delay_days
+        return delay_distribution(self.graph.durations, probabilities, expected, worst)
+
+    def simulate(
+        self,
+        iterations: int = 10000,
+        seed: Optional[int] = None,
+        chunk_size: int = 256,
+        workers: Optional[int] = None,
+        top_k: int = 10,
+        project_id: str = ""
+    ) -> MonteCarloScheduleRisk:
+        """
+        Run the simulation.
+
+        Args:
+            iterations: Number of sampled schedules
+            seed: Seed for reproducible results (None draws fresh entropy)
+            chunk_size: Iterations per batched CPM pass (bounds peak memory)
+            workers: Spread chunks over this many processes (None/1 = in-process)
+            top_k: Number of tasks in the tornado ranking (capped at the task count)
+            project_id: Echoed into the result
+
+        Returns:
+            MonteCarloScheduleRisk with percentiles, criticality index and tornado ranking
+        """
+        if iterations <= 0:
+            raise ValueError("iterations must be positive")
+        if top_k <= 0:
+            raise ValueError("top_k must be positive")
+        graph = self.graph
+        sizes = [min(chunk_size, iterations - start) for start in range(0, iterations, chunk_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        logger.info(f"Monte Carlo: {iterations} iterations over {graph.num_tasks} tasks "
+                    f"in {len(sizes)} chunks (workers={workers or 1})")
+
+        if graph.num_tasks == 0:
+            chunks = [{'finish': np.zeros(size)} for size in sizes]
+        elif workers and workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(graph, self.params)) as pool:
+                chunks = list(pool.map(_simulate_chunk_in_worker, seeds, sizes))
+        else:
+            chunks = [simulate_chunk(graph, self.params, s, size) for s, size in zip(seeds, sizes)]
+
+        return self._summarize(chunks, iterations, seed, top_k, project_id)
+
+    def _summarize(self, chunks: List[Dict[str, np.ndarray]], iterations: int,
+                   seed: Optional[int], top_k: int, project_id: str) -> MonteCarloScheduleRisk:
+        """Merge chunk statistics into percentiles, criticality and tornado ranking"""
+        graph = self.graph
+        finish = np.concatenate([chunk['finish'] for chunk in chunks])
+        deterministic = graph.forward_pass()[1].max().item() if graph.num_tasks else 0
+        p50, p80, p95 = np.percentile(finish, [50, 80, 95]).tolist()
+
+        criticality_index: Dict[str, float] = {}
+        tornado: List[Dict] = []
+        if graph.num_tasks:
+            critical = sum(chunk['critical'] for chunk in chunks) / iterations
+            criticality_index = dict(zip(graph.task_ids, critical.tolist()))
+
+            # Pearson correlation of each task's delay with the project overrun
+            overrun = finish - deterministic
+            overrun_mean = overrun.mean()
+            overrun_var = overrun.var()
+            delay_mean = sum(chunk['delay_sum'] for chunk in chunks) / iterations
+            delay_var = sum(chunk['delay_sq_sum'] for chunk in chunks) / iterations - delay_mean ** 2
+            cross = sum(chunk['delay_finish_sum'] for chunk in chunks) / iterations
+            covariance = cross - delay_mean * (overrun_mean + deterministic)
+            denominator = np.sqrt(np.clip(delay_var, 0.0, None) * overrun_var)
+            correlation = np.divide(covariance, denominator, out=np.zeros(graph.num_tasks),
+                                    where=denominator > 1e-12)
+
+            ranked = np.argsort(-np.abs(correlation), kind='stable')[:top_k]
+            tornado = [
+                {
+                    "task_id": graph.task_ids[i],
+                    "correlation": round(float(correlation[i]), 4),
+                    "criticality_index": round(float(critical[i]), 3),
+                    "mean_delay_days": round(float(delay_mean[i]), 2),
+                }
+                for i in ranked if correlation[i] != 0
+            ]
+
+        return MonteCarloScheduleRisk(
+            project_id=project_id,
+            iterations=iterations,
+            seed=seed,
+            deterministic_duration_days=deterministic,
+            mean_duration_days=float(finish.mean()),
+            p50_duration_days=p50,
+            p80_duration_days=p80,
+            p95_duration_days=p95,
+            on_time_probability=float(np.mean(finish <= deterministic + CRITICAL_TOLERANCE_DAYS)),
+            criticality_index=criticality_index,
+            tornado=tornado,
+        )
@@ -0,0 +1,416 @@
+"""
+Phase 16: Reachability Index - Downstream Impact Queries
+
+Precomputed answers to "which tasks does a delay on X reach", "how many" and
+"is A upstream of B", built once per schedule and kept current on edits
+instead of running a fresh BFS per question.
+
+Three representations, picked at build time:
+    bitset    (up to BITSET_MAX_TASKS tasks) full transitive closure, one
+              Python int bitset of descendants per task: counts are cached
+              popcounts and upstream checks are a single bit test. Adding or
+              removing a dependency re-ORs only the affected ancestors.
+    interval  (larger schedules) topological levels plus two DFS post-order
+              interval labellings. A reaches B only if level(A) < level(B) and
+              B's intervals nest inside A's, so most negative checks are O(1)
+              and positive ones search only the pruned cone. Counts come from
+              a batched column-bitset pass. Both labels are necessary
+              conditions, so an added dependency only widens its ancestors'
+              intervals and raises its descendants' levels, and a removed
+              one needs no relabelling at all.
+    search    (cyclic schedules) plain BFS over the adjacency lists.
+
+Impact scopes (successor -> hop distance) are BFS over the downstream cone,
+O(k) in its size, and cached per task until the next structural edit.
+"""
+
+import logging
+import os
+from collections import deque
+from typing import Dict, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+BITSET_MAX_TASKS = int(os.environ.get('SCHEDULE_REACHABILITY_BITSET_MAX_TASKS', '16000'))
+COUNT_BATCH_BYTES = 64 * 1024 * 1024  # working set of the batched count pass (interval mode)
+
+
+class ReachabilityIndex:
+    """Downstream reachability over a schedule's live adjacency lists"""
+
+    def __init__(
+        self,
+        tasks: Mapping[str, object],
+        successors: Mapping[str, List[str]],
+        predecessors: Mapping[str, List[str]],
+        bitset_max_tasks: Optional[int] = None
+    ):
+        """
+        Args:
+            tasks: task_id -> Task (only the keys are used)
+            successors: task_id -> successor ids (the analyzer's adjacency_list)
+            predecessors: task_id -> predecessor ids (the analyzer's reverse_adjacency)
+            bitset_max_tasks: Largest schedule kept as a full closure (default BITSET_MAX_TASKS)
+        """
+        self._tasks = tasks
+        self._successors = successors
+        self._predecessors = predecessors
+        self.bitset_max_tasks = BITSET_MAX_TASKS if bitset_max_tasks is None else bitset_max_tasks
+        self.mode: Optional[str] = None  # None until (re)built
+        self._scope_cache: Dict[str, Dict[str, int]] = {}
+        self._counts: Optional[List[int]] = None
+
+    # ------------------------------------------------------------------ build
+
+    def _build(self) -> None:
+        ids = list(self._tasks)
+        index = {task_id: i for i, task_id in enumerate(ids)}
+        succ = [[index[s] for s in self._successors.get(task_id, ())] for task_id in ids]
+        order = _topological_order(succ)
+
+        self._scope_cache = {}
+        if order is None:
+            logger.warning("Schedule has a dependency cycle; reachability falls back to search")
+            self.mode = 'search'
+            self._ids, self._index, self._counts = ids, index, None
+        elif len(ids) <= self.bitset_max_tasks:
+            self.mode = 'bitset'
+            self._ids, self._index = ids, index
+            reach = [0] * len(ids)
+            for v in reversed(order):
+                bits = 0
+                for s in succ[v]:
+                    bits |= reach[s] | (1 << s)
+                reach[v] = bits
+            self._reach = reach
+            self._counts = [bits.bit_count() for bits in reach]
+        else:
+            # Renumber tasks in topological order
+            self.mode = 'interval'
+            self._ids = [ids[v] for v in order]
+            self._index = {task_id: i for i, task_id in enumerate(self._ids)}
+            rank = [0] * len(ids)
+            for i, v in enumerate(order):
+                rank[v] = i
+            self._succ = [[rank[s] for s in succ[v]] for v in order]
+            self._label()
+            self._counts = None
+        logger.debug(f"Reachability index built: {len(ids)} tasks, {self.mode} mode")
+
+    def _label(self) -> None:
+        """Levels and two post-order interval labellings (tasks already in topological order)"""
+        succ = self._succ
+        n = len(succ)
+        level = [0] * n
+        for v in range(n):
+            for s in succ[v]:
+                if level[s] <= level[v]:
+                    level[s] = level[v] + 1
+        self._level = level
+
+        has_pred = bytearray(n)
+        for children in succ:
+            for s in children:
+                has_pred[s] = 1
+        roots = [v for v in range(n) if not has_pred[v]]
+        self._intervals = []
+        for reverse in (False, True):
+            high = _post_order(succ, roots[::-1] if reverse else roots, reverse)
+            low = high[:]
+            for v in range(n - 1, -1, -1):
+                for s in succ[v]:
+                    if low[s] < low[v]:
+                        low[v] = low[s]
+            self._intervals.append((low, high))
+        self._next_label = n
+
+    def _ensure(self) -> None:
+        if self.mode is None:
+            self._build()
+
+    # ---------------------------------------------------------------- queries
+
+    def impact_scope(self, task_id: str) -> Dict[str, int]:
+        """Every downstream task of `task_id` with its distance in dependency hops"""
+        self._ensure()
+        scope = self._scope_cache.get(task_id)
+        if scope is None:
+            scope = {}
+            if task_id in self._tasks:
+                visited = {task_id}
+                queue = deque([(task_id, 0)])
+                successors = self._successors
+                while queue:
+                    current, distance = queue.popleft()
+                    for successor in successors.get(current, ()):
+                        if successor not in visited:
+                            visited.add(successor)
+                            scope[successor] = distance + 1
+                            queue.append((successor, distance + 1))
+            self._scope_cache[task_id] = scope
+        return dict(scope)
+
+    def descendant_count(self, task_id: str) -> int:
+        """Number of tasks downstream of `task_id`"""
+        self._ensure()
+        i = self._index.get(task_id)
+        if i is None:
+            return 0
+        if self._counts is not None:
+            return self._counts[i]
+        return len(self.impact_scope(task_id))
+
+    def descendant_counts(self) -> Dict[str, int]:
+        """Downstream task count for every task (the blast-radius heatmap)"""
+        self._ensure()
+        if self._counts is None:
+            if self.mode == 'interval':
+                self._counts = self._batched_counts()
+            else:
+                return {task_id: len(self.impact_scope(task_id)) for task_id in self._ids}
+        counts = self._counts
+        return {task_id: counts[i] for i, task_id in enumerate(self._ids)}
+
+    def is_upstream(self, upstream_id: str, downstream_id: str) -> bool:
+        """True when `downstream_id` is reachable from `upstream_id` through dependencies"""
+        self._ensure()
+        a = self._index.get(upstream_id)
+        b = self._index.get(downstream_id)
+        if a is None or b is None:
+            return False
+        if self.mode == 'bitset':
+            return bool((self._reach[a] >> b) & 1)
+        if self.mode == 'interval':
+            return self._interval_reaches(a, b)
+        return downstream_id in self.impact_scope(upstream_id)
+
+    def _nests(self, outer: int, inner: int) -> bool:
+        for low, high in self._intervals:
+            if low[inner] < low[outer] or high[inner] > high[outer]:
+                return False
+        return True
+
+    def _interval_reaches(self, a: int, b: int) -> bool:
+        level = self._level
+        if level[a] >= level[b] or not self._nests(a, b):
+            return False
+        target_level = level[b]
+        stack = [a]
+        seen = {a}
+        while stack:
+            for s in self._succ[stack.pop()]:
+                if s == b:
+                    return True
+                if s not in seen and level[s] < target_level and self._nests(s, b):
+                    seen.add(s)
+                    stack.append(s)
+        return False
+
+    def _batched_counts(self) -> List[int]:
+        """
+        Exact descendant counts without a full closure: descendants are
+        counted one column batch of the closure at a time, sized so the batch
+        bitsets stay within COUNT_BATCH_BYTES.
+        """
+        n = len(self._succ)
+        # Level order is topological: every edge goes to a strictly higher level
+        order = sorted(range(n), key=self._level.__getitem__)
+        rank = [0] * n
+        for r, v in enumerate(order):
+            rank[v] = r
+        succ = [[rank[s] for s in self._succ[v]] for v in order]
+
+        batch = max(64, COUNT_BATCH_BYTES * 8 // max(n, 1))
+        counts = [0] * n
+        for lo in range(0, n, batch):
+            hi = min(n, lo + batch)
+            # Only tasks ranked before `hi` can reach this batch
+            reach = [0] * hi
+            for v in range(hi - 1, -1, -1):
+                bits = 0
+                for s in succ[v]:
+                    if s < hi:
+                        bits |= reach[s]
+                        if s >= lo:
+                            bits |= 1 << (s - lo)
+                reach[v] = bits
+                counts[v] += bits.bit_count()
+        return [counts[rank[v]] for v in range(n)]
+
+    # ------------------------------------------------------ incremental edits
+
+    def add_task(self, task_id: str) -> None:
+        """Register a new task (no dependencies yet)"""
+        if self.mode is None or task_id in self._index:
+            return
+        i = len(self._ids)
+        self._ids.append(task_id)
+        self._index[task_id] = i
+        if self.mode == 'bitset':
+            self._reach.append(0)
+            self._counts.append(0)
+        elif self.mode == 'interval':
+            self._succ.append([])
+            self._level.append(0)
+            for low, high in self._intervals:
+                low.append(self._next_label)
+                high.append(self._next_label)
+            self._next_label += 1
+            if self._counts is not None:
+                self._counts.append(0)
+
+    def add_edge(self, pred_id: str, succ_id: str) -> None:
+        """A dependency pred -> succ was added to the adjacency lists"""
+        if self.mode is None:
+            return
+        self._scope_cache = {}
+        if self.mode == 'search':
+            return
+        p, s = self._index[pred_id], self._index[succ_id]
+        if p == s or self.is_upstream(succ_id, pred_id):
+            self.mode = None  # new cycle: rebuild (into search mode) on next query
+            return
+        if self.mode == 'bitset':
+            self._add_closure_edge(pred_id, s)
+        else:
+            self._succ[p].append(s)
+            self._counts = None
+            self._relabel_for_edge(p, s)
+
+    def _add_closure_edge(self, pred_id: str, s: int) -> None:
+        added = self._reach[s] | (1 << s)
+        # Ancestors whose closure already had these tasks pass them on unchanged
+        queue = deque([pred_id])
+        seen = {pred_id}
+        while queue:
+            task_id = queue.popleft()
+            i = self._index[task_id]
+            merged = self._reach[i] | added
+            if merged == self._reach[i]:
+                continue
+            self._reach[i] = merged
+            self._counts[i] = merged.bit_count()
+            for ancestor in self._predecessors.get(task_id, ()):
+                if ancestor not in seen:
+                    seen.add(ancestor)
+                    queue.append(ancestor)
+
+    def _relabel_for_edge(self, p: int, s: int) -> None:
+        """Restore level order below s and interval nesting above p after adding p -> s"""
+        level = self._level
+        if level[s] <= level[p]:
+            level[s] = level[p] + 1
+            stack = [s]
+            while stack:
+                v = stack.pop()
+                for c in self._succ[v]:
+                    if level[c] <= level[v]:
+                        level[c] = level[v] + 1
+                        stack.append(c)
+
+        index = self._index
+        ids = self._ids
+        for low, high in self._intervals:
+            target_low, target_high = low[s], high[s]
+            stack = [p]
+            while stack:
+                v = stack.pop()
+                if low[v] <= target_low and high[v] >= target_high:
+                    continue  # so do all of v's ancestors
+                low[v] = min(low[v], target_low)
+                high[v] = max(high[v], target_high)
+                stack.extend(index[a] for a in self._predecessors.get(ids[v], ()))
+
+    def remove_edge(self, pred_id: str, succ_id: str) -> None:
+        """A dependency pred -> succ was removed from the adjacency lists"""
+        if self.mode is None:
+            return
+        self._scope_cache = {}
+        if self.mode == 'search':
+            return
+        if self.mode == 'interval':
+            # Levels and intervals over-approximate, so they stay valid
+            self._succ[self._index[pred_id]].remove(self._index[succ_id])
+            self._counts = None
+            return
+
+        # Recompute the closure of pred's ancestor cone, successors first
+        cone = {pred_id}
+        queue = deque([pred_id])
+        while queue:
+            for ancestor in self._predecessors.get(queue.popleft(), ()):
+                if ancestor not in cone:
+                    cone.add(ancestor)
+                    queue.append(ancestor)
+        index = self._index
+        reach = self._reach
+        for task_id in _post_order_within(self._successors, cone):
+            bits = 0
+            for successor in self._successors.get(task_id, ()):
+                s = index[successor]
+                bits |= reach[s] | (1 << s)
+            i = index[task_id]
+            reach[i] = bits
+            self._counts[i] = bits.bit_count()
+
+
+def _topological_order(succ: List[List[int]]) -> Optional[List[int]]:
+    """Kahn's algorithm over index adjacency; None if there is a cycle"""
+    n = len(succ)
+    in_degree = [0] * n
+    for children in succ:
+        for s in children:
+            in_degree[s] += 1
+    order = [v for v in range(n) if in_degree[v] == 0]
+    for v in order:  # order grows while iterating
+        for s in succ[v]:
+            in_degree[s] -= 1
+            if in_degree[s] == 0:
+                order.append(s)
+    return order if len(order) == n else None
+
+
+def _post_order(succ: List[List[int]], roots: List[int], reverse: bool) -> List[int]:
+    """Iterative DFS post-order numbers from `roots` (children visited reversed if asked)"""
+    post = [0] * len(succ)
+    visited = bytearray(len(succ))
+    counter = 0
+    for root in roots:
+        if visited[root]:
+            continue
+        visited[root] = 1
+        stack = [(root, iter(reversed(succ[root]) if reverse else succ[root]))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if not visited[child]:
+                    visited[child] = 1
+                    stack.append((child, iter(reversed(succ[child]) if reverse else succ[child])))
+                    break
+            else:
+                stack.pop()
+                post[node] = counter
+                counter += 1
+    return post
+
+
+def _post_order_within(successors: Mapping[str, List[str]], nodes: set) -> List[str]:
+    """Tasks of `nodes` ordered so each comes after its successors within `nodes` (acyclic)"""
+    order = []
+    done = set()
+    for start in nodes:
+        if start in done:
+            continue
+        done.add(start)
+        stack = [(start, iter(successors.get(start, ())))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if child in nodes and child not in done:
+                    done.add(child)
+                    stack.append((child, iter(successors.get(child, ()))))
+                    break
+            else:
+                stack.pop()
+                order.append(node)
+    return order
@@ -4,31 +4,181 @@ Phase 16: Smart Schedule Dependencies - Core Dependency Analysis
 Analyzes task dependencies, computes critical path, and identifies schedule risks.
 """
 
+import gc
+import heapq
 import logging
-from typing import Dict, List, Set, Optional, Tuple
+from typing import Dict, Iterable, List, Set, Optional, Tuple
 from collections import defaultdict, deque
 from phase16_types import (
-    Task, TaskDependency, DependencyType, CriticalPathAnalysis,
-    ScheduleRiskFactors, TaskStatus
+    Task, TaskDependency, DependencyType, CriticalPathAnalysis, CPMDates,
+    ScheduleRiskFactors, TaskStatus, CycleMode, DependencyCycle, DEPENDENCY_ANCHORS, DEPENDENCY_TYPES
 )
+from phase16_cycles import ScheduleCycleError, find_dependency_cycles
+from phase16_reachability import ReachabilityIndex
+from phase14_logging import event_limiter, log_rate_limited
 
 logger = logging.getLogger(__name__)
 
 
-class ScheduleDependencyAnalyzer:
-    """Analyzes task dependencies and critical path in construction schedules"""
+def start_offset(dependency: TaskDependency, pred_duration, succ_duration):
+    """
+    Minimum gap between predecessor start and successor start for a dependency.
+    
+    FS: pred duration + lag, SS: lag, FF: pred duration + lag - succ duration,
+    SF: lag - succ duration.
+    """
+    pred_finish, succ_finish = DEPENDENCY_ANCHORS[dependency.dependency_type]
+    offset = dependency.lag_days
+    if pred_finish:
+        offset += pred_duration
+    if succ_finish:
+        offset -= succ_duration
+    return offset
+
+
+class DependencyEdgeIndex:
+    """
+    Indexed store of dependency edges.
+
+    Keeps a (predecessor, successor) -> dependency map plus per-task
+    adjacency lists of the dependency objects themselves, so lag and
+    dependency type are available without scanning every dependency.
+    """
     
     def __init__(self):
+        self.by_pair: Dict[Tuple[str, str], TaskDependency] = {}
+        self.out_edges: Dict[str, List[TaskDependency]] = defaultdict(list)  # task_id -> outgoing deps
+        self.in_edges: Dict[str, List[TaskDependency]] = defaultdict(list)  # task_id -> incoming deps
+    
+    def add(self, dependency: TaskDependency) -> None:
+        """Index a dependency (first dependency wins for duplicate task pairs)"""
+        key = (dependency.predecessor_task_id, dependency.successor_task_id)
+        self.by_pair.setdefault(key, dependency)
+        self.out_edges[dependency.predecessor_task_id].append(dependency)
+        self.in_edges[dependency.successor_task_id].append(dependency)
+    
+    def remove(self, dependency: TaskDependency) -> None:
+        """Drop a dependency from the index"""
+        pred_id = dependency.predecessor_task_id
+        succ_id = dependency.successor_task_id
+        self.out_edges[pred_id] = [d for d in self.out_edges[pred_id] if d is not dependency]
+        self.in_edges[succ_id] = [d for d in self.in_edges[succ_id] if d is not dependency]
+        if self.by_pair.get((pred_id, succ_id)) is dependency:
+            del self.by_pair[(pred_id, succ_id)]
+            for other in self.out_edges[pred_id]:
+                if other.successor_task_id == succ_id:
+                    self.by_pair[(pred_id, succ_id)] = other
+                    break
+    
+    def get(self, pred_id: str, succ_id: str) -> Optional[TaskDependency]:
+        """Return the dependency between two tasks, if any"""
+        return self.by_pair.get((pred_id, succ_id))
+    
+    def lag(self, pred_id: str, succ_id: str) -> int:
+        """Lag in days between two tasks (0 when they are not linked)"""
+        dep = self.by_pair.get((pred_id, succ_id))
+        return dep.lag_days if dep is not None else 0
+
+
+class ScheduleDependencyAnalyzer:
+    """
+    Analyzes task dependencies and critical path in construction schedules.
+    
+    After calculate_critical_path() the analyzer keeps its early/late dates, so
+    later edits (add_task, add_dependency, remove_dependency,
+    update_task_duration, mark_task_complete) only re-propagate through the
+    affected downstream/upstream cones and update `current_analysis` in place.
+    
+    Dependency cycles are handled according to `cycle_mode` (see
+    calculate_critical_path).
+    """
+    
+    def __init__(self, cycle_mode: CycleMode = CycleMode.EXCLUDE):
+        self.cycle_mode = CycleMode(cycle_mode)
         self.tasks: Dict[str, Task] = {}
         self.dependencies: Dict[str, TaskDependency] = {}
         self.adjacency_list: Dict[str, List[str]] = defaultdict(list)  # task_id -> successors
         self.reverse_adjacency: Dict[str, List[str]] = defaultdict(list)  # task_id -> predecessors
+        self.edges = DependencyEdgeIndex()
+        
+        # Incremental CPM state (populated by calculate_critical_path)
+        self.current_analysis: Optional[CriticalPathAnalysis] = None
+        self._earliest_start: Dict[str, int] = {}
+        self._late_offset: Dict[str, int] = {}  # latest start - project duration
+        self._topo_position: Dict[str, int] = {}
+        self._next_position = 0
+        
+        # Downstream reachability (built on first impact query)
+        self._reachability: Optional[ReachabilityIndex] = None
+    
+    @classmethod
+    def from_frame(cls, frame) -> 'ScheduleDependencyAnalyzer':
+        """Analyzer loaded from a ScheduleFrame (see load_frame)"""
+        analyzer = cls()
+        analyzer.load_frame(frame)
+        return analyzer
+    
+    def load_frame(self, frame) -> None:
+        """
+        Bulk-load a ScheduleFrame into an empty analyzer.
+        
+        The frame already resolved ids, duplicates and unknown tasks, so rows
+        go straight into the task/dependency dicts, adjacency lists and edge
+        index without the per-call checks of add_task/add_dependency.
+        """
+        if self.tasks:
+            raise ValueError("load_frame requires an empty analyzer")
+        
+        # Hundreds of thousands of new container objects would otherwise trigger
+        # repeated full collections; none of them can be garbage yet
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            task_ids = frame.task_ids
+            tasks = self.tasks
+            for task_id, name, duration, complexity, weather, resource in zip(
+                task_ids, frame.names, frame.durations, frame.complexity, frame.weather, frame.resource
+            ):
+                tasks[task_id] = Task(task_id, name, duration, complexity_factor=complexity,
+                                      weather_dependency=bool(weather), resource_constrained=bool(resource))
+            
+            dependencies = self.dependencies
+            adjacency = self.adjacency_list
+            reverse = self.reverse_adjacency
+            edges = self.edges
+            for dep_id, pred, succ, code, lag in zip(
+                frame.dependency_ids, frame.predecessors, frame.successors, frame.type_codes, frame.lags
+            ):
+                pred_id = task_ids[pred]
+                succ_id = task_ids[succ]
+                dependency = TaskDependency(dep_id, pred_id, succ_id, DEPENDENCY_TYPES[code], lag)
+                dependencies[dep_id] = dependency
+                adjacency[pred_id].append(succ_id)
+                reverse[succ_id].append(pred_id)
+                edges.add(dependency)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        
+        logger.info(f"Loaded {len(tasks)} tasks and {len(dependencies)} dependencies from frame")
     
     def add_task(self, task: Task) -> None:
         """Register a task in the schedule"""
-        if task.task_id in self.tasks:
+        previous = self.tasks.get(task.task_id)
+        if previous is not None:
             logger.warning(f"Task {task.task_id} already exists, overwriting")
         self.tasks[task.task_id] = task
+        if previous is None and self._reachability is not None:
+            self._reachability.add_task(task.task_id)
+        
+        if self.current_analysis is not None:
+            if previous is not None:
+                old_finish = {task.task_id: self._earliest_start[task.task_id] + previous.duration_days}
+                self._apply_duration_change(task.task_id, old_finish)
+            else:
+                self._topo_position[task.task_id] = self._next_position
+                self._next_position += 1
+                self._apply_incremental({task.task_id}, {task.task_id}, {task.task_id: None})
     
     def add_dependency(self, dependency: TaskDependency) -> None:
         """Register a dependency relationship"""
@@ -43,22 +193,159 @@ class ScheduleDependencyAnalyzer:
             logger.error(f"Successor task {succ_id} not found")
             return
         
+        keeps_order = self.current_analysis is None or self._reorder_for_edge(pred_id, succ_id)
+        
         # Register dependency
         self.dependencies[dependency.dependency_id] = dependency
         self.adjacency_list[pred_id].append(succ_id)
         self.reverse_adjacency[succ_id].append(pred_id)
+        self.edges.add(dependency)
+        if self._reachability is not None:
+            self._reachability.add_edge(pred_id, succ_id)
+        
+        log_rate_limited(logger, logging.DEBUG, 'ADD_DEPENDENCY', "Added dependency: %s -> %s (%s)",
+                         pred_id, succ_id, dependency.dependency_type)
+        
+        if self.current_analysis is not None:
+            if keeps_order:
+                self._apply_incremental({succ_id}, {pred_id}, {})
+            else:
+                logger.warning(f"Dependency {dependency.dependency_id} creates a cycle; "
+                               f"incremental state dropped until the next full analysis")
+                self.current_analysis = None
+    
+    def remove_dependency(self, dependency_id: str) -> Optional[CriticalPathAnalysis]:
+        """Unregister a dependency relationship (incrementally re-propagating dates)"""
+        dependency = self.dependencies.pop(dependency_id, None)
+        if dependency is None:
+            logger.error(f"Dependency {dependency_id} not found")
+            return self.current_analysis
+        
+        pred_id = dependency.predecessor_task_id
+        succ_id = dependency.successor_task_id
+        self.adjacency_list[pred_id].remove(succ_id)
+        self.reverse_adjacency[succ_id].remove(pred_id)
+        self.edges.remove(dependency)
+        if self._reachability is not None:
+            self._reachability.remove_edge(pred_id, succ_id)
         
-        logger.debug(f"Added dependency: {pred_id} -> {succ_id} ({dependency.dependency_type})")
+        if self.current_analysis is not None:
+            self._apply_incremental({succ_id}, {pred_id}, {})
+        return self.current_analysis
     
-    def calculate_critical_path(self) -> CriticalPathAnalysis:
+    def update_task_duration(self, task_id: str, duration_days: int) -> Optional[CriticalPathAnalysis]:
+        """
+        Change a task's duration.
+        
+        With incremental state this re-propagates only the task's downstream
+        (early dates) and upstream (late dates) cones; otherwise the change is
+        picked up by the next calculate_critical_path().
+        """
+        if task_id not in self.tasks:
+            logger.error(f"Task {task_id} not found")
+            return self.current_analysis
+        
+        task = self.tasks[task_id]
+        if self.current_analysis is None:
+            task.duration_days = duration_days
+            return None
+        
+        old_finish = {task_id: self._earliest_start[task_id] + task.duration_days}
+        task.duration_days = duration_days
+        return self._apply_duration_change(task_id, old_finish)
+    
+    def mark_task_complete(self, task_id: str, actual_duration_days: Optional[int] = None) -> Optional[CriticalPathAnalysis]:
+        """Mark a task completed, optionally recording its actual duration"""
+        if task_id not in self.tasks:
+            logger.error(f"Task {task_id} not found")
+            return self.current_analysis
+        
+        self.tasks[task_id].status = TaskStatus.COMPLETED
+        if actual_duration_days is not None and actual_duration_days != self.tasks[task_id].duration_days:
+            return self.update_task_duration(task_id, actual_duration_days)
+        
+        # Completion only changes which critical tasks count as bottlenecks
+        analysis = self.current_analysis
+        if analysis is not None:
+            analysis.critical_path, analysis.bottleneck_tasks = self._critical_path_details(analysis.critical_tasks)
+        return analysis
+    
+    def calculate_critical_path(self, cycle_mode: Optional[CycleMode] = None) -> CriticalPathAnalysis:
         """
         Calculate critical path using forward/backward pass (CPM algorithm).
         
+        Honors all four dependency types (FS/SS/FF/SF) and their lags.
+        
+        Tasks the forward pass cannot order sit on or downstream of a
+        dependency cycle. Only then are the strongly connected components of
+        those tasks computed, so acyclic schedules pay nothing for the check.
+        Cycles are then handled per `cycle_mode` (default: self.cycle_mode):
+        FAIL raises ScheduleCycleError, EXCLUDE analyzes the schedule without
+        the cyclic tasks and CONDENSE gives each cycle's tasks a shared start.
+        Either way the analysis lists the cycles and keeps no incremental state.
+        
+        Args:
+            cycle_mode: How to handle dependency cycles
+        
         Returns:
             CriticalPathAnalysis with critical path and slack times
         """
+        # summarize the dependency import before the analysis log lines
+        event_limiter.report_suppressed('ADD_DEPENDENCY')
         logger.info("Calculating critical path...")
         
+        topo_order, earliest_start, latest_start, project_duration = self._cpm_pass()
+        if latest_start is None:
+            ordered = set(topo_order)
+            unordered = [t for t in self.tasks if t not in ordered]
+            return self._analyze_around_cycles(CycleMode(cycle_mode or self.cycle_mode), unordered)
+        
+        # Step 3: Identify critical path (slack = 0)
+        slack = {}
+        for task_id in self.tasks:
+            slack[task_id] = latest_start.get(task_id, 0) - earliest_start.get(task_id, 0)
+        
+        analysis = self.summarize_critical_path(slack, project_duration)
+        
+        # Keep dates for incremental updates
+        self.current_analysis = analysis
+        self._earliest_start = earliest_start
+        self._late_offset = {t: latest_start[t] - project_duration for t in topo_order}
+        self._topo_position = {t: i for i, t in enumerate(topo_order)}
+        self._next_position = len(topo_order)
+        return analysis
+    
+    def cpm_dates(self) -> Optional[CPMDates]:
+        """
+        Earliest starts, slack and topological positions of every task.
+        
+        Read from the incremental state when calculate_critical_path() kept
+        it; otherwise computed by a forward/backward pass that stores nothing,
+        so an analyzer shared between requests is left as it is. None when
+        dependency cycles leave tasks unordered.
+        """
+        analysis = self.current_analysis
+        if analysis is not None:
+            return CPMDates(self._earliest_start, analysis.slack_by_task, self._topo_position,
+                            analysis.project_duration_days)
+        topo_order, earliest_start, latest_start, project_duration = self._cpm_pass()
+        if latest_start is None:
+            return None
+        return CPMDates(
+            earliest_start,
+            {t: latest_start[t] - earliest_start[t] for t in self.tasks},
+            {t: i for i, t in enumerate(topo_order)},
+            project_duration
+        )
+    
+    def _cpm_pass(self) -> Tuple[List[str], Dict[str, int], Optional[Dict[str, int]], int]:
+        """
+        Forward and backward pass over the schedule; reads the graph, stores nothing.
+        
+        Returns (topo_order, earliest_start, latest_start, project_duration).
+        When cycles leave tasks out of topo_order, latest_start is None and
+        project_duration 0.
+        """
         # Step 1: Forward pass - calculate earliest start/finish times
         earliest_start = {}
         earliest_finish = {}
@@ -68,24 +355,22 @@ class ScheduleDependencyAnalyzer:
                     for task_id in self.tasks}
         queue = deque([t for t in self.tasks if in_degree[t] == 0])
         
+        topo_order = []
+        
         while queue:
             task_id = queue.popleft()
             task = self.tasks[task_id]
+            topo_order.append(task_id)
             
-            # Earliest start = max(earliest finish of predecessors + lag)
-            if task_id in self.reverse_adjacency and self.reverse_adjacency[task_id]:
-                pred_ids = self.reverse_adjacency[task_id]
-                max_pred_finish = 0
-                for pred_id in pred_ids:
-                    if pred_id in earliest_finish:
-                        # Find lag for this dependency
-                        lag = 0
-                        for dep in self.dependencies.values():
-                            if dep.predecessor_task_id == pred_id and dep.successor_task_id == task_id:
-                                lag = dep.lag_days
-                                break
-                        max_pred_finish = max(max_pred_finish, earliest_finish[pred_id] + lag)
-                earliest_start[task_id] = max_pred_finish
+            # Earliest start = max(predecessor start + dependency offset), never before day 0
+            if self.edges.in_edges.get(task_id):
+                max_pred_start = 0
+                for dep in self.edges.in_edges[task_id]:
+                    pred_id = dep.predecessor_task_id
+                    if pred_id in earliest_start:
+                        offset = start_offset(dep, self.tasks[pred_id].duration_days, task.duration_days)
+                        max_pred_start = max(max_pred_start, earliest_start[pred_id] + offset)
+                earliest_start[task_id] = max_pred_start
             else:
                 earliest_start[task_id] = 0
             
@@ -97,9 +382,11 @@ class ScheduleDependencyAnalyzer:
                 if in_degree[succ_id] == 0:
                     queue.append(succ_id)
         
+        if len(topo_order) < len(self.tasks):
+            return topo_order, earliest_start, None, 0
+        
         # Step 2: Backward pass - calculate latest start/finish times
         project_duration = max(earliest_finish.values()) if earliest_finish else 0
-        latest_finish = {task_id: project_duration for task_id in self.tasks}
         latest_start = {}
         
         # Process in reverse topological order
@@ -108,25 +395,16 @@ class ScheduleDependencyAnalyzer:
         
         while queue:
             task_id = queue.popleft()
+            duration = self.tasks[task_id].duration_days
             
-            if task_id in self.adjacency_list and self.adjacency_list[task_id]:
-                succ_ids = self.adjacency_list[task_id]
-                min_succ_start = float('inf')
-                for succ_id in succ_ids:
-                    if succ_id in latest_start:
-                        # Find lag
-                        lag = 0
-                        for dep in self.dependencies.values():
-                            if dep.predecessor_task_id == task_id and dep.successor_task_id == succ_id:
-                                lag = dep.lag_days
-                                break
-                        min_succ_start = min(min_succ_start, latest_start[succ_id] - lag)
-                if min_succ_start != float('inf'):
-                    latest_finish[task_id] = min_succ_start
-                else:
-                    latest_finish[task_id] = earliest_finish.get(task_id, project_duration)
-            
-            latest_start[task_id] = latest_finish[task_id] - self.tasks[task_id].duration_days
+            # Latest start = min(successor latest start - dependency offset), never finishing after the project
+            latest = project_duration - duration
+            for dep in self.edges.out_edges.get(task_id, ()):
+                succ_id = dep.successor_task_id
+                if succ_id in latest_start:
+                    offset = start_offset(dep, duration, self.tasks[succ_id].duration_days)
+                    latest = min(latest, latest_start[succ_id] - offset)
+            latest_start[task_id] = latest
             
             # Queue predecessors
             for pred_id in self.reverse_adjacency[task_id]:
@@ -134,22 +412,108 @@ class ScheduleDependencyAnalyzer:
                 if out_degree[pred_id] == 0:
                     queue.append(pred_id)
         
-        # Step 3: Identify critical path (slack = 0)
+        return topo_order, earliest_start, latest_start, project_duration
+    
+    def find_cycles(self) -> List[DependencyCycle]:
+        """Every dependency cycle in the schedule, with the ids of its loop dependencies"""
+        return find_dependency_cycles(self.tasks, self.edges.out_edges)
+    
+    def _analyze_around_cycles(self, cycle_mode: CycleMode, unordered: List[str]) -> CriticalPathAnalysis:
+        """
+        CPM for a schedule with dependency cycles.
+        
+        `unordered` (the tasks Kahn's algorithm could not order) is closed
+        under successors, so every cycle lies inside it. The cycles become
+        blocks: EXCLUDE drops their tasks and every dependency touching them,
+        CONDENSE keeps each block as one node whose tasks all start together,
+        ignoring the dependencies inside the loop. The block graph is acyclic
+        and goes through the usual forward/backward pass.
+        """
+        self.current_analysis = None
+        cycles = find_dependency_cycles(unordered, self.edges.out_edges)
+        logger.warning(f"Schedule contains {len(cycles)} dependency cycle(s) involving "
+                       f"{sum(len(c.task_ids) for c in cycles)} tasks (cycle mode: {cycle_mode.value})")
+        if cycle_mode is CycleMode.FAIL:
+            raise ScheduleCycleError(cycles)
+        
+        block: Dict[str, str] = {}  # cyclic task -> representative task of its cycle
+        for cycle in cycles:
+            for task_id in cycle.task_ids:
+                block[task_id] = cycle.task_ids[0]
+        excluded = block if cycle_mode is CycleMode.EXCLUDE else {}
+        
+        members: Dict[str, List[str]] = defaultdict(list)
+        for task_id in self.tasks:
+            if task_id not in excluded:
+                members[block.get(task_id, task_id)].append(task_id)
+        in_deps: Dict[str, List[TaskDependency]] = defaultdict(list)
+        out_deps: Dict[str, List[TaskDependency]] = defaultdict(list)
+        for dep in self.dependencies.values():
+            pred_id, succ_id = dep.predecessor_task_id, dep.successor_task_id
+            if pred_id in excluded or succ_id in excluded:
+                continue
+            pred_node, succ_node = block.get(pred_id, pred_id), block.get(succ_id, succ_id)
+            if pred_node != succ_node:
+                out_deps[pred_node].append(dep)
+                in_deps[succ_node].append(dep)
+        
+        # Forward pass over blocks
+        tasks = self.tasks
+        in_degree = {node: len(in_deps[node]) for node in members}
+        queue = deque(node for node in members if in_degree[node] == 0)
+        order = []
+        earliest_start: Dict[str, int] = {}
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            start = 0
+            for dep in in_deps[node]:
+                pred_id = dep.predecessor_task_id
+                offset = start_offset(dep, tasks[pred_id].duration_days, tasks[dep.successor_task_id].duration_days)
+                start = max(start, earliest_start[block.get(pred_id, pred_id)] + offset)
+            earliest_start[node] = start
+            for dep in out_deps[node]:
+                succ_node = block.get(dep.successor_task_id, dep.successor_task_id)
+                in_degree[succ_node] -= 1
+                if in_degree[succ_node] == 0:
+                    queue.append(succ_node)
+        
+        project_duration = max((earliest_start[node] + tasks[t].duration_days
+                                for node, group in members.items() for t in group), default=0)
+        
+        # Backward pass over blocks
+        latest_start: Dict[str, int] = {}
+        for node in reversed(order):
+            latest = min(project_duration - tasks[t].duration_days for t in members[node])
+            for dep in out_deps[node]:
+                succ_id = dep.successor_task_id
+                offset = start_offset(dep, tasks[dep.predecessor_task_id].duration_days, tasks[succ_id].duration_days)
+                latest = min(latest, latest_start[block.get(succ_id, succ_id)] - offset)
+            latest_start[node] = latest
+        
         slack = {}
+        for task_id in tasks:
+            if task_id not in excluded:
+                node = block.get(task_id, task_id)
+                slack[task_id] = latest_start[node] - earliest_start[node]
+        analysis = self.summarize_critical_path(slack, project_duration)
+        analysis.cycles = cycles
+        analysis.excluded_tasks = list(excluded)
+        return analysis
+    
+    def summarize_critical_path(self, slack: Dict[str, int], project_duration) -> CriticalPathAnalysis:
+        """
+        Derive critical tasks, critical path and bottlenecks from per-task slack.
+        
+        Shared by every CPM engine (dict passes, VectorizedCPMEngine) so their
+        analyses are built the same way.
+        """
         critical_tasks = set()
-        for task_id in self.tasks:
-            slack[task_id] = latest_start.get(task_id, 0) - earliest_start.get(task_id, 0)
-            if slack[task_id] == 0:
+        for task_id, task_slack in slack.items():
+            if task_slack == 0:
                 critical_tasks.add(task_id)
         
-        # Build critical path
-        critical_path = self._build_critical_path(critical_tasks)
-        
-        # Identify bottlenecks (critical tasks with dependent tasks)
-        bottlenecks = [t for t in critical_tasks 
-                      if len(self.adjacency_list[t]) > 0 and 
-                      any(self.tasks[succ].status != TaskStatus.COMPLETED 
-                          for succ in self.adjacency_list[t])]
+        critical_path, bottlenecks = self._critical_path_details(critical_tasks)
         
         result = CriticalPathAnalysis(
             critical_path=critical_path,
@@ -162,8 +526,185 @@ class ScheduleDependencyAnalyzer:
         logger.info(f"Critical path length: {len(critical_path)} tasks, duration: {project_duration:.0f} days")
         return result
     
-    def _build_critical_path(self, critical_tasks: Set[str]) -> List[str]:
-        """Reconstruct critical path from critical tasks"""
+    def _critical_path_details(self, critical_tasks: Set[str]) -> Tuple[List[str], List[str]]:
+        """Critical path and bottleneck tasks for a set of critical tasks"""
+        critical_path = self.build_critical_path(critical_tasks)
+        
+        # Identify bottlenecks (critical tasks with dependent tasks)
+        bottlenecks = [t for t in critical_tasks 
+                      if len(self.adjacency_list[t]) > 0 and 
+                      any(self.tasks[succ].status != TaskStatus.COMPLETED 
+                          for succ in self.adjacency_list[t])]
+        return critical_path, bottlenecks
+    
+    # ------------------------------------------------------------------
+    # Incremental recomputation
+    # ------------------------------------------------------------------
+    
+    def _apply_duration_change(self, task_id: str, old_finish: Dict[str, Optional[int]]) -> CriticalPathAnalysis:
+        """Re-propagate after a task's duration changed (its finish and FF/SF offsets move)"""
+        forward_seeds = {task_id}
+        forward_seeds.update(dep.successor_task_id for dep in self.edges.out_edges.get(task_id, ()))
+        backward_seeds = {task_id}
+        backward_seeds.update(dep.predecessor_task_id for dep in self.edges.in_edges.get(task_id, ()))
+        return self._apply_incremental(forward_seeds, backward_seeds, old_finish)
+    
+    def _apply_incremental(
+        self,
+        forward_seeds: Iterable[str],
+        backward_seeds: Iterable[str],
+        old_finish: Dict[str, Optional[int]]
+    ) -> CriticalPathAnalysis:
+        """
+        Re-propagate early dates downstream of `forward_seeds` and late dates
+        upstream of `backward_seeds`, then update slack and the critical set.
+        
+        Late dates are stored relative to the project duration, so a change in
+        project duration only shifts slack and never re-runs the backward pass.
+        
+        Args:
+            old_finish: Earliest finish before the edit for tasks whose duration
+                changed (None for new tasks); filled in for re-dated tasks
+        """
+        analysis = self.current_analysis
+        changed = self._propagate_forward(forward_seeds, old_finish)
+        changed |= self._propagate_backward(backward_seeds)
+        
+        old_duration = analysis.project_duration_days
+        project_duration = self._updated_project_duration(old_duration, old_finish)
+        
+        slack = analysis.slack_by_task
+        critical_tasks = analysis.critical_tasks
+        for task_id in (self.tasks if project_duration != old_duration else changed):
+            task_slack = project_duration + self._late_offset[task_id] - self._earliest_start[task_id]
+            slack[task_id] = task_slack
+            if task_slack == 0:
+                critical_tasks.add(task_id)
+            else:
+                critical_tasks.discard(task_id)
+        
+        analysis.project_duration_days = int(project_duration)
+        analysis.critical_path, analysis.bottleneck_tasks = self._critical_path_details(critical_tasks)
+        return analysis
+    
+    def _propagate_forward(self, seeds: Iterable[str], old_finish: Dict[str, Optional[int]]) -> Set[str]:
+        """Recompute earliest starts through the downstream cone, in topological order"""
+        earliest_start = self._earliest_start
+        position = self._topo_position
+        queued = set(seeds)
+        heap = [(position[t], t) for t in queued]
+        heapq.heapify(heap)
+        changed = set()
+        
+        while heap:
+            _, task_id = heapq.heappop(heap)
+            queued.discard(task_id)
+            task = self.tasks[task_id]
+            
+            start = 0
+            for dep in self.edges.in_edges.get(task_id, ()):
+                pred_id = dep.predecessor_task_id
+                offset = start_offset(dep, self.tasks[pred_id].duration_days, task.duration_days)
+                start = max(start, earliest_start[pred_id] + offset)
+            
+            previous = earliest_start.get(task_id)
+            if start == previous:
+                continue
+            old_finish.setdefault(task_id, None if previous is None else previous + task.duration_days)
+            earliest_start[task_id] = start
+            changed.add(task_id)
+            
+            for dep in self.edges.out_edges.get(task_id, ()):
+                succ_id = dep.successor_task_id
+                if succ_id not in queued:
+                    queued.add(succ_id)
+                    heapq.heappush(heap, (position[succ_id], succ_id))
+        return changed
+    
+    def _propagate_backward(self, seeds: Iterable[str]) -> Set[str]:
+        """Recompute relative latest starts through the upstream cone, in reverse topological order"""
+        late_offset = self._late_offset
+        position = self._topo_position
+        queued = set(seeds)
+        heap = [(-position[t], t) for t in queued]
+        heapq.heapify(heap)
+        changed = set()
+        
+        while heap:
+            _, task_id = heapq.heappop(heap)
+            queued.discard(task_id)
+            duration = self.tasks[task_id].duration_days
+            
+            latest = -duration
+            for dep in self.edges.out_edges.get(task_id, ()):
+                succ_id = dep.successor_task_id
+                offset = start_offset(dep, duration, self.tasks[succ_id].duration_days)
+                latest = min(latest, late_offset[succ_id] - offset)
+            
+            if latest == late_offset.get(task_id):
+                continue
+            late_offset[task_id] = latest
+            changed.add(task_id)
+            
+            for dep in self.edges.in_edges.get(task_id, ()):
+                pred_id = dep.predecessor_task_id
+                if pred_id not in queued:
+                    queued.add(pred_id)
+                    heapq.heappush(heap, (-position[pred_id], pred_id))
+        return changed
+    
+    def _updated_project_duration(self, old_duration: int, old_finish: Dict[str, Optional[int]]):
+        """New project duration, rescanning all tasks only if a finishing task got shorter"""
+        new_finishes = [self._earliest_start[t] + self.tasks[t].duration_days for t in old_finish]
+        longest = max(new_finishes, default=0)
+        if longest >= old_duration:
+            return longest
+        if any(finish == old_duration for finish in old_finish.values()):
+            return max((self._earliest_start[t] + task.duration_days for t, task in self.tasks.items()), default=0)
+        return old_duration
+    
+    def _reorder_for_edge(self, pred_id: str, succ_id: str) -> bool:
+        """
+        Keep the stored topological order valid for a new edge pred -> succ
+        (Pearce-Kelly). Returns False if the edge would close a cycle.
+        """
+        position = self._topo_position
+        lower, upper = position[succ_id], position[pred_id]
+        if pred_id == succ_id:
+            return False
+        if lower > upper:
+            return True
+        
+        # Tasks reachable from succ that currently sit before pred
+        forward, stack, seen = [], [succ_id], {succ_id}
+        while stack:
+            node = stack.pop()
+            forward.append(node)
+            for nxt in self.adjacency_list[node]:
+                if nxt == pred_id:
+                    return False
+                if nxt not in seen and position[nxt] < upper:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        
+        # Tasks that reach pred and currently sit after succ
+        backward, stack, seen = [], [pred_id], {pred_id}
+        while stack:
+            node = stack.pop()
+            backward.append(node)
+            for prev in self.reverse_adjacency[node]:
+                if prev not in seen and position[prev] > lower:
+                    seen.add(prev)
+                    stack.append(prev)
+        
+        slots = sorted(position[t] for t in forward + backward)
+        reordered = sorted(backward, key=position.get) + sorted(forward, key=position.get)
+        for slot, task_id in zip(slots, reordered):
+            position[task_id] = slot
+        return True
+    
+    def build_critical_path(self, critical_tasks: Set[str]) -> List[str]:
+        """Reconstruct critical path from critical tasks (e.g. the zero-slack tasks of a what-if run)"""
         if not critical_tasks:
             return []
         
@@ -178,8 +719,9 @@ class ScheduleDependencyAnalyzer:
         if not start:
             start = list(critical_tasks)[0]
         
-        # Follow critical path
+        # Follow critical path (stopping if it loops back on itself)
         path = [start]
+        on_path = {start}
         current = start
         while True:
             # Find next critical task
@@ -190,8 +732,9 @@ class ScheduleDependencyAnalyzer:
                     next_task = succ
                     break
             
-            if next_task is None:
+            if next_task is None or next_task in on_path:
                 break
+            on_path.add(next_task)
             path.append(next_task)
             current = next_task
         
@@ -248,26 +791,28 @@ class ScheduleDependencyAnalyzer:
             confidence_level=conf_level
         )
     
+    @property
+    def reachability(self) -> ReachabilityIndex:
+        """Downstream reachability index (built on first use, updated on edits)"""
+        if self._reachability is None:
+            self._reachability = ReachabilityIndex(self.tasks, self.adjacency_list, self.reverse_adjacency)
+        return self._reachability
+    
     def get_task_impact_scope(self, task_id: str) -> Dict[str, int]:
         """
-        BFS to find all tasks affected if this task is delayed.
+        Find all tasks affected if this task is delayed.
         Returns dict of {affected_task_id: propagation_distance}
         """
-        affected = {}
-        visited = set()
-        queue = deque([(task_id, 0)])
-        
-        while queue:
-            current, distance = queue.popleft()
-            if current in visited:
-                continue
-            visited.add(current)
-            
-            if current != task_id:
-                affected[current] = distance
-            
-            for successor in self.adjacency_list[current]:
-                if successor not in visited:
-                    queue.append((successor, distance + 1))
-        
-        return affected
+        return self.reachability.impact_scope(task_id)
+    
+    def get_downstream_count(self, task_id: str) -> int:
+        """Number of tasks affected if this task is delayed"""
+        return self.reachability.descendant_count(task_id)
+    
+    def get_downstream_counts(self) -> Dict[str, int]:
+        """Affected-task count for every task (blast-radius heatmap)"""
+        return self.reachability.descendant_counts()
+    
+    def is_upstream(self, upstream_task_id: str, downstream_task_id: str) -> bool:
+        """Whether a delay on the first task can reach the second"""
+        return self.reachability.is_upstream(upstream_task_id, downstream_task_id)
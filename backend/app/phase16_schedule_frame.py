@@ -0,0 +1,194 @@
+"""
+Phase 16: Schedule Frame - Columnar Bulk Schedule Representation
+
+Parallel arrays for tasks (ids, names, durations, complexity, flags) and
+dependencies (ids, predecessor/successor task indexes, type codes, lags),
+with task_id strings interned once and dependencies stored as integer task
+indexes instead of repeated id strings.
+
+Used for bulk imports: rows are appended straight into the columns, then
+ScheduleDependencyAnalyzer.from_frame loads the analyzer in one pass and
+CompiledScheduleGraph.from_frame compiles the array graph from the column
+buffers without going through any Task/TaskDependency object.
+"""
+
+import logging
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+
+from phase16_types import Task, TaskDependency, DependencyType, DEPENDENCY_TYPES
+
+logger = logging.getLogger(__name__)
+
+DEPENDENCY_TYPE_CODES = {dep_type: code for code, dep_type in enumerate(DEPENDENCY_TYPES)}
+_TYPES_BY_VALUE = {dep_type.value: dep_type for dep_type in DEPENDENCY_TYPES}
+
+
+def _intern(value):
+    """Intern string ids (other id types are kept as given)"""
+    return sys.intern(value) if type(value) is str else value
+
+
+def parse_dependency_type(value: Optional[str]) -> DependencyType:
+    """Dependency type from a row value (unknown or missing values mean finish-to-start)"""
+    if not value:
+        return DependencyType.FINISH_TO_START
+    return _TYPES_BY_VALUE.get(value.lower(), DependencyType.FINISH_TO_START)
+
+
+class ScheduleFrame:
+    """
+    Struct-of-arrays schedule.
+
+    Tasks and dependencies are keyed by id like the analyzer's dicts:
+    appending an id that already exists overwrites that row in place.
+    """
+
+    def __init__(self):
+        # Task columns
+        self.task_ids: List[str] = []
+        self.names: List[str] = []
+        self.durations = array('q')
+        self.complexity = array('d')
+        self.weather = bytearray()
+        self.resource = bytearray()
+        self.task_index: Dict[str, int] = {}
+
+        # Dependency columns (predecessor/successor are task row indexes)
+        self.dependency_ids: List[str] = []
+        self.predecessors = array('q')
+        self.successors = array('q')
+        self.type_codes = bytearray()
+        self.lags = array('q')
+        self.dependency_index: Dict[str, int] = {}
+
+    @property
+    def num_tasks(self) -> int:
+        return len(self.task_ids)
+
+    @property
+    def num_dependencies(self) -> int:
+        return len(self.dependency_ids)
+
+    def append_task(
+        self,
+        task_id: str,
+        name: str,
+        duration_days: int,
+        complexity_factor: float = 1.0,
+        weather_dependency: bool = False,
+        resource_constrained: bool = False
+    ) -> int:
+        """Add (or overwrite) a task row; returns its row index"""
+        task_id = _intern(task_id)
+        row = self.task_index.get(task_id)
+        if row is None:
+            row = self.task_index[task_id] = len(self.task_ids)
+            self.task_ids.append(task_id)
+            self.names.append(name)
+            self.durations.append(duration_days)
+            self.complexity.append(complexity_factor)
+            self.weather.append(bool(weather_dependency))
+            self.resource.append(bool(resource_constrained))
+        else:
+            logger.warning(f"Task {task_id} already exists, overwriting")
+            self.names[row] = name
+            self.durations[row] = duration_days
+            self.complexity[row] = complexity_factor
+            self.weather[row] = bool(weather_dependency)
+            self.resource[row] = bool(resource_constrained)
+        return row
+
+    def append_dependency(
+        self,
+        dependency_id: str,
+        predecessor_task_id: str,
+        successor_task_id: str,
+        dependency_type: DependencyType = DependencyType.FINISH_TO_START,
+        lag_days: int = 0
+    ) -> Optional[int]:
+        """
+        Add (or overwrite) a dependency row between two known tasks.
+
+        Returns its row index, or None (logged) when either task is unknown.
+        """
+        pred = self.task_index.get(predecessor_task_id)
+        succ = self.task_index.get(successor_task_id)
+        if pred is None:
+            logger.error(f"Predecessor task {predecessor_task_id} not found")
+            return None
+        if succ is None:
+            logger.error(f"Successor task {successor_task_id} not found")
+            return None
+
+        dependency_id = _intern(dependency_id)
+        code = DEPENDENCY_TYPE_CODES[dependency_type]
+        row = self.dependency_index.get(dependency_id)
+        if row is None:
+            row = self.dependency_index[dependency_id] = len(self.dependency_ids)
+            self.dependency_ids.append(dependency_id)
+            self.predecessors.append(pred)
+            self.successors.append(succ)
+            self.type_codes.append(code)
+            self.lags.append(lag_days)
+        else:
+            self.predecessors[row] = pred
+            self.successors[row] = succ
+            self.type_codes[row] = code
+            self.lags[row] = lag_days
+        return row
+
+    def append_task_row(self, row: Dict[str, Any]) -> int:
+        """Add a task from an /api/schedule/analyze JSON row"""
+        return self.append_task(
+            task_id=row['task_id'],
+            name=row.get('name', 'Unknown'),
+            duration_days=int(row['duration_days']),
+            complexity_factor=float(row.get('complexity_factor', 1.0)),
+            weather_dependency=bool(row.get('weather_dependency', False)),
+            resource_constrained=bool(row.get('resource_constrained', False))
+        )
+
+    def append_dependency_row(self, row: Dict[str, Any]) -> Optional[int]:
+        """Add a dependency from an /api/schedule/analyze JSON row"""
+        return self.append_dependency(
+            dependency_id=row['dependency_id'],
+            predecessor_task_id=row['predecessor_task_id'],
+            successor_task_id=row['successor_task_id'],
+            dependency_type=parse_dependency_type(row.get('dependency_type')),
+            lag_days=int(row.get('lag_days', 0))
+        )
+
+    @classmethod
+    def from_rows(
+        cls,
+        tasks_data: Iterable[Dict[str, Any]],
+        deps_data: Iterable[Dict[str, Any]]
+    ) -> 'ScheduleFrame':
+        """Build a frame from task and dependency JSON rows (tasks first)"""
+        frame = cls()
+        for row in tasks_data:
+            frame.append_task_row(row)
+        for row in deps_data:
+            frame.append_dependency_row(row)
+        return frame
+
+    def task(self, row: int) -> Task:
+        """Materialize one task row"""
+        return Task(
+            self.task_ids[row], self.names[row], self.durations[row],
+            complexity_factor=self.complexity[row],
+            weather_dependency=bool(self.weather[row]),
+            resource_constrained=bool(self.resource[row])
+        )
+
+    def dependency(self, row: int) -> TaskDependency:
+        """Materialize one dependency row"""
+        return TaskDependency(
+            self.dependency_ids[row],
+            self.task_ids[self.predecessors[row]],
+            self.task_ids[self.successors[row]],
+            DEPENDENCY_TYPES[self.type_codes[row]],
+            self.lags[row]
+        )
@@ -0,0 +1,179 @@
+"""
+Phase 16: Schedule Store - Server-Side Cache of Analyzed Schedules
+
+Keeps the analyzer (with its compiled graph and incremental CPM state) and the
+last ProjectScheduleIntelligence per project_id, so read endpoints can serve
+results without clients re-POSTing the full task list.
+
+Entries are validated by a content hash of the submitted tasks and
+dependencies and evicted least-recently-used once either the project count or
+the total task count exceeds its bound. The HTTP ETag also covers the analysis
+options (project name, engine, cycle mode) the stored views depend on.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import cached_property
+from typing import Any, Dict, List, Optional
+
+from phase16_types import ProjectScheduleIntelligence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PROJECTS = int(os.environ.get('SCHEDULE_CACHE_MAX_PROJECTS', '64'))
+DEFAULT_MAX_TASKS = int(os.environ.get('SCHEDULE_CACHE_MAX_TASKS', '1000000'))
+
+# Shared canonical row encoder (json.dumps would build a new encoder per row)
+_ROW_ENCODER = json.JSONEncoder(sort_keys=True, separators=(',', ':'), default=str)
+
+
+class ScheduleContentHasher:
+    """
+    Incremental schedule_content_hash.
+
+    Each section is hashed on its own, so rows can be fed as they stream in,
+    in any interleaving of tasks and dependencies.
+    """
+
+    SECTIONS = ('tasks', 'dependencies')
+
+    def __init__(self):
+        self._digests = {section: hashlib.sha256(section.encode('utf-8')) for section in self.SECTIONS}
+
+    def update(self, section: str, row: Dict[str, Any]) -> None:
+        digest = self._digests[section]
+        digest.update(_ROW_ENCODER.encode(row).encode('utf-8'))
+        digest.update(b'\n')
+
+    def hexdigest(self) -> str:
+        combined = hashlib.sha256()
+        for section in self.SECTIONS:
+            combined.update(self._digests[section].digest())
+        return combined.hexdigest()
+
+
+def schedule_content_hash(tasks_data: List[Dict[str, Any]], deps_data: List[Dict[str, Any]]) -> str:
+    """Stable SHA-256 of a schedule's task and dependency rows (key order independent)"""
+    hasher = ScheduleContentHasher()
+    for section, rows in (('tasks', tasks_data), ('dependencies', deps_data)):
+        for row in rows:
+            hasher.update(section, row)
+    return hasher.hexdigest()
+
+
+def schedule_etag(content_hash: str, project_name: Any, engine: Any, cycle_mode: Any) -> str:
+    """ETag of a stored analysis: the schedule content plus the options it was analyzed with"""
+    return hashlib.sha256(_ROW_ENCODER.encode([content_hash, project_name, engine, cycle_mode]).encode('utf-8')).hexdigest()
+
+
+@dataclass
+class CachedSchedule:
+    """A project's analyzed schedule as held by the store"""
+    project_id: str
+    content_hash: str
+    analyzer: Any  # ScheduleDependencyAnalyzer
+    intelligence: ProjectScheduleIntelligence
+    analysis_response: Dict[str, Any]
+    compiled_graph: Any = None  # CompiledScheduleGraph when the vectorized engine ran
+    stored_at: str = field(default_factory=lambda: datetime.utcnow().isoformat() + 'Z')
+    payloads: Dict[str, bytes] = field(default_factory=dict)  # pre-serialized GET bodies
+
+    @cached_property
+    def etag(self) -> str:
+        response = self.analysis_response
+        return schedule_etag(self.content_hash, response.get('project_name'),
+                             response.get('engine'), response.get('cycle_mode'))
+
+    @property
+    def task_count(self) -> int:
+        return self.intelligence.total_tasks
+
+
+class ScheduleStore:
+    """Thread-safe, size-bounded LRU store of analyzed schedules keyed by project_id"""
+
+    def __init__(self, max_projects: int = DEFAULT_MAX_PROJECTS, max_tasks: int = DEFAULT_MAX_TASKS):
+        self.max_projects = max_projects
+        self.max_tasks = max_tasks
+        self._entries: "OrderedDict[str, CachedSchedule]" = OrderedDict()
+        self._total_tasks = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, project_id: str, content_hash: Optional[str] = None) -> Optional[CachedSchedule]:
+        """
+        Look up a project, optionally requiring a matching content hash.
+
+        Returns None on a miss or when the stored schedule is stale.
+        """
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is None or (content_hash is not None and entry.content_hash != content_hash):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(project_id)
+            self.hits += 1
+            return entry
+
+    def put(self, entry: CachedSchedule) -> None:
+        """Store (or replace) a project's schedule, evicting LRU entries past the bounds"""
+        with self._lock:
+            previous = self._entries.pop(entry.project_id, None)
+            if previous is not None:
+                self._total_tasks -= previous.task_count
+            self._entries[entry.project_id] = entry
+            self._total_tasks += entry.task_count
+
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_projects or self._total_tasks > self.max_tasks
+            ):
+                evicted_id, evicted = self._entries.popitem(last=False)
+                self._total_tasks -= evicted.task_count
+                self.evictions += 1
+                logger.info(f"Evicted schedule {evicted_id} from cache ({evicted.task_count} tasks)")
+
+    def invalidate(self, project_id: str) -> bool:
+        """Drop a project's cached schedule; returns True if one was stored"""
+        with self._lock:
+            entry = self._entries.pop(project_id, None)
+            if entry is None:
+                return False
+            self._total_tasks -= entry.task_count
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_tasks = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'projects': len(self._entries),
+                'tasks': self._total_tasks,
+                'max_projects': self.max_projects,
+                'max_tasks': self.max_tasks,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def __contains__(self, project_id: str) -> bool:
+        with self._lock:
+            return project_id in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# Process-wide store used by the schedule blueprint (one per worker process)
+schedule_store = ScheduleStore()
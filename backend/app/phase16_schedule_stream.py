@@ -0,0 +1,362 @@
+"""
+Phase 16: Streaming Schedule Ingestion
+
+Reads /api/schedule/analyze bodies straight from the request stream into a
+ScheduleFrame, one row at a time, instead of materializing the whole payload
+as a list of dicts first.
+
+Two formats are supported:
+    JSON    the regular {"project_id": ..., "tasks": [...], "dependencies": [...]}
+            object; the tasks/dependencies arrays are decoded element by element
+    NDJSON  one JSON object per line; lines with a dependency_id are
+            dependencies, lines with a task_id are tasks and any other object
+            supplies top-level fields (project_id, project_name, engine)
+
+A row that fails to decode or to convert is recorded as a RowError with its
+index (array position for JSON, 0-based line number for NDJSON) and the stream
+carries on. Only a broken overall structure (e.g. unterminated arrays) aborts
+with ScheduleStreamError.
+
+Dependencies whose tasks have not been read yet (dependencies array before the
+tasks array, or out-of-order NDJSON lines) are held back and applied at the end.
+"""
+
+import codecs
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from phase16_schedule_frame import ScheduleFrame
+from phase16_schedule_store import ScheduleContentHasher
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_BYTES = 64 * 1024
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRUCTURE = re.compile(r'["\[\]{},]')
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+
+class ScheduleStreamError(ValueError):
+    """The request body is not a readable schedule at all"""
+
+
+@dataclass
+class RowError:
+    """A task or dependency row that was skipped"""
+    section: str  # "tasks", "dependencies" or "lines" (undecodable NDJSON line)
+    row: int
+    error: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"section": self.section, "row": self.row, "error": self.error}
+
+
+@dataclass
+class ScheduleIngest:
+    """Result of reading one schedule stream"""
+    frame: ScheduleFrame
+    fields: Dict[str, Any]  # top-level values other than the row arrays
+    content_hash: str
+    task_rows: int = 0
+    dependency_rows: int = 0
+    errors: List[RowError] = field(default_factory=list)
+
+
+class _ScheduleSink:
+    """Feeds decoded rows into a ScheduleFrame and the content hash"""
+
+    def __init__(self):
+        self.frame = ScheduleFrame()
+        self.hasher = ScheduleContentHasher()
+        self.errors: List[RowError] = []
+        self.task_rows = 0
+        self.dependency_rows = 0
+        self._deferred: List[Tuple[int, Dict[str, Any]]] = []
+
+    def _check_row(self, section: str, index: int, row: Any, error: Optional[str]) -> bool:
+        if error is None and not isinstance(row, dict):
+            error = f"expected a JSON object, got {type(row).__name__}"
+        if error is not None:
+            self.errors.append(RowError(section, index, error))
+            return False
+        self.hasher.update(section, row)
+        return True
+
+    def add_task(self, index: int, row: Any, error: Optional[str] = None) -> None:
+        self.task_rows += 1
+        if not self._check_row('tasks', index, row, error):
+            return
+        try:
+            self.frame.append_task_row(row)
+        except KeyError as e:
+            self.errors.append(RowError('tasks', index, f"missing required field {e}"))
+        except (TypeError, ValueError) as e:
+            self.errors.append(RowError('tasks', index, f"invalid value: {e}"))
+
+    def add_dependency(self, index: int, row: Any, error: Optional[str] = None) -> None:
+        self.dependency_rows += 1
+        if not self._check_row('dependencies', index, row, error):
+            return
+        task_index = self.frame.task_index
+        if row.get('predecessor_task_id') in task_index and row.get('successor_task_id') in task_index:
+            self._append_dependency(index, row)
+        else:
+            self._deferred.append((index, row))
+
+    def _append_dependency(self, index: int, row: Dict[str, Any]) -> None:
+        try:
+            self.frame.append_dependency_row(row)
+        except KeyError as e:
+            self.errors.append(RowError('dependencies', index, f"missing required field {e}"))
+        except (TypeError, ValueError) as e:
+            self.errors.append(RowError('dependencies', index, f"invalid value: {e}"))
+
+    def finish(self, fields: Dict[str, Any]) -> ScheduleIngest:
+        """Apply held-back dependencies and package the result"""
+        task_index = self.frame.task_index
+        for index, row in self._deferred:
+            missing = [key for key in ('predecessor_task_id', 'successor_task_id')
+                       if row.get(key) not in task_index]
+            if missing and all(key in row for key in missing):
+                self.errors.append(RowError('dependencies', index, f"unknown task {row[missing[0]]!r}"))
+            else:
+                self._append_dependency(index, row)
+        self._deferred = []
+        self.errors.sort(key=lambda e: (e.section != 'tasks', e.row))
+        return ScheduleIngest(
+            frame=self.frame,
+            fields=fields,
+            content_hash=self.hasher.hexdigest(),
+            task_rows=self.task_rows,
+            dependency_rows=self.dependency_rows,
+            errors=self.errors,
+        )
+
+
+class _JsonStreamReader:
+    """
+    Cursor over a JSON text read in chunks.
+
+    Values are decoded with json's C raw_decode straight from the buffer; the
+    pure-Python structural scan only runs when a decode fails, to tell a value
+    cut off at the end of the buffer from a malformed one and to skip it.
+    """
+
+    def __init__(self, stream, chunk_size: int):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._decoder = json.JSONDecoder()
+        self._consumed = 0
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    @property
+    def offset(self) -> int:
+        return self._consumed + self.pos
+
+    def _fill(self) -> bool:
+        """Append the next chunk (at least doubling a long pending value); False at end of stream"""
+        if self.eof:
+            return False
+        pending = len(self.buf) - self.pos
+        data = self._stream.read(max(self._chunk_size, pending))
+        if not data:
+            self.eof = True
+            text = self._text.decode(b'', final=True)
+        else:
+            text = self._text.decode(data)
+        self._consumed += self.pos
+        self.buf = self.buf[self.pos:] + text
+        self.pos = 0
+        return bool(text) or not self.eof
+
+    def peek(self) -> Optional[str]:
+        """Next non-whitespace character, without consuming it (None at end of stream)"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return None
+
+    def expect(self, chars: str) -> str:
+        """Consume the next character, which must be one of `chars`"""
+        char = self.peek()
+        if char is None or char not in chars:
+            found = 'end of stream' if char is None else repr(char)
+            raise ScheduleStreamError(f"Expected one of {' '.join(chars)} at offset {self.offset}, found {found}")
+        self.pos += 1
+        return char
+
+    def _value_end(self, start: int) -> Optional[int]:
+        """Index of the ',' ']' or '}' closing the value at `start`, None if not buffered yet"""
+        buf = self.buf
+        depth = 0
+        pos = start
+        while True:
+            match = _STRUCTURE.search(buf, pos)
+            if match is None:
+                return None
+            char = match.group()
+            pos = match.end()
+            if char == '"':
+                tail = _STRING_TAIL.match(buf, pos)
+                if tail is None:
+                    return None
+                pos = tail.end()
+            elif char in '[{':
+                depth += 1
+            elif depth == 0:
+                return match.start()
+            elif char != ',':
+                depth -= 1
+
+    def item(self, delimiters: str) -> Tuple[Any, Optional[str]]:
+        """
+        Decode the value at the cursor, which must be followed by one of `delimiters`.
+
+        Returns (value, None), or (None, error message) after skipping a
+        malformed value up to the next delimiter.
+        """
+        if self.peek() is None:
+            raise ScheduleStreamError(f"Unexpected end of stream at offset {self.offset}")
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                end = None
+            if end is not None:
+                after = _WHITESPACE.match(self.buf, end).end()
+                if after == len(self.buf):
+                    if self.eof:
+                        self.pos = end
+                        return value, None
+                    # A number or the closing delimiter may still be cut off
+                    self._fill()
+                    continue
+                if self.buf[after] in delimiters:
+                    self.pos = after
+                    return value, None
+            boundary = self._value_end(self.pos)
+            if boundary is not None:
+                break
+            if not self._fill():
+                raise ScheduleStreamError(f"Unexpected end of stream at offset {self.offset}")
+
+        raw = self.buf[self.pos:boundary]
+        self.pos = boundary
+        try:
+            json.loads(raw)
+            message = "malformed value"
+        except json.JSONDecodeError as e:
+            message = str(e)
+        return None, message
+
+    def value(self, delimiters: str) -> Any:
+        """Decode the value at the cursor; malformed values are fatal"""
+        start = self.offset
+        value, error = self.item(delimiters)
+        if error is not None:
+            raise ScheduleStreamError(f"Malformed value at offset {start}: {error}")
+        return value
+
+
+def read_json_schedule(stream, chunk_size: int = STREAM_CHUNK_BYTES) -> ScheduleIngest:
+    """
+    Stream a JSON schedule object into a ScheduleFrame.
+
+    Args:
+        stream: Binary file-like object (e.g. flask.request.stream)
+        chunk_size: Bytes read per refill
+
+    Returns:
+        ScheduleIngest with the frame, other top-level fields and row errors
+    """
+    reader = _JsonStreamReader(stream, chunk_size)
+    sink = _ScheduleSink()
+    fields: Dict[str, Any] = {}
+    sections = {'tasks': sink.add_task, 'dependencies': sink.add_dependency}
+
+    if reader.peek() is None:
+        raise ScheduleStreamError("Empty request body")
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.pos += 1
+    else:
+        while True:
+            key = reader.value(':')
+            if not isinstance(key, str):
+                raise ScheduleStreamError(f"Expected an object key at offset {reader.offset}")
+            reader.expect(':')
+            add_row = sections.get(key)
+            if add_row is not None and reader.peek() == '[':
+                reader.pos += 1
+                index = 0
+                if reader.peek() == ']':
+                    reader.pos += 1
+                else:
+                    while True:
+                        row, error = reader.item(',]')
+                        add_row(index, row, error)
+                        index += 1
+                        if reader.expect(',]') == ']':
+                            break
+            else:
+                fields[key] = reader.value(',}')
+            if reader.expect(',}') == '}':
+                break
+
+    if reader.peek() is not None:
+        raise ScheduleStreamError(f"Unexpected data after the schedule object at offset {reader.offset}")
+    return sink.finish(fields)
+
+
+def _iter_lines(stream, chunk_size: int) -> Iterator[bytes]:
+    """Split a binary stream into lines without reading it whole"""
+    tail = b''
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            break
+        lines = (tail + data).split(b'\n')
+        tail = lines.pop()
+        yield from lines
+    if tail:
+        yield tail
+
+
+def read_ndjson_schedule(stream, chunk_size: int = STREAM_CHUNK_BYTES) -> ScheduleIngest:
+    """
+    Stream an NDJSON schedule (one task, dependency or header object per line).
+
+    Row errors carry the 0-based line number; lines that are not JSON objects
+    are reported under the "lines" section.
+    """
+    sink = _ScheduleSink()
+    fields: Dict[str, Any] = {}
+
+    for line_number, line in enumerate(_iter_lines(stream, chunk_size)):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            sink.errors.append(RowError('lines', line_number, str(e)))
+            continue
+        if not isinstance(row, dict):
+            sink.errors.append(RowError('lines', line_number, f"expected a JSON object, got {type(row).__name__}"))
+        elif 'dependency_id' in row:
+            sink.add_dependency(line_number, row)
+        elif 'task_id' in row:
+            sink.add_task(line_number, row)
+        else:
+            fields.update(row)
+
+    return sink.finish(fields)
@@ -26,7 +26,26 @@ class DependencyType(str, Enum):
     START_TO_FINISH = "start_to_finish"      # Task B finishes when Task A starts (rare)
 
 
-@dataclass
+class CycleMode(str, Enum):
+    """How critical path analysis handles dependency cycles"""
+    FAIL = "fail"          # Refuse the schedule (ScheduleCycleError listing the cycles)
+    EXCLUDE = "exclude"    # Analyze the rest of the schedule without the cyclic tasks
+    CONDENSE = "condense"  # Treat each cycle as one block whose tasks share a start
+
+
+# Which end of each task a dependency ties together: (predecessor finish?, successor finish?)
+DEPENDENCY_ANCHORS = {
+    DependencyType.FINISH_TO_START: (True, False),
+    DependencyType.START_TO_START: (False, False),
+    DependencyType.FINISH_TO_FINISH: (True, True),
+    DependencyType.START_TO_FINISH: (False, True),
+}
+
+# Stable integer codes for columnar storage (index into this tuple)
+DEPENDENCY_TYPES = tuple(DependencyType)
+
+
+@dataclass(slots=True)
 class Task:
     """Represents a construction project task"""
     task_id: str
@@ -51,7 +70,7 @@ class Task:
         return False
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskDependency:
     """Represents a dependency relationship between two tasks"""
     dependency_id: str
@@ -65,6 +84,17 @@ class TaskDependency:
         return hash(self.dependency_id)
 
 
+@dataclass
+class DependencyCycle:
+    """Tasks whose dependencies loop back on each other (one strongly connected component)"""
+    task_ids: List[str]
+    dependency_ids: List[str]  # Dependencies between these tasks, i.e. the loop edges
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to JSON-serializable dict"""
+        return {"task_ids": self.task_ids, "dependency_ids": self.dependency_ids}
+
+
 @dataclass
 class CriticalPathAnalysis:
     """Results of critical path analysis"""
@@ -73,6 +103,17 @@ class CriticalPathAnalysis:
     slack_by_task: Dict[str, int]  # Task ID -> days of slack/float
     critical_tasks: Set[str]
     bottleneck_tasks: List[str]  # Tasks with zero slack that are delay risks
+    cycles: List[DependencyCycle] = field(default_factory=list)  # Dependency loops found in the schedule
+    excluded_tasks: List[str] = field(default_factory=list)  # Cyclic tasks left out (CycleMode.EXCLUDE)
+
+
+@dataclass
+class CPMDates:
+    """Per-task CPM dates of an acyclic schedule, for walking it in dependency order"""
+    earliest_start: Dict[str, int]
+    slack_by_task: Dict[str, int]
+    topo_position: Dict[str, int]  # Task ID -> index in a topological order
+    project_duration_days: int
 
 
 @dataclass
@@ -87,6 +128,34 @@ class DelayPropagation:
     explanation: str
 
 
+@dataclass
+class MultiDelayPropagation:
+    """Exact schedule slippage from a set of simultaneous task overruns"""
+    delays: Dict[str, int]  # Task ID -> reported finish overrun (the shocks)
+    start_slippage: Dict[str, int]  # Task ID -> days its earliest start moves (pushed tasks only)
+    finish_slippage: Dict[str, int]  # Task ID -> days its earliest finish moves
+    float_exceeded: Dict[str, int]  # Task ID -> days of finish slippage beyond its total float
+    baseline_duration_days: int
+    project_delay_days: int  # Change in project finish
+
+    @property
+    def project_duration_days(self) -> int:
+        return self.baseline_duration_days + self.project_delay_days
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to JSON-serializable dict"""
+        return {
+            "delays": self.delays,
+            "start_slippage": self.start_slippage,
+            "finish_slippage": self.finish_slippage,
+            "float_exceeded": self.float_exceeded,
+            "affected_task_count": len(self.finish_slippage),
+            "baseline_duration_days": self.baseline_duration_days,
+            "project_duration_days": self.project_duration_days,
+            "project_delay_days": self.project_delay_days,
+        }
+
+
 @dataclass
 class ScheduleRiskFactors:
     """Quantified risk factors for schedule delays"""
@@ -129,3 +198,84 @@ class ProjectScheduleIntelligence:
             "recommended_buffer_days": self.recommended_buffer_days,
             "integration_risk_score": self.integration_risk_score,
         }
+
+
+@dataclass
+class MonteCarloScheduleRisk:
+    """Completion-date distribution from Monte Carlo schedule simulation"""
+    project_id: str
+    iterations: int
+    seed: Optional[int]
+    deterministic_duration_days: float  # CPM duration with planned task durations
+    mean_duration_days: float
+    p50_duration_days: float
+    p80_duration_days: float
+    p95_duration_days: float
+    on_time_probability: float  # P(finish <= deterministic duration)
+    criticality_index: Dict[str, float]  # Task ID -> share of iterations on the critical path
+    tornado: List[Dict[str, Any]]  # Tasks ranked by duration/finish correlation
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to JSON-serializable dict"""
+        return {
+            "project_id": self.project_id,
+            "iterations": self.iterations,
+            "seed": self.seed,
+            "deterministic_duration_days": self.deterministic_duration_days,
+            "mean_duration_days": round(self.mean_duration_days, 2),
+            "p50_duration_days": round(self.p50_duration_days, 2),
+            "p80_duration_days": round(self.p80_duration_days, 2),
+            "p95_duration_days": round(self.p95_duration_days, 2),
+            "on_time_probability": round(self.on_time_probability, 3),
+            "criticality_index": {k: round(v, 3) for k, v in self.criticality_index.items()},
+            "tornado": self.tornado,
+        }
+
+
+class ScenarioAction(str, Enum):
+    """Schedule edit applied by a what-if scenario"""
+    SET_DURATION = "set_duration"  # task duration becomes `days`
+    CRASH = "crash"  # task duration shortened by `days` (not below 0)
+    DELAY = "delay"  # task finish overruns by `days`
+    SET_LAG = "set_lag"  # dependency lag becomes `days`
+    ADD_LAG = "add_lag"  # dependency lag grows by `days`
+
+
+@dataclass
+class ScenarioChange:
+    """One edit within a what-if scenario"""
+    action: ScenarioAction
+    target_id: str  # Task ID, or dependency ID for lag actions
+    days: int
+
+
+@dataclass
+class WhatIfScenario:
+    """Named set of schedule edits evaluated against a base schedule"""
+    scenario_id: str
+    changes: List[ScenarioChange] = field(default_factory=list)
+
+
+@dataclass
+class ScenarioOutcome:
+    """Compact diff of a what-if scenario against the base schedule"""
+    scenario_id: str
+    project_duration_days: int
+    finish_delta_days: int  # vs base project duration (negative = earlier)
+    critical_path: List[str]
+    critical_path_added: List[str]  # critical tasks that were not critical in the base schedule
+    critical_path_removed: List[str]  # base critical tasks that gained float
+    affected_tasks: Dict[str, int]  # Task ID -> finish delta days (moved tasks only)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to JSON-serializable dict"""
+        return {
+            "scenario_id": self.scenario_id,
+            "project_duration_days": self.project_duration_days,
+            "finish_delta_days": self.finish_delta_days,
+            "critical_path": self.critical_path,
+            "critical_path_added": self.critical_path_added,
+            "critical_path_removed": self.critical_path_removed,
+            "affected_task_count": len(self.affected_tasks),
+            "affected_tasks": self.affected_tasks,
+        }
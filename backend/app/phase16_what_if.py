@@ -0,0 +1,172 @@
+"""
+Phase 16: What-If Scenarios - Batched Recovery Option Evaluation
+
+Evaluates many schedule edits (crash a task, add lag, delay a task) against
+one base schedule. The graph is compiled once; every scenario is a column of
+a (tasks x scenarios) duration matrix and a matching lag matrix, so all of
+them share the base topological levels and run through one batched
+forward/backward pass per chunk.
+
+Each scenario is reported as a compact diff against the base schedule:
+finish date change, critical path changes and the tasks whose finish moved.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from phase16_cpm_engine import CompiledScheduleGraph
+from phase16_types import ScenarioAction, ScenarioOutcome, WhatIfScenario
+
+logger = logging.getLogger(__name__)
+
+LAG_ACTIONS = (ScenarioAction.SET_LAG, ScenarioAction.ADD_LAG)
+
+# Encoded change: (action, task or edge index, days)
+EncodedChange = Tuple[ScenarioAction, int, int]
+
+# Compiled graph installed in pool workers by the initializer
+_WORKER_GRAPH: Optional[CompiledScheduleGraph] = None
+
+
+def evaluate_chunk(
+    graph: CompiledScheduleGraph,
+    scenarios: List[List[EncodedChange]]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Batched CPM for a chunk of encoded scenarios.
+
+    Returns:
+        (project duration per scenario, earliest finish (tasks x scenarios),
+         critical mask (tasks x scenarios))
+    """
+    size = len(scenarios)
+    durations = np.repeat(graph.durations[:, None], size, axis=1)
+    lags = None
+    if any(action in LAG_ACTIONS for changes in scenarios for action, _, _ in changes):
+        lags = np.repeat(graph.edge_lag[:, None], size, axis=1)
+
+    for col, changes in enumerate(scenarios):
+        for action, index, days in changes:
+            if action == ScenarioAction.SET_DURATION:
+                durations[index, col] = days
+            elif action == ScenarioAction.CRASH:
+                durations[index, col] = max(0, durations[index, col] - days)
+            elif action == ScenarioAction.DELAY:
+                durations[index, col] += days
+            elif action == ScenarioAction.SET_LAG:
+                lags[index, col] = days
+            else:
+                lags[index, col] += days
+
+    earliest_start, earliest_finish = graph.forward_pass(durations, lags)
+    project_duration = earliest_finish.max(axis=0)
+    latest_start, _ = graph.backward_pass(project_duration, durations, lags)
+    return project_duration, earliest_finish, latest_start == earliest_start
+
+
+def _init_worker(graph: CompiledScheduleGraph) -> None:
+    global _WORKER_GRAPH
+    _WORKER_GRAPH = graph
+
+
+def _evaluate_chunk_in_worker(scenarios: List[List[EncodedChange]]):
+    return evaluate_chunk(_WORKER_GRAPH, scenarios)
+
+
+class WhatIfScenarioEngine:
+    """Evaluates batches of what-if scenarios against a shared compiled schedule"""
+
+    def __init__(self, analyzer, graph: Optional[CompiledScheduleGraph] = None):
+        """
+        Args:
+            analyzer: ScheduleDependencyAnalyzer holding the base schedule
+            graph: Pre-compiled graph for the analyzer (compiled on demand if omitted)
+        """
+        self.analyzer = analyzer
+        self.graph = graph if graph is not None else CompiledScheduleGraph.from_analyzer(analyzer)
+        if self.graph.num_tasks == 0:
+            raise ValueError("Base schedule has no tasks")
+        self.edge_index = {dep_id: i for i, dep_id in enumerate(self.graph.dependency_ids)}
+
+        # Base schedule dates and float, shared by every scenario diff
+        earliest_start, self.base_finish = self.graph.forward_pass()
+        self.base_duration = int(self.base_finish.max())
+        latest_start, _ = self.graph.backward_pass(self.base_duration)
+        self.base_critical = latest_start == earliest_start
+        self.base_critical_path = analyzer.build_critical_path(set(self._task_ids(self.base_critical)))
+
+    def _task_ids(self, mask: np.ndarray) -> List[str]:
+        task_ids = self.graph.task_ids
+        return [task_ids[i] for i in np.flatnonzero(mask)]
+
+    def _encode(self, scenario: WhatIfScenario) -> List[EncodedChange]:
+        """Resolve a scenario's task/dependency IDs to graph indexes"""
+        encoded = []
+        for change in scenario.changes:
+            index = (self.edge_index if change.action in LAG_ACTIONS else self.graph.index).get(change.target_id)
+            if index is None:
+                kind = "dependency" if change.action in LAG_ACTIONS else "task"
+                raise ValueError(f"Scenario {scenario.scenario_id}: unknown {kind} {change.target_id}")
+            if change.action not in LAG_ACTIONS and change.days < 0:
+                # Lags may be negative (leads); task durations, crashes and delays may not
+                raise ValueError(f"Scenario {scenario.scenario_id}: negative days for {change.action.value} "
+                                 f"on {change.target_id}")
+            encoded.append((change.action, index, change.days))
+        return encoded
+
+    def evaluate(
+        self,
+        scenarios: List[WhatIfScenario],
+        workers: Optional[int] = None,
+        chunk_size: int = 64
+    ) -> List[ScenarioOutcome]:
+        """
+        Evaluate every scenario against the base schedule.
+
+        Args:
+            scenarios: Scenarios to compare
+            workers: Spread scenario chunks over this many processes (None/1 = in-process)
+            chunk_size: Scenarios per batched CPM pass
+
+        Returns:
+            One ScenarioOutcome per scenario, in request order
+        """
+        encoded = [self._encode(scenario) for scenario in scenarios]
+        chunks = [encoded[i:i + chunk_size] for i in range(0, len(encoded), chunk_size)]
+        logger.info(f"Evaluating {len(scenarios)} what-if scenarios on {self.graph.num_tasks} tasks")
+
+        if workers and workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self.graph,)) as pool:
+                results = list(pool.map(_evaluate_chunk_in_worker, chunks))
+        else:
+            results = [evaluate_chunk(self.graph, chunk) for chunk in chunks]
+
+        outcomes = []
+        scenario_iter = iter(scenarios)
+        for project_duration, earliest_finish, critical in results:
+            finish_delta = earliest_finish - self.base_finish[:, None]
+            for col in range(project_duration.size):
+                outcomes.append(self._outcome(
+                    next(scenario_iter).scenario_id, int(project_duration[col]),
+                    finish_delta[:, col], critical[:, col]
+                ))
+        return outcomes
+
+    def _outcome(self, scenario_id: str, project_duration: int,
+                 finish_delta: np.ndarray, critical: np.ndarray) -> ScenarioOutcome:
+        """Diff one evaluated scenario against the base schedule"""
+        moved = np.flatnonzero(finish_delta)
+        task_ids = self.graph.task_ids
+        return ScenarioOutcome(
+            scenario_id=scenario_id,
+            project_duration_days=project_duration,
+            finish_delta_days=project_duration - self.base_duration,
+            critical_path=self.analyzer.build_critical_path(set(self._task_ids(critical))),
+            critical_path_added=self._task_ids(critical & ~self.base_critical),
+            critical_path_removed=self._task_ids(self.base_critical & ~critical),
+            affected_tasks={task_ids[i]: int(finish_delta[i]) for i in moved},
+        )
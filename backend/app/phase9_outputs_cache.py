@@ -0,0 +1,154 @@
+"""
+Phase 9: Outputs Cache - Parsed Reports and Encoded Responses per File Version
+
+/phase9/outputs serves the same report to every dashboard poll. This cache
+keeps, per report file version, the parsed report (JSON sources) and the
+encoded response body for each combination of request options, plus its
+gzip encoding compressed once on first use.
+
+A version is the report's (path, mtime_ns, size); any change to the file
+drops everything cached for the previous version. Response ETags derive
+from the version and the request options, and Last-Modified from the
+file's mtime, so clients can revalidate with a conditional GET.
+Dropped data with a close() method (a memory-mapped ColumnarOutputs) is
+closed at once, so the report file can be replaced while the server runs.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_RESPONSES = int(os.environ.get('PHASE9_CACHE_MAX_RESPONSES', '32'))
+# Bodies smaller than this are not worth gzipping
+GZIP_MIN_BYTES = 1024
+
+
+@dataclass(frozen=True)
+class ReportVersion:
+    """Identity of one state of a report file"""
+    path: str
+    mtime_ns: int
+    size: int
+
+    @classmethod
+    def of(cls, path) -> "ReportVersion":
+        st = os.stat(path)
+        return cls(str(path), st.st_mtime_ns, st.st_size)
+
+    @property
+    def last_modified(self) -> datetime:
+        return datetime.fromtimestamp(self.mtime_ns // 1_000_000_000, tz=timezone.utc)
+
+    def etag(self, key: Hashable) -> str:
+        """ETag for the response to request options `key` at this version"""
+        text = f"{self.path}\0{self.mtime_ns}\0{self.size}\0{key!r}"
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
+
+
+@dataclass
+class CachedResponse:
+    """An encoded response body with its headers, and its gzip encoding once requested"""
+    body: bytes
+    etag: str
+    mimetype: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    _gzipped: Optional[bytes] = None
+
+    @property
+    def compressible(self) -> bool:
+        return len(self.body) >= GZIP_MIN_BYTES
+
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6, mtime=0)
+        return self._gzipped
+
+
+class Phase9OutputsCache:
+    """Thread-safe cache of one report version's parsed data and LRU-bounded encoded responses"""
+
+    def __init__(self, max_responses: int = DEFAULT_MAX_RESPONSES):
+        self.max_responses = max_responses
+        self._version: Optional[ReportVersion] = None
+        self._data: Any = None
+        self._has_data = False
+        self._responses: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        # Held while loading or building so concurrent misses wait for one build
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+
+    def _switch_to(self, version: ReportVersion) -> None:
+        if version != self._version:
+            if self._version is not None:
+                logger.info(f"Phase 9 report changed ({version.path}); dropping cached responses")
+            self._version = version
+            self._drop_data()
+            self._responses.clear()
+
+    def _drop_data(self) -> None:
+        """Forget the loaded data, closing it if it holds a file (e.g. a memory map)"""
+        data, self._data, self._has_data = self._data, None, False
+        close = getattr(data, 'close', None)
+        if callable(close):
+            close()
+
+    def data(self, version: ReportVersion, load: Callable[[], Any]) -> Any:
+        """
+        The report parsed by `load()`, loaded once per version.
+
+        Callers must not modify it, nor use it once the version changes (it may be closed).
+        """
+        with self._lock:
+            self._switch_to(version)
+            if not self._has_data:
+                self._data = load()
+                self._has_data = True
+                self.loads += 1
+            return self._data
+
+    def response(self, version: ReportVersion, key: Hashable, build: Callable[[], CachedResponse]) -> CachedResponse:
+        """The response for request options `key`, built by `build()` once per version"""
+        with self._lock:
+            self._switch_to(version)
+            entry = self._responses.get(key)
+            if entry is not None:
+                self._responses.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            entry = build()
+            self._responses[key] = entry
+            while len(self._responses) > self.max_responses:
+                self._responses.popitem(last=False)
+            return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version = None
+            self._drop_data()
+            self._responses.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'version': self._version.path if self._version else None,
+                'responses': len(self._responses),
+                'max_responses': self.max_responses,
+                'hits': self.hits,
+                'misses': self.misses,
+                'loads': self.loads,
+            }
+
+
+# Process-wide cache used by /phase9/outputs (one per worker process)
+phase9_outputs_cache = Phase9OutputsCache()
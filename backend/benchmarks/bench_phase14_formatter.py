@@ -0,0 +1,75 @@
+"""
+Phase 14: StructuredFormatter per-record cost
+
+Microseconds per format() call for a plain record, a record with extra
+details and a record carrying an exception, comparing
+    default      utcnow().isoformat(), hasattr probes, json.dumps per record
+    fast-json    StructuredFormatter(fast=True) without orjson
+    fast-orjson  StructuredFormatter(fast=True) with orjson (when installed)
+Records are created up front with timestamps spread over ~1 ms each, as at
+a few thousand lines per second.
+
+Usage:
+    python backend/benchmarks/bench_phase14_formatter.py [--records 100000]
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+import phase14_logging
+from phase14_logging import StructuredFormatter
+
+
+def make_records(kind, n):
+    records = []
+    start = time.time()
+    exc_info = None
+    if kind == 'exception':
+        try:
+            raise ValueError('model input out of range')
+        except ValueError:
+            exc_info = sys.exc_info()
+    for i in range(n):
+        record = logging.LogRecord('bench.phase9', logging.INFO, __file__, 42, 'scored project %s', (f'P-{i}',), exc_info)
+        record.created = start + i * 0.0002
+        if kind != 'plain':
+            record.details = {'project_id': f'P-{i}', 'risk_score': 0.42, 'factors': ['weather', 'permits']}
+            record.request_id = 'req-123'
+        records.append(record)
+    return records
+
+
+def per_record_us(formatter, records):
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for record in records:
+            formatter.format(record)
+        best = min(best, time.perf_counter() - start)
+    return best / len(records) * 1e6
+
+
+def run(n):
+    modes = [('default', StructuredFormatter(), None), ('fast-json', StructuredFormatter(fast=True), None)]
+    if phase14_logging.orjson is not None:
+        modes.append(('fast-orjson', StructuredFormatter(fast=True), phase14_logging.orjson))
+    orjson = phase14_logging.orjson
+    print(f"{n} records, us per record")
+    print(f"  {'record':<10}" + "".join(f"{name:>13}" for name, _, _ in modes))
+    for kind in ('plain', 'details', 'exception'):
+        records = make_records(kind, n)
+        timings = []
+        for _, formatter, encoder in modes:
+            phase14_logging.orjson = encoder
+            timings.append(per_record_us(formatter, records))
+        phase14_logging.orjson = orjson
+        print(f"  {kind:<10}" + "".join(f"{t:13.2f}" for t in timings))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=100000)
+    args = parser.parse_args()
+    run(args.records)
@@ -0,0 +1,95 @@
+"""
+Phase 14: Logging pipeline benchmark
+
+Request latency of a small Flask endpoint that writes a few structured log
+lines per request, with logging
+    off      root level above INFO (records are filtered out)
+    sync     setup_logging(): file and console handlers on the request thread
+    async    setup_logging(async_mode=True): the request thread only enqueues;
+             formatting and batched writes happen on the listener thread
+Console output goes to /dev/null. Requests run on --threads concurrent client
+threads; p50/p99 are per request.
+
+Usage:
+    python backend/benchmarks/bench_phase14_logging.py [--requests 5000] [--lines 5] [--threads 4]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from phase14_logging import setup_logging, shutdown_logging
+
+
+def make_app(lines):
+    from flask import Flask
+    app = Flask(__name__)
+    logger = logging.getLogger('bench.request')
+
+    @app.route('/work')
+    def work():
+        for i in range(lines):
+            logger.info('handled step %d', i, extra={'details': {'step': i, 'project_id': 'P-1001'}, 'request_id': 'r1'})
+        return 'ok'
+
+    return app
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_mode(mode, n_requests, lines, threads):
+    log_dir = Path(tempfile.mkdtemp())
+    setup_logging(app_name='bench', log_dir=log_dir, async_mode=(mode == 'async'))
+    if mode == 'off':
+        logging.getLogger().setLevel(logging.WARNING)
+    app = make_app(lines)
+    latencies = []
+    lock = threading.Lock()
+
+    def client_thread(count):
+        client = app.test_client()
+        local = []
+        for _ in range(count):
+            start = time.perf_counter()
+            client.get('/work')
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=client_thread, args=(n_requests // threads,)) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    drain_start = time.perf_counter()
+    shutdown_logging()
+    drain = time.perf_counter() - drain_start
+    written = sum(1 for _ in open(log_dir / 'bench.log')) if (log_dir / 'bench.log').exists() else 0
+    print(f"  {mode:<6} p50 {percentile(latencies, 0.5) * 1e6:8.0f} us   p99 {percentile(latencies, 0.99) * 1e6:8.0f} us"
+          f"   {len(latencies) / elapsed:8.0f} req/s   lines {written:7d}   drain {drain * 1000:6.1f} ms")
+
+
+def run(n_requests, lines, threads):
+    sys.stderr = open(os.devnull, 'w')  # console handler output
+    print(f"{n_requests} requests x {lines} log lines, {threads} threads")
+    for mode in ('off', 'sync', 'async'):
+        run_mode(mode, n_requests, lines, threads)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--lines", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+    run(args.requests, args.lines, args.threads)
@@ -0,0 +1,70 @@
+"""
+Phase 14: PerformanceTracker overhead
+
+Microseconds added per tracked call (an empty operation inside
+PerformanceTracker, logging disabled) for each memory accounting mode:
+    per-call-process  psutil.Process() created twice per call (previous behaviour)
+    rss               cached process handle, RSS read before and after
+    tracemalloc       allocation delta for 1 in --sample-every calls
+    off               timing and metrics only
+plus the latency of ResourceMonitor.get_cpu_usage() (it used to block for 1 s).
+
+Usage:
+    python backend/benchmarks/bench_phase14_performance.py [--calls 20000] [--sample-every 100]
+"""
+
+import argparse
+import logging
+import time
+
+import psutil
+
+import phase14_performance
+from phase14_performance import MemoryProbe, PerformanceTracker, ResourceMonitor
+
+
+class PerCallProcessProbe:
+    """The previous accounting: a new psutil.Process for each RSS read"""
+
+    def start(self):
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+
+    def stop(self, start):
+        return psutil.Process().memory_info().rss / (1024 * 1024) - start
+
+
+def per_call_us(calls):
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(calls):
+            with PerformanceTracker('noop'):
+                pass
+        best = min(best, time.perf_counter() - start)
+    return best / calls * 1e6
+
+
+def run(calls, sample_every):
+    logging.disable(logging.CRITICAL)
+    probes = [
+        ('per-call-process', PerCallProcessProbe()),
+        ('rss', MemoryProbe('rss')),
+        ('tracemalloc', MemoryProbe('tracemalloc', sample_every=sample_every)),
+        ('off', MemoryProbe('off')),
+    ]
+    print(f"{calls} tracked calls, us per call")
+    for name, probe in probes:
+        phase14_performance.memory_probe = probe
+        print(f"  {name:<18} {per_call_us(calls):8.2f}")
+
+    start = time.perf_counter()
+    ResourceMonitor.get_cpu_usage()
+    print(f"get_cpu_usage: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--sample-every", type=int, default=100)
+    args = parser.parse_args()
+    run(args.calls, args.sample_every)
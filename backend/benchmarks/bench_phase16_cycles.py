@@ -0,0 +1,80 @@
+"""
+Phase 16: Dependency cycle detection benchmark
+
+Cost of cycle handling relative to a full POST /api/schedule/analyze:
+    analyze          the endpoint end to end on an acyclic schedule (cycle
+                     detection is on by default and costs nothing here, since
+                     the SCC pass only runs on tasks Kahn's algorithm left over)
+    critical path    calculate_critical_path on the same schedule
+    full SCC pass    find_cycles over the whole schedule, i.e. what an
+                     unconditional pre-pass would add
+and calculate_critical_path on the same schedule with a few back edges
+closing loops, in exclude and condense mode.
+
+Usage:
+    python backend/benchmarks/bench_phase16_cycles.py [--tasks 100000] [--loops 5]
+"""
+
+import argparse
+import logging
+import random
+import time
+
+from phase16_synthetic import synthetic_rows, build_analyzer
+from phase16_types import CycleMode
+
+
+def timed(label, fn, repeat=3):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<26} {best * 1000:9.1f} ms")
+    return result
+
+
+def run(n_tasks, loops):
+    from flask import Flask
+    from phase16_api import schedule_bp
+    from phase16_schedule_store import schedule_store
+
+    logging.disable(logging.WARNING)
+    tasks, deps = synthetic_rows(n_tasks)
+    print(f"{n_tasks} tasks, {len(deps)} dependencies")
+
+    app = Flask(__name__)
+    app.register_blueprint(schedule_bp)
+    client = app.test_client()
+    payload = {"project_id": "BENCH", "tasks": tasks, "dependencies": deps}
+
+    def analyze():
+        schedule_store.clear()
+        assert client.post('/api/schedule/analyze', json=payload).status_code == 200
+
+    timed("analyze", analyze, repeat=1)
+    analyzer = build_analyzer(tasks, deps)
+    timed("critical path", analyzer.calculate_critical_path)
+    assert timed("full SCC pass", analyzer.find_cycles) == []
+
+    # Close loops by pointing late tasks back at tasks that reach them
+    rng = random.Random(12)
+    for i in range(loops):
+        pred = succ = f"T{rng.randrange(n_tasks // 2, n_tasks)}"
+        for _ in range(10):
+            succ = rng.choice(analyzer.reverse_adjacency[succ])
+        deps.append({"dependency_id": f"back{i}", "predecessor_task_id": pred, "successor_task_id": succ,
+                     "dependency_type": "finish_to_start", "lag_days": 0})
+    cyclic = build_analyzer(tasks, deps)
+    cp = timed("critical path, exclude", lambda: cyclic.calculate_critical_path(CycleMode.EXCLUDE))
+    print(f"    {len(cp.cycles)} cycles, {len(cp.excluded_tasks)} tasks excluded")
+    timed("critical path, condense", lambda: cyclic.calculate_critical_path(CycleMode.CONDENSE))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--loops", type=int, default=5)
+    args = parser.parse_args()
+    run(args.tasks, args.loops)
@@ -0,0 +1,66 @@
+"""
+Phase 16: Incremental critical path benchmark
+
+Compares a full calculate_critical_path() on a 50k-task schedule with the
+incremental update after a single-task edit (duration change, dependency
+add/remove).
+
+Usage:
+    python backend/benchmarks/bench_phase16_incremental.py [--tasks 50000] [--edits 200]
+"""
+
+import argparse
+import logging
+import random
+import statistics
+import time
+
+from phase16_synthetic import synthetic_rows, build_analyzer
+from phase16_types import TaskDependency, DependencyType
+
+
+def _summary(label, samples_ms):
+    samples_ms = sorted(samples_ms)
+    p95 = samples_ms[int(len(samples_ms) * 0.95) - 1]
+    print(f"{label:<24} median={statistics.median(samples_ms):8.2f}ms  p95={p95:8.2f}ms  max={samples_ms[-1]:8.2f}ms")
+
+
+def run(n_tasks, n_edits, seed=16):
+    logging.disable(logging.WARNING)
+    rng = random.Random(seed)
+    tasks, deps = synthetic_rows(n_tasks, mixed_types=True)
+    analyzer = build_analyzer(tasks, deps)
+
+    start = time.perf_counter()
+    analyzer.calculate_critical_path()
+    print(f"full CPM ({n_tasks} tasks, {len(deps)} deps): {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    task_ids = list(analyzer.tasks)
+    durations = []
+    for _ in range(n_edits):
+        task_id = rng.choice(task_ids)
+        new_duration = max(0, analyzer.tasks[task_id].duration_days + rng.choice((-3, -1, 1, 3)))
+        start = time.perf_counter()
+        analyzer.update_task_duration(task_id, new_duration)
+        durations.append((time.perf_counter() - start) * 1000)
+    _summary("update_task_duration", durations)
+
+    added, removed = [], []
+    for i in range(n_edits):
+        a, b = sorted(rng.sample(range(n_tasks), 2))
+        start = time.perf_counter()
+        analyzer.add_dependency(TaskDependency(f"bench{i}", f"T{a}", f"T{b}", DependencyType.FINISH_TO_START))
+        added.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        analyzer.remove_dependency(f"bench{i}")
+        removed.append((time.perf_counter() - start) * 1000)
+    _summary("add_dependency", added)
+    _summary("remove_dependency", removed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=50000)
+    parser.add_argument("--edits", type=int, default=200)
+    args = parser.parse_args()
+    run(args.tasks, args.edits)
@@ -0,0 +1,45 @@
+"""
+Phase 16: Monte Carlo schedule risk benchmark
+
+Times MonteCarloScheduleSimulator.simulate on a synthetic schedule, in-process
+and (optionally) across a process pool. A fixed seed gives identical results
+for every worker count.
+
+Usage:
+    python backend/benchmarks/bench_phase16_monte_carlo.py [--tasks 5000] [--iterations 10000] [--workers 1,4]
+"""
+
+import argparse
+import logging
+import time
+
+from phase16_synthetic import synthetic_rows, build_analyzer
+from phase16_monte_carlo import MonteCarloScheduleSimulator
+
+
+def run(n_tasks, iterations, worker_counts, chunk_size):
+    logging.disable(logging.INFO)
+    tasks, deps = synthetic_rows(n_tasks)
+    analyzer = build_analyzer(tasks, deps)
+    start = time.perf_counter()
+    simulator = MonteCarloScheduleSimulator(analyzer)
+    setup_ms = (time.perf_counter() - start) * 1000
+    print(f"{n_tasks} tasks, {len(deps)} dependencies, {iterations} iterations (setup {setup_ms:.0f} ms)")
+
+    for workers in worker_counts:
+        start = time.perf_counter()
+        result = simulator.simulate(iterations, seed=16, chunk_size=chunk_size, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"  workers={workers:<3} {elapsed:7.2f} s   P50={result.p50_duration_days:.1f}"
+              f" P80={result.p80_duration_days:.1f} P95={result.p95_duration_days:.1f}"
+              f" (CPM {result.deterministic_duration_days}d)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=10000)
+    parser.add_argument("--workers", default="1")
+    parser.add_argument("--chunk-size", type=int, default=256)
+    args = parser.parse_args()
+    run(args.tasks, args.iterations, [int(w) for w in args.workers.split(",")], args.chunk_size)
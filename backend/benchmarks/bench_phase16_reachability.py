@@ -0,0 +1,77 @@
+"""
+Phase 16: Reachability index benchmark
+
+Blast-radius heatmap (downstream count of every task) via one BFS per task,
+as get_task_impact_scope used to run, versus the reachability index, plus
+random "is A upstream of B" checks and incremental dependency edits.
+
+Usage:
+    python backend/benchmarks/bench_phase16_reachability.py [--tasks 5000] [--bfs-limit 20000]
+"""
+
+import argparse
+import logging
+import random
+import time
+from collections import deque
+
+from phase16_synthetic import synthetic_rows, build_analyzer
+from phase16_types import TaskDependency, DependencyType
+
+
+def bfs_count(analyzer, task_id):
+    visited = {task_id}
+    queue = deque([task_id])
+    while queue:
+        for successor in analyzer.adjacency_list.get(queue.popleft(), ()):
+            if successor not in visited:
+                visited.add(successor)
+                queue.append(successor)
+    return len(visited) - 1
+
+
+def run(n_tasks, bfs_limit, queries):
+    logging.disable(logging.WARNING)
+    tasks, deps = synthetic_rows(n_tasks)
+    analyzer = build_analyzer(tasks, deps)
+    print(f"{n_tasks} tasks, {len(deps)} dependencies")
+
+    if n_tasks <= bfs_limit:
+        start = time.perf_counter()
+        expected = {task_id: bfs_count(analyzer, task_id) for task_id in analyzer.tasks}
+        print(f"  BFS per task heatmap        {time.perf_counter() - start:8.2f} s")
+    else:
+        expected = None
+
+    start = time.perf_counter()
+    counts = analyzer.get_downstream_counts()
+    print(f"  index build + heatmap       {time.perf_counter() - start:8.2f} s   ({analyzer.reachability.mode} mode)")
+    if expected is not None:
+        assert counts == expected
+
+    rng = random.Random(1)
+    ids = list(analyzer.tasks)
+    pairs = [(rng.choice(ids), rng.choice(ids)) for _ in range(queries)]
+    start = time.perf_counter()
+    hits = sum(analyzer.is_upstream(a, b) for a, b in pairs)
+    elapsed = time.perf_counter() - start
+    print(f"  {queries} is_upstream checks   {elapsed:8.3f} s   ({hits} reachable)")
+
+    start = time.perf_counter()
+    for i in range(20):
+        a, b = sorted(rng.sample(range(n_tasks), 2))
+        analyzer.add_dependency(TaskDependency(f"bench{i}", f"T{a}", f"T{b}", DependencyType.FINISH_TO_START))
+        analyzer.get_downstream_count(f"T{a}")
+    for i in range(20):
+        analyzer.remove_dependency(f"bench{i}")
+        analyzer.get_downstream_count("T0")
+    print(f"  20 adds + 20 removes        {time.perf_counter() - start:8.2f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--bfs-limit", type=int, default=20000, help="skip the BFS baseline above this size")
+    parser.add_argument("--queries", type=int, default=100000)
+    args = parser.parse_args()
+    run(args.tasks, args.bfs_limit, args.queries)
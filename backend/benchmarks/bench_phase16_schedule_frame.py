@@ -0,0 +1,62 @@
+"""
+Phase 16: Bulk schedule load benchmark
+
+Compares loading /api/schedule/analyze rows one object at a time
+(add_task/add_dependency, then CompiledScheduleGraph.from_analyzer) with the
+columnar ScheduleFrame path (ScheduleFrame.from_rows, then
+ScheduleDependencyAnalyzer.from_frame and CompiledScheduleGraph.from_frame).
+Reports wall time (untraced) plus retained and peak traced memory for each
+stage.
+
+Usage:
+    python backend/benchmarks/bench_phase16_schedule_frame.py [--tasks 100000]
+"""
+
+import argparse
+import gc
+import logging
+import time
+import tracemalloc
+
+from phase16_synthetic import synthetic_rows, build_analyzer
+from phase16_schedule_frame import ScheduleFrame
+from phase16_schedule_dependencies import ScheduleDependencyAnalyzer
+from phase16_cpm_engine import CompiledScheduleGraph
+
+
+def measure(label, build):
+    """Time one build, then rebuild under tracemalloc for its retained and peak memory"""
+    gc.collect()
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<28} {elapsed:7.2f} s   retained {retained / 2**20:7.1f} MiB   peak {peak / 2**20:7.1f} MiB")
+    return result
+
+
+def run(n_tasks):
+    logging.disable(logging.INFO)
+    tasks, deps = synthetic_rows(n_tasks, mixed_types=True)
+    print(f"{n_tasks} tasks, {len(deps)} dependencies")
+
+    print("per-object:")
+    analyzer = measure("add_task/add_dependency", lambda: build_analyzer(tasks, deps))
+    measure("compile from analyzer", lambda: CompiledScheduleGraph.from_analyzer(analyzer))
+    del analyzer
+
+    print("frame:")
+    frame = measure("ScheduleFrame.from_rows", lambda: ScheduleFrame.from_rows(tasks, deps))
+    measure("analyzer from frame", lambda: ScheduleDependencyAnalyzer.from_frame(frame))
+    measure("compile from frame", lambda: CompiledScheduleGraph.from_frame(frame))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=100000)
+    args = parser.parse_args()
+    run(args.tasks)
@@ -0,0 +1,73 @@
+"""
+Phase 16: Streaming ingestion benchmark
+
+Peak traced memory and wall time of turning a serialized /api/schedule/analyze
+body into a ScheduleFrame three ways:
+    parsed   read the whole body, json.loads it, ScheduleFrame.from_rows
+             (what request.get_json() does)
+    json     read_json_schedule over the body stream (?stream=1)
+    ndjson   read_ndjson_schedule over the NDJSON form of the same schedule
+
+The serialized body itself is built before tracing starts; only what each
+path allocates while reading it is counted.
+
+Usage:
+    python backend/benchmarks/bench_phase16_streaming.py [--tasks 100000]
+"""
+
+import argparse
+import gc
+import io
+import json
+import logging
+import time
+import tracemalloc
+
+from phase16_synthetic import synthetic_rows
+from phase16_schedule_frame import ScheduleFrame
+from phase16_schedule_store import schedule_content_hash
+from phase16_schedule_stream import read_json_schedule, read_ndjson_schedule
+
+
+def parsed_body(body: bytes) -> ScheduleFrame:
+    data = json.loads(io.BytesIO(body).read())
+    schedule_content_hash(data['tasks'], data['dependencies'])
+    return ScheduleFrame.from_rows(data['tasks'], data['dependencies'])
+
+
+def measure(label, build, body):
+    """Time one untraced build, then rebuild under tracemalloc for the peak"""
+    gc.collect()
+    start = time.perf_counter()
+    build(body)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    frame = build(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<8} {elapsed:7.2f} s   peak {peak / 2**20:8.1f} MiB   "
+          f"{frame.num_tasks} tasks / {frame.num_dependencies} deps")
+
+
+def run(n_tasks):
+    logging.disable(logging.INFO)
+    tasks, deps = synthetic_rows(n_tasks, mixed_types=True)
+    body = json.dumps({"project_id": "BENCH", "tasks": tasks, "dependencies": deps}).encode()
+    lines = [json.dumps({"project_id": "BENCH"})]
+    lines.extend(json.dumps(row) for row in tasks)
+    lines.extend(json.dumps(row) for row in deps)
+    ndjson_body = "\n".join(lines).encode()
+    del tasks, deps, lines
+    print(f"{n_tasks} tasks: JSON body {len(body) / 2**20:.1f} MiB, NDJSON body {len(ndjson_body) / 2**20:.1f} MiB")
+
+    measure("parsed", parsed_body, body)
+    measure("json", lambda b: read_json_schedule(io.BytesIO(b)).frame, body)
+    measure("ndjson", lambda b: read_ndjson_schedule(io.BytesIO(b)).frame, ndjson_body)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=100000)
+    args = parser.parse_args()
+    run(args.tasks)
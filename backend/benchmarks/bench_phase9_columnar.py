@@ -0,0 +1,113 @@
+"""
+Phase 9: Columnar output format benchmark
+
+Compares the JSON array report with the columnar encoding
+(scripts/phase9/columnar.py) on a synthetic portfolio:
+    size            bytes on disk, raw and gzip-compressed
+    encode          writing the report
+    full decode     every project back as a dict
+    page            one risk_level-filtered page of 50 projects, i.e. what
+                    /phase9/outputs does per request (json.load + filter,
+                    versus opening the memory map and selecting columns)
+
+Usage:
+    python backend/benchmarks/bench_phase9_columnar.py [--projects 100000]
+"""
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from scripts.phase9 import columnar  # noqa: E402
+
+LEVELS = ["low", "medium", "high", "critical"]
+FACTORS = ["schedule_slippage_pct", "subcontractor_changes", "inspection_failure_rate",
+           "rolling_weekly_weather_volatility", "workforce_unreliability_score"]
+
+
+def synthetic_outputs(n, seed=7):
+    rng = random.Random(seed)
+    outputs = []
+    for i in range(n):
+        score = round(rng.random(), 3)
+        outputs.append({
+            "schema_version": "phase9-v1",
+            "project_id": f"P-{i:06d}",
+            "project_name": f"Project {i}",
+            "risk_score": score,
+            "risk_level": LEVELS[min(3, int(score * 4))],
+            "predicted_delay_days": rng.randint(0, 40),
+            "delay_probability": round(rng.random(), 3),
+            "confidence_score": round(rng.random(), 3),
+            "primary_risk_factors": [{"factor": f, "contribution": round(rng.random() / 3, 3)}
+                                     for f in rng.sample(FACTORS, 3)],
+            "recommended_actions": rng.sample(["schedule-audit", "quality-review", "monitor"], 2),
+            "explanation": "Schedule slippage and subcontractor churn are top contributors.",
+            "model_version": "v1",
+            "generated_at": "2026-01-01T00:00:00+00:00",
+        })
+    return outputs
+
+
+def timed(fn, repeat=3):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def run(n):
+    outputs = synthetic_outputs(n)
+    tmp = Path(tempfile.mkdtemp())
+    json_path, col_path = tmp / 'phase9_outputs.json', tmp / 'phase9_outputs.p9col'
+
+    json_encode, _ = timed(lambda: json_path.write_text(json.dumps(outputs), encoding='utf-8'))
+    col_encode, _ = timed(lambda: columnar.write(col_path, outputs))
+
+    def json_full():
+        return json.loads(json_path.read_bytes())
+
+    def col_full():
+        with columnar.ColumnarOutputs(col_path) as view:
+            return view.rows()
+
+    def json_page():
+        return [o for o in json_full() if o["risk_level"] == "high"][1000:1050]
+
+    def col_page():
+        with columnar.ColumnarOutputs(col_path) as view:
+            return view.rows(view.select(risk_level="high", offset=1000, limit=50))
+
+    json_full_ms, a = timed(json_full)
+    col_full_ms, b = timed(col_full)
+    assert a == b
+    json_page_ms, a = timed(json_page)
+    col_page_ms, b = timed(col_page)
+    assert a == b
+
+    print(f"{n} projects")
+    print(f"  {'':<14} {'json':>12} {'columnar':>12}")
+    for label, j, c in [
+        ("size (MB)", json_path.stat().st_size / 1e6, col_path.stat().st_size / 1e6),
+        ("gzip (MB)", len(gzip.compress(json_path.read_bytes(), 6)) / 1e6, len(gzip.compress(col_path.read_bytes(), 6)) / 1e6),
+        ("encode (ms)", json_encode, col_encode),
+        ("full decode", json_full_ms, col_full_ms),
+        ("page (ms)", json_page_ms, col_page_ms),
+    ]:
+        print(f"  {label:<14} {j:12.2f} {c:12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--projects", type=int, default=100000)
+    args = parser.parse_args()
+    run(args.projects)
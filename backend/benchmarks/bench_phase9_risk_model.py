@@ -0,0 +1,48 @@
+"""
+Phase 9: Risk scoring benchmark
+
+Per-call latency of risk.score() with the compiled RiskModel against the
+reference implementation that re-read the weight tables on every call
+(tests/unit/test_phase9_risk_model.py), on a random portfolio with the same
+mix of clean and malformed feature values as the determinism tests.
+
+Usage:
+    python backend/benchmarks/bench_phase9_risk_model.py [--projects 200] [--rounds 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from scripts.phase9 import risk  # noqa: E402
+from tests.unit.test_phase9_risk_model import _reference_score, _rows  # noqa: E402
+
+
+def per_call_us(fn, rows, rounds):
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for features in rows:
+            fn(features)
+        best = min(best, (time.perf_counter() - start) / len(rows))
+    return best * 1e6
+
+
+def run(n, rounds):
+    rows = _rows(n, seed=23)
+    before = per_call_us(_reference_score, rows, rounds)
+    after = per_call_us(risk.score, rows, rounds)
+    print(f"risk.score single call ({n} projects, best of {rounds})")
+    print(f"  reference  {before:8.1f} us")
+    print(f"  compiled   {after:8.1f} us   ({before / after:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    run(args.projects, args.rounds)
@@ -0,0 +1,82 @@
+"""
+Phase 16: Synthetic schedule generator for benchmarks
+
+Builds layered, acyclic construction-style schedules of arbitrary size so the
+Phase 16 engines can be timed without real Monday.com exports.
+"""
+
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Phase 16 modules use flat imports from backend/app
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'app'))
+
+from phase16_types import Task, TaskDependency, DependencyType  # noqa: E402
+from phase16_schedule_dependencies import ScheduleDependencyAnalyzer  # noqa: E402
+
+
+def synthetic_rows(
+    n_tasks: int,
+    avg_fan_in: int = 2,
+    layer_width: int = 50,
+    seed: int = 16,
+    mixed_types: bool = False,
+) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Generate task and dependency rows in the /api/schedule/analyze JSON shape.
+
+    Tasks are laid out in layers of `layer_width`; every task outside the first
+    layer depends on up to `avg_fan_in` tasks from the previous few layers.
+    """
+    rng = random.Random(seed)
+    dep_types = [t.value for t in DependencyType] if mixed_types else [DependencyType.FINISH_TO_START.value]
+    tasks = []
+    deps = []
+    for i in range(n_tasks):
+        tasks.append({
+            "task_id": f"T{i}",
+            "name": f"Task {i}",
+            "duration_days": rng.randint(1, 20),
+            "complexity_factor": round(rng.uniform(0.5, 2.0), 2),
+            "weather_dependency": rng.random() < 0.2,
+            "resource_constrained": rng.random() < 0.3,
+        })
+        layer = i // layer_width
+        if layer == 0:
+            continue
+        lo = max(0, (layer - 3) * layer_width)
+        hi = layer * layer_width
+        for pred in set(rng.randrange(lo, hi) for _ in range(avg_fan_in)):
+            deps.append({
+                "dependency_id": f"D{len(deps)}",
+                "predecessor_task_id": f"T{pred}",
+                "successor_task_id": f"T{i}",
+                "dependency_type": rng.choice(dep_types),
+                "lag_days": rng.choice((0, 0, 0, 1, 2)),
+            })
+    return tasks, deps
+
+
+def build_analyzer(tasks: List[Dict], deps: List[Dict]) -> ScheduleDependencyAnalyzer:
+    """Load generated rows into a ScheduleDependencyAnalyzer"""
+    analyzer = ScheduleDependencyAnalyzer()
+    for row in tasks:
+        analyzer.add_task(Task(
+            task_id=row["task_id"],
+            name=row["name"],
+            duration_days=row["duration_days"],
+            complexity_factor=row["complexity_factor"],
+            weather_dependency=row["weather_dependency"],
+            resource_constrained=row["resource_constrained"],
+        ))
+    for row in deps:
+        analyzer.add_dependency(TaskDependency(
+            dependency_id=row["dependency_id"],
+            predecessor_task_id=row["predecessor_task_id"],
+            successor_task_id=row["successor_task_id"],
+            dependency_type=DependencyType(row["dependency_type"]),
+            lag_days=row["lag_days"],
+        ))
+    return analyzer
@@ -0,0 +1,319 @@
+"""
+Phase 14: Unit Tests - Asynchronous Logging Pipeline, Fast Formatter and Rate-Limited Events
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import unittest
+import phase14_logging
+from phase14_logging import (
+    BatchingQueueListener, BoundedQueueHandler, EventRateLimiter, StructuredFormatter, _emit_batch, setup_logging,
+    shutdown_logging,
+)
+
+
+def make_record(msg, level=logging.INFO, *args):
+    return logging.LogRecord('test', level, __file__, 1, msg, args, None)
+
+
+class ThreadRecordingFormatter(StructuredFormatter):
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def format(self, record):
+        self.threads.add(threading.current_thread().name)
+        return super().format(record)
+
+
+class TestBoundedQueueHandler(unittest.TestCase):
+
+    def test_drop_policy_keeps_errors_and_reports_losses(self):
+        handler = BoundedQueueHandler(queue.Queue(maxsize=5), overflow='drop')
+        for i in range(20):
+            handler.handle(make_record('info %s', logging.INFO, i))
+        handler.handle(make_record('failure', logging.ERROR))
+        self.assertEqual(handler.stats.to_dict(), {'enqueued': 6, 'dropped': 15, 'evicted': 1})
+        queued = [handler.queue.get_nowait().getMessage() for _ in range(5)]
+        self.assertEqual(queued, ['info 1', 'info 2', 'info 3', 'info 4', 'failure'])
+
+        # the listener announces the losses with the next batch
+        path = Path(tempfile.mkdtemp()) / 'out.log'
+        file_handler = logging.FileHandler(path)
+        listener = BatchingQueueListener(handler.queue, file_handler, stats=handler.stats)
+        listener.start()
+        handler.handle(make_record('after'))
+        listener.stop()
+        file_handler.close()
+        lines = path.read_text().splitlines()
+        self.assertEqual(lines, ['after', 'Log queue full: dropped 16 log records'])
+
+    def test_sample_and_drop_oldest_policies(self):
+        handler = BoundedQueueHandler(queue.Queue(maxsize=2), overflow='sample', sample_every=5)
+        for i in range(14):
+            handler.handle(make_record(str(i)))
+        # 12 overflowing records: the 1st, 6th and 11th of them are kept
+        self.assertEqual([handler.queue.get_nowait().msg for _ in range(2)], ['7', '12'])
+        self.assertEqual(handler.stats.to_dict(), {'enqueued': 5, 'dropped': 9, 'evicted': 3})
+
+        handler = BoundedQueueHandler(queue.Queue(maxsize=3), overflow='drop_oldest')
+        for i in range(10):
+            handler.handle(make_record(str(i)))
+        self.assertEqual([handler.queue.get_nowait().msg for _ in range(3)], ['7', '8', '9'])
+        with self.assertRaises(ValueError):
+            BoundedQueueHandler(queue.Queue(), overflow='block')
+
+    def test_sentinel_requeued_without_blocking(self):
+        class RefillingQueue(queue.Queue):
+            # another producer refills the queue as soon as the sentinel is taken
+            def get_nowait(self):
+                item = super().get_nowait()
+                if item is None:
+                    self.put_nowait(make_record('racing'))
+                return item
+
+        handler = BoundedQueueHandler(RefillingQueue(maxsize=1), overflow='drop_oldest')
+        handler.queue.put_nowait(None)
+        worker = threading.Thread(target=handler.handle, args=(make_record('late'),), daemon=True)
+        worker.start()
+        worker.join(timeout=5)
+        self.assertFalse(worker.is_alive())
+        self.assertIsNone(handler.queue.get_nowait())
+        self.assertEqual(handler.stats.to_dict(), {'enqueued': 0, 'dropped': 1, 'evicted': 1})
+
+    def test_prepare_defers_formatting(self):
+        handler = BoundedQueueHandler(queue.Queue())
+        try:
+            raise KeyError('k')
+        except KeyError:
+            record = logging.LogRecord('t', logging.ERROR, __file__, 1, 'bad %s', ('x',), sys.exc_info())
+        handler.handle(record)
+        queued = handler.queue.get_nowait()
+        self.assertEqual((queued.msg, queued.args), ('bad x', None))
+        self.assertIn('KeyError', queued.exc_text)
+        self.assertIsNone(queued.exc_info[2])
+        self.assertEqual(json.loads(StructuredFormatter().format(queued))['exception']['type'], 'KeyError')
+        self.assertIsNotNone(record.exc_info[2])
+
+
+class TestFastFormatter(unittest.TestCase):
+
+    def make_records(self):
+        plain = make_record('plain %s', logging.INFO, 'message')
+        extra = make_record('with extras', logging.WARNING)
+        extra.details = {'project_id': 'P-1', 'when': datetime(2025, 1, 2, tzinfo=timezone.utc), 7: 'int key'}
+        extra.request_id = 'r-1'
+        extra.error_code = 'E42'
+        try:
+            raise ValueError('bad input')
+        except ValueError:
+            failed = logging.LogRecord('test', logging.ERROR, __file__, 1, 'failed', None, sys.exc_info())
+        failed.error = 'ValueError: bad input'
+        failed.traceback = 'Traceback ...'
+        return [plain, extra, failed]
+
+    def test_same_entry_as_default_mode(self):
+        slow, fast = StructuredFormatter(), StructuredFormatter(fast=True)
+        encoders = [('json', None)]
+        if phase14_logging.orjson is not None:
+            encoders.append(('orjson', phase14_logging.orjson))
+        for name, encoder in encoders:
+            with self.subTest(encoder=name), mock.patch.object(phase14_logging, 'orjson', encoder):
+                for record in self.make_records():
+                    expected, actual = json.loads(slow.format(record)), json.loads(fast.format(record))
+                    expected_ts, actual_ts = expected.pop('timestamp'), actual.pop('timestamp')
+                    if name == 'orjson' and 'details' in expected:
+                        # orjson renders datetimes as ISO-8601 rather than str()
+                        expected['details']['when'] = actual['details']['when']
+                    self.assertEqual(actual, expected)
+                    self.assertEqual(list(actual), list(expected))
+                    self.assertRegex(actual_ts, r'^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{3}Z$')
+                    self.assertEqual(actual_ts[:19], expected_ts[:19])
+
+    def test_timestamp_from_record_cached_per_millisecond(self):
+        formatter = StructuredFormatter(fast=True)
+        created = datetime(2024, 2, 4, 10, 30, 45, 123500, tzinfo=timezone.utc).timestamp()
+        self.assertEqual(formatter._timestamp(created), '2024-02-04T10:30:45.123Z')
+        self.assertIs(formatter._timestamp(created + 0.0003), formatter._timestamp(created))
+        self.assertEqual(formatter._timestamp(created + 0.001), '2024-02-04T10:30:45.124Z')
+        self.assertEqual(formatter._timestamp(created + 1.0), '2024-02-04T10:30:46.123Z')
+
+    def test_encoder_falls_back_for_values_orjson_rejects(self):
+        entry = {'message': 'big', 'details': {'count': 2 ** 70}}
+        self.assertEqual(json.loads(phase14_logging._encode_json(entry)), entry)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestEventRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = ListHandler()
+        self.logger = logging.getLogger('test.phase14.events')
+        self.logger.addHandler(self.handler)
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+
+    def messages(self):
+        return [r.getMessage() for r in self.handler.records]
+
+    def test_token_bucket_per_event_type_with_suppressed_counts(self):
+        clock = FakeClock()
+        limiter = EventRateLimiter(rate=2, burst=3, clock=clock)
+        logged = [limiter.log(self.logger, logging.INFO, 'ADD_DEPENDENCY', 'edge %d', i) for i in range(50_000)]
+        self.assertEqual(sum(logged), 3)
+        self.assertTrue(limiter.log(self.logger, logging.INFO, 'OTHER', 'other event'))
+        clock.now += 0.5
+        self.assertTrue(limiter.log(self.logger, logging.INFO, 'ADD_DEPENDENCY', 'edge %d', 50_000))
+        self.assertEqual(self.messages(), ['edge 0', 'edge 1', 'edge 2', 'other event',
+                                           'Suppressed 49,997 ADD_DEPENDENCY events', 'edge 50000'])
+        self.assertEqual(self.handler.records[4].details, {'event_type': 'ADD_DEPENDENCY', 'suppressed': 49_997})
+        self.assertEqual(self.handler.records[3].funcName, 'test_token_bucket_per_event_type_with_suppressed_counts')
+        self.assertEqual(limiter.stats()['ADD_DEPENDENCY'], {'seen': 50_001, 'logged': 4, 'suppressed': 49_997})
+
+    def test_sampling_reporting_and_level_filtering(self):
+        limiter = EventRateLimiter(rate=None)
+        limiter.configure('INFERENCE', sample_every=10)
+        for i in range(25):
+            limiter.log(self.logger, logging.INFO, 'INFERENCE', 'call %d', i)
+        self.assertEqual(self.messages(), ['call 0', 'Suppressed 9 INFERENCE events', 'call 10',
+                                           'Suppressed 9 INFERENCE events', 'call 20'])
+        self.assertEqual(limiter.report_suppressed(), {'INFERENCE': 4})
+        self.assertEqual(self.messages()[-1], 'Suppressed 4 INFERENCE events')
+        self.assertEqual(limiter.report_suppressed(), {})
+
+        self.logger.setLevel(logging.INFO)
+        self.assertFalse(limiter.log(self.logger, logging.DEBUG, 'INFERENCE', 'filtered'))
+        self.assertEqual(limiter.stats()['INFERENCE']['seen'], 25)
+
+    def test_dependency_import_logs_a_bounded_number_of_lines(self):
+        from phase16_types import Task, TaskDependency, DependencyType
+        from phase16_schedule_dependencies import ScheduleDependencyAnalyzer
+
+        limiter = EventRateLimiter(rate=0, burst=5)
+        handler = ListHandler()
+        dep_logger = logging.getLogger('phase16_schedule_dependencies')
+        dep_logger.addHandler(handler)
+        dep_logger.setLevel(logging.DEBUG)
+        try:
+            with mock.patch.object(phase14_logging, 'event_limiter', limiter), \
+                    mock.patch('phase16_schedule_dependencies.event_limiter', limiter):
+                analyzer = ScheduleDependencyAnalyzer()
+                for i in range(1000):
+                    analyzer.add_task(Task(f't{i}', f't{i}', 1))
+                for i in range(999):
+                    analyzer.add_dependency(TaskDependency(f'd{i}', f't{i}', f't{i + 1}', DependencyType.FINISH_TO_START))
+                analyzer.calculate_critical_path()
+        finally:
+            dep_logger.removeHandler(handler)
+            dep_logger.setLevel(logging.NOTSET)
+        messages = [r.getMessage() for r in handler.records]
+        self.assertEqual(sum(m.startswith('Added dependency') for m in messages), 5)
+        self.assertIn('Suppressed 994 ADD_DEPENDENCY events', messages)
+        self.assertLess(messages.index('Suppressed 994 ADD_DEPENDENCY events'), messages.index('Calculating critical path...'))
+
+
+    def test_one_limiter_under_both_import_paths(self):
+        backend = Path(__file__).resolve().parent.parent
+        code = ("import app.phase14_logging as packaged, phase14_model_safety, phase16_schedule_dependencies as deps\n"
+                "import phase14_logging as bare\n"
+                "assert bare is packaged and deps.event_limiter is packaged.event_limiter\n"
+                "assert phase14_model_safety.event_limiter is packaged.event_limiter\n")
+        result = subprocess.run([sys.executable, '-c', code], cwd=str(backend), capture_output=True, text=True,
+                                env=dict(os.environ, PYTHONPATH=os.pathsep.join([str(backend), str(backend / 'app')])))
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+class TestBatchWrites(unittest.TestCase):
+
+    def test_rotation_within_a_batch(self):
+        log_dir = Path(tempfile.mkdtemp())
+        handler = logging.handlers.RotatingFileHandler(log_dir / 'app.log', maxBytes=300, backupCount=20)
+        records = [make_record(f'line {i:03d} ' + 'x' * 20) for i in range(60)]
+        _emit_batch(handler, records)
+        handler.close()
+        files = sorted(log_dir.iterdir(), key=lambda p: -int(p.suffix[1:]) if p.suffix != '.log' else 0)
+        self.assertGreater(len(files), 5)
+        self.assertTrue(all(p.stat().st_size <= 300 for p in files))
+        lines = [line for p in files for line in p.read_text().splitlines()]
+        self.assertEqual(lines, [r.getMessage() for r in records])
+
+
+class TestAsyncSetup(unittest.TestCase):
+
+    def setUp(self):
+        self.log_dir = Path(tempfile.mkdtemp())
+        self.root_handlers = logging.getLogger().handlers[:]
+        self.root_level = logging.getLogger().level
+
+    def tearDown(self):
+        shutdown_logging()
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        for handler in self.root_handlers:
+            root.addHandler(handler)
+        root.setLevel(self.root_level)
+
+    def test_listener_formats_and_shutdown_flushes(self):
+        setup_logging(app_name='async-test', log_dir=self.log_dir, async_mode=True)
+        listener = phase14_logging._queue_listener
+        formatter = ThreadRecordingFormatter()
+        listener.handlers[0].setFormatter(formatter)
+        listener.handlers[1].setLevel(logging.CRITICAL)  # keep the console quiet
+
+        from phase14_verification import StartupVerifier
+        self.assertEqual(StartupVerifier.check_logging_initialized(), (True, None))
+
+        logger = logging.getLogger('phase14.async')
+        for i in range(3000):
+            logger.info('event %d', i, extra={'details': {'i': i}})
+        shutdown_logging()
+
+        lines = [json.loads(line) for line in (self.log_dir / 'async-test.log').read_text().splitlines()]
+        events = [line for line in lines if line['message'].startswith('event ')]
+        self.assertEqual([e['details']['i'] for e in events], list(range(3000)))
+        self.assertNotIn(threading.current_thread().name, formatter.threads)
+        self.assertIsNone(phase14_logging._queue_listener)
+
+
+    def test_log_async_environment_flag(self):
+        for value, enabled in (('1', True), ('yes', True), ('TRUE', True), ('0', False), ('', False)):
+            with self.subTest(LOG_ASYNC=value), mock.patch.dict('os.environ', {'LOG_ASYNC': value}):
+                setup_logging(app_name='async-flag', log_dir=self.log_dir)
+                self.assertEqual(phase14_logging._queue_listener is not None, enabled)
+                shutdown_logging()
+
+if __name__ == "__main__":
+    unittest.main()
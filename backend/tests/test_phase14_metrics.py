@@ -0,0 +1,276 @@
+"""
+Phase 14: Unit Tests - Metrics Registry, Prometheus Exposition and Resource Sampling
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import unittest
+import phase14_performance
+from phase14_performance import (
+    LatencyHistogram, MemoryProbe, MetricsRegistry, MultiProcessMetrics, PerformanceTracker, ResourceMonitor,
+    ResourceSampler, current_process, install_request_metrics, metrics_registry, operation_timer,
+)
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_buckets_cover_values_contiguously(self):
+        histogram = LatencyHistogram()
+        previous_upper = 0
+        for index in range(4000):
+            lower, upper = histogram.bucket_bounds(index)
+            self.assertEqual(lower, previous_upper)
+            self.assertEqual(histogram.bucket(lower), index)
+            self.assertEqual(histogram.bucket(upper - 1), index)
+            if lower >= 1 << histogram.bits:
+                self.assertLessEqual((upper - lower) / upper, 2 / (1 << histogram.bits))
+            previous_upper = upper
+
+    def test_quantiles_within_relative_error(self):
+        rng = random.Random(3)
+        values = sorted(rng.lognormvariate(-5, 1.5) for _ in range(20000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+        for q in (0.5, 0.9, 0.99, 0.999):
+            exact = values[int(q * len(values) + 0.5) - 1]
+            self.assertAlmostEqual(histogram.quantile(q) / exact, 1, delta=0.02)
+        self.assertEqual(histogram.count, len(values))
+        self.assertAlmostEqual(histogram.sum, sum(values))
+        self.assertEqual(LatencyHistogram().quantile(0.5), 0.0)
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def test_render_prometheus_text(self):
+        registry = MetricsRegistry()
+        registry.describe('jobs_total', 'Jobs run')
+        registry.inc('jobs_total', labels={'kind': 'import', 'note': 'a "quoted"\\path'})
+        registry.inc('jobs_total', 2, labels={'kind': 'import', 'note': 'a "quoted"\\path'})
+        registry.set_gauge('queue_depth', 4.5)
+        for ms in (1, 2, 3, 40):
+            registry.observe('job_seconds', ms / 1000, {'kind': 'import'})
+        text = registry.render()
+        self.assertIn('# HELP jobs_total Jobs run\n# TYPE jobs_total counter\n', text)
+        self.assertIn('jobs_total{kind="import",note="a \\"quoted\\"\\\\path"} 3\n', text)
+        self.assertIn('# TYPE queue_depth gauge\nqueue_depth 4.5\n', text)
+        self.assertIn('job_seconds_bucket{kind="import",le="0.001"} 1\n', text)
+        self.assertIn('job_seconds_bucket{kind="import",le="0.01"} 3\n', text)
+        self.assertIn('job_seconds_bucket{kind="import",le="+Inf"} 4\n', text)
+        self.assertIn('job_seconds_count{kind="import"} 4\n', text)
+        self.assertIn('# TYPE job_seconds_quantiles summary\n', text)
+        median = next(line for line in text.splitlines() if line.startswith('job_seconds_quantiles{kind="import",quantile="0.5"}'))
+        self.assertAlmostEqual(float(median.split()[1]), 0.002, delta=0.00005)
+
+    def test_merge_snapshots(self):
+        workers = [MetricsRegistry() for _ in range(3)]
+        for i, registry in enumerate(workers):
+            registry.inc('requests_total', i + 1, {'endpoint': '/x'})
+            registry.set_gauge('in_progress', 1)
+            for _ in range(100):
+                registry.observe('latency_seconds', 0.01 * (i + 1), {'endpoint': '/x'})
+        merged = MetricsRegistry()
+        for registry in workers:
+            merged.merge(json.loads(json.dumps(registry.snapshot())))
+        self.assertEqual(merged.counter_value('requests_total', {'endpoint': '/x'}), 6)
+        self.assertEqual(merged.gauge_value('in_progress'), 3)
+        histogram = merged.histogram('latency_seconds', {'endpoint': '/x'})
+        self.assertEqual(histogram.count, 300)
+        self.assertAlmostEqual(histogram.quantile(0.5), 0.02, delta=0.0005)
+
+    def test_max_merged_gauges(self):
+        workers = [MetricsRegistry() for _ in range(2)]
+        for i, registry in enumerate(workers):
+            registry.describe('host_load', 'Host load', gauge_merge='max')
+            registry.set_gauge('host_load', 40 + i)
+            registry.set_gauge('worker_rss', 100)
+        merged = MetricsRegistry()
+        for registry in workers:
+            merged.merge(registry.snapshot())
+        self.assertEqual(merged.gauge_value('host_load'), 41)
+        self.assertEqual(merged.gauge_value('worker_rss'), 200)
+
+
+class TestMultiProcessMetrics(unittest.TestCase):
+
+    def test_collect_merges_workers_and_skips_gauges_of_exited_ones(self):
+        directory = Path(tempfile.mkdtemp())
+        collector = MultiProcessMetrics(directory, interval=60)
+        exited = MetricsRegistry()
+        exited.inc('requests_total', 5)
+        exited.set_gauge('in_progress', 7)
+        snapshot = exited.snapshot()
+        snapshot['pid'] = 2 ** 22 + 12345  # above the default pid_max
+        (directory / f"metrics-{snapshot['pid']}.json").write_text(json.dumps(snapshot))
+
+        local = MetricsRegistry()
+        local.inc('requests_total', 2)
+        local.set_gauge('in_progress', 1)
+        collector.write(local)
+        local.inc('requests_total', 10)
+        collector.maybe_write(local)  # within the interval: not rewritten
+
+        merged = collector.collect()
+        self.assertEqual(merged.counter_value('requests_total'), 7)
+        self.assertEqual(merged.gauge_value('in_progress'), 1)
+        started = int(current_process().create_time() * 1000)
+        self.assertEqual(sorted(p.name for p in directory.iterdir()),
+                         sorted([f"metrics-{snapshot['pid']}.json", f"metrics-{os.getpid()}-{started}.json"]))
+
+    def test_restarted_worker_with_reused_pid_keeps_predecessor_totals(self):
+        directory = Path(tempfile.mkdtemp())
+        collector = MultiProcessMetrics(directory, interval=60)
+        predecessor = MetricsRegistry()
+        predecessor.inc('requests_total', 5)
+        predecessor.set_gauge('in_progress', 7)
+        snapshot = predecessor.snapshot()
+        snapshot['pid'] = os.getpid()
+        snapshot['started'] = 1000.0  # same pid, earlier process
+        (directory / f"metrics-{os.getpid()}-1000000.json").write_text(json.dumps(snapshot))
+
+        local = MetricsRegistry()
+        local.inc('requests_total', 2)
+        local.set_gauge('in_progress', 1)
+        collector.write(local)
+
+        merged = collector.collect()
+        self.assertEqual(merged.counter_value('requests_total'), 7)
+        self.assertEqual(merged.gauge_value('in_progress'), 1)
+        self.assertEqual(len(list(directory.glob('metrics-*.json'))), 2)
+
+    def test_render_metrics_uses_collector(self):
+        directory = Path(tempfile.mkdtemp())
+        collector = MultiProcessMetrics(directory)
+        other = MetricsRegistry()
+        other.inc('operations_total', 40, {'operation': 'load', 'outcome': 'success'})
+        snapshot = other.snapshot()
+        snapshot['pid'] = os.getppid()
+        (directory / f"metrics-{os.getppid()}.json").write_text(json.dumps(snapshot))
+        with mock.patch.object(phase14_performance, 'multiprocess_metrics', collector):
+            metrics_registry.reset()
+            with operation_timer('load'):
+                pass
+            text = phase14_performance.render_metrics()
+        metrics_registry.reset()
+        self.assertIn('operations_total{operation="load",outcome="success"} 41\n', text)
+
+
+class TestOperationMetrics(unittest.TestCase):
+
+    def setUp(self):
+        metrics_registry.reset()
+        self.addCleanup(metrics_registry.reset)
+
+    def test_tracker_and_timer_feed_registry(self):
+        @phase14_performance.track_performance
+        def build_report():
+            return 1
+
+        build_report()
+        with self.assertRaises(ValueError):
+            with PerformanceTracker('build_report'):
+                raise ValueError('bad')
+        with self.assertRaises(KeyError):
+            with operation_timer('lookup'):
+                raise KeyError('x')
+
+        self.assertEqual(metrics_registry.counter_value(
+            'operations_total', {'operation': 'build_report', 'outcome': 'success'}), 1)
+        self.assertEqual(metrics_registry.counter_value(
+            'operations_total', {'operation': 'build_report', 'outcome': 'failure'}), 1)
+        self.assertEqual(metrics_registry.counter_value(
+            'operations_total', {'operation': 'lookup', 'outcome': 'failure'}), 1)
+        self.assertEqual(metrics_registry.histogram('operation_duration_seconds', {'operation': 'build_report'}).count, 2)
+
+    def test_flask_request_hooks(self):
+        from flask import Flask
+        app = Flask(__name__)
+        install_request_metrics(app)
+
+        @app.route('/items/<item_id>')
+        def item(item_id):
+            if item_id == 'boom':
+                raise RuntimeError('boom')
+            return 'ok'
+
+        client = app.test_client()
+        for item_id in ('1', '2', 'boom'):
+            client.get(f'/items/{item_id}')
+        client.get('/metrics')
+
+        labels = {'method': 'GET', 'endpoint': '/items/<item_id>'}
+        self.assertEqual(metrics_registry.counter_value('http_requests_total', dict(labels, status=200)), 2)
+        self.assertEqual(metrics_registry.counter_value('http_requests_total', dict(labels, status=500)), 1)
+        self.assertEqual(metrics_registry.counter_value(
+            'http_requests_total', {'method': 'GET', 'endpoint': 'unmatched', 'status': 404}), 0)
+        self.assertEqual(metrics_registry.histogram('http_request_duration_seconds', labels).count, 3)
+        self.assertEqual(metrics_registry.gauge_value('http_requests_in_progress'), 0)
+
+
+class TestResourceAccounting(unittest.TestCase):
+
+    def test_process_handle_cached(self):
+        self.assertIs(current_process(), current_process())
+        self.assertEqual(current_process().pid, os.getpid())
+
+    def test_memory_probe_modes(self):
+        self.assertIsInstance(MemoryProbe('rss').stop(MemoryProbe('rss').start()), float)
+        self.assertIsNone(MemoryProbe('off').start())
+        with self.assertRaises(ValueError):
+            MemoryProbe('heap')
+
+        self.assertFalse(tracemalloc.is_tracing())
+        probe = MemoryProbe('tracemalloc', sample_every=3)
+        deltas = []
+        for _ in range(6):
+            token = probe.start()
+            self.assertEqual(tracemalloc.is_tracing(), token is not None)
+            block = bytearray(4 * 1024 * 1024)
+            deltas.append(probe.stop(token))
+            del block
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual([d is not None for d in deltas], [True, False, False, True, False, False])
+        self.assertGreaterEqual(deltas[0], 3.9)
+
+        other = MemoryProbe('tracemalloc', sample_every=1)
+        outer, inner = probe.start(), other.start()
+        probe.stop(outer)
+        self.assertTrue(tracemalloc.is_tracing())  # still needed by the other probe
+        other.stop(inner)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_sampler_publishes_gauges_without_blocking(self):
+        registry = MetricsRegistry()
+        sampler = ResourceSampler(interval=0.05, registry=registry)
+        self.assertIsNone(sampler.latest())
+        sampler.start()
+        self.addCleanup(sampler.stop)
+        first = sampler.latest()
+        deadline = time.time() + 5
+        while sampler.latest() is first and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertIsNot(sampler.latest(), first)
+        self.assertGreater(registry.gauge_value('process_resident_memory_bytes'), 0)
+        for name in ('process_cpu_percent', 'system_cpu_percent', 'system_memory_percent'):
+            self.assertIsNotNone(registry.gauge_value(name))
+        sampler.stop()
+        self.assertIsNone(sampler._thread)
+
+        start = time.perf_counter()
+        usage = ResourceMonitor.get_cpu_usage()
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertIn('percent', usage)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,6 +12,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 import unittest
+from unittest import mock
 from phase16_types import (
     Task, TaskDependency, DependencyType, TaskStatus
 )
@@ -155,6 +156,123 @@ class TestScheduleDependencyAnalyzer(unittest.TestCase):
         self.assertIn("interior", scope)
 
 
+class TestDependencyEdgeIndex(unittest.TestCase):
+    """Test the indexed edge store used by the CPM passes"""
+    
+    def setUp(self):
+        self.analyzer = ScheduleDependencyAnalyzer()
+        for task_id in ("a", "b", "c"):
+            self.analyzer.add_task(Task(task_id, f"Task {task_id}", 4))
+        self.analyzer.add_dependency(TaskDependency(
+            "dep1", "a", "b", DependencyType.FINISH_TO_START, lag_days=2
+        ))
+        self.analyzer.add_dependency(TaskDependency(
+            "dep2", "b", "c", DependencyType.FINISH_TO_START, lag_days=0
+        ))
+    
+    def test_pair_lookup(self):
+        """Edges are retrievable by (predecessor, successor)"""
+        edges = self.analyzer.edges
+        self.assertEqual(edges.get("a", "b").dependency_id, "dep1")
+        self.assertEqual(edges.lag("a", "b"), 2)
+        self.assertEqual(edges.lag("a", "c"), 0)
+        self.assertIsNone(edges.get("c", "a"))
+        self.assertEqual([d.dependency_id for d in edges.out_edges["b"]], ["dep2"])
+        self.assertEqual([d.dependency_id for d in edges.in_edges["b"]], ["dep1"])
+    
+    def test_lag_applied_in_both_passes(self):
+        """Lags from the index shift earliest and latest dates"""
+        cp = self.analyzer.calculate_critical_path()
+        self.assertEqual(cp.project_duration_days, 14)
+        self.assertEqual(cp.critical_path, ["a", "b", "c"])
+    
+    def test_rejected_dependency_not_indexed(self):
+        """Dependencies on unknown tasks are not added to the index"""
+        self.analyzer.add_dependency(TaskDependency(
+            "dep3", "c", "missing", DependencyType.FINISH_TO_START
+        ))
+        self.assertIsNone(self.analyzer.edges.get("c", "missing"))
+    
+    def test_cpm_visits_each_edge_once_per_pass(self):
+        """CPM walks the edge index: one offset per dependency and pass, never a scan of all dependencies"""
+        import phase16_schedule_dependencies
+        
+        class ScanCountingDict(dict):
+            scans = 0
+            
+            def values(self):
+                self.scans += 1
+                return super().values()
+            
+            def items(self):
+                self.scans += 1
+                return super().items()
+            
+            def __iter__(self):
+                self.scans += 1
+                return super().__iter__()
+        
+        for n in (500, 8000):
+            analyzer = ScheduleDependencyAnalyzer()
+            for i in range(n):
+                analyzer.add_task(Task(f"t{i}", f"Task {i}", 1 + i % 7))
+            for i in range(1, n):
+                for pred in {i - 1, i // 2}:
+                    analyzer.add_dependency(TaskDependency(
+                        f"d{i}_{pred}", f"t{pred}", f"t{i}", DependencyType.FINISH_TO_START
+                    ))
+            analyzer.dependencies = ScanCountingDict(analyzer.dependencies)
+            with mock.patch.object(phase16_schedule_dependencies, 'start_offset',
+                                   wraps=phase16_schedule_dependencies.start_offset) as offsets:
+                analyzer.calculate_critical_path()
+            with self.subTest(tasks=n):
+                self.assertEqual(offsets.call_count, 2 * len(analyzer.dependencies))
+                self.assertEqual(analyzer.dependencies.scans, 0)
+
+
+class TestDependencyTypes(unittest.TestCase):
+    """CPM and delay propagation honor SS/FF/SF relationships"""
+    
+    def analyze(self, dep_type, lag=0):
+        analyzer = ScheduleDependencyAnalyzer()
+        analyzer.add_task(Task("a", "Task A", 5))
+        analyzer.add_task(Task("b", "Task B", 3))
+        analyzer.add_dependency(TaskDependency("dep1", "a", "b", dep_type, lag_days=lag))
+        return analyzer, analyzer.calculate_critical_path()
+    
+    def test_finish_to_start(self):
+        _, cp = self.analyze(DependencyType.FINISH_TO_START)
+        self.assertEqual(cp.project_duration_days, 8)
+    
+    def test_start_to_start(self):
+        """B starts 2 days after A starts and finishes with it"""
+        _, cp = self.analyze(DependencyType.START_TO_START, lag=2)
+        self.assertEqual(cp.project_duration_days, 5)
+        self.assertEqual(cp.slack_by_task, {"a": 0, "b": 0})
+    
+    def test_finish_to_finish(self):
+        """B finishes 1 day after A finishes"""
+        _, cp = self.analyze(DependencyType.FINISH_TO_FINISH, lag=1)
+        self.assertEqual(cp.project_duration_days, 6)
+        self.assertEqual(cp.critical_path, ["a", "b"])
+    
+    def test_start_to_finish(self):
+        """B only has to finish after A starts, so it floats"""
+        _, cp = self.analyze(DependencyType.START_TO_FINISH)
+        self.assertEqual(cp.project_duration_days, 5)
+        self.assertEqual(cp.slack_by_task, {"a": 0, "b": 2})
+    
+    def test_delay_through_start_anchored_dependency(self):
+        """A finish overrun does not push a start-to-start successor"""
+        analyzer, cp = self.analyze(DependencyType.START_TO_START)
+        engine = DelayPropagationEngine(analyzer)
+        self.assertEqual(engine.simulate_task_delay("a", 4, cp.critical_path).affected_tasks, {})
+        
+        analyzer, cp = self.analyze(DependencyType.FINISH_TO_FINISH)
+        engine = DelayPropagationEngine(analyzer)
+        self.assertEqual(engine.simulate_task_delay("a", 4, cp.critical_path).affected_tasks, {"b": 4})
+
+
 class TestDelayPropagationEngine(unittest.TestCase):
     """Test delay propagation modeling"""
     
@@ -201,7 +319,18 @@ class TestDelayPropagationEngine(unittest.TestCase):
         
         # 2-day delay with 3-day lag should not propagate to C
         self.assertNotIn("c", delay_prop.affected_tasks)
-    
+
+    def test_larger_delay_on_later_path_wins(self):
+        """A delay reaching a task along a second path is max-merged, not dropped"""
+        # a -> c directly with a 4-day lag, and a -> b -> c without lag
+        self.analyzer.add_dependency(TaskDependency(
+            "dep3", "a", "c", DependencyType.FINISH_TO_START, lag_days=4
+        ))
+        cp = self.analyzer.calculate_critical_path()
+        delay_prop = self.engine.simulate_task_delay("a", 6, cp.critical_path)
+        self.assertEqual(delay_prop.affected_tasks, {"b": 6, "c": 6})
+        self.assertEqual(delay_prop.propagation_path, ["a", "b", "c"])
+
     def test_schedule_resilience(self):
         """Test resilience calculation"""
         cp = self.analyzer.calculate_critical_path()
@@ -0,0 +1,182 @@
+"""
+Phase 16: Parity Tests - Vectorized CPM Engine
+
+Checks that the array-backed engine returns exactly the same
+CriticalPathAnalysis as the dict-based ScheduleDependencyAnalyzer.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import unittest
+from phase16_types import Task, TaskDependency, DependencyType, TaskStatus
+from phase16_schedule_dependencies import ScheduleDependencyAnalyzer
+from phase16_cpm_engine import CompiledScheduleGraph, VectorizedCPMEngine
+
+
+def random_schedule(n_tasks, n_edges, seed, max_lag=3, mixed_types=False):
+    """Random DAG (edges only go from lower to higher index, in shuffled task order)"""
+    rng = random.Random(seed)
+    dep_types = list(DependencyType) if mixed_types else [DependencyType.FINISH_TO_START]
+    analyzer = ScheduleDependencyAnalyzer()
+    ids = [f"t{i}" for i in range(n_tasks)]
+    insertion = ids[:]
+    rng.shuffle(insertion)
+    for task_id in insertion:
+        analyzer.add_task(Task(task_id, task_id, rng.randint(0, 15)))
+    for e in range(n_edges):
+        a, b = sorted(rng.sample(range(n_tasks), 2))
+        analyzer.add_dependency(TaskDependency(
+            f"d{e}", ids[a], ids[b], rng.choice(dep_types),
+            lag_days=rng.randint(0, max_lag)
+        ))
+    return analyzer
+
+
+class TestVectorizedCPMParity(unittest.TestCase):
+    """Vectorized engine must match the reference CPM implementation"""
+
+    def assertSameAnalysis(self, analyzer):
+        expected = analyzer.calculate_critical_path()
+        actual = VectorizedCPMEngine(analyzer).calculate_critical_path()
+        self.assertEqual(actual.project_duration_days, expected.project_duration_days)
+        self.assertEqual(actual.slack_by_task, expected.slack_by_task)
+        self.assertEqual(list(actual.slack_by_task), list(expected.slack_by_task))
+        self.assertEqual(actual.critical_tasks, expected.critical_tasks)
+        self.assertEqual(actual.critical_path, expected.critical_path)
+        self.assertEqual(sorted(actual.bottleneck_tasks), sorted(expected.bottleneck_tasks))
+        for value in actual.slack_by_task.values():
+            self.assertIsInstance(value, int)
+
+    def test_reference_project(self):
+        """Foundation/framing/electrical example from the analyzer tests"""
+        analyzer = ScheduleDependencyAnalyzer()
+        for task_id, duration in [("foundation", 10), ("framing", 15), ("roofing", 8),
+                                  ("electrical", 12), ("interior", 20)]:
+            analyzer.add_task(Task(task_id, task_id.title(), duration))
+        for dep_id, pred, succ, lag in [("dep1", "foundation", "framing", 1),
+                                        ("dep2", "foundation", "electrical", 0),
+                                        ("dep3", "framing", "roofing", 2),
+                                        ("dep4", "roofing", "interior", 0),
+                                        ("dep5", "electrical", "interior", 1)]:
+            analyzer.add_dependency(TaskDependency(dep_id, pred, succ, DependencyType.FINISH_TO_START, lag))
+        self.assertSameAnalysis(analyzer)
+
+    def test_empty_and_isolated(self):
+        """No tasks, and tasks without any dependencies"""
+        self.assertSameAnalysis(ScheduleDependencyAnalyzer())
+        analyzer = ScheduleDependencyAnalyzer()
+        for i in range(4):
+            analyzer.add_task(Task(f"solo{i}", "Solo", 3 + i))
+        self.assertSameAnalysis(analyzer)
+
+    def test_parallel_edges_and_completed_successors(self):
+        """Duplicate task pairs use the largest lag; completed successors are not bottlenecks"""
+        analyzer = ScheduleDependencyAnalyzer()
+        analyzer.add_task(Task("a", "A", 5))
+        analyzer.add_task(Task("b", "B", 5, status=TaskStatus.COMPLETED))
+        analyzer.add_task(Task("c", "C", 2))
+        analyzer.add_dependency(TaskDependency("d1", "a", "b", DependencyType.FINISH_TO_START, 1))
+        analyzer.add_dependency(TaskDependency("d2", "a", "b", DependencyType.FINISH_TO_START, 4))
+        analyzer.add_dependency(TaskDependency("d3", "a", "c", DependencyType.FINISH_TO_START, 0))
+        self.assertSameAnalysis(analyzer)
+
+    def test_random_graphs(self):
+        """Random DAGs of varying density"""
+        for seed, (n, e) in enumerate([(10, 15), (60, 40), (200, 600), (500, 2000), (1500, 1500)]):
+            with self.subTest(seed=seed, tasks=n, edges=e):
+                self.assertSameAnalysis(random_schedule(n, e, seed))
+
+    def test_random_mixed_type_graphs(self):
+        """Random DAGs mixing FS/SS/FF/SF dependencies"""
+        for seed, (n, e) in enumerate([(10, 20), (200, 600), (800, 1600)]):
+            with self.subTest(seed=seed, tasks=n, edges=e):
+                self.assertSameAnalysis(random_schedule(n, e, seed, mixed_types=True))
+
+    def test_wide_fan_in_and_fan_out(self):
+        """Hub tasks with more predecessors/successors than the per-rank merges cover"""
+        analyzer = random_schedule(120, 200, seed=11, mixed_types=True)
+        analyzer.add_task(Task("hub_in", "Hub In", 3))
+        analyzer.add_task(Task("hub_out", "Hub Out", 2))
+        for i in range(60):
+            analyzer.add_dependency(TaskDependency(f"in{i}", f"t{i}", "hub_in", DependencyType.FINISH_TO_START, i % 4))
+            analyzer.add_dependency(TaskDependency(f"out{i}", "hub_out", f"t{i + 60}", DependencyType.START_TO_START, i % 3))
+        self.assertSameAnalysis(analyzer)
+
+    def test_large_mixed_type_graph(self):
+        """50k+ mixed-type edges: engines agree and every constraint holds"""
+        import numpy as np
+
+        analyzer = random_schedule(20000, 55000, seed=3, mixed_types=True)
+        self.assertSameAnalysis(analyzer)
+
+        graph = CompiledScheduleGraph.from_analyzer(analyzer)
+        earliest_start, _ = graph.forward_pass()
+        required = earliest_start[graph.edge_pred] + graph.start_offsets()
+        self.assertTrue(np.all(earliest_start[graph.edge_succ] >= required))
+        # every task starting after day 0 is pinned by at least one dependency
+        binding = np.zeros(graph.num_tasks, dtype=bool)
+        binding[graph.edge_succ[earliest_start[graph.edge_succ] == required]] = True
+        self.assertTrue(np.all(binding[earliest_start > 0]))
+
+    def test_compiled_graph_levels(self):
+        """Levels are longest-path depths and topo order respects every edge"""
+        analyzer = random_schedule(300, 900, seed=7)
+        graph = CompiledScheduleGraph.from_analyzer(analyzer)
+        position = {int(node): i for i, node in enumerate(graph.topo_order)}
+        for pred, succ in zip(graph.edge_pred, graph.edge_succ):
+            self.assertLess(position[int(pred)], position[int(succ)])
+            self.assertGreater(graph.level[succ], graph.level[pred])
+        self.assertEqual(len(graph.topo_order), graph.num_tasks)
+
+    def test_cycle_rejected(self):
+        """Cyclic schedules cannot be compiled"""
+        analyzer = ScheduleDependencyAnalyzer()
+        analyzer.add_task(Task("a", "A", 1))
+        analyzer.add_task(Task("b", "B", 1))
+        analyzer.add_dependency(TaskDependency("d1", "a", "b", DependencyType.FINISH_TO_START))
+        analyzer.add_dependency(TaskDependency("d2", "b", "a", DependencyType.FINISH_TO_START))
+        with self.assertRaises(ValueError):
+            CompiledScheduleGraph.from_analyzer(analyzer)
+
+
+class TestAnalyzeEndpointEngine(unittest.TestCase):
+    """/api/schedule/analyze engine selection"""
+
+    def setUp(self):
+        from flask import Flask
+        from phase16_api import schedule_bp
+        app = Flask(__name__)
+        app.register_blueprint(schedule_bp)
+        self.client = app.test_client()
+        self.payload = {
+            "project_id": "P1",
+            "tasks": [
+                {"task_id": "a", "duration_days": 4},
+                {"task_id": "b", "duration_days": 6},
+                {"task_id": "c", "duration_days": 2},
+            ],
+            "dependencies": [
+                {"dependency_id": "d1", "predecessor_task_id": "a", "successor_task_id": "b"},
+                {"dependency_id": "d2", "predecessor_task_id": "a", "successor_task_id": "c", "lag_days": 1},
+            ],
+        }
+
+    def test_engines_agree(self):
+        dict_resp = self.client.post('/api/schedule/analyze', json=self.payload).get_json()
+        vec_resp = self.client.post('/api/schedule/analyze?engine=vectorized', json=self.payload).get_json()
+        self.assertEqual(vec_resp["engine"], "vectorized")
+        self.assertEqual(dict_resp["engine"], "dict")
+        for key in ("critical_path", "project_duration_days", "schedule_resilience_score"):
+            self.assertEqual(vec_resp[key], dict_resp[key])
+
+    def test_unknown_engine(self):
+        resp = self.client.post('/api/schedule/analyze', json=dict(self.payload, engine="quantum"))
+        self.assertEqual(resp.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,207 @@
+"""
+Phase 16: Unit Tests - Dependency Cycle Detection
+
+Every dependency loop must be reported with its tasks and loop dependencies,
+and cyclic schedules must either be rejected or analyzed around the loops
+(excluding or condensing them) instead of yielding incomplete CPM dates.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import unittest
+from phase16_types import Task, TaskDependency, DependencyType, CycleMode
+from phase16_schedule_dependencies import ScheduleDependencyAnalyzer
+from phase16_cycles import ScheduleCycleError, find_dependency_cycles
+from phase16_schedule_store import schedule_store
+from test_phase16_cpm_engine import random_schedule
+
+
+def build(durations, links, cycle_mode=CycleMode.EXCLUDE):
+    analyzer = ScheduleDependencyAnalyzer(cycle_mode)
+    for task_id, duration in durations.items():
+        analyzer.add_task(Task(task_id, task_id, duration))
+    for pred, succ in links:
+        analyzer.add_dependency(TaskDependency(pred + succ, pred, succ, DependencyType.FINISH_TO_START))
+    return analyzer
+
+
+def reachable(analyzer, task_id):
+    seen, stack = set(), [task_id]
+    while stack:
+        for succ in analyzer.adjacency_list[stack.pop()]:
+            if succ not in seen:
+                seen.add(succ)
+                stack.append(succ)
+    return seen
+
+
+class TestFindCycles(unittest.TestCase):
+
+    def test_reference_cycles(self):
+        analyzer = build({t: 1 for t in "abcdefg"},
+                         [("a", "b"), ("b", "c"), ("c", "a"), ("c", "d"), ("d", "e"), ("e", "d"), ("f", "f"), ("a", "g")])
+        cycles = analyzer.find_cycles()
+        self.assertEqual([(c.task_ids, sorted(c.dependency_ids)) for c in cycles], [
+            (["a", "b", "c"], ["ab", "bc", "ca"]),
+            (["d", "e"], ["de", "ed"]),
+            (["f"], ["ff"]),
+        ])
+        self.assertEqual(cycles[0].to_dict(), {"task_ids": ["a", "b", "c"], "dependency_ids": ["ab", "bc", "ca"]})
+        self.assertEqual(build({t: 1 for t in "abc"}, [("a", "b"), ("b", "c")]).find_cycles(), [])
+
+    def test_matches_mutual_reachability(self):
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                analyzer = random_schedule(80, 120, seed=seed)
+                rng = random.Random(seed)
+                for i in range(6):
+                    a, b = sorted(rng.sample(range(80), 2))
+                    analyzer.add_dependency(TaskDependency(f"back{i}", f"t{b}", f"t{a}", DependencyType.FINISH_TO_START))
+                closure = {t: reachable(analyzer, t) for t in analyzer.tasks}
+                expected = {t: frozenset(u for u in closure[t] if t in closure[u]) for t in analyzer.tasks}
+                cycles = find_dependency_cycles(analyzer.tasks, analyzer.edges.out_edges)
+                found = {t: frozenset(c.task_ids) for c in cycles for t in c.task_ids}
+                self.assertEqual(found, {t: scc for t, scc in expected.items() if scc})
+                for cycle in cycles:
+                    members = set(cycle.task_ids)
+                    self.assertEqual(sorted(cycle.dependency_ids), sorted(
+                        d.dependency_id for d in analyzer.dependencies.values()
+                        if d.predecessor_task_id in members and d.successor_task_id in members))
+
+    def test_deep_cycle_is_iterative(self):
+        n = 20000
+        analyzer = build({f"t{i}": 1 for i in range(n)}, [(f"t{i}", f"t{i + 1}") for i in range(n - 1)])
+        analyzer.add_dependency(TaskDependency("back", f"t{n - 1}", "t0", DependencyType.FINISH_TO_START))
+        self.assertEqual(len(analyzer.find_cycles()[0].task_ids), n)
+
+
+class TestCycleModes(unittest.TestCase):
+
+    def setUp(self):
+        self.durations = {"a": 3, "b": 2, "c": 4, "d": 1, "e": 5}
+        self.links = [("a", "b"), ("b", "c"), ("c", "b"), ("c", "d"), ("a", "e")]
+
+    def test_fail(self):
+        analyzer = build(self.durations, self.links, CycleMode.FAIL)
+        with self.assertRaises(ScheduleCycleError) as ctx:
+            analyzer.calculate_critical_path()
+        self.assertEqual([c.task_ids for c in ctx.exception.cycles], [["b", "c"]])
+        self.assertIsNone(analyzer.current_analysis)
+
+    def test_exclude_matches_schedule_without_cycle(self):
+        cp = build(self.durations, self.links).calculate_critical_path()
+        self.assertEqual(cp.excluded_tasks, ["b", "c"])
+        self.assertEqual([c.dependency_ids for c in cp.cycles], [["bc", "cb"]])
+        self.assertEqual(cp.slack_by_task, {"a": 0, "d": 7, "e": 0})
+        self.assertEqual(cp.project_duration_days, 8)
+        self.assertEqual(cp.critical_path, ["a", "e"])
+
+    def test_condense_shares_block_start(self):
+        analyzer = build(self.durations, self.links)
+        cp = analyzer.calculate_critical_path(CycleMode.CONDENSE)
+        # b and c both start at 3; d follows c (3 + 4); e runs 3..8
+        self.assertEqual(cp.project_duration_days, 8)
+        self.assertEqual(cp.slack_by_task, {"a": 0, "b": 0, "c": 0, "d": 0, "e": 0})
+        self.assertEqual(cp.excluded_tasks, [])
+        self.assertEqual(len(cp.cycles), 1)
+        self.assertLessEqual(len(cp.critical_path), 5)
+        self.assertIsNone(analyzer.current_analysis)
+
+    def test_random_exclude_matches_pruned_schedule(self):
+        for seed in range(4):
+            with self.subTest(seed=seed):
+                analyzer = random_schedule(120, 240, seed=seed, mixed_types=True)
+                rng = random.Random(seed)
+                for i in range(3):
+                    start = rng.choice([t for t in sorted(analyzer.tasks) if analyzer.adjacency_list[t]])
+                    end = rng.choice(sorted(reachable(analyzer, start)))
+                    analyzer.add_dependency(TaskDependency(f"back{i}", end, start, DependencyType.FINISH_TO_START))
+                cp = analyzer.calculate_critical_path()
+                self.assertTrue(cp.cycles)
+                excluded = set(cp.excluded_tasks)
+
+                pruned = ScheduleDependencyAnalyzer()
+                for task_id, task in analyzer.tasks.items():
+                    if task_id not in excluded:
+                        pruned.add_task(Task(task_id, task_id, task.duration_days))
+                for dep in analyzer.dependencies.values():
+                    if dep.predecessor_task_id not in excluded and dep.successor_task_id not in excluded:
+                        pruned.add_dependency(dep)
+                expected = pruned.calculate_critical_path()
+                self.assertEqual(cp.slack_by_task, expected.slack_by_task)
+                self.assertEqual(cp.project_duration_days, expected.project_duration_days)
+                self.assertEqual(cp.critical_tasks, expected.critical_tasks)
+
+    def test_acyclic_schedule_reports_nothing(self):
+        cp = random_schedule(50, 100, seed=1).calculate_critical_path(CycleMode.FAIL)
+        self.assertEqual((cp.cycles, cp.excluded_tasks), ([], []))
+
+
+class TestAnalyzeEndpointCycles(unittest.TestCase):
+
+    def setUp(self):
+        from flask import Flask
+        from phase16_api import schedule_bp
+        schedule_store.clear()
+        app = Flask(__name__)
+        app.register_blueprint(schedule_bp)
+        self.client = app.test_client()
+        self.payload = {
+            "project_id": "P15",
+            "tasks": [{"task_id": t, "duration_days": 2} for t in "abcd"],
+            "dependencies": [{"dependency_id": p + s, "predecessor_task_id": p, "successor_task_id": s}
+                             for p, s in [("a", "b"), ("b", "c"), ("c", "b"), ("c", "d")]],
+        }
+
+    def test_modes(self):
+        for engine in ("dict", "vectorized"):
+            with self.subTest(engine=engine):
+                body = self.client.post(f'/api/schedule/analyze?engine={engine}', json=self.payload).get_json()
+                self.assertEqual(body["cycles"], [{"task_ids": ["b", "c"], "dependency_ids": ["bc", "cb"]}])
+                self.assertEqual(body["excluded_tasks"], ["b", "c"])
+                self.assertEqual(body["cycle_mode"], "exclude")
+                self.assertEqual(body["engine"], "dict")
+                self.assertEqual(body["requested_engine"], engine)
+                self.assertEqual(len(body["warnings"]), int(engine == "vectorized"))
+
+        body = self.client.post('/api/schedule/analyze', json=dict(self.payload, cycle_mode="condense")).get_json()
+        self.assertEqual(body["excluded_tasks"], [])
+        self.assertEqual(body["project_duration_days"], 6)
+        self.assertFalse(body["cached"])
+
+        resp = self.client.post('/api/schedule/analyze?cycle_mode=fail', json=self.payload)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.get_json()["cycles"][0]["task_ids"], ["b", "c"])
+
+        resp = self.client.post('/api/schedule/analyze?cycle_mode=ignore', json=self.payload)
+        self.assertEqual(resp.status_code, 400)
+
+    def test_vectorized_fallback_reported_and_cached(self):
+        first = self.client.post('/api/schedule/analyze?engine=vectorized', json=self.payload).get_json()
+        self.assertEqual((first["engine"], first["requested_engine"]), ("dict", "vectorized"))
+        again = self.client.post('/api/schedule/analyze?engine=vectorized', json=self.payload).get_json()
+        self.assertTrue(again["cached"])
+        resp = self.client.get('/api/schedule/critical-path/P15')
+        self.assertEqual(resp.headers["ETag"].strip('"'), first["etag"])
+        as_dict = self.client.post('/api/schedule/analyze', json=self.payload).get_json()
+        self.assertEqual(as_dict["etag"], first["etag"])  # same analysis, same validator
+
+    def test_cycle_mode_change_revalidates(self):
+        self.client.post('/api/schedule/analyze', json=self.payload)
+        first = self.client.get('/api/schedule/critical-path/P15')
+        self.assertEqual(first.get_json()["excluded_tasks"], ["b", "c"])
+
+        self.client.post('/api/schedule/analyze', json=dict(self.payload, cycle_mode="condense"))
+        resp = self.client.get('/api/schedule/critical-path/P15', headers={"If-None-Match": first.headers["ETag"]})
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp.headers["ETag"], first.headers["ETag"])
+        self.assertEqual(resp.get_json()["excluded_tasks"], [])
+        self.assertNotEqual(resp.get_json()["critical_path"], first.get_json()["critical_path"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Phase 16: Unit Tests - Incremental Critical Path Recomputation
+
+Edits applied to an analyzed schedule must leave it in exactly the state a
+fresh full CPM run would produce.
+"""
+
+import random
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import unittest
+from phase16_types import Task, TaskDependency, DependencyType, TaskStatus
+from phase16_schedule_dependencies import ScheduleDependencyAnalyzer
+
+
+def fresh_analysis(analyzer):
+    """Full CPM on an independent copy of the analyzer's schedule"""
+    copy = ScheduleDependencyAnalyzer()
+    for task in analyzer.tasks.values():
+        copy.add_task(replace(task))
+    for dep in analyzer.dependencies.values():
+        copy.add_dependency(replace(dep))
+    return copy.calculate_critical_path()
+
+
+class TestIncrementalCriticalPath(unittest.TestCase):
+    """Incremental edits vs full recomputation"""
+
+    def setUp(self):
+        # a(5) -> b(3) -> d(4)
+        #      \-> c(2) -/
+        self.analyzer = ScheduleDependencyAnalyzer()
+        for task_id, duration in [("a", 5), ("b", 3), ("c", 2), ("d", 4)]:
+            self.analyzer.add_task(Task(task_id, task_id.upper(), duration))
+        for dep_id, pred, succ in [("ab", "a", "b"), ("ac", "a", "c"), ("bd", "b", "d"), ("cd", "c", "d")]:
+            self.analyzer.add_dependency(TaskDependency(dep_id, pred, succ, DependencyType.FINISH_TO_START))
+        self.cp = self.analyzer.calculate_critical_path()
+
+    def assertMatchesFresh(self):
+        expected = fresh_analysis(self.analyzer)
+        actual = self.analyzer.current_analysis
+        self.assertIsNotNone(actual)
+        self.assertEqual(actual.project_duration_days, expected.project_duration_days)
+        self.assertEqual(actual.slack_by_task, expected.slack_by_task)
+        self.assertEqual(actual.critical_tasks, expected.critical_tasks)
+        self.assertEqual(sorted(actual.bottleneck_tasks), sorted(expected.bottleneck_tasks))
+        for task_id in actual.critical_path:
+            self.assertIn(task_id, actual.critical_tasks)
+        for pred, succ in zip(actual.critical_path, actual.critical_path[1:]):
+            self.assertIn(succ, self.analyzer.adjacency_list[pred])
+
+    def test_duration_change_updates_in_place(self):
+        """Lengthening the off-path task makes it critical; same objects are updated"""
+        slack = self.cp.slack_by_task
+        result = self.analyzer.update_task_duration("c", 6)
+        self.assertIs(result, self.cp)
+        self.assertIs(result.slack_by_task, slack)
+        self.assertEqual(result.project_duration_days, 15)
+        self.assertIn("c", result.critical_tasks)
+        self.assertNotIn("b", result.critical_tasks)
+        self.assertMatchesFresh()
+
+    def test_shortening_the_project(self):
+        """Crashing the only finishing task triggers a project duration rescan"""
+        self.analyzer.update_task_duration("d", 1)
+        self.assertEqual(self.cp.project_duration_days, 9)
+        self.assertMatchesFresh()
+
+    def test_add_and_remove_dependency(self):
+        self.analyzer.add_task(Task("e", "E", 10))
+        self.assertMatchesFresh()
+        self.analyzer.add_dependency(TaskDependency("ce", "c", "e", DependencyType.START_TO_START, lag_days=1))
+        self.assertMatchesFresh()
+        self.analyzer.remove_dependency("ce")
+        self.assertMatchesFresh()
+        self.analyzer.remove_dependency("bd")
+        self.assertMatchesFresh()
+
+    def test_edge_against_topological_order(self):
+        """A new edge from a later task to an earlier one reorders instead of failing"""
+        self.analyzer.add_task(Task("x", "X", 7))
+        self.analyzer.add_dependency(TaskDependency("xa", "x", "a", DependencyType.FINISH_TO_START))
+        self.assertMatchesFresh()
+        self.assertEqual(self.cp.project_duration_days, 19)
+
+    def test_cycle_drops_incremental_state(self):
+        self.analyzer.add_dependency(TaskDependency("da", "d", "a", DependencyType.FINISH_TO_START))
+        self.assertIsNone(self.analyzer.current_analysis)
+
+    def test_mark_complete(self):
+        """Completing the only successor removes a bottleneck; actual duration re-dates"""
+        self.analyzer.mark_task_complete("d")
+        self.assertEqual(self.analyzer.tasks["d"].status, TaskStatus.COMPLETED)
+        self.assertNotIn("b", self.cp.bottleneck_tasks)
+        self.analyzer.mark_task_complete("a", actual_duration_days=8)
+        self.assertEqual(self.cp.project_duration_days, 15)
+        self.assertMatchesFresh()
+
+    def test_without_prior_analysis(self):
+        """Edits before the first full run are simply recorded"""
+        analyzer = ScheduleDependencyAnalyzer()
+        analyzer.add_task(Task("a", "A", 5))
+        self.assertIsNone(analyzer.update_task_duration("a", 9))
+        self.assertEqual(analyzer.calculate_critical_path().project_duration_days, 9)
+
+    def test_random_edit_sequences(self):
+        """Random duration/dependency edits on mixed-type graphs"""
+        rng = random.Random(4)
+        types = list(DependencyType)
+        for trial in range(5):
+            analyzer = ScheduleDependencyAnalyzer()
+            n = 80
+            for i in range(n):
+                analyzer.add_task(Task(f"t{i}", f"T{i}", rng.randint(1, 12)))
+            for e in range(160):
+                a, b = sorted(rng.sample(range(n), 2))
+                analyzer.add_dependency(TaskDependency(
+                    f"d{e}", f"t{a}", f"t{b}", rng.choice(types), lag_days=rng.randint(0, 3)
+                ))
+            analyzer.calculate_critical_path()
+            self.analyzer = analyzer
+            for step in range(40):
+                action = rng.random()
+                if action < 0.5:
+                    analyzer.update_task_duration(f"t{rng.randrange(n)}", rng.randint(0, 15))
+                elif action < 0.75 and analyzer.dependencies:
+                    analyzer.remove_dependency(rng.choice(sorted(analyzer.dependencies)))
+                else:
+                    a, b = sorted(rng.sample(range(n), 2))
+                    analyzer.add_dependency(TaskDependency(
+                        f"n{trial}_{step}", f"t{a}", f"t{b}", rng.choice(types)
+                    ))
+                with self.subTest(trial=trial, step=step):
+                    self.assertMatchesFresh()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Phase 16: Unit Tests - Monte Carlo Schedule Risk Simulation
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import unittest
+from unittest import mock
+import numpy as np
+from phase16_types import Task, TaskDependency, DependencyType, TaskStatus
+from phase16_schedule_dependencies import ScheduleDependencyAnalyzer
+from phase16_cpm_engine import CompiledScheduleGraph
+from phase16_monte_carlo import MonteCarloScheduleSimulator, delay_distribution, sample_delays
+from phase16_schedule_store import schedule_store
+from test_phase16_cpm_engine import random_schedule
+
+
+def diamond(status=TaskStatus.NOT_STARTED):
+    # a(5) -> b(10) -> d(4)
+    #      \-> c(2) -/
+    analyzer = ScheduleDependencyAnalyzer()
+    for task_id, duration in [("a", 5), ("b", 10), ("c", 2), ("d", 4)]:
+        analyzer.add_task(Task(task_id, task_id.upper(), duration, status=status,
+                               complexity_factor=1.5, weather_dependency=task_id == "b"))
+    for dep_id, pred, succ in [("ab", "a", "b"), ("ac", "a", "c"), ("bd", "b", "d"), ("cd", "c", "d")]:
+        analyzer.add_dependency(TaskDependency(dep_id, pred, succ, DependencyType.FINISH_TO_START))
+    return analyzer
+
+
+class TestMonteCarloSimulation(unittest.TestCase):
+
+    def test_batched_passes_match_single_runs(self):
+        """Each column of a batched pass equals a 1-D pass on that column"""
+        graph = CompiledScheduleGraph.from_analyzer(random_schedule(300, 900, seed=2, mixed_types=True))
+        rng = np.random.default_rng(0)
+        durations = graph.durations[:, None] + rng.uniform(0, 5, (graph.num_tasks, 7))
+        earliest_start, earliest_finish = graph.forward_pass(durations)
+        finish = earliest_finish.max(axis=0)
+        latest_start, _ = graph.backward_pass(finish, durations)
+        for col in range(durations.shape[1]):
+            es, ef = graph.forward_pass(durations[:, col])
+            ls, _ = graph.backward_pass(ef.max(), durations[:, col])
+            np.testing.assert_allclose(earliest_start[:, col], es)
+            np.testing.assert_allclose(latest_start[:, col], ls)
+
+    def test_no_risk_is_deterministic(self):
+        """Completed tasks never slip: every percentile is the CPM duration"""
+        result = MonteCarloScheduleSimulator(diamond(TaskStatus.COMPLETED)).simulate(500, seed=1)
+        self.assertEqual(result.deterministic_duration_days, 19)
+        self.assertEqual(result.p50_duration_days, 19)
+        self.assertEqual(result.p95_duration_days, 19)
+        self.assertEqual(result.on_time_probability, 1.0)
+        self.assertEqual(result.criticality_index, {"a": 1.0, "b": 1.0, "c": 0.0, "d": 1.0})
+        self.assertEqual(result.tornado, [])
+
+    def test_distribution_and_ranking(self):
+        result = MonteCarloScheduleSimulator(diamond()).simulate(4000, seed=7, chunk_size=300)
+        self.assertLessEqual(result.deterministic_duration_days, result.p50_duration_days)
+        self.assertLessEqual(result.p50_duration_days, result.p80_duration_days)
+        self.assertLessEqual(result.p80_duration_days, result.p95_duration_days)
+        self.assertLess(result.on_time_probability, 1.0)
+        # c has 8 days of float and can never become critical
+        self.assertEqual(result.criticality_index["c"], 0.0)
+        self.assertEqual(result.criticality_index["b"], 1.0)
+        self.assertEqual(result.tornado[0]["task_id"], "b")
+        correlation = {row["task_id"]: row["correlation"] for row in result.tornado}
+        self.assertLess(abs(correlation.get("c", 0.0)), 0.05)
+
+    def test_seeded_results_are_reproducible(self):
+        """Same seed, same numbers, regardless of worker count"""
+        simulator = MonteCarloScheduleSimulator(random_schedule(200, 500, seed=5))
+        first = simulator.simulate(1000, seed=42, chunk_size=128)
+        second = simulator.simulate(1000, seed=42, chunk_size=128)
+        pooled = simulator.simulate(1000, seed=42, chunk_size=128, workers=2)
+        self.assertEqual(first.to_dict(), second.to_dict())
+        self.assertEqual(first.to_dict(), pooled.to_dict())
+        self.assertNotEqual(first.p95_duration_days, simulator.simulate(1000, seed=43).p95_duration_days)
+
+    def test_delay_model_matches_risk_factors(self):
+        """Sampled overruns average to expected_delay_days and never exceed the upper bound"""
+        params = delay_distribution(np.array([10, 1, 20]), np.array([0.5, 0.9, 0.0]),
+                                    np.array([1.5, 0.27, 0.0]), np.array([5, 0, 10]))
+        delays = sample_delays(params, np.random.default_rng(3), 200000)
+        np.testing.assert_allclose(delays.mean(axis=1), [1.5, 0.27, 0.0], atol=0.02)
+        self.assertTrue(np.all(delays >= 0))
+        self.assertTrue(np.all(delays.max(axis=1) <= params['high']))
+        np.testing.assert_allclose((delays > 0).mean(axis=1), [0.5, 0.9, 0.0], atol=0.01)
+
+
+class TestMonteCarloEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        from flask import Flask
+        from phase16_api import schedule_bp
+        schedule_store.clear()
+        app = Flask(__name__)
+        app.register_blueprint(schedule_bp)
+        self.client = app.test_client()
+
+    def test_simulate_stored_project(self):
+        self.assertEqual(self.client.get('/api/schedule/monte-carlo/P9').status_code, 404)
+        self.client.post('/api/schedule/analyze', json={
+            "project_id": "P9",
+            "tasks": [{"task_id": "a", "duration_days": 4}, {"task_id": "b", "duration_days": 6}],
+            "dependencies": [{"dependency_id": "d1", "predecessor_task_id": "a", "successor_task_id": "b"}],
+        })
+        resp = self.client.get('/api/schedule/monte-carlo/P9?iterations=500&seed=3')
+        self.assertEqual(resp.status_code, 200)
+        body = resp.get_json()["monte_carlo"]
+        self.assertEqual(body["iterations"], 500)
+        self.assertEqual(body["deterministic_duration_days"], 10)
+        self.assertGreaterEqual(body["p95_duration_days"], body["p50_duration_days"])
+        self.assertEqual(self.client.get('/api/schedule/monte-carlo/P9?iterations=0').status_code, 400)
+        for top_k in ("0", "-1", "few"):
+            self.assertEqual(self.client.get(f'/api/schedule/monte-carlo/P9?top_k={top_k}').status_code, 400)
+        tornado = self.client.get('/api/schedule/monte-carlo/P9?iterations=50&top_k=50').get_json()["monte_carlo"]["tornado"]
+        self.assertLessEqual(len(tornado), 2)
+
+        self.assertEqual(self.client.get('/api/schedule/monte-carlo/P9?workers=two').status_code, 400)
+        import phase16_api
+        simulate = MonteCarloScheduleSimulator.simulate
+        with mock.patch.object(phase16_api, 'MAX_WORKERS', 1), \
+                mock.patch.object(MonteCarloScheduleSimulator, 'simulate', autospec=True, side_effect=simulate) as spy:
+            resp = self.client.get('/api/schedule/monte-carlo/P9?iterations=50&workers=100000')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(spy.call_args.kwargs['workers'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+"""
+Phase 16: Unit Tests - Multi-Source Delay Propagation
+
+Propagating a batch of overruns must give exactly the dates a full CPM rerun
+with the extended durations would give.
+"""
+
+import random
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import unittest
+from phase16_types import Task, TaskDependency, DependencyType
+from phase16_schedule_dependencies import ScheduleDependencyAnalyzer, start_offset
+from phase16_delay_propagation import DelayPropagationEngine
+from phase16_schedule_store import schedule_store
+from test_phase16_cpm_engine import random_schedule
+
+
+def rerun_with_delays(analyzer, delays):
+    """Earliest starts/finishes and duration of a fresh CPM run with extended durations"""
+    copy = ScheduleDependencyAnalyzer()
+    for task in analyzer.tasks.values():
+        copy.add_task(replace(task, duration_days=task.duration_days + delays.get(task.task_id, 0)))
+    for dep in analyzer.dependencies.values():
+        copy.add_dependency(replace(dep))
+    cp = copy.calculate_critical_path()
+    finish = {t: copy._earliest_start[t] + copy.tasks[t].duration_days for t in copy.tasks}
+    return copy._earliest_start, finish, cp.project_duration_days
+
+
+class TestMultiDelayPropagation(unittest.TestCase):
+
+    def setUp(self):
+        # a(5) -> b(3) -> d(4)      c has 2 days of float
+        #      \-> c(1) -/
+        self.analyzer = ScheduleDependencyAnalyzer()
+        for task_id, duration in [("a", 5), ("b", 3), ("c", 1), ("d", 4)]:
+            self.analyzer.add_task(Task(task_id, task_id.upper(), duration))
+        for dep_id, pred, succ in [("ab", "a", "b"), ("ac", "a", "c"), ("bd", "b", "d"), ("cd", "c", "d")]:
+            self.analyzer.add_dependency(TaskDependency(dep_id, pred, succ, DependencyType.FINISH_TO_START))
+        self.cp = self.analyzer.calculate_critical_path()
+        self.engine = DelayPropagationEngine(self.analyzer)
+
+    def test_float_absorbs_delay(self):
+        result = self.engine.propagate_delays({"c": 2})
+        self.assertEqual(result.finish_slippage, {"c": 2})
+        self.assertEqual(result.project_delay_days, 0)
+        self.assertEqual(result.float_exceeded, {})
+
+        result = self.engine.propagate_delays({"c": 3})
+        self.assertEqual(result.finish_slippage, {"c": 3, "d": 1})
+        self.assertEqual(result.start_slippage, {"d": 1})
+        self.assertEqual(result.float_exceeded, {"c": 1, "d": 1})
+        self.assertEqual(result.project_duration_days, 13)
+
+    def test_simultaneous_shocks_max_merge(self):
+        """Two shocks meeting at d: the larger push wins, they do not add up"""
+        result = self.engine.propagate_delays([("b", 2), ("c", 6), ("b", 1)])
+        self.assertEqual(result.delays, {"b": 2, "c": 6})
+        self.assertEqual(result.finish_slippage, {"b": 2, "c": 6, "d": 4})
+        self.assertEqual(result.project_delay_days, 4)
+        # read-only: the stored analysis is untouched
+        self.assertEqual(self.analyzer.current_analysis.project_duration_days, 12)
+
+    def test_unanalyzed_schedule_is_not_mutated(self):
+        """Without stored CPM state (e.g. after the vectorized engine) the dates are computed privately"""
+        fresh = ScheduleDependencyAnalyzer()
+        for task in self.analyzer.tasks.values():
+            fresh.add_task(replace(task))
+        for dep in self.analyzer.dependencies.values():
+            fresh.add_dependency(replace(dep))
+        result = DelayPropagationEngine(fresh).propagate_delays({"c": 3})
+        self.assertEqual(result, self.engine.propagate_delays({"c": 3}))
+        self.assertIsNone(fresh.current_analysis)
+        self.assertEqual((fresh._earliest_start, fresh._topo_position), ({}, {}))
+
+    def test_unknown_task(self):
+        with self.assertRaises(ValueError):
+            self.engine.propagate_delays({"zz": 3})
+
+    def test_matches_full_rerun(self):
+        """Random FS/SS schedules and shock sets vs a full CPM rerun"""
+        rng = random.Random(9)
+        for trial in range(6):
+            analyzer = random_schedule(150, 300, seed=trial)
+            for dep in analyzer.dependencies.values():
+                dep.dependency_type = rng.choice([DependencyType.FINISH_TO_START, DependencyType.START_TO_START])
+            cp = analyzer.calculate_critical_path()
+            shocks = {f"t{rng.randrange(150)}": rng.randint(1, 10) for _ in range(rng.randint(1, 12))}
+
+            result = DelayPropagationEngine(analyzer).propagate_delays(shocks)
+            new_start, new_finish, duration = rerun_with_delays(analyzer, shocks)
+            with self.subTest(trial=trial):
+                self.assertEqual(result.project_duration_days, duration)
+                for task_id, task in analyzer.tasks.items():
+                    start = analyzer._earliest_start[task_id]
+                    self.assertEqual(result.start_slippage.get(task_id, 0), new_start[task_id] - start)
+                    self.assertEqual(result.finish_slippage.get(task_id, 0),
+                                     new_finish[task_id] - start - task.duration_days)
+                    excess = result.finish_slippage.get(task_id, 0) - cp.slack_by_task[task_id]
+                    self.assertEqual(result.float_exceeded.get(task_id, 0), max(0, excess))
+
+    def test_mixed_types_are_feasible_and_tight(self):
+        """With FF/SF links every constraint holds and every pushed task is pinned"""
+        analyzer = random_schedule(300, 700, seed=21, mixed_types=True)
+        analyzer.calculate_critical_path()
+        rng = random.Random(2)
+        shocks = {f"t{rng.randrange(300)}": rng.randint(1, 8) for _ in range(15)}
+        result = DelayPropagationEngine(analyzer).propagate_delays(shocks)
+
+        duration = {t: task.duration_days + shocks.get(t, 0) for t, task in analyzer.tasks.items()}
+        start = {t: s + result.start_slippage.get(t, 0) for t, s in analyzer._earliest_start.items()}
+        for dep in analyzer.dependencies.values():
+            pred, succ = dep.predecessor_task_id, dep.successor_task_id
+            self.assertGreaterEqual(start[succ], start[pred] + start_offset(dep, duration[pred], duration[succ]))
+        for task_id in result.start_slippage:
+            self.assertTrue(any(
+                start[task_id] == start[dep.predecessor_task_id]
+                + start_offset(dep, duration[dep.predecessor_task_id], duration[task_id])
+                for dep in analyzer.edges.in_edges[task_id]
+            ))
+        self.assertEqual(result.project_duration_days, max(start[t] + duration[t] for t in start))
+
+
+class TestPropagateEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        from flask import Flask
+        from phase16_api import schedule_bp
+        schedule_store.clear()
+        app = Flask(__name__)
+        app.register_blueprint(schedule_bp)
+        self.client = app.test_client()
+
+    def test_propagate_stored_schedule(self):
+        self.client.post('/api/schedule/analyze', json={
+            "project_id": "P3",
+            "tasks": [{"task_id": "a", "duration_days": 4}, {"task_id": "b", "duration_days": 6},
+                      {"task_id": "c", "duration_days": 1}],
+            "dependencies": [{"dependency_id": "d1", "predecessor_task_id": "a", "successor_task_id": "b"}],
+        })
+        resp = self.client.post('/api/schedule/propagate/P3', json={"delays": [
+            {"task_id": "a", "delay_days": 2}, {"task_id": "c", "delay_days": 3},
+        ]})
+        self.assertEqual(resp.status_code, 200)
+        propagation = resp.get_json()["propagation"]
+        self.assertEqual(propagation["finish_slippage"], {"a": 2, "b": 2, "c": 3})
+        self.assertEqual(propagation["project_delay_days"], 2)
+
+        vectorized = self.client.post('/api/schedule/analyze?engine=vectorized', json={
+            "project_id": "P4",
+            "tasks": [{"task_id": "a", "duration_days": 4}, {"task_id": "b", "duration_days": 6}],
+            "dependencies": [{"dependency_id": "d1", "predecessor_task_id": "a", "successor_task_id": "b"}],
+        })
+        self.assertEqual(vectorized.status_code, 200)
+        resp = self.client.post('/api/schedule/propagate/P4', json={"delays": [{"task_id": "a", "delay_days": 2}]})
+        self.assertEqual(resp.get_json()["propagation"]["finish_slippage"], {"a": 2, "b": 2})
+        self.assertIsNone(schedule_store.get("P4").analyzer.current_analysis)
+
+        bad = self.client.post('/api/schedule/propagate/P3', json={"delays": [{"task_id": "x", "delay_days": 1}]})
+        self.assertEqual(bad.status_code, 400)
+        self.assertEqual(self.client.post('/api/schedule/propagate/none', json={"delays": []}).status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
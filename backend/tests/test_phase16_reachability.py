@@ -0,0 +1,137 @@
+"""
+Phase 16: Unit Tests - Reachability Index
+
+Impact scopes, downstream counts and upstream checks must match a plain BFS,
+in both the full-closure and the interval-labelled representation, and stay
+correct through incremental edits.
+"""
+
+import random
+import sys
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import unittest
+from phase16_types import Task, TaskDependency, DependencyType
+from phase16_schedule_dependencies import ScheduleDependencyAnalyzer
+from phase16_reachability import ReachabilityIndex
+from phase16_schedule_store import schedule_store
+from test_phase16_cpm_engine import random_schedule
+
+
+def bfs_scope(analyzer, task_id):
+    distances = {task_id: 0}
+    queue = deque([task_id])
+    while queue:
+        current = queue.popleft()
+        for successor in analyzer.adjacency_list.get(current, ()):
+            if successor not in distances:
+                distances[successor] = distances[current] + 1
+                queue.append(successor)
+    del distances[task_id]
+    return distances
+
+
+def use_index(analyzer, bitset_max_tasks):
+    analyzer._reachability = ReachabilityIndex(
+        analyzer.tasks, analyzer.adjacency_list, analyzer.reverse_adjacency, bitset_max_tasks)
+    return analyzer._reachability
+
+
+class TestReachabilityIndex(unittest.TestCase):
+
+    def assertMatchesBfs(self, analyzer, rng, pairs=300):
+        scopes = {t: bfs_scope(analyzer, t) for t in analyzer.tasks}
+        self.assertEqual(analyzer.get_downstream_counts(), {t: len(s) for t, s in scopes.items()})
+        for task_id in rng.sample(sorted(analyzer.tasks), 20):
+            self.assertEqual(analyzer.get_task_impact_scope(task_id), scopes[task_id])
+            self.assertEqual(analyzer.get_downstream_count(task_id), len(scopes[task_id]))
+        ids = sorted(analyzer.tasks)
+        for _ in range(pairs):
+            a, b = rng.choice(ids), rng.choice(ids)
+            self.assertEqual(analyzer.is_upstream(a, b), b in scopes[a], (a, b))
+
+    def test_modes_match_bfs(self):
+        rng = random.Random(11)
+        for seed in range(3):
+            for bitset_max_tasks, mode in ((10 ** 6, 'bitset'), (0, 'interval')):
+                with self.subTest(seed=seed, mode=mode):
+                    analyzer = random_schedule(150, 400, seed=seed)
+                    index = use_index(analyzer, bitset_max_tasks)
+                    self.assertMatchesBfs(analyzer, rng)
+                    self.assertEqual(index.mode, mode)
+
+    def test_incremental_edits(self):
+        rng = random.Random(12)
+        for bitset_max_tasks in (10 ** 6, 0):
+            analyzer = random_schedule(120, 250, seed=7)
+            index = use_index(analyzer, bitset_max_tasks)
+            analyzer.get_downstream_counts()
+            for step in range(40):
+                if step % 3 == 0:
+                    analyzer.remove_dependency(rng.choice(sorted(analyzer.dependencies)))
+                elif step % 7 == 0:
+                    task_id = f"new{step}"
+                    analyzer.add_task(Task(task_id, task_id, 2))
+                    analyzer.add_dependency(TaskDependency(f"n{step}", task_id, "t119", DependencyType.FINISH_TO_START))
+                else:
+                    a, b = sorted(rng.sample(range(120), 2))
+                    analyzer.add_dependency(TaskDependency(f"x{step}", f"t{a}", f"t{b}", DependencyType.FINISH_TO_START))
+                with self.subTest(bitset_max_tasks=bitset_max_tasks, step=step):
+                    self.assertMatchesBfs(analyzer, rng, pairs=50)
+            self.assertIn(index.mode, ('bitset', 'interval'))
+
+    def test_cycle_falls_back_to_search(self):
+        analyzer = random_schedule(30, 60, seed=2)
+        analyzer.get_downstream_counts()
+        analyzer.add_dependency(TaskDependency("loop", "t29", "t0", DependencyType.FINISH_TO_START))
+        self.assertMatchesBfs(analyzer, random.Random(3), pairs=100)
+        self.assertEqual(analyzer.reachability.mode, 'search')
+
+    def test_reference_scope(self):
+        analyzer = ScheduleDependencyAnalyzer()
+        for task_id in "abcd":
+            analyzer.add_task(Task(task_id, task_id, 1))
+        for dep_id, pred, succ in [("ab", "a", "b"), ("bc", "b", "c"), ("ac", "a", "c")]:
+            analyzer.add_dependency(TaskDependency(dep_id, pred, succ, DependencyType.FINISH_TO_START))
+        self.assertEqual(analyzer.get_task_impact_scope("a"), {"b": 1, "c": 1})
+        self.assertEqual(analyzer.get_downstream_counts(), {"a": 2, "b": 1, "c": 0, "d": 0})
+        self.assertTrue(analyzer.is_upstream("a", "c"))
+        self.assertFalse(analyzer.is_upstream("c", "a"))
+        self.assertFalse(analyzer.is_upstream("a", "missing"))
+        self.assertEqual(analyzer.get_task_impact_scope("missing"), {})
+
+
+class TestImpactEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        from flask import Flask
+        from phase16_api import schedule_bp
+        schedule_store.clear()
+        app = Flask(__name__)
+        app.register_blueprint(schedule_bp)
+        self.client = app.test_client()
+
+    def test_heatmap_and_task_scope(self):
+        self.assertEqual(self.client.get('/api/schedule/impact/P14').status_code, 404)
+        self.client.post('/api/schedule/analyze', json={
+            "project_id": "P14",
+            "tasks": [{"task_id": t, "duration_days": 2} for t in "abc"],
+            "dependencies": [{"dependency_id": "ab", "predecessor_task_id": "a", "successor_task_id": "b"},
+                             {"dependency_id": "bc", "predecessor_task_id": "b", "successor_task_id": "c"}],
+        })
+        resp = self.client.get('/api/schedule/impact/P14')
+        self.assertEqual(resp.get_json()["downstream_counts"], {"a": 2, "b": 1, "c": 0})
+        self.assertEqual(self.client.get('/api/schedule/impact/P14', headers={"If-None-Match": resp.headers["ETag"]}).status_code, 304)
+
+        body = self.client.get('/api/schedule/impact/P14?task_id=a&downstream_task_id=c').get_json()
+        self.assertEqual(body["impact_scope"], {"b": 1, "c": 2})
+        self.assertEqual(body["downstream_count"], 2)
+        self.assertTrue(body["is_upstream"])
+        self.assertEqual(self.client.get('/api/schedule/impact/P14?task_id=zz').status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
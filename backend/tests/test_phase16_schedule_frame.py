@@ -0,0 +1,117 @@
+"""
+Phase 16: Unit Tests - Columnar Schedule Frame
+
+A ScheduleFrame bulk load must produce the same analyzer and compiled graph
+as registering the same rows one object at a time.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import unittest
+import numpy as np
+from phase16_types import Task, TaskDependency, DependencyType
+from phase16_schedule_dependencies import ScheduleDependencyAnalyzer
+from phase16_schedule_frame import ScheduleFrame
+from phase16_cpm_engine import CompiledScheduleGraph
+from test_phase16_cpm_engine import random_schedule
+
+
+def schedule_rows(analyzer):
+    """Task and dependency JSON rows for an analyzer's schedule"""
+    tasks = [{
+        "task_id": task.task_id, "name": task.name, "duration_days": task.duration_days,
+        "complexity_factor": task.complexity_factor,
+        "weather_dependency": task.weather_dependency,
+        "resource_constrained": task.resource_constrained,
+    } for task in analyzer.tasks.values()]
+    deps = [{
+        "dependency_id": dep.dependency_id, "predecessor_task_id": dep.predecessor_task_id,
+        "successor_task_id": dep.successor_task_id, "dependency_type": dep.dependency_type.value,
+        "lag_days": dep.lag_days,
+    } for dep in analyzer.dependencies.values()]
+    return tasks, deps
+
+
+class TestScheduleFrame(unittest.TestCase):
+
+    def setUp(self):
+        self.reference = random_schedule(200, 500, seed=5, mixed_types=True)
+        for i, task in enumerate(self.reference.tasks.values()):
+            task.complexity_factor = 0.5 + (i % 4) * 0.5
+            task.weather_dependency = i % 3 == 0
+            task.resource_constrained = i % 5 == 0
+        self.frame = ScheduleFrame.from_rows(*schedule_rows(self.reference))
+
+    def test_analyzer_matches_object_path(self):
+        loaded = ScheduleDependencyAnalyzer.from_frame(self.frame)
+        self.assertEqual(list(loaded.tasks), list(self.reference.tasks))
+        for task_id, task in self.reference.tasks.items():
+            self.assertEqual(loaded.tasks[task_id], task)
+            self.assertEqual(loaded.tasks[task_id].complexity_factor, task.complexity_factor)
+            self.assertEqual(loaded.tasks[task_id].weather_dependency, task.weather_dependency)
+            self.assertEqual(loaded.tasks[task_id].resource_constrained, task.resource_constrained)
+        for dep_id, dep in self.reference.dependencies.items():
+            self.assertEqual(loaded.dependencies[dep_id], dep)
+        self.assertEqual(dict(loaded.adjacency_list), dict(self.reference.adjacency_list))
+        self.assertEqual(dict(loaded.reverse_adjacency), dict(self.reference.reverse_adjacency))
+        self.assertEqual(set(loaded.edges.by_pair), set(self.reference.edges.by_pair))
+
+        expected = self.reference.calculate_critical_path()
+        actual = loaded.calculate_critical_path()
+        self.assertEqual(actual.critical_path, expected.critical_path)
+        self.assertEqual(actual.slack_by_task, expected.slack_by_task)
+
+    def test_compiled_graph_matches(self):
+        expected = CompiledScheduleGraph.from_analyzer(self.reference)
+        actual = CompiledScheduleGraph.from_frame(self.frame)
+        self.assertEqual(actual.task_ids, expected.task_ids)
+        self.assertEqual(actual.dependency_ids, expected.dependency_ids)
+        for name in ("durations", "edge_pred", "edge_succ", "edge_lag", "edge_pred_finish", "edge_succ_finish"):
+            np.testing.assert_array_equal(getattr(actual, name), getattr(expected, name), err_msg=name)
+        np.testing.assert_array_equal(actual.forward_pass()[0], expected.forward_pass()[0])
+
+        # Compiling copies the columns, so the frame can keep growing
+        self.frame.append_task("extra", "Extra", 3)
+        self.assertEqual(actual.num_tasks, expected.num_tasks)
+
+    def test_overwrites_and_unknown_tasks(self):
+        frame = ScheduleFrame()
+        frame.append_task("a", "A", 2)
+        frame.append_task("b", "B", 3)
+        self.assertEqual(frame.append_task("a", "A2", 7), 0)
+        self.assertIsNone(frame.append_dependency("d1", "a", "zz"))
+        frame.append_dependency("d1", "a", "b")
+        frame.append_dependency_row({"dependency_id": "d1", "predecessor_task_id": "b",
+                                     "successor_task_id": "a", "dependency_type": "start_to_start",
+                                     "lag_days": 2})
+        self.assertEqual((frame.num_tasks, frame.num_dependencies), (2, 1))
+        self.assertEqual(frame.task(0), Task("a", "A2", 7))
+        self.assertEqual(frame.task(0).duration_days, 7)
+        dep = frame.dependency(0)
+        self.assertEqual((dep.predecessor_task_id, dep.dependency_type, dep.lag_days),
+                         ("b", DependencyType.START_TO_START, 2))
+
+    def test_ids_interned_and_shared(self):
+        task_id = "".join(["task", "-1"])  # built at runtime, not a constant
+        frame = ScheduleFrame()
+        frame.append_task(task_id, "T", 1)
+        frame.append_task("other", "O", 1)
+        frame.append_dependency("d", "task-1", "other")
+        self.assertIs(frame.task_ids[0], sys.intern("task-1"))
+        analyzer = ScheduleDependencyAnalyzer.from_frame(frame)
+        self.assertIs(analyzer.dependencies["d"].predecessor_task_id, frame.task_ids[0])
+
+    def test_load_frame_requires_empty_analyzer(self):
+        with self.assertRaises(ValueError):
+            self.reference.load_frame(self.frame)
+
+    def test_slotted_records(self):
+        self.assertFalse(hasattr(Task("a", "A", 1), "__dict__"))
+        self.assertFalse(hasattr(TaskDependency("d", "a", "b", DependencyType.FINISH_TO_START), "__dict__"))
+
+
+if __name__ == "__main__":
+    unittest.main()
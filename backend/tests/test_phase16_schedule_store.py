@@ -0,0 +1,135 @@
+"""
+Phase 16: Unit Tests - Schedule Store and Cached GET Endpoints
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import unittest
+from phase16_types import CriticalPathAnalysis, ProjectScheduleIntelligence
+from phase16_schedule_store import CachedSchedule, ScheduleStore, schedule_content_hash, schedule_store
+
+
+def make_entry(project_id, total_tasks=10, content_hash="h"):
+    cp = CriticalPathAnalysis([], 0, {}, set(), [])
+    intelligence = ProjectScheduleIntelligence(
+        project_id, project_id, total_tasks, cp, {}, [], 1.0, [], 0, 0.0
+    )
+    return CachedSchedule(project_id, content_hash, None, intelligence, {})
+
+
+class TestScheduleStore(unittest.TestCase):
+
+    def test_content_hash_ignores_key_order(self):
+        a = schedule_content_hash([{"task_id": "a", "duration_days": 3}], [])
+        b = schedule_content_hash([{"duration_days": 3, "task_id": "a"}], [])
+        c = schedule_content_hash([{"task_id": "a", "duration_days": 4}], [])
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+    def test_lru_eviction_by_project_count(self):
+        store = ScheduleStore(max_projects=2, max_tasks=1000)
+        store.put(make_entry("p1"))
+        store.put(make_entry("p2"))
+        store.get("p1")  # p2 becomes least recently used
+        store.put(make_entry("p3"))
+        self.assertIn("p1", store)
+        self.assertNotIn("p2", store)
+        self.assertEqual(store.stats()["evictions"], 1)
+
+    def test_eviction_by_task_count(self):
+        store = ScheduleStore(max_projects=10, max_tasks=100)
+        store.put(make_entry("p1", total_tasks=60))
+        store.put(make_entry("p2", total_tasks=30))
+        store.put(make_entry("p1", total_tasks=50))  # replacement is not double counted
+        self.assertEqual(store.stats()["tasks"], 80)
+        store.put(make_entry("p3", total_tasks=40))
+        self.assertEqual(len(store), 2)
+        self.assertNotIn("p2", store)
+        # a single oversized schedule is still kept
+        store.put(make_entry("big", total_tasks=500))
+        self.assertEqual(len(store), 1)
+
+    def test_stale_hash_misses(self):
+        store = ScheduleStore()
+        store.put(make_entry("p1", content_hash="old"))
+        self.assertIsNone(store.get("p1", "new"))
+        self.assertIsNotNone(store.get("p1", "old"))
+        self.assertTrue(store.invalidate("p1"))
+        self.assertIsNone(store.get("p1"))
+
+
+class TestCachedScheduleEndpoints(unittest.TestCase):
+    """/critical-path and /integration-risk serve the stored analysis"""
+
+    def setUp(self):
+        from flask import Flask
+        from phase16_api import schedule_bp
+        schedule_store.clear()
+        app = Flask(__name__)
+        app.register_blueprint(schedule_bp)
+        self.client = app.test_client()
+        self.payload = {
+            "project_id": "P7",
+            "tasks": [
+                {"task_id": "a", "duration_days": 4},
+                {"task_id": "b", "duration_days": 6},
+            ],
+            "dependencies": [
+                {"dependency_id": "d1", "predecessor_task_id": "a", "successor_task_id": "b"},
+            ],
+        }
+
+    def test_unknown_project(self):
+        self.assertEqual(self.client.get('/api/schedule/critical-path/nope').status_code, 404)
+        self.assertEqual(self.client.get('/api/schedule/integration-risk/nope').status_code, 404)
+
+    def test_analyze_then_poll(self):
+        analysis = self.client.post('/api/schedule/analyze', json=self.payload).get_json()
+        self.assertFalse(analysis["cached"])
+
+        resp = self.client.get('/api/schedule/critical-path/P7')
+        self.assertEqual(resp.status_code, 200)
+        body = resp.get_json()
+        self.assertEqual(body["critical_path"], ["a", "b"])
+        self.assertEqual(body["project_duration_days"], 10)
+        etag = resp.headers["ETag"].strip('"')
+        self.assertEqual(etag, analysis["etag"])
+
+        not_modified = self.client.get('/api/schedule/critical-path/P7', headers={"If-None-Match": f'"{etag}"'})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.data, b"")
+
+        risk = self.client.get('/api/schedule/integration-risk/P7')
+        self.assertEqual(risk.status_code, 200)
+        self.assertEqual(risk.get_json()["integration_risk_score"], analysis["integration_risk_score"])
+
+    def test_resubmission_and_change(self):
+        first = self.client.post('/api/schedule/analyze', json=self.payload).get_json()
+        again = self.client.post('/api/schedule/analyze', json=self.payload).get_json()
+        self.assertTrue(again["cached"])
+        self.assertEqual(again["content_hash"], first["content_hash"])
+
+        self.payload["tasks"][1]["duration_days"] = 9
+        changed = self.client.post('/api/schedule/analyze', json=self.payload).get_json()
+        self.assertFalse(changed["cached"])
+        resp = self.client.get('/api/schedule/critical-path/P7', headers={"If-None-Match": f'"{first["etag"]}"'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json()["project_duration_days"], 13)
+
+    def test_etag_covers_analysis_options(self):
+        first = self.client.post('/api/schedule/analyze', json=self.payload).get_json()
+        for change in ({"project_name": "Renamed"}, {"engine": "vectorized"}):
+            with self.subTest(change=change):
+                changed = self.client.post('/api/schedule/analyze', json=dict(self.payload, **change)).get_json()
+                self.assertEqual(changed["content_hash"], first["content_hash"])
+                self.assertNotEqual(changed["etag"], first["etag"])
+                resp = self.client.get('/api/schedule/critical-path/P7', headers={"If-None-Match": f'"{first["etag"]}"'})
+                self.assertEqual(resp.status_code, 200)
+                self.assertEqual(resp.headers["ETag"].strip('"'), changed["etag"])
+
+
+if __name__ == "__main__":
+    unittest.main()
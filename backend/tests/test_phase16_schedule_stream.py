@@ -0,0 +1,145 @@
+"""
+Phase 16: Unit Tests - Streaming Schedule Ingestion
+
+Streamed JSON/NDJSON bodies must build the same frame (and content hash) as
+the parsed-body path, whatever the read chunk size, and report malformed rows
+by index without giving up on the rest of the stream.
+"""
+
+import io
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import unittest
+from phase16_schedule_frame import ScheduleFrame
+from phase16_schedule_store import schedule_content_hash, schedule_store
+from phase16_schedule_stream import ScheduleStreamError, read_json_schedule, read_ndjson_schedule
+from test_phase16_cpm_engine import random_schedule
+from test_phase16_schedule_frame import schedule_rows
+
+
+def frame_columns(frame):
+    return (frame.task_ids, frame.names, list(frame.durations), list(frame.complexity),
+            bytes(frame.weather), bytes(frame.resource), frame.dependency_ids,
+            list(frame.predecessors), list(frame.successors), bytes(frame.type_codes), list(frame.lags))
+
+
+def ndjson(*objects):
+    return b"".join(json.dumps(obj).encode() + b"\n" for obj in objects)
+
+
+class TestJsonStream(unittest.TestCase):
+
+    def setUp(self):
+        self.tasks, self.deps = schedule_rows(random_schedule(60, 120, seed=4, mixed_types=True))
+        self.tasks[3]["name"] = 'Pour "slab", level ]2[ {east}\\ é'
+        self.body = json.dumps({"project_id": "P10", "tasks": self.tasks, "dependencies": self.deps,
+                                "project_name": "Tower"}, indent=1).encode()
+
+    def test_matches_parsed_body_for_any_chunk_size(self):
+        expected = ScheduleFrame.from_rows(self.tasks, self.deps)
+        for chunk_size in (1, 7, 100, 1 << 16):
+            with self.subTest(chunk_size=chunk_size):
+                ingest = read_json_schedule(io.BytesIO(self.body), chunk_size=chunk_size)
+                self.assertEqual(frame_columns(ingest.frame), frame_columns(expected))
+                self.assertEqual(ingest.fields, {"project_id": "P10", "project_name": "Tower"})
+                self.assertEqual(ingest.content_hash, schedule_content_hash(self.tasks, self.deps))
+                self.assertEqual((ingest.task_rows, ingest.dependency_rows), (60, 120))
+                self.assertEqual(ingest.errors, [])
+
+    def test_dependencies_before_tasks(self):
+        body = json.dumps({"dependencies": self.deps, "tasks": self.tasks}).encode()
+        ingest = read_json_schedule(io.BytesIO(body), chunk_size=50)
+        self.assertEqual(frame_columns(ingest.frame), frame_columns(ScheduleFrame.from_rows(self.tasks, self.deps)))
+
+    def test_malformed_rows_reported_and_skipped(self):
+        body = (b'{"tasks": [{"task_id": "a", "duration_days": 2}, {"task_id": }, 5, '
+                b'{"task_id": "b"}, {"task_id": "c", "duration_days": "x"}, {"task_id": "d", "duration_days": 1} x, '
+                b'{"task_id": "e", "duration_days": 3}], '
+                b'"dependencies": [{"dependency_id": "ae", "predecessor_task_id": "a", "successor_task_id": "e"}, '
+                b'{"dependency_id": "az", "predecessor_task_id": "a", "successor_task_id": "z"}, '
+                b'{"dependency_id": "a?", "predecessor_task_id": "a"}]}')
+        for chunk_size in (3, 1 << 16):
+            with self.subTest(chunk_size=chunk_size):
+                ingest = read_json_schedule(io.BytesIO(body), chunk_size=chunk_size)
+                self.assertEqual(ingest.frame.task_ids, ["a", "e"])
+                self.assertEqual(ingest.frame.dependency_ids, ["ae"])
+                self.assertEqual([(e.section, e.row) for e in ingest.errors], [
+                    ("tasks", 1), ("tasks", 2), ("tasks", 3), ("tasks", 4), ("tasks", 5),
+                    ("dependencies", 1), ("dependencies", 2),
+                ])
+                self.assertIn("duration_days", ingest.errors[2].error)
+                self.assertIn("'z'", ingest.errors[5].error)
+                self.assertEqual(ingest.task_rows, 7)
+
+    def test_broken_structure_is_fatal(self):
+        for body in (b'', b'[1, 2]', b'{"tasks": [{"task_id": "a", "duration_days": 1}',
+                     b'{"tasks": []} trailing', b'{"tasks": [{"task_id": "a", "name": "unterminated}]}'):
+            with self.subTest(body=body), self.assertRaises(ScheduleStreamError):
+                read_json_schedule(io.BytesIO(body), chunk_size=4)
+
+
+class TestNdjsonStream(unittest.TestCase):
+
+    def test_rows_header_and_bad_lines(self):
+        body = ndjson(
+            {"project_id": "P11", "engine": "vectorized"},
+            {"dependency_id": "ab", "predecessor_task_id": "a", "successor_task_id": "b", "lag_days": 1},
+            {"task_id": "a", "duration_days": 3},
+        ) + b'{"task_id": "oops", \n\n[1]\n' + ndjson({"task_id": "b", "duration_days": 2})
+        ingest = read_ndjson_schedule(io.BytesIO(body), chunk_size=5)
+        self.assertEqual(ingest.fields, {"project_id": "P11", "engine": "vectorized"})
+        self.assertEqual(ingest.frame.task_ids, ["a", "b"])
+        self.assertEqual(list(ingest.frame.lags), [1])
+        self.assertEqual([(e.section, e.row) for e in ingest.errors], [("lines", 3), ("lines", 5)])
+        self.assertEqual(ingest.content_hash, schedule_content_hash(
+            [{"task_id": "a", "duration_days": 3}, {"task_id": "b", "duration_days": 2}],
+            [{"dependency_id": "ab", "predecessor_task_id": "a", "successor_task_id": "b", "lag_days": 1}],
+        ))
+
+
+class TestStreamingEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        from flask import Flask
+        from phase16_api import schedule_bp
+        schedule_store.clear()
+        app = Flask(__name__)
+        app.register_blueprint(schedule_bp)
+        self.client = app.test_client()
+        self.tasks, self.deps = schedule_rows(random_schedule(40, 80, seed=6))
+        self.payload = {"project_id": "P12", "project_name": "Depot", "tasks": self.tasks, "dependencies": self.deps}
+
+    def test_streamed_json_matches_parsed(self):
+        parsed = self.client.post('/api/schedule/analyze', json=self.payload).get_json()
+        schedule_store.clear()
+        streamed = self.client.post('/api/schedule/analyze?stream=1', data=json.dumps(self.payload),
+                                    content_type='application/json').get_json()
+        for key in ("content_hash", "critical_path", "project_duration_days", "schedule_intelligence"):
+            self.assertEqual(streamed[key], parsed[key], key)
+        self.assertEqual(streamed["rows_read"], {"tasks": 40, "dependencies": 80})
+        self.assertEqual(streamed["row_errors"], [])
+
+    def test_ndjson_with_bad_rows(self):
+        body = ndjson({"project_id": "P13"}, *self.tasks, {"task_id": "bad"}, *self.deps)
+        resp = self.client.post('/api/schedule/analyze', data=body, content_type='application/x-ndjson')
+        self.assertEqual(resp.status_code, 200)
+        body = resp.get_json()
+        self.assertEqual(body["project_id"], "P13")
+        self.assertEqual(body["row_error_count"], 1)
+        self.assertEqual(body["row_errors"][0]["row"], 41)
+        self.assertIn("P13", schedule_store)
+
+    def test_no_valid_tasks(self):
+        resp = self.client.post('/api/schedule/analyze', data=b'{"task_id": 1}\n', content_type='application/x-ndjson')
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(len(resp.get_json()["row_errors"]), 1)
+        resp = self.client.post('/api/schedule/analyze?stream=1', data=b'{"tasks": [', content_type='application/json')
+        self.assertEqual(resp.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
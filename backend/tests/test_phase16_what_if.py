@@ -0,0 +1,191 @@
+"""
+Phase 16: Unit Tests - Batched What-If Scenarios
+
+Every scenario evaluated in a batch must match a fresh CPM run on a copy of
+the schedule with the scenario's edits applied.
+"""
+
+import random
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import unittest
+from unittest import mock
+from phase16_types import Task, TaskDependency, DependencyType, ScenarioAction, ScenarioChange, WhatIfScenario
+from phase16_schedule_dependencies import ScheduleDependencyAnalyzer
+from phase16_what_if import WhatIfScenarioEngine
+from phase16_schedule_store import schedule_store
+from test_phase16_cpm_engine import random_schedule
+
+
+def apply_scenario(analyzer, scenario):
+    """Copy of the schedule with the scenario's edits, analyzed from scratch"""
+    tasks = {t: replace(task) for t, task in analyzer.tasks.items()}
+    deps = {d: replace(dep) for d, dep in analyzer.dependencies.items()}
+    for change in scenario.changes:
+        if change.action == ScenarioAction.SET_DURATION:
+            tasks[change.target_id].duration_days = change.days
+        elif change.action == ScenarioAction.CRASH:
+            task = tasks[change.target_id]
+            task.duration_days = max(0, task.duration_days - change.days)
+        elif change.action == ScenarioAction.DELAY:
+            tasks[change.target_id].duration_days += change.days
+        elif change.action == ScenarioAction.SET_LAG:
+            deps[change.target_id].lag_days = change.days
+        else:
+            deps[change.target_id].lag_days += change.days
+    copy = ScheduleDependencyAnalyzer()
+    for task in tasks.values():
+        copy.add_task(task)
+    for dep in deps.values():
+        copy.add_dependency(dep)
+    copy.calculate_critical_path()
+    return copy
+
+
+def random_scenarios(analyzer, count, rng):
+    task_ids = sorted(analyzer.tasks)
+    dep_ids = sorted(analyzer.dependencies)
+    scenarios = []
+    for i in range(count):
+        changes = []
+        for _ in range(rng.randint(0, 4)):
+            action = rng.choice(list(ScenarioAction))
+            target = rng.choice(dep_ids if action in (ScenarioAction.SET_LAG, ScenarioAction.ADD_LAG) else task_ids)
+            changes.append(ScenarioChange(action, target, rng.randint(0, 12)))
+        scenarios.append(WhatIfScenario(f"s{i}", changes))
+    return scenarios
+
+
+class TestWhatIfScenarios(unittest.TestCase):
+
+    def assertMatchesRerun(self, analyzer, scenario, outcome, base_finish):
+        rerun = apply_scenario(analyzer, scenario)
+        cp = rerun.current_analysis
+        self.assertEqual(outcome.project_duration_days, cp.project_duration_days)
+        self.assertLessEqual(set(outcome.critical_path), cp.critical_tasks)
+        finish = {t: rerun._earliest_start[t] + task.duration_days for t, task in rerun.tasks.items()}
+        moved = {t: finish[t] - base_finish[t] for t in finish if finish[t] != base_finish[t]}
+        self.assertEqual(outcome.affected_tasks, moved)
+
+    def test_random_scenarios_match_rerun(self):
+        rng = random.Random(8)
+        for seed in range(4):
+            analyzer = random_schedule(120, 300, seed=seed, mixed_types=True)
+            analyzer.calculate_critical_path()
+            base_finish = {t: analyzer._earliest_start[t] + task.duration_days for t, task in analyzer.tasks.items()}
+            scenarios = random_scenarios(analyzer, 25, rng)
+            outcomes = WhatIfScenarioEngine(analyzer).evaluate(scenarios, chunk_size=10)
+            self.assertEqual([o.scenario_id for o in outcomes], [s.scenario_id for s in scenarios])
+            for scenario, outcome in zip(scenarios, outcomes):
+                with self.subTest(seed=seed, scenario=scenario.scenario_id):
+                    self.assertMatchesRerun(analyzer, scenario, outcome, base_finish)
+
+    def test_crash_critical_task(self):
+        """Crashing a critical task moves the finish and swaps the critical path"""
+        analyzer = ScheduleDependencyAnalyzer()
+        for task_id, duration in [("a", 5), ("b", 10), ("c", 8), ("d", 4)]:
+            analyzer.add_task(Task(task_id, task_id.upper(), duration))
+        for dep_id, pred, succ in [("ab", "a", "b"), ("ac", "a", "c"), ("bd", "b", "d"), ("cd", "c", "d")]:
+            analyzer.add_dependency(TaskDependency(dep_id, pred, succ, DependencyType.FINISH_TO_START))
+        engine = WhatIfScenarioEngine(analyzer)
+        self.assertEqual(engine.base_critical_path, ["a", "b", "d"])
+
+        crash, baseline = engine.evaluate([
+            WhatIfScenario("crash_b", [ScenarioChange(ScenarioAction.CRASH, "b", 5)]),
+            WhatIfScenario("nothing"),
+        ])
+        self.assertEqual(crash.finish_delta_days, -2)
+        self.assertEqual(crash.critical_path, ["a", "c", "d"])
+        self.assertEqual(crash.critical_path_added, ["c"])
+        self.assertEqual(crash.critical_path_removed, ["b"])
+        self.assertEqual(crash.affected_tasks, {"b": -5, "d": -2})
+        self.assertEqual(baseline.finish_delta_days, 0)
+        self.assertEqual(baseline.affected_tasks, {})
+
+    def test_unknown_targets_rejected(self):
+        engine = WhatIfScenarioEngine(random_schedule(10, 10, seed=1))
+        with self.assertRaises(ValueError):
+            engine.evaluate([WhatIfScenario("x", [ScenarioChange(ScenarioAction.DELAY, "nope", 1)])])
+        with self.assertRaises(ValueError):
+            engine.evaluate([WhatIfScenario("x", [ScenarioChange(ScenarioAction.ADD_LAG, "t1", 1)])])
+
+    def test_negative_task_days_rejected(self):
+        engine = WhatIfScenarioEngine(random_schedule(10, 10, seed=1))
+        for action in (ScenarioAction.SET_DURATION, ScenarioAction.CRASH, ScenarioAction.DELAY):
+            with self.subTest(action=action), self.assertRaises(ValueError):
+                engine.evaluate([WhatIfScenario("x", [ScenarioChange(action, "t1", -3)])])
+        dep_id = sorted(engine.edge_index)[0]
+        engine.evaluate([WhatIfScenario("lead", [ScenarioChange(ScenarioAction.ADD_LAG, dep_id, -1)])])
+
+    def test_worker_pool_matches_in_process(self):
+        analyzer = random_schedule(200, 500, seed=3, mixed_types=True)
+        scenarios = random_scenarios(analyzer, 30, random.Random(1))
+        engine = WhatIfScenarioEngine(analyzer)
+        serial = engine.evaluate(scenarios, chunk_size=8)
+        pooled = engine.evaluate(scenarios, chunk_size=8, workers=2)
+        self.assertEqual([o.to_dict() for o in serial], [o.to_dict() for o in pooled])
+
+
+class TestWhatIfEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        from flask import Flask
+        from phase16_api import schedule_bp
+        schedule_store.clear()
+        app = Flask(__name__)
+        app.register_blueprint(schedule_bp)
+        self.client = app.test_client()
+        self.schedule = {
+            "project_id": "P4",
+            "tasks": [{"task_id": "a", "duration_days": 4}, {"task_id": "b", "duration_days": 6}],
+            "dependencies": [{"dependency_id": "d1", "predecessor_task_id": "a", "successor_task_id": "b"}],
+        }
+        self.scenarios = [
+            {"scenario_id": "lag", "changes": [{"action": "add_lag", "dependency_id": "d1", "days": 2}]},
+            {"scenario_id": "crash", "changes": [{"action": "crash", "task_id": "b", "days": 1}]},
+        ]
+
+    def test_inline_and_stored_base(self):
+        resp = self.client.post('/api/schedule/what-if', json=dict(self.schedule, scenarios=self.scenarios))
+        self.assertEqual(resp.status_code, 200)
+        body = resp.get_json()
+        self.assertEqual(body["base"]["project_duration_days"], 10)
+        self.assertEqual([s["finish_delta_days"] for s in body["scenarios"]], [2, -1])
+        self.assertEqual(body["scenarios"][0]["affected_tasks"], {"b": 2})
+
+        stored = self.client.post('/api/schedule/what-if', json={"project_id": "P4", "scenarios": self.scenarios})
+        self.assertEqual(stored.status_code, 404)
+        self.client.post('/api/schedule/analyze', json=self.schedule)
+        stored = self.client.post('/api/schedule/what-if', json={"project_id": "P4", "scenarios": self.scenarios})
+        self.assertEqual(stored.get_json()["scenarios"], body["scenarios"])
+
+    def test_invalid_action(self):
+        bad = [{"scenario_id": "x", "changes": [{"action": "teleport", "task_id": "a", "days": 1}]}]
+        resp = self.client.post('/api/schedule/what-if', json=dict(self.schedule, scenarios=bad))
+        self.assertEqual(resp.status_code, 400)
+
+    def test_negative_days_rejected(self):
+        for action in ("set_duration", "crash", "delay"):
+            bad = [{"scenario_id": "x", "changes": [{"action": action, "task_id": "b", "days": -7}]}]
+            resp = self.client.post('/api/schedule/what-if', json=dict(self.schedule, scenarios=bad))
+            self.assertEqual(resp.status_code, 400, action)
+
+    def test_workers_validated_and_clamped(self):
+        import phase16_api
+        for workers in ("many", None, [2]):
+            resp = self.client.post('/api/schedule/what-if', json=dict(self.schedule, scenarios=self.scenarios, workers=workers))
+            self.assertEqual(resp.status_code, 400)
+        evaluate = WhatIfScenarioEngine.evaluate
+        with mock.patch.object(phase16_api, 'MAX_WORKERS', 1), \
+                mock.patch.object(WhatIfScenarioEngine, 'evaluate', autospec=True, side_effect=evaluate) as spy:
+            resp = self.client.post('/api/schedule/what-if', json=dict(self.schedule, scenarios=self.scenarios, workers=10 ** 6))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(spy.call_args.kwargs['workers'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
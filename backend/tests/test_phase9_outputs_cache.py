@@ -0,0 +1,89 @@
+"""
+Phase 9: Unit Tests - Outputs Cache
+"""
+
+import gzip
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import unittest
+from phase9_outputs_cache import CachedResponse, Phase9OutputsCache, ReportVersion
+
+
+class TestPhase9OutputsCache(unittest.TestCase):
+
+    def setUp(self):
+        fd, name = tempfile.mkstemp(suffix='.json')
+        os.write(fd, b'[]')
+        os.close(fd)
+        self.path = Path(name)
+        self.addCleanup(self.path.unlink)
+
+    def test_version_tracks_file(self):
+        v1 = ReportVersion.of(self.path)
+        self.assertEqual(ReportVersion.of(self.path), v1)
+        self.assertNotEqual(v1.etag('a'), v1.etag('b'))
+        self.path.write_bytes(b'[1]')
+        v2 = ReportVersion.of(self.path)
+        self.assertNotEqual(v2, v1)
+        self.assertNotEqual(v2.etag('a'), v1.etag('a'))
+
+    def test_data_loaded_once_per_version(self):
+        cache = Phase9OutputsCache()
+        v1 = ReportVersion(str(self.path), 1, 2)
+        loads = []
+        for _ in range(3):
+            self.assertEqual(cache.data(v1, lambda: loads.append(1) or [1]), [1])
+        cache.data(ReportVersion(str(self.path), 2, 2), lambda: loads.append(2) or [2])
+        self.assertEqual(loads, [1, 2])
+        self.assertEqual(cache.stats()['loads'], 2)
+
+    def test_dropped_data_is_closed(self):
+        class Mapped:
+            closed = False
+
+            def close(self):
+                self.closed = True
+
+        cache = Phase9OutputsCache()
+        first, second = Mapped(), Mapped()
+        cache.data(ReportVersion(str(self.path), 1, 2), lambda: first)
+        cache.data(ReportVersion(str(self.path), 1, 2), lambda: second)
+        self.assertFalse(first.closed)
+        cache.data(ReportVersion(str(self.path), 2, 2), lambda: second)
+        self.assertTrue(first.closed)
+        cache.clear()
+        self.assertTrue(second.closed)
+
+    def test_responses_lru_and_dropped_on_new_version(self):
+        cache = Phase9OutputsCache(max_responses=2)
+        v1 = ReportVersion(str(self.path), 1, 2)
+        builds = []
+
+        def build(key):
+            def make():
+                builds.append(key)
+                return CachedResponse(key.encode() * 2000, v1.etag(key), 'application/json')
+            return make
+
+        for key in ('a', 'b', 'a', 'c', 'a', 'b'):
+            cache.response(v1, key, build(key))
+        self.assertEqual(builds, ['a', 'b', 'c', 'b'])
+        self.assertEqual(cache.stats()['hits'], 2)
+
+        entry = cache.response(v1, 'a', build('a'))
+        self.assertTrue(entry.compressible)
+        self.assertIs(entry.gzipped(), entry.gzipped())
+        self.assertEqual(gzip.decompress(entry.gzipped()), entry.body)
+
+        cache.response(ReportVersion(str(self.path), 1, 3), 'a', build('a'))
+        self.assertEqual(builds[-1], 'a')
+        self.assertEqual(cache.stats()['responses'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,284 @@
+"""Phase 9 columnar output format.
+
+A typed-array encoding of a list of Phase 9 project outputs, so consumers
+can filter and slice a portfolio without parsing one JSON object per
+project. A file is:
+
+    MAGIC (8 bytes) | header length (uint64 LE) | header (JSON) | buffers
+
+and every buffer starts on a 64-byte boundary. The header lists, per
+column, its kind and the (offset, nbytes, dtype) of its buffers:
+
+    f8      float64 values (risk_score, confidence_score, delay_probability)
+    number  float64 values plus a uint8 tag (None/int/float/bool) so
+            predicted_delay_days round-trips exactly
+    dict    uint32 codes into a dictionary stored in the header
+            (risk_level, model_version, schema_version, generated_at)
+    str     int64 offsets plus one UTF-8 blob, with an optional uint8
+            null mask (project_id, project_name, explanation)
+    json    like str, holding each value JSON-encoded (list fields and any
+            fields outside the schema, kept together under EXTRA_COLUMN)
+
+ColumnarOutputs memory-maps a file (or wraps bytes) and exposes columns as
+numpy views; only the rows asked for are turned back into dicts. numpy is
+required for both reading and writing.
+"""
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # the columnar format needs numpy; JSON/NDJSON do not
+    np = None
+
+from .schema import SCHEMA_VERSION
+
+FORMAT = "phase9-columnar-v1"
+MAGIC = b"P9COL\x001\n"
+MIMETYPE = "application/vnd.phase9.columnar"
+SUFFIX = ".p9col"
+ALIGN = 64
+EXTRA_COLUMN = "__extra__"
+
+COLUMN_KINDS = {
+    "schema_version": "dict",
+    "project_id": "str",
+    "project_name": "str",
+    "risk_score": "f8",
+    "risk_level": "dict",
+    "predicted_delay_days": "number",
+    "delay_probability": "f8",
+    "confidence_score": "f8",
+    "primary_risk_factors": "json",
+    "recommended_actions": "json",
+    "explanation": "str",
+    "model_version": "dict",
+    "generated_at": "dict",
+}
+
+# predicted_delay_days tags
+_NONE, _INT, _FLOAT, _BOOL = 0, 1, 2, 3
+
+
+def is_columnar(path: Path) -> bool:
+    return str(path).endswith(SUFFIX)
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("the Phase 9 columnar format requires numpy")
+
+
+def _encode_column(kind: str, values: List[Any]):
+    """(buffers, dictionary) for one column; buffers maps a buffer name to a numpy array"""
+    if kind == "f8":
+        return {"values": np.asarray(values, dtype="<f8")}, None
+    if kind == "number":
+        tags = np.fromiter(
+            (_NONE if v is None else _BOOL if isinstance(v, bool) else _INT if isinstance(v, int) else _FLOAT for v in values),
+            dtype="u1", count=len(values),
+        )
+        numbers = np.fromiter((0.0 if v is None else float(v) for v in values), dtype="<f8", count=len(values))
+        return {"values": numbers, "tags": tags}, None
+    if kind == "dict":
+        dictionary: Dict[Any, int] = {}
+        codes = np.fromiter((dictionary.setdefault(v, len(dictionary)) for v in values), dtype="<u4", count=len(values))
+        return {"codes": codes}, list(dictionary)
+    if kind in ("str", "json"):
+        if kind == "json":
+            values = [json.dumps(v) for v in values]
+        nulls = [v is None for v in values]
+        encoded = [b"" if v is None else v.encode("utf-8") for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+        np.cumsum(np.fromiter(map(len, encoded), dtype="<i8", count=len(encoded)), out=offsets[1:])
+        buffers = {"offsets": offsets, "data": np.frombuffer(b"".join(encoded), dtype="u1")}
+        if any(nulls):
+            buffers["nulls"] = np.asarray(nulls, dtype="u1")
+        return buffers, None
+    raise ValueError(f"unknown column kind: {kind}")
+
+
+def encode(outputs: Sequence[Dict[str, Any]]) -> bytes:
+    """Encode project outputs (already validated) in the columnar format"""
+    _require_numpy()
+    outputs = list(outputs)
+    columns = {name: [obj.get(name) for obj in outputs] for name in COLUMN_KINDS}
+    extras = [{k: v for k, v in obj.items() if k not in COLUMN_KINDS} for obj in outputs]
+    kinds = dict(COLUMN_KINDS)
+    if any(extras):
+        columns[EXTRA_COLUMN] = extras
+        kinds[EXTRA_COLUMN] = "json"
+
+    header_columns = []
+    chunks = []
+    position = 0
+    for name, kind in kinds.items():
+        buffers, dictionary = _encode_column(kind, columns[name])
+        entry: Dict[str, Any] = {"name": name, "kind": kind, "buffers": {}}
+        if dictionary is not None:
+            entry["dictionary"] = dictionary
+        for buffer_name, array in buffers.items():
+            data = array.tobytes()
+            entry["buffers"][buffer_name] = [position, len(data), array.dtype.str]
+            padding = -len(data) % ALIGN
+            chunks.append(data + b"\0" * padding)
+            position += len(data) + padding
+        header_columns.append(entry)
+
+    header = {"format": FORMAT, "schema_version": SCHEMA_VERSION, "count": len(outputs), "columns": header_columns}
+    header_bytes = json.dumps(header).encode("utf-8")
+    prefix = MAGIC + struct.pack("<Q", len(header_bytes)) + header_bytes
+    # buffer offsets in the header count from the end of this aligned prefix
+    prefix += b"\0" * (-len(prefix) % ALIGN)
+    return prefix + b"".join(chunks)
+
+
+def write(path: Path, outputs: Sequence[Dict[str, Any]]) -> None:
+    """Encode outputs to `path` (callers validate first; see output_writer.write_phase9_outputs)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = encode(outputs)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+    tmp.replace(path)
+
+
+class ColumnarOutputs:
+    """Read-only view of a columnar Phase 9 outputs file or buffer.
+
+    Opening a file maps it into memory; nothing is decoded until a column
+    or rows are requested, and `column()` returns numpy views over the
+    mapped bytes. Filtering and slicing (`select`) work on those arrays, so
+    only the rows actually returned are converted back into dicts.
+    """
+
+    def __init__(self, source: Union[Path, str, bytes]):
+        _require_numpy()
+        self._mmap = None
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            buf = memoryview(source)
+        else:
+            with open(source, "rb") as fh:
+                self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            buf = memoryview(self._mmap)
+        if bytes(buf[:len(MAGIC)]) != MAGIC:
+            raise ValueError("not a Phase 9 columnar file")
+        (header_len,) = struct.unpack_from("<Q", buf, len(MAGIC))
+        start = len(MAGIC) + 8
+        self.header = json.loads(bytes(buf[start:start + header_len]))
+        if self.header.get("format") != FORMAT:
+            raise ValueError(f"unsupported columnar format: {self.header.get('format')}")
+        base = start + header_len
+        base += -base % ALIGN
+        self._bytes = np.frombuffer(buf, dtype="u1")
+        self._base = base
+        self.columns = {entry["name"]: entry for entry in self.header["columns"]}
+        self._cache: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return self.header["count"]
+
+    def close(self) -> None:
+        """Release the memory map; views obtained from this object must no longer be used"""
+        self._cache.clear()
+        self._bytes = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # numpy views still exported; the map is released when they are collected
+            self._mmap = None
+
+    def _buffers(self, name: str) -> Dict[str, Any]:
+        buffers = self._cache.get(name)
+        if buffers is None:
+            entry = self.columns[name]
+            buffers = {}
+            for buffer_name, (offset, nbytes, dtype) in entry["buffers"].items():
+                raw = self._bytes[self._base + offset:self._base + offset + nbytes]
+                buffers[buffer_name] = raw.view(dtype)
+            self._cache[name] = buffers
+        return buffers
+
+    def column(self, name: str):
+        """The column as a numpy array: floats for f8/number, codes for dict, offsets for str/json"""
+        buffers = self._buffers(name)
+        return buffers.get("values", buffers.get("codes", buffers.get("offsets")))
+
+    def dictionary(self, name: str) -> List[Any]:
+        return self.columns[name].get("dictionary", [])
+
+    def select(
+        self,
+        risk_level: Optional[str] = None,
+        min_risk_score: Optional[float] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ):
+        """Indices of the rows matching the filters, after skipping `offset` and keeping at most `limit`"""
+        mask = None
+        if risk_level is not None:
+            levels = self.dictionary("risk_level")
+            if risk_level not in levels:
+                return np.zeros(0, dtype=np.int64)
+            mask = self.column("risk_level") == levels.index(risk_level)
+        if min_risk_score is not None:
+            above = self.column("risk_score") >= min_risk_score
+            mask = above if mask is None else mask & above
+        indices = np.arange(len(self), dtype=np.int64) if mask is None else np.flatnonzero(mask)
+        return indices[offset:] if limit is None else indices[offset:offset + limit]
+
+    def values(self, name: str, indices=None) -> List[Any]:
+        """Python values of one column for `indices` (all rows if None), decoded a column at a time"""
+        kind = self.columns[name]["kind"]
+        buffers = self._buffers(name)
+        idx = slice(None) if indices is None else np.asarray(indices, dtype=np.int64)
+        if kind == "f8":
+            return buffers["values"][idx].tolist()
+        if kind == "number":
+            return [None if tag == _NONE else bool(v) if tag == _BOOL else int(v) if tag == _INT else v
+                    for tag, v in zip(buffers["tags"][idx].tolist(), buffers["values"][idx].tolist())]
+        if kind == "dict":
+            dictionary = self.columns[name]["dictionary"]
+            return [dictionary[code] for code in buffers["codes"][idx].tolist()]
+        offsets = buffers["offsets"]
+        if indices is None:
+            starts, ends = offsets[:-1].tolist(), offsets[1:].tolist()
+        else:
+            starts, ends = offsets[idx].tolist(), offsets[idx + 1].tolist()
+        data = memoryview(buffers["data"])
+        if kind == "json":
+            # one parse for the whole column slice instead of one per value
+            values = json.loads(b"[" + b",".join(data[a:b] for a, b in zip(starts, ends)) + b"]")
+        else:
+            values = [str(data[a:b], "utf-8") for a, b in zip(starts, ends)]
+        nulls = buffers.get("nulls")
+        if nulls is not None:
+            for j in np.flatnonzero(nulls[idx]).tolist():
+                values[j] = None
+        return values
+
+    def rows(self, indices=None) -> List[Dict[str, Any]]:
+        """Project outputs for `indices` (all rows if None) as dicts, in the original key order"""
+        names = [name for name in self.columns if name != EXTRA_COLUMN]
+        rows = [dict(zip(names, values)) for values in zip(*(self.values(name, indices) for name in names))]
+        if EXTRA_COLUMN in self.columns:
+            for row, extra in zip(rows, self.values(EXTRA_COLUMN, indices)):
+                row.update(extra)
+        return rows
+
+    def __enter__(self) -> "ColumnarOutputs":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read(path: Path) -> List[Dict[str, Any]]:
+    """All outputs of a columnar file as dicts"""
+    with ColumnarOutputs(path) as outputs:
+        return outputs.rows()
@@ -7,10 +7,13 @@ file to `reports/phase9_outputs.json` using the canonical output writer.
 Run locally when you want to produce a canonical Phase9 outputs file for
 integration testing:
 
-    python scripts/phase9/generate_phase9_outputs.py
+    python scripts/phase9/generate_phase9_outputs.py [--format ndjson|ndjson.gz]
 
+With `--format ndjson` (or `ndjson.gz`) the outputs are streamed to
+`reports/phase9_outputs.ndjson[.gz]` with a sidecar offset index instead.
 """
 from pathlib import Path
+import argparse
 import json
 from datetime import datetime, timezone
 import sys
@@ -32,6 +35,11 @@ OUT_PATH = OUT_DIR / 'phase9_outputs.json'
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Generate Phase 9 outputs for local development')
+    parser.add_argument('--format', choices=['json', 'ndjson', 'ndjson.gz'], default='json')
+    args = parser.parse_args()
+    out_path = OUT_DIR / f'phase9_outputs.{args.format}'
+
     if not MOCK_PATH.exists():
         print('Mock sample not found at', MOCK_PATH)
         return
@@ -46,8 +54,8 @@ def main():
     OUT_DIR.mkdir(parents=True, exist_ok=True)
     # write validated outputs
     try:
-        output_writer.write_phase9_outputs(OUT_PATH, data)
-        print('Wrote phase9 outputs to', OUT_PATH)
+        output_writer.write_phase9_outputs(out_path, data)
+        print('Wrote phase9 outputs to', out_path)
     except Exception as e:
         print('Failed to write outputs:', e)
 
@@ -0,0 +1,134 @@
+"""Phase 9 output reader for the NDJSON format.
+
+NDJSON outputs (one project output per line, optionally gzip-compressed
+when the file name ends in `.gz`) are written in blocks by
+`output_writer.NDJSONOutputWriter`. Next to the data file sits a small
+sidecar index (`<path>.idx.json`) with the byte offset, record count and
+per-risk_level counts of every block. `iter_outputs` uses it to skip whole
+blocks when paginating or filtering, so reading a page touches only the
+blocks that hold it and memory stays flat for any report size.
+
+gzip files are written as one gzip member per block, so a block offset is
+a valid place to start decompressing.
+"""
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+INDEX_FORMAT = "phase9-ndjson-index-v1"
+NDJSON_SUFFIXES = (".ndjson", ".ndjson.gz")
+
+
+def is_ndjson(path: Path) -> bool:
+    return str(path).endswith(NDJSON_SUFFIXES)
+
+
+def is_gzip(path: Path) -> bool:
+    return str(path).endswith(".gz")
+
+
+def index_path(path: Path) -> Path:
+    """Sidecar index location for an NDJSON data file"""
+    path = Path(path)
+    return path.with_name(path.name + ".idx.json")
+
+
+def load_index(path: Path) -> Optional[Dict[str, Any]]:
+    """The sidecar index for `path`, or None when missing, unreadable or stale.
+
+    An index is stale when the data file's size or mtime differ from the
+    ones recorded at write time (e.g. the file was replaced by hand).
+    """
+    path = Path(path)
+    try:
+        with open(index_path(path), "r", encoding="utf-8") as fh:
+            index = json.load(fh)
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    if index.get("format") != INDEX_FORMAT or index.get("size") != st.st_size or index.get("mtime_ns") != st.st_mtime_ns:
+        return None
+    return index
+
+
+def count_outputs(path: Path, risk_level: Optional[str] = None) -> Optional[int]:
+    """Number of outputs (with `risk_level`, if given) according to the index; None without a usable index"""
+    index = load_index(path)
+    if index is None:
+        return None
+    if risk_level is None:
+        return index["count"]
+    return index["risk_level_counts"].get(risk_level, 0)
+
+
+def _block_lines(fh, path: Path, offset: int, count: Optional[int]) -> Iterator[bytes]:
+    """Non-empty lines of the block starting at byte `offset` (all remaining lines when count is None)"""
+    fh.seek(offset)
+    stream = gzip.GzipFile(fileobj=fh, mode="rb") if is_gzip(path) else fh
+    remaining = count
+    for line in stream:
+        if remaining is not None and remaining <= 0:
+            break
+        line = line.strip()
+        if not line:
+            continue
+        yield line
+        if remaining is not None:
+            remaining -= 1
+
+
+def iter_outputs(
+    path: Path,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    risk_level: Optional[str] = None,
+    raw: bool = False,
+) -> Iterator[Union[Dict[str, Any], bytes]]:
+    """Stream outputs from an NDJSON file, one at a time.
+
+    Skips the first `offset` outputs (after filtering by `risk_level`) and
+    stops after `limit`. With `raw=True` each output is yielded as its
+    encoded JSON line (bytes) instead of a dict. Without a usable index the
+    file is scanned from the start.
+    """
+    path = Path(path)
+    if limit is not None and limit <= 0:
+        return
+    index = load_index(path)
+    if index is None:
+        blocks: List[Dict[str, Any]] = [{"offset": 0, "count": None, "risk_levels": None}]
+    else:
+        blocks = index["blocks"]
+
+    skip = offset
+    produced = 0
+    with open(path, "rb") as fh:
+        for block in blocks:
+            if block["count"] is not None:
+                matching = block["count"] if risk_level is None else block["risk_levels"].get(risk_level, 0)
+                if matching <= skip:
+                    skip -= matching
+                    continue
+            for line in _block_lines(fh, path, block["offset"], block["count"]):
+                obj = None
+                if risk_level is not None:
+                    obj = json.loads(line)
+                    if obj.get("risk_level") != risk_level:
+                        continue
+                if skip:
+                    skip -= 1
+                    continue
+                if raw:
+                    yield line
+                else:
+                    yield obj if obj is not None else json.loads(line)
+                produced += 1
+                if limit is not None and produced >= limit:
+                    return
+
+
+def read_outputs(path: Path, **kwargs) -> List[Dict[str, Any]]:
+    """All outputs from an NDJSON file as a list (see iter_outputs for paging and filtering)"""
+    return list(iter_outputs(path, **kwargs))
@@ -2,12 +2,21 @@
 persists them using the shared reporting helper.
 
 This module provides a single entrypoint `write_phase9_outputs(path, outputs)`
-which will raise ValueError when validation fails.
+which will raise ValueError when validation fails. Paths ending in `.ndjson`
+or `.ndjson.gz` are written as NDJSON by `NDJSONOutputWriter`, which streams
+outputs in validated, flushed blocks and writes the sidecar offset index
+used by `output_reader`; `.p9col` paths get the columnar encoding from
+`columnar`.
 """
+import gzip
+import json
+import os
+from collections import Counter
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterable, List
 
-from . import reporting
+from . import columnar, reporting
+from .output_reader import INDEX_FORMAT, index_path, is_gzip, is_ndjson
 
 try:
     from . import schema as phase9_schema
@@ -17,18 +26,137 @@ except Exception:
     except Exception:
         phase9_schema = None
 
+# Outputs per NDJSON block: the unit of validation, flushing and index lookup
+DEFAULT_BLOCK_SIZE = 1000
 
-def write_phase9_outputs(path: Path, outputs: List[Dict[str, Any]]) -> None:
+
+class NDJSONOutputWriter:
+    """Stream Phase 9 outputs to an NDJSON (or gzip NDJSON) file.
+
+    Outputs are buffered into blocks of `block_size`; each block is
+    validated, encoded one object per line and flushed before the next one
+    is collected, so memory stays bounded by one block. The data goes to a
+    temporary file that replaces `path` on close(), followed by the sidecar
+    index, so readers never see a half-written report. A validation error
+    raises SchemaValidationError (indices count from the first output
+    written) and leaves any existing report untouched.
+
+        with NDJSONOutputWriter(path) as writer:
+            for output in outputs:
+                writer.write(output)
+    """
+
+    def __init__(self, path: Path, block_size: int = DEFAULT_BLOCK_SIZE, compresslevel: int = 6):
+        if phase9_schema is None:
+            raise RuntimeError("phase9.schema is unavailable; cannot validate outputs")
+        if block_size <= 0:
+            raise ValueError("block_size must be positive")
+        self.path = Path(path)
+        self.block_size = block_size
+        self.compresslevel = compresslevel
+        self.count = 0
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self._pending: List[Dict[str, Any]] = []
+        self._blocks: List[Dict[str, Any]] = []
+        self._level_counts: Counter = Counter()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(self._tmp_path, "wb")
+
+    def write(self, output: Dict[str, Any]) -> None:
+        self._pending.append(output)
+        if len(self._pending) >= self.block_size:
+            self._flush_block()
+
+    def write_many(self, outputs: Iterable[Dict[str, Any]]) -> None:
+        for output in outputs:
+            self.write(output)
+
+    def _flush_block(self) -> None:
+        block, self._pending = self._pending, []
+        if not block:
+            return
+        errors = phase9_schema.DEFAULT_VALIDATOR.validate(block)
+        if errors:
+            raise phase9_schema.SchemaValidationError([e._replace(index=e.index + self.count) for e in errors])
+        data = "".join(json.dumps(output) + "\n" for output in block).encode("utf-8")
+        if is_gzip(self.path):
+            data = gzip.compress(data, compresslevel=self.compresslevel, mtime=0)
+        levels = Counter(output["risk_level"] for output in block)
+        self._blocks.append({"offset": self._fh.tell(), "count": len(block), "risk_levels": dict(levels)})
+        self._fh.write(data)
+        self._fh.flush()
+        self._level_counts.update(levels)
+        self.count += len(block)
+
+    def close(self) -> None:
+        """Write the last block, move the report into place and write its index"""
+        if self._fh.closed:
+            return
+        try:
+            self._flush_block()
+        except Exception:
+            self.abort()
+            raise
+        self._fh.close()
+        st = os.stat(self._tmp_path)
+        os.replace(self._tmp_path, self.path)
+        index = {
+            "format": INDEX_FORMAT,
+            "schema_version": phase9_schema.SCHEMA_VERSION,
+            "compression": "gzip" if is_gzip(self.path) else None,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "count": self.count,
+            "risk_level_counts": dict(self._level_counts),
+            "blocks": self._blocks,
+        }
+        idx_path = index_path(self.path)
+        idx_tmp = idx_path.with_name(idx_path.name + ".tmp")
+        with open(idx_tmp, "w", encoding="utf-8") as fh:
+            json.dump(index, fh)
+        os.replace(idx_tmp, idx_path)
+
+    def abort(self) -> None:
+        """Discard everything written so far; the existing report (if any) is kept"""
+        self._fh.close()
+        try:
+            os.remove(self._tmp_path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "NDJSONOutputWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_phase9_outputs(path: Path, outputs: Iterable[Dict[str, Any]], block_size: int = DEFAULT_BLOCK_SIZE) -> None:
     """Validate Phase 9 outputs and write to `path`.
 
+    `.ndjson` / `.ndjson.gz` paths are streamed block by block (`outputs`
+    may then be any iterable); `.p9col` paths are written in the columnar
+    format (requires numpy); anything else is written as one JSON array.
     Raises ValueError if validation fails.
     """
     if phase9_schema is None:
         # best-effort: attempt to import runtime schema when possible
         raise RuntimeError("phase9.schema is unavailable; cannot validate outputs")
 
-    # validate (will raise ValueError on first failure)
-    phase9_schema.validate_many(outputs)
+    if is_ndjson(path):
+        with NDJSONOutputWriter(path, block_size=block_size) as writer:
+            writer.write_many(outputs)
+        return
+
+    if columnar.is_columnar(path):
+        outputs = list(outputs)
+        phase9_schema.validate_many(outputs)
+        columnar.write(path, outputs)
+        return
 
-    # write using reporting helper; pass explicit validator for clarity
-    reporting.write_json_report(path, outputs, validator=lambda o: phase9_schema.validate_many(o))
+    # the reporting helper runs the validator once before writing and raises
+    # SchemaValidationError (a ValueError) listing every invalid field
+    reporting.write_json_report(path, outputs, validator=phase9_schema.validate_many)
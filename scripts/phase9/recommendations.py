@@ -2,122 +2,259 @@
 
 Given a project record and risk breakdown, emit structured, explainable
 recommendations. Rules are deterministic and auditable.
+
+The rules live in a declarative table (RECOMMENDATION_RULES): each rule
+compares one input (a feature, the risk score or the top breakdown factor)
+with a threshold and names the recommendation to emit. A
+RecommendationEngine compiles a rule table once and evaluates it per
+project (recommendations_from) or for a whole portfolio as one boolean
+mask per rule (recommendations_batch). Extra rules can be loaded from
+dicts or JSON without code changes.
 """
-from typing import Dict, List
+import json
+import math
+import operator
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
 
+from .risk import DEFAULT_MODEL, RiskModel, _float_column, _to_float, np
 
-def recommendations_from(features: Dict[str, float], risk_score: float, breakdown: List[Dict[str, float]]) -> List[Dict[str, str]]:
-    recs = []
+# Pseudo-features a rule can test instead of a project feature
+RISK_SCORE = "@risk_score"
+TOP_FACTOR = "@top_factor"
 
-    # High-level rules
-    if risk_score >= 0.85:
-        recs.append({
-            "id": "expedite-mitigation",
-            "title": "Expedite mitigation planning",
-            "reason": "Risk score is critical; convene mitigation and rebaseline schedule.",
-        })
-
-    # If schedule slippage is a top contributor
-    top = breakdown[0]["factor"] if breakdown else None
-    if top == "schedule_slippage_pct":
-        recs.append({
-            "id": "schedule-audit",
-            "title": "Run schedule audit",
-            "reason": "Recent schedule slippage is the largest contributor to risk.",
-        })
-
-    # Subcontractor churn
-    subs = features.get("subcontractor_changes", 0)
-    try:
-        subs_f = float(subs)
-    except Exception:
-        subs_f = 0
-    if subs_f >= 2:
-        recs.append({
-            "id": "stabilize-subcontractors",
-            "title": "Stabilize subcontractor assignments",
-            "reason": f"Detected {int(subs_f)} subcontractor changes; consider lock-in contracts.",
-        })
-
-    # Inspection failure handling
-    insp = features.get("inspection_failure_rate", 0.0)
-    try:
-        insp_f = float(insp)
-    except Exception:
-        insp_f = 0.0
-    if insp_f >= 0.2:
-        recs.append({
-            "id": "quality-review",
-            "title": "Initiate quality review",
-            "reason": "Inspection failure rate exceeds 20%; review QC processes.",
-        })
-
-    # Weather volatility
-    wv = features.get("rolling_weekly_weather_volatility", 0.0)
-    try:
-        wv_f = float(wv)
-    except Exception:
-        wv_f = 0.0
-    if wv_f >= 0.5:
-        recs.append({
-            "id": "adjust-weather-contingency",
-            "title": "Adjust weather contingency",
-            "reason": "High recent weather volatility; increase contingency planning.",
-        })
+COMPARATORS = {
+    ">=": operator.ge,
+    ">": operator.gt,
+    "<=": operator.le,
+    "<": operator.lt,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
 
-    # Phase 20 - Workforce recommendations
-    wf_unrel = features.get("workforce_unreliability_score", 0.0)
-    try:
-        wf_f = float(wf_unrel)
-    except Exception:
-        wf_f = 0.0
-    if wf_f >= 0.4:
-        recs.append({
-            "id": "improve-attendance",
-            "title": "Improve workforce attendance",
-            "reason": "Detected workforce unreliability; consider incentives and backup crews.",
-        })
-    wf_pen = features.get("workforce_pattern_penalty", 0.0)
-    try:
-        wf_pen_f = float(wf_pen)
-    except Exception:
-        wf_pen_f = 0.0
-    if wf_pen_f >= 0.2:
-        recs.append({
-            "id": "address-patterns",
-            "title": "Address repeated no-shows",
-            "reason": "Pattern-based penalties detected; perform crew-level audits and retraining.",
-        })
 
-    # Phase 21 - Compliance & Safety recommendations
-    incident_p = features.get("safety_incident_probability", 0.0)
-    try:
-        incident_f = float(incident_p)
-    except Exception:
-        incident_f = 0.0
-    if incident_f >= 0.25:
-        recs.append({
-            "id": "safety-remediation",
-            "title": "Implement safety remediation",
-            "reason": "Elevated incident probability; prioritize safety interventions and inspections.",
-        })
-    comp_exp = features.get("compliance_exposure_score", 0.0)
-    try:
-        comp_f = float(comp_exp)
-    except Exception:
-        comp_f = 0.0
-    if comp_f >= 0.3:
-        recs.append({
-            "id": "prepare-audit",
-            "title": "Prepare for potential compliance citations",
-            "reason": "Compliance exposure is high; ensure documentation and corrective actions.",
-        })
+@dataclass(frozen=True)
+class RecommendationRule:
+    """One row of the rule table.
+
+    The rule fires when `feature` `op` `threshold` holds. `feature` is a
+    project feature (float() of its value; missing or unconvertible -> 0),
+    RISK_SCORE, TOP_FACTOR (the first breakdown factor, compared as a
+    string), or None for a rule that always fires. With `level` set, the
+    threshold is that risk level's lower bound in the scoring model.
+    `reason` may reference {value} and {int_value}, the tested value.
+    """
+    id: str
+    title: str
+    reason: str
+    feature: Optional[str] = None
+    op: str = ">="
+    threshold: Any = None
+    level: Optional[str] = None
+
+    def __post_init__(self):
+        if self.op not in COMPARATORS:
+            raise ValueError(f"rule {self.id}: unknown comparator {self.op!r}, expected one of {list(COMPARATORS)}")
+        if self.feature is not None and self.threshold is None and self.level is None:
+            raise ValueError(f"rule {self.id}: a threshold or risk level is required")
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "RecommendationRule":
+        return cls(**data)
+
 
+RECOMMENDATION_RULES = (
+    # High-level rules
+    RecommendationRule("expedite-mitigation", "Expedite mitigation planning",
+                       "Risk score is critical; convene mitigation and rebaseline schedule.",
+                       feature=RISK_SCORE, level="critical"),
+    RecommendationRule("schedule-audit", "Run schedule audit",
+                       "Recent schedule slippage is the largest contributor to risk.",
+                       feature=TOP_FACTOR, op="==", threshold="schedule_slippage_pct"),
+    RecommendationRule("stabilize-subcontractors", "Stabilize subcontractor assignments",
+                       "Detected {int_value} subcontractor changes; consider lock-in contracts.",
+                       feature="subcontractor_changes", threshold=2),
+    RecommendationRule("quality-review", "Initiate quality review",
+                       "Inspection failure rate exceeds 20%; review QC processes.",
+                       feature="inspection_failure_rate", threshold=0.2),
+    RecommendationRule("adjust-weather-contingency", "Adjust weather contingency",
+                       "High recent weather volatility; increase contingency planning.",
+                       feature="rolling_weekly_weather_volatility", threshold=0.5),
+    # Phase 20 - Workforce recommendations
+    RecommendationRule("improve-attendance", "Improve workforce attendance",
+                       "Detected workforce unreliability; consider incentives and backup crews.",
+                       feature="workforce_unreliability_score", threshold=0.4),
+    RecommendationRule("address-patterns", "Address repeated no-shows",
+                       "Pattern-based penalties detected; perform crew-level audits and retraining.",
+                       feature="workforce_pattern_penalty", threshold=0.2),
+    # Phase 21 - Compliance & Safety recommendations
+    RecommendationRule("safety-remediation", "Implement safety remediation",
+                       "Elevated incident probability; prioritize safety interventions and inspections.",
+                       feature="safety_incident_probability", threshold=0.25),
+    RecommendationRule("prepare-audit", "Prepare for potential compliance citations",
+                       "Compliance exposure is high; ensure documentation and corrective actions.",
+                       feature="compliance_exposure_score", threshold=0.3),
     # Always include a simple next-step recommendation
-    recs.append({
-        "id": "monitor",
-        "title": "Monitor and rerun scoring",
-        "reason": "Recompute risk daily and track top contributors.",
-    })
+    RecommendationRule("monitor", "Monitor and rerun scoring",
+                       "Recompute risk daily and track top contributors."),
+)
+
+
+def load_rules(source) -> List[RecommendationRule]:
+    """Rules from a JSON file path or a list of dicts with RecommendationRule fields"""
+    if isinstance(source, (str, Path)):
+        with open(source, "r", encoding="utf-8") as fh:
+            source = json.load(fh)
+    return [RecommendationRule.from_dict(item) for item in source]
+
+
+class RuleStats:
+    """Per-rule hit counts and evaluation time, accumulated by the engine when passed in"""
+
+    def __init__(self):
+        self.projects = 0
+        self.hits: Counter = Counter()
+        self.seconds: Counter = Counter()
+
+    def as_rows(self) -> List[Dict[str, Any]]:
+        """One row per evaluated rule: id, hits, hit_rate, seconds"""
+        return [
+            {"id": rule_id, "hits": self.hits[rule_id],
+             "hit_rate": self.hits[rule_id] / self.projects if self.projects else 0.0,
+             "seconds": self.seconds[rule_id]}
+            for rule_id in self.seconds
+        ]
+
+
+def _format_reason(template: str, value) -> str:
+    int_value = int(value) if isinstance(value, float) and math.isfinite(value) else value
+    return template.format(value=value, int_value=int_value)
+
+
+class RecommendationEngine:
+    """A rule table compiled against a risk model; immutable and shareable across threads"""
+
+    def __init__(self, rules: Iterable[RecommendationRule] = RECOMMENDATION_RULES, model: Optional[RiskModel] = None):
+        self.model = model or DEFAULT_MODEL
+        self.rules = tuple(rules)
+        # (rule, comparator, resolved threshold, fixed recommendation or None if the reason is a template)
+        self._compiled = tuple(
+            (rule, COMPARATORS[rule.op],
+             self.model.threshold(rule.level) if rule.level is not None else rule.threshold,
+             None if "{" in rule.reason else {"id": rule.id, "title": rule.title, "reason": rule.reason})
+            for rule in self.rules
+        )
+
+    def evaluate(
+        self,
+        features: Mapping[str, Any],
+        risk_score: float,
+        breakdown: List[Dict[str, float]],
+        stats: Optional[RuleStats] = None,
+    ) -> List[Dict[str, str]]:
+        """Recommendations for one project, in rule order"""
+        recs = []
+        for rule, compare, threshold, fixed in self._compiled:
+            if stats is not None:
+                start = time.perf_counter()
+            feature = rule.feature
+            if feature is None:
+                hit, value = True, None
+            else:
+                if feature == RISK_SCORE:
+                    value = risk_score
+                elif feature == TOP_FACTOR:
+                    value = breakdown[0]["factor"] if breakdown else None
+                else:
+                    value = _to_float(features.get(feature, 0))
+                hit = compare(value, threshold)
+            if hit:
+                recs.append(dict(fixed) if fixed is not None else
+                            {"id": rule.id, "title": rule.title, "reason": _format_reason(rule.reason, value)})
+            if stats is not None:
+                stats.seconds[rule.id] += time.perf_counter() - start
+                stats.hits[rule.id] += bool(hit)
+        if stats is not None:
+            stats.projects += 1
+        return recs
+
+    def evaluate_batch(
+        self,
+        features: Mapping[str, Any],
+        risk_scores: Sequence[float],
+        breakdowns: Sequence[List[Dict[str, float]]],
+        stats: Optional[RuleStats] = None,
+    ) -> List[List[Dict[str, str]]]:
+        """Recommendations for every row of a DataFrame or dict of columns.
+
+        Takes the same `features` as RiskModel.score_batch plus its scores
+        and breakdowns. Each rule is evaluated as one boolean mask over the
+        portfolio; row i gets exactly what evaluate() returns for project i.
+        """
+        if np is None:
+            raise ImportError("recommendations_batch requires numpy")
+        n = len(risk_scores)
+        recs: List[List[Dict[str, str]]] = [[] for _ in range(n)]
+        columns: Dict[str, Any] = {}
+
+        for rule, compare, threshold, fixed in self._compiled:
+            start = time.perf_counter()
+            feature = rule.feature
+            values = columns.get(feature)
+            if feature is None:
+                mask = np.ones(n, dtype=bool)
+            else:
+                if values is None:
+                    if feature == RISK_SCORE:
+                        values = np.asarray(risk_scores, dtype=np.float64)
+                    elif feature == TOP_FACTOR:
+                        values = np.array([b[0]["factor"] if b else None for b in breakdowns], dtype=object)
+                    elif feature in features:
+                        values, _ = _float_column(features[feature], n)
+                    else:
+                        values = np.zeros(n, dtype=np.float64)
+                    columns[feature] = values
+                mask = np.asarray(compare(values, threshold), dtype=bool)
+
+            hits = np.flatnonzero(mask).tolist()
+            if fixed is not None:
+                for i in hits:
+                    recs[i].append(dict(fixed))
+            else:
+                for i in hits:
+                    value = values[i].item() if isinstance(values[i], np.generic) else values[i]
+                    recs[i].append({"id": rule.id, "title": rule.title, "reason": _format_reason(rule.reason, value)})
+            if stats is not None:
+                stats.seconds[rule.id] += time.perf_counter() - start
+                stats.hits[rule.id] += len(hits)
+        if stats is not None:
+            stats.projects += n
+        return recs
+
+
+DEFAULT_ENGINE = RecommendationEngine()
+
+
+def recommendations_from(
+    features: Dict[str, float],
+    risk_score: float,
+    breakdown: List[Dict[str, float]],
+    model: Optional[RiskModel] = None,
+    stats: Optional[RuleStats] = None,
+) -> List[Dict[str, str]]:
+    """Recommendations for one project; `model` supplies the risk thresholds (DEFAULT_MODEL if omitted)"""
+    engine = DEFAULT_ENGINE if model is None or model is DEFAULT_ENGINE.model else RecommendationEngine(model=model)
+    return engine.evaluate(features, risk_score, breakdown, stats)
+
 
-    return recs
+def recommendations_batch(
+    features: Mapping[str, Any],
+    risk_scores: Sequence[float],
+    breakdowns: Sequence[List[Dict[str, float]]],
+    stats: Optional[RuleStats] = None,
+) -> List[List[Dict[str, str]]]:
+    """Recommendations for a whole portfolio with the default rules (see RecommendationEngine.evaluate_batch)"""
+    return DEFAULT_ENGINE.evaluate_batch(features, risk_scores, breakdowns, stats)
@@ -8,7 +8,16 @@ The original linear scoring is preserved; new inputs are added with
 explicit, auditable weights and simple normalizers to keep outputs
 deterministic for demo mode.
 """
-from typing import Dict, List, Tuple
+import hashlib
+import heapq
+import json
+from itertools import islice
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # score_batch needs numpy; score() does not
+    np = None
 
 # simple weight table: feature -> weight contribution (positive increases risk)
 # These weights are intentionally explicit and small in number for auditability.
@@ -100,6 +109,16 @@ NORMALIZERS = {
 }
 
 
+# Phase 22 IoT/site signals: feature -> weight in the amplification average
+IOT_AMPLIFIER_WEIGHTS = {
+    "iot_weather_severity": 0.6,
+    "iot_environmental_hazard_index": 0.3,
+    "iot_activity_anomaly_score": 0.4,
+}
+# Largest IoT amplification: scores grow by at most this fraction
+IOT_MAX_AMPLIFICATION = 0.25
+
+
 RISK_THRESHOLDS = {
     "low": 0.0,
     "medium": 0.25,
@@ -107,96 +126,413 @@ RISK_THRESHOLDS = {
     "critical": 0.85,
 }
 
+# Bump when the scoring arithmetic changes; RiskModel.version also hashes the tables
+RISK_MODEL_SPEC_VERSION = 1
+
+EXPLAIN_TOP_FACTORS = 3
+
+# Breakdown entry that sums every contributor left out of a top-k breakdown
+OTHER_FACTOR = "other"
+
+
+# Array forms of the scalar normalizers. Python's min/max return their first
+# argument unless the other compares strictly smaller/larger, so NaN maps to
+# 1.0 exactly as in score(); np.clip would propagate it instead.
+def _min_with(bound, v):
+    return np.where(v < bound, v, bound)
+
+
+def _max_with(bound, v):
+    return np.where(v > bound, v, bound)
 
-def score(features: Dict[str, float]) -> Tuple[float, List[Dict[str, float]]]:
-    """Compute normalized risk score (0.0-1.0) and return factor breakdown.
 
-    This function preserves the existing Phase 9 linear scoring and adds
-    deterministic, auditable inputs from Phase 20 and Phase 21. Phase 22
-    IoT/site signals are applied as a bounded multiplicative amplifier so
-    they increase or decrease the final score proportionally rather than
-    becoming standalone additive drivers.
+def _clip_unit(v):
+    return _max_with(0.0, _min_with(1.0, v))
+
+
+def _count_array(v):
+    return np.where(v <= 0, 0.0, np.where(v == 1, 0.2, _min_with(1.0, v / 5.0)))
+
+
+_ARRAY_NORMALIZERS = {
+    _normalize_schedule_slippage: _clip_unit,
+    _normalize_avg_delay: lambda v: _clip_unit(v / 30.0),
+    _normalize_count: _count_array,
+    _normalize_rate: _clip_unit,
+    _normalize_workforce_score: _clip_unit,
+    _normalize_incident_probability: _clip_unit,
+}
+
+
+def _to_float(raw) -> float:
+    try:
+        return float(raw)
+    except Exception:
+        return 0.0
 
-    Returns (risk_score, breakdown) where breakdown is ordered list of {factor, weight, value, contribution}.
+
+def _is_missing(raw) -> bool:
+    """None or NaN: an empty DataFrame cell, scored as if the key were absent"""
+    return raw is None or (isinstance(raw, float) and raw != raw)
+
+
+def _is_frame(features) -> bool:
+    """Whether a batch is a pandas DataFrame (checked without importing pandas)"""
+    return hasattr(features, "iloc") and hasattr(features, "columns")
+
+
+def _float_column(values, n: int):
+    """Column as float64 plus its missing-cell mask, converting element by element (failures -> 0.0) unless already numeric"""
+    column = np.asarray(values)
+    if column.dtype.kind in "biuf":
+        column = column.astype(np.float64).reshape(n)
+        return column, np.isnan(column)
+    if column.dtype.kind != "O":
+        # keep the original cells; a str array would have turned NaN into "nan"
+        column = np.asarray(values, dtype=object)
+    cells = column.reshape(n)
+    missing = np.fromiter((_is_missing(x) for x in cells), dtype=bool, count=n)
+    return np.fromiter((_to_float(x) for x in cells), dtype=np.float64, count=n), missing
+
+
+def _top_k_mask(contributions, k: int):
+    """Per row, mark the k largest entries; ties at the cut go to the lowest column, as in a stable sort"""
+    kth = -np.partition(-contributions, k - 1, axis=1)[:, k - 1:k] if k else np.full((len(contributions), 1), np.inf)
+    above = contributions > kth
+    ties = contributions == kth
+    room = k - above.sum(axis=1, keepdims=True)
+    return above | (ties & (np.cumsum(ties, axis=1) <= room))
+
+
+def _zero_normalizer(raw) -> float:
+    return 0.0
+
+
+def _contribution(item) -> float:
+    return item["contribution"]
+
+
+def _other_entry(residual: List[Dict[str, float]]) -> Dict[str, Any]:
+    """The "other" bucket: how many contributors were folded in and their summed contribution"""
+    return {"factor": OTHER_FACTOR, "weight": 0.0, "value": len(residual),
+            "contribution": sum(item["contribution"] for item in residual)}
+
+
+def compact_breakdown(breakdown: List[Dict[str, Any]], top_k: Optional[int]) -> List[Dict[str, Any]]:
+    """First `top_k` entries of a sorted breakdown plus an "other" bucket for the rest (all entries if None)"""
+    if top_k is None or len(breakdown) <= top_k:
+        return breakdown
+    top_k = max(0, top_k)
+    return breakdown[:top_k] + [_other_entry(breakdown[top_k:])]
+
+
+class RiskModel:
+    """Risk scoring tables compiled once into fixed-order tuples and arrays.
+
+    Built from WEIGHTS, NORMALIZERS, RISK_THRESHOLDS and the IoT amplifier
+    config (or explicit replacements), so score() no longer re-sums the
+    weights or rebuilds lookup tables per call. A model never changes after
+    construction and keeps no per-call state, so one instance can be shared
+    by every caller and thread. `version` identifies the tables and
+    arithmetic it was built from, for stamping outputs.
     """
-    contributions = []
-    total_raw = 0.0
-
-    # compute core additive contributions (Phase 9 + Phase 20/21)
-    for feat, w in WEIGHTS.items():
-        normalizer = NORMALIZERS.get(feat, lambda x: 0.0)
-        raw_val = features.get(feat, 0)
-        norm = normalizer(raw_val)
-        contrib = norm * w
-        contributions.append({"factor": feat, "weight": w, "value": norm, "contribution": contrib})
-        total_raw += contrib
-
-    # total_raw is already in 0..sum(weights); normalize by sum(weights)
-    weight_sum = sum(WEIGHTS.values())
-    if weight_sum <= 0:
-        normalized = 0.0
-    else:
-        normalized = max(0.0, min(1.0, total_raw / weight_sum))
-
-    # keep base value for attribution before IoT amplification
-    base_normalized = normalized
-
-    # Phase 22 - IoT/site conditions act as amplifiers (multiplicative)
-    # Collect IoT signals if present and compute an amplification factor
-    iot_keys = [
-        "iot_weather_severity",
-        "iot_environmental_hazard_index",
-        "iot_activity_anomaly_score",
-    ]
-    # small per-signal weights to control amplification magnitude
-    iot_weight_map = {"iot_weather_severity": 0.6, "iot_environmental_hazard_index": 0.3, "iot_activity_anomaly_score": 0.4}
-    iot_norm_total = 0.0
-    iot_weight_sum = 0.0
-    for k in iot_keys:
-        if k in features:
-            try:
-                v = float(features.get(k, 0))
-            except Exception:
-                v = 0.0
-            v = max(0.0, min(1.0, v))
-            w = iot_weight_map.get(k, 0.0)
-            iot_norm_total += v * w
-            iot_weight_sum += w
-            # add to breakdown with zero additive contribution (acts via multiplier)
-            contributions.append({"factor": k, "weight": 0.0, "value": v, "contribution": 0.0})
-
-    if iot_weight_sum > 0 and iot_norm_total > 0:
-        # Base amplification: between 1.0 and 1.25 depending on IoT severity
-        iot_avg = iot_norm_total / iot_weight_sum
-        amplification = 1.0 + min(0.25, iot_avg * 0.25)
-        normalized = max(0.0, min(1.0, normalized * amplification))
-    else:
-        amplification = 1.0
-
-    # record IoT amplification as a breakdown entry (small, for explainability)
-    iot_added = max(0.0, normalized - base_normalized)
-    if iot_added > 0:
-        contributions.append({"factor": "iot_amplification", "weight": 0.0, "value": amplification, "contribution": iot_added})
-
-    # sort breakdown by contribution desc
-    breakdown = sorted(contributions, key=lambda x: x["contribution"], reverse=True)
-    return normalized, breakdown
-
-
-def risk_level_from_score(score_val: float) -> str:
-    if score_val >= RISK_THRESHOLDS["critical"]:
-        return "critical"
-    if score_val >= RISK_THRESHOLDS["high"]:
-        return "high"
-    if score_val >= RISK_THRESHOLDS["medium"]:
-        return "medium"
-    return "low"
-
-
-def explain_score(score_val: float, breakdown: List[Dict[str, float]]) -> str:
-    pieces = []
-    for item in breakdown[:3]:
-        name = item["factor"]
-        contrib = item.get("contribution", 0.0)
-        pieces.append(f"{name} (+{contrib:.2f})")
-    return ", ".join(pieces)
+
+    def __init__(
+        self,
+        weights: Optional[Mapping[str, float]] = None,
+        normalizers: Optional[Mapping[str, Callable[[Any], float]]] = None,
+        thresholds: Optional[Mapping[str, float]] = None,
+        iot_weights: Optional[Mapping[str, float]] = None,
+        iot_max_amplification: float = IOT_MAX_AMPLIFICATION,
+    ):
+        weights = WEIGHTS if weights is None else weights
+        normalizers = NORMALIZERS if normalizers is None else normalizers
+        thresholds = RISK_THRESHOLDS if thresholds is None else thresholds
+        iot_weights = IOT_AMPLIFIER_WEIGHTS if iot_weights is None else iot_weights
+
+        self.factors: Tuple[str, ...] = tuple(weights)
+        self.weights: Tuple[float, ...] = tuple(weights[f] for f in self.factors)
+        self.normalizers = tuple(normalizers.get(f, _zero_normalizer) for f in self.factors)
+        self.weight_sum: float = sum(self.weights)
+        self.iot_factors: Tuple[str, ...] = tuple(iot_weights)
+        self.iot_weights: Tuple[float, ...] = tuple(iot_weights[k] for k in self.iot_factors)
+        self.iot_max_amplification = iot_max_amplification
+        # (level, threshold) from the highest threshold down
+        self.thresholds: Tuple[Tuple[str, float], ...] = tuple(
+            sorted(thresholds.items(), key=lambda item: item[1], reverse=True))
+        self._additive = tuple(zip(self.factors, self.weights, self.normalizers))
+        self._iot = tuple(zip(self.iot_factors, self.iot_weights))
+        self._array_normalizers = tuple(_ARRAY_NORMALIZERS.get(n) for n in self.normalizers)
+        self._weight_vector = np.array(self.weights, dtype=np.float64) if np is not None else None
+
+        spec = {
+            "spec_version": RISK_MODEL_SPEC_VERSION,
+            "weights": list(zip(self.factors, self.weights)),
+            "normalizers": [f"{n.__module__}.{n.__qualname__}" for n in self.normalizers],
+            "thresholds": [list(item) for item in self.thresholds],
+            "iot_weights": list(self._iot),
+            "iot_max_amplification": iot_max_amplification,
+        }
+        self.spec_hash = hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()
+        self.version = f"{RISK_MODEL_SPEC_VERSION}-{self.spec_hash[:12]}"
+
+    def threshold(self, level: str) -> float:
+        """Lower score bound of a risk level"""
+        for name, value in self.thresholds:
+            if name == level:
+                return value
+        raise KeyError(level)
+
+    def score(
+        self,
+        features: Mapping[str, Any],
+        top_k: Optional[int] = None,
+    ) -> Tuple[float, List[Dict[str, float]]]:
+        """Compute normalized risk score (0.0-1.0) and return factor breakdown.
+
+        This preserves the existing Phase 9 linear scoring and adds
+        deterministic, auditable inputs from Phase 20 and Phase 21. Phase 22
+        IoT/site signals are applied as a bounded multiplicative amplifier so
+        they increase or decrease the final score proportionally rather than
+        becoming standalone additive drivers.
+
+        Returns (risk_score, breakdown) where breakdown is ordered list of {factor, weight, value, contribution}.
+        With `top_k`, only the k largest contributors are selected and
+        ordered; the rest are summed into a trailing "other" entry (value =
+        how many contributors it holds, contribution = their sum in factor order).
+        """
+        contributions = []
+        total_raw = 0.0
+
+        # compute core additive contributions (Phase 9 + Phase 20/21)
+        for feat, w, normalizer in self._additive:
+            norm = normalizer(features.get(feat, 0))
+            contrib = norm * w
+            contributions.append({"factor": feat, "weight": w, "value": norm, "contribution": contrib})
+            total_raw += contrib
+
+        # total_raw is already in 0..sum(weights); normalize by sum(weights)
+        if self.weight_sum <= 0:
+            normalized = 0.0
+        else:
+            normalized = max(0.0, min(1.0, total_raw / self.weight_sum))
+
+        # keep base value for attribution before IoT amplification
+        base_normalized = normalized
+
+        # Phase 22 - IoT/site conditions act as amplifiers (multiplicative)
+        iot_norm_total = 0.0
+        iot_weight_sum = 0.0
+        for k, w in self._iot:
+            if k in features:
+                try:
+                    v = float(features.get(k, 0))
+                except Exception:
+                    v = 0.0
+                v = max(0.0, min(1.0, v))
+                iot_norm_total += v * w
+                iot_weight_sum += w
+                # add to breakdown with zero additive contribution (acts via multiplier)
+                contributions.append({"factor": k, "weight": 0.0, "value": v, "contribution": 0.0})
+
+        if iot_weight_sum > 0 and iot_norm_total > 0:
+            # Amplification between 1.0 and 1.0 + iot_max_amplification depending on IoT severity
+            iot_avg = iot_norm_total / iot_weight_sum
+            amplification = 1.0 + min(self.iot_max_amplification, iot_avg * self.iot_max_amplification)
+            normalized = max(0.0, min(1.0, normalized * amplification))
+        else:
+            amplification = 1.0
+
+        # record IoT amplification as a breakdown entry (small, for explainability)
+        iot_added = max(0.0, normalized - base_normalized)
+        if iot_added > 0:
+            contributions.append({"factor": "iot_amplification", "weight": 0.0, "value": amplification, "contribution": iot_added})
+
+        # sort breakdown by contribution desc
+        if top_k is None:
+            contributions.sort(key=_contribution, reverse=True)
+            return normalized, contributions
+        top = heapq.nlargest(max(0, top_k), contributions, key=_contribution)
+        if len(top) == len(contributions):
+            return normalized, top
+        chosen = set(map(id, top))
+        top.append(_other_entry([item for item in contributions if id(item) not in chosen]))
+        return normalized, top
+
+    def score_batch(
+        self,
+        features: Mapping[str, Any],
+        top_k: Optional[int] = None,
+    ) -> Tuple[Any, List[List[Dict[str, float]]]]:
+        """Score many projects at once; row i matches score() on row i bit for bit.
+
+        `features` is a DataFrame or a dict of equal-length columns (lists or
+        arrays) keyed by feature name. A missing column counts as 0 for every
+        row, as in score(). IoT columns that are present amplify every row,
+        the way an IoT key present in a project dict does. In a DataFrame a
+        None/NaN cell counts as a key the row lacks, since that is what
+        pd.DataFrame(records) leaves where a record has no such key; dict
+        columns keep score()'s handling of None/NaN values.
+
+        Normalizers run as array expressions over whole columns (custom
+        normalizers fall back to being called per value). Contributions are
+        the normalized matrix times the weight vector, summed column by column
+        in factor order so the floating-point result equals score()'s loop.
+
+        Returns (scores, breakdowns): a float64 array and, per row, the
+        breakdown score(features, top_k) would return. With `top_k` each row's
+        k largest contributors are picked with a partition (ties going to the
+        earlier factor, as in the stable sort) and only those are sorted.
+        """
+        if np is None:
+            raise ImportError("score_batch requires numpy")
+
+        columns = list(features.keys())
+        n = len(features[columns[0]]) if columns else 0
+
+        # NaN/None cells of a DataFrame are absent keys; in dict columns they are values
+        cells_missing = _is_frame(features)
+        no_cells_missing = np.zeros(n, dtype=bool)
+
+        factors = list(self.factors)
+        num_additive = len(factors)
+        values = np.zeros((n, num_additive + len(self.iot_factors) + 1), dtype=np.float64)
+        for j, (feat, normalizer, array_normalizer) in enumerate(
+                zip(self.factors, self.normalizers, self._array_normalizers)):
+            if feat not in features:
+                values[:, j] = normalizer(0)
+            elif array_normalizer is not None:
+                column, missing = _float_column(features[feat], n)
+                values[:, j] = array_normalizer(column)
+                if cells_missing:
+                    values[:, j] = np.where(missing, normalizer(0), values[:, j])
+            else:
+                values[:, j] = np.fromiter(
+                    (normalizer(0 if cells_missing and _is_missing(x) else x) for x in features[feat]),
+                    dtype=np.float64, count=n)
+
+        contributions = np.zeros_like(values)
+        contributions[:, :num_additive] = values[:, :num_additive] * self._weight_vector
+        total_raw = np.zeros(n, dtype=np.float64)
+        for j in range(num_additive):
+            total_raw += contributions[:, j]
+
+        if self.weight_sum <= 0:
+            normalized = np.zeros(n, dtype=np.float64)
+        else:
+            normalized = _clip_unit(total_raw / self.weight_sum)
+        base_normalized = normalized
+
+        # Phase 22 - IoT amplification, same accumulation order as score();
+        # missing DataFrame cells add exact zeros and get no breakdown entry (-inf)
+        iot_norm_total = np.zeros(n, dtype=np.float64)
+        iot_weight_sum = np.zeros(n, dtype=np.float64)
+        column = num_additive
+        for k, w in self._iot:
+            if k in features:
+                raw, missing = _float_column(features[k], n)
+                if not cells_missing:
+                    missing = no_cells_missing
+                v = np.where(missing, 0.0, _clip_unit(raw))
+                iot_norm_total += v * w
+                iot_weight_sum += np.where(missing, 0.0, w)
+                values[:, column] = v
+                contributions[:, column] = np.where(missing, -np.inf, 0.0)
+                factors.append(k)
+                column += 1
+
+        amplification = np.ones(n, dtype=np.float64)
+        if column > num_additive:
+            amplified = iot_norm_total > 0
+            iot_avg = iot_norm_total / np.where(amplified, iot_weight_sum, 1.0)
+            cap = self.iot_max_amplification
+            amplification = np.where(amplified, 1.0 + _min_with(cap, iot_avg * cap), 1.0)
+            normalized = np.where(amplified, _clip_unit(normalized * amplification), normalized)
+
+        iot_added = _max_with(0.0, normalized - base_normalized)
+        values[:, column] = amplification
+        contributions[:, column] = np.where(iot_added > 0, iot_added, -np.inf)
+        factors.append("iot_amplification")
+        width = column + 1
+        values = values[:, :width]
+        contributions = contributions[:, :width]
+
+        # Absent IoT and amplification entries sort last (-inf) and are never reported
+        present = contributions > -np.inf
+        keep = width if top_k is None else max(0, min(top_k, width))
+        if keep < width:
+            selected = _top_k_mask(contributions, keep)
+            residual = np.where(selected | ~present, 0.0, contributions)
+            other_contribution = np.zeros(n, dtype=np.float64)
+            for j in range(width):
+                other_contribution += residual[:, j]
+            other_count = (present & ~selected).sum(axis=1).tolist()
+            other_contribution = other_contribution.tolist()
+            chosen = np.nonzero(selected)[1].reshape(n, keep)
+        else:
+            chosen = np.broadcast_to(np.arange(width), (n, width))
+        # Stable descending order of the chosen columns, like sorted(..., reverse=True);
+        # only the kept entries are converted back to Python floats
+        chosen_contributions = np.take_along_axis(contributions, chosen, axis=1)
+        order = np.take_along_axis(chosen, np.argsort(-chosen_contributions, axis=1, kind="stable"), axis=1)
+        top_values = np.take_along_axis(values, order, axis=1).tolist()
+        top_contributions = np.take_along_axis(contributions, order, axis=1).tolist()
+        factor_weights = list(self.weights) + [0.0] * (width - num_additive)
+        breakdowns = []
+        for i, (row_order, row_values, row_contributions) in enumerate(
+                zip(order.tolist(), top_values, top_contributions)):
+            while row_contributions and row_contributions[-1] == -np.inf:
+                del row_order[-1]  # no such entry for this row
+                del row_contributions[-1]
+            breakdown = [
+                {"factor": factors[j], "weight": factor_weights[j], "value": v, "contribution": c}
+                for j, v, c in zip(row_order, row_values, row_contributions)
+            ]
+            if keep < width and other_count[i]:
+                breakdown.append({"factor": OTHER_FACTOR, "weight": 0.0, "value": other_count[i],
+                                  "contribution": other_contribution[i]})
+            breakdowns.append(breakdown)
+        return normalized, breakdowns
+
+    def risk_level(self, score_val: float) -> str:
+        """Highest level whose threshold the score reaches (the lowest level otherwise)"""
+        for level, threshold in self.thresholds[:-1]:
+            if score_val >= threshold:
+                return level
+        return self.thresholds[-1][0]
+
+    def explain(self, score_val: float, breakdown: List[Dict[str, float]]) -> str:
+        """One-line summary of the top contributors"""
+        pieces = []
+        contributors = (item for item in breakdown if item["factor"] != OTHER_FACTOR)
+        for item in islice(contributors, EXPLAIN_TOP_FACTORS):
+            name = item["factor"]
+            contrib = item.get("contribution", 0.0)
+            pieces.append(f"{name} (+{contrib:.2f})")
+        return ", ".join(pieces)
+
+
+# Compiled from the module-level tables at import; build a new RiskModel to
+# score with edited tables
+DEFAULT_MODEL = RiskModel()
+
+
+def score(features: Dict[str, float], top_k: Optional[int] = None) -> Tuple[float, List[Dict[str, float]]]:
+    """Compute normalized risk score (0.0-1.0) and factor breakdown with DEFAULT_MODEL (see RiskModel.score)"""
+    return DEFAULT_MODEL.score(features, top_k)
+
+
+def score_batch(
+    features: Mapping[str, Any],
+    top_k: Optional[int] = None,
+) -> Tuple[Any, List[List[Dict[str, float]]]]:
+    """Score a DataFrame or dict of columns with DEFAULT_MODEL (see RiskModel.score_batch)"""
+    return DEFAULT_MODEL.score_batch(features, top_k)
+
+
+def risk_level_from_score(score_val: float, model: Optional[RiskModel] = None) -> str:
+    return (model or DEFAULT_MODEL).risk_level(score_val)
+
+
+def explain_score(score_val: float, breakdown: List[Dict[str, float]], model: Optional[RiskModel] = None) -> str:
+    return (model or DEFAULT_MODEL).explain(score_val, breakdown)
@@ -3,9 +3,23 @@
 This module defines the canonical output schema (phase9-v1) and functions to
 validate project output dicts. Validation is intentionally implemented without
 external dependencies so CI remains offline-safe.
+
+validate_project_output checks one dict and stops at the first problem.
+BatchValidator checks a whole list (or a dict of columns) field by field,
+with numeric range checks as array operations when numpy is available and
+one timestamp parse per distinct value, and reports every problem with its
+record index.
 """
+from bisect import bisect_right
 from datetime import datetime
-from typing import Any, Dict, List
+from itertools import accumulate
+from operator import itemgetter
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # range checks fall back to plain loops
+    np = None
 
 SCHEMA_VERSION = "phase9-v1"
 
@@ -102,7 +116,222 @@ def validate_project_output(obj: Dict[str, Any]) -> None:
         raise ValueError("explanation must be a non-empty string")
 
 
+# How many errors SchemaValidationError spells out in its message
+MAX_REPORTED_ERRORS = 20
+
+# Fields with a 0..1 range check; True when NaN counts as out of range
+RANGE_CHECKED_FIELDS = {
+    "risk_score": True,
+    "confidence_score": True,
+    "delay_probability": False,
+}
+
+_MISSING = object()
+
+
+def _distinct(values: List[Any]):
+    """The distinct values, or all of them if any is unhashable (e.g. a list)"""
+    try:
+        return set(values)
+    except TypeError:
+        return values
+
+
+class SchemaError(NamedTuple):
+    index: int
+    field: Optional[str]
+    message: str
+
+
+class SchemaValidationError(ValueError):
+    """Every schema violation found in a batch; `errors` is a list of SchemaError"""
+
+    def __init__(self, errors: Sequence[SchemaError]):
+        self.errors = list(errors)
+        shown = "; ".join(
+            f"[{e.index}] {e.field}: {e.message}" if e.field else f"[{e.index}] {e.message}"
+            for e in self.errors[:MAX_REPORTED_ERRORS]
+        )
+        more = len(self.errors) - MAX_REPORTED_ERRORS
+        super().__init__(f"{len(self.errors)} schema error(s): {shown}" + (f"; ... and {more} more" if more > 0 else ""))
+
+
+def _range_violations(values: List[float], nan_fails: bool) -> List[int]:
+    """Positions in `values` outside 0..1"""
+    if np is not None and values:
+        arr = np.asarray(values, dtype=np.float64)
+        bad = ~((arr >= 0.0) & (arr <= 1.0)) if nan_fails else (arr < 0.0) | (arr > 1.0)
+        return np.flatnonzero(bad).tolist()
+    if nan_fails:
+        return [j for j, v in enumerate(values) if not (0.0 <= v <= 1.0)]
+    return [j for j, v in enumerate(values) if v < 0.0 or v > 1.0]
+
+
+class BatchValidator:
+    """The Phase 9 schema compiled for checking many outputs at once.
+
+    Accepts exactly what validate_project_output accepts. Type checks are
+    cached per (field, concrete type); a field with the wrong type skips that
+    field's value checks for the record.
+    """
+
+    def __init__(self, required_fields: Mapping[str, Any] = REQUIRED_FIELDS, schema_version: str = SCHEMA_VERSION):
+        self.schema_version = schema_version
+        self.fields = tuple(
+            (name, expected if isinstance(expected, tuple) else (expected,)) for name, expected in required_fields.items()
+        )
+        self._accepted: Dict[str, Dict[type, bool]] = {name: {} for name, _ in self.fields}
+
+    def validate(self, outputs: Sequence[Any]) -> List[SchemaError]:
+        """All schema errors in a list of project output dicts, ordered by record index"""
+        errors = []
+        if all(issubclass(t, dict) for t in set(map(type, outputs))):
+            records, index = outputs, range(len(outputs))
+        else:
+            records, index = [], []
+            for i, obj in enumerate(outputs):
+                if isinstance(obj, dict):
+                    records.append(obj)
+                    index.append(i)
+                else:
+                    errors.append(SchemaError(i, None, "project output must be a dict"))
+        columns = {}
+        for name in ("schema_version",) + tuple(name for name, _ in self.fields):
+            try:
+                columns[name] = list(map(itemgetter(name), records))
+            except KeyError:
+                columns[name] = [obj.get(name, _MISSING) for obj in records]
+        errors.extend(self._check_columns(columns, index))
+        errors.sort(key=lambda e: e.index)
+        return errors
+
+    def validate_columns(self, columns: Mapping[str, Sequence[Any]], n: Optional[int] = None) -> List[SchemaError]:
+        """All schema errors in a columnar batch (field -> one value per record); absent columns are missing fields"""
+        lengths = {len(values) for values in columns.values()}
+        if n is None:
+            n = lengths.pop() if lengths else 0
+        if lengths - {n}:
+            raise ValueError("all columns must have the same length")
+        missing = [_MISSING] * n
+        names = ("schema_version",) + tuple(name for name, _ in self.fields)
+        full = {name: list(columns[name]) if name in columns else missing for name in names}
+        errors = self._check_columns(full, range(n))
+        errors.sort(key=lambda e: e.index)
+        return errors
+
+    def _check_columns(self, columns: Dict[str, List[Any]], index: Sequence[int]) -> List[SchemaError]:
+        errors = []
+        if any(ver != self.schema_version for ver in _distinct(columns["schema_version"])):
+            for pos, ver in enumerate(columns["schema_version"]):
+                if ver != self.schema_version:
+                    ver = None if ver is _MISSING else ver
+                    errors.append(SchemaError(index[pos], "schema_version",
+                                              f"invalid schema_version: expected {self.schema_version}, got {ver}"))
+
+        # values of each field that have the expected type, with their positions
+        typed: Dict[str, Tuple[Sequence[int], List[Any]]] = {}
+        for name, types in self.fields:
+            column = columns[name]
+            accepted = self._accepted[name]
+            seen = set(map(type, column))
+            for t in seen - accepted.keys():
+                accepted[t] = issubclass(t, types)
+            if all(accepted[t] for t in seen):
+                typed[name] = (range(len(column)), column)
+                continue
+            good = []
+            for pos, value in enumerate(column):
+                if value is _MISSING:
+                    errors.append(SchemaError(index[pos], name, "missing required field"))
+                elif accepted[type(value)]:
+                    good.append(pos)
+                else:
+                    errors.append(SchemaError(index[pos], name, f"wrong type: {_type_name(value)} expected one of "
+                                                                f"{[t.__name__ for t in types]}"))
+            typed[name] = (good, [column[pos] for pos in good])
+
+        for name, nan_fails in RANGE_CHECKED_FIELDS.items():
+            if name in typed:
+                rows, values = typed[name]
+                for j in _range_violations(values, nan_fails):
+                    errors.append(SchemaError(index[rows[j]], name, f"out of range 0.0-1.0: {float(values[j])}"))
+
+        if "primary_risk_factors" in typed:
+            errors.extend(self._check_factors(*typed["primary_risk_factors"], index))
+
+        if "generated_at" in typed:
+            rows, stamps = typed["generated_at"]
+            problems = {}
+            for stamp in set(stamps):
+                try:
+                    datetime.fromisoformat(stamp)
+                except Exception as e:
+                    problems[stamp] = f"must be ISO timestamp: {e}"
+            if problems:
+                errors.extend(SchemaError(index[rows[j]], "generated_at", problems[stamp])
+                              for j, stamp in enumerate(stamps) if stamp in problems)
+
+        if "explanation" in typed:
+            rows, texts = typed["explanation"]
+            blank = {text for text in set(texts) if not text.strip()}
+            if blank:
+                errors.extend(SchemaError(index[rows[j]], "explanation", "must be a non-empty string")
+                              for j, text in enumerate(texts) if text in blank)
+        return errors
+
+    @staticmethod
+    def _check_factors(rows: Sequence[int], lists: List[list], index: Sequence[int]) -> List[SchemaError]:
+        items = [item for factors in lists for item in factors]
+        # fast path: every item is a dict with both keys and a float()-able contribution
+        contributions = None
+        if all(issubclass(t, dict) for t in set(map(type, items))):
+            try:
+                if all("factor" in item for item in items):
+                    contributions = list(map(float, [item["contribution"] for item in items]))
+            except Exception:
+                contributions = None
+        if contributions is not None:
+            starts = list(accumulate(map(len, lists), initial=0))
+            errors = []
+            for m in _range_violations(contributions, nan_fails=False):
+                k = bisect_right(starts, m) - 1
+                errors.append(SchemaError(index[rows[k]], "primary_risk_factors",
+                                          f"[{m - starts[k]}].contribution must be between 0 and 1"))
+            return errors
+
+        errors = []
+        contributions = []
+        owners = []
+        for k, factors in enumerate(lists):
+            for j, item in enumerate(factors):
+                if not isinstance(item, dict):
+                    errors.append(SchemaError(index[rows[k]], "primary_risk_factors", f"[{j}] must be dict"))
+                elif "factor" not in item or "contribution" not in item:
+                    errors.append(SchemaError(index[rows[k]], "primary_risk_factors", f"[{j}] missing 'factor' or 'contribution'"))
+                else:
+                    try:
+                        contributions.append(float(item["contribution"]))
+                        owners.append((k, j))
+                    except Exception:
+                        errors.append(SchemaError(index[rows[k]], "primary_risk_factors", f"[{j}].contribution must be numeric"))
+        for m in _range_violations(contributions, nan_fails=False):
+            k, j = owners[m]
+            errors.append(SchemaError(index[rows[k]], "primary_risk_factors", f"[{j}].contribution must be between 0 and 1"))
+        return errors
+
+
+DEFAULT_VALIDATOR = BatchValidator()
+
+
 def validate_many(outputs: List[Dict[str, Any]]) -> None:
-    """Validate a list of outputs; raises first encountered ValueError."""
-    for o in outputs:
-        validate_project_output(o)
+    """Validate a list of outputs; raises SchemaValidationError (a ValueError) listing every error found."""
+    errors = DEFAULT_VALIDATOR.validate(outputs)
+    if errors:
+        raise SchemaValidationError(errors)
+
+
+def validate_columns(columns: Mapping[str, Sequence[Any]], n: Optional[int] = None) -> None:
+    """Validate a columnar batch (field -> values); raises SchemaValidationError listing every error found."""
+    errors = DEFAULT_VALIDATOR.validate_columns(columns, n)
+    if errors:
+        raise SchemaValidationError(errors)
@@ -29,4 +29,138 @@ def test_phase9_outputs(client):
         data = resp.get_json()
         assert isinstance(data, list)
         assert len(data) >= 1
-        assert 'project_id' in data[0]
\ No newline at end of file
+        assert 'project_id' in data[0]
+
+def test_phase9_outputs_top_factors(client):
+    full = client.get('/phase9/outputs?factors=all')
+    if full.status_code != 200:
+        pytest.skip("phase9 outputs not available")
+    resp = client.get('/phase9/outputs?factors=1')
+    assert resp.status_code == 200
+    for full_obj, obj in zip(full.get_json(), resp.get_json()):
+        factors = full_obj['primary_risk_factors']
+        if len(factors) > 1:
+            assert obj['primary_risk_factors'][0] == factors[0]
+            other = obj['primary_risk_factors'][1]
+            assert other['factor'] == 'other'
+            assert other['value'] == len(factors) - 1
+    assert client.get('/phase9/outputs?factors=few').status_code == 400
+
+
+def test_phase9_outputs_ndjson_paging(client, tmp_path, monkeypatch):
+    from scripts.phase9 import output_writer
+    resp = client.get('/phase9/outputs')
+    if resp.status_code != 200:
+        pytest.skip("phase9 outputs not available")
+    base = resp.get_json()[0]
+    outputs = [dict(base, project_id=f"P{i}", risk_level=("high" if i % 3 == 0 else "low")) for i in range(50)]
+    output_writer.write_phase9_outputs(tmp_path / 'phase9_outputs.ndjson.gz', outputs, block_size=8)
+    monkeypatch.setattr(main, 'PHASE9_REPORTS_DIR', tmp_path)
+
+    resp = client.get('/phase9/outputs?risk_level=high&offset=3&limit=4')
+    assert resp.status_code == 200
+    assert resp.headers['X-Total-Count'] == '17'
+    assert [o['project_id'] for o in resp.get_json()] == ['P9', 'P12', 'P15', 'P18']
+
+    resp = client.get('/phase9/outputs?offset=48&format=ndjson&variant=live')
+    assert resp.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in resp.data.splitlines()]
+    assert [o['project_id'] for o in lines] == ['P48', 'P49']
+    assert lines[0]['project_name'].endswith('(LIVE)')
+
+    resp = client.get('/phase9/outputs?limit=2', headers={'Accept': 'application/x-ndjson'})
+    assert len(resp.data.splitlines()) == 2
+    assert client.get('/phase9/outputs?offset=-1').status_code == 400
+    assert client.get('/phase9/outputs?format=xml').status_code == 400
+
+
+def test_phase9_outputs_cache_and_conditional_get(client, tmp_path, monkeypatch):
+    import gzip
+    from app.phase9_outputs_cache import phase9_outputs_cache
+    resp = client.get('/phase9/outputs')
+    if resp.status_code != 200:
+        pytest.skip("phase9 outputs not available")
+    base = resp.get_json()[0]
+    report = tmp_path / 'phase9_outputs.json'
+    report.write_text(json.dumps([dict(base, project_id=f"P{i}") for i in range(40)]), encoding='utf-8')
+    monkeypatch.setattr(main, 'PHASE9_REPORTS_DIR', tmp_path)
+    phase9_outputs_cache.clear()
+    loads = phase9_outputs_cache.loads
+
+    first = client.get('/phase9/outputs')
+    etag = first.headers['ETag']
+    assert first.headers['Last-Modified'] and first.headers['Cache-Control'] == 'no-cache'
+    live = client.get('/phase9/outputs?variant=live&limit=2').get_json()
+    assert live[0]['project_name'].endswith('(LIVE)')
+    again = client.get('/phase9/outputs')
+    assert again.data == first.data and again.headers['ETag'] == etag
+    assert not any(o['project_name'].endswith('(LIVE)') for o in again.get_json())
+    assert phase9_outputs_cache.loads == loads + 1
+
+    assert client.get('/phase9/outputs', headers={'If-None-Match': etag}).status_code == 304
+    assert client.get('/phase9/outputs', headers={'If-Modified-Since': first.headers['Last-Modified']}).status_code == 304
+    assert client.get('/phase9/outputs?limit=3', headers={'If-None-Match': etag}).status_code == 200
+
+    zipped = client.get('/phase9/outputs', headers={'Accept-Encoding': 'gzip'})
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(zipped.data) == first.data
+    assert zipped.headers['ETag'] != etag
+
+    # a rewritten report is a new version
+    report.write_text(json.dumps([dict(base, project_id="NEW")]), encoding='utf-8')
+    os.utime(report, ns=(report.stat().st_atime_ns, report.stat().st_mtime_ns + 5_000_000_000))
+    fresh = client.get('/phase9/outputs', headers={'If-None-Match': etag})
+    assert fresh.status_code == 200
+    assert [o['project_id'] for o in fresh.get_json()] == ['NEW']
+    assert phase9_outputs_cache.loads == loads + 2
+
+
+def test_phase9_outputs_columnar(client, tmp_path, monkeypatch):
+    pytest.importorskip("numpy")
+    from scripts.phase9 import columnar, output_writer
+    resp = client.get('/phase9/outputs')
+    if resp.status_code != 200:
+        pytest.skip("phase9 outputs not available")
+    base = resp.get_json()[0]
+    outputs = [dict(base, project_id=f"P{i}", risk_level=("high" if i % 4 == 0 else "low")) for i in range(30)]
+    output_writer.write_phase9_outputs(tmp_path / 'phase9_outputs.p9col', outputs)
+    output_writer.write_phase9_outputs(tmp_path / 'phase9_outputs.json', outputs[:1])
+    monkeypatch.setattr(main, 'PHASE9_REPORTS_DIR', tmp_path)
+
+    resp = client.get('/phase9/outputs?risk_level=high&offset=1&limit=3')
+    assert resp.headers['X-Total-Count'] == '8'
+    assert resp.get_json() == [outputs[4], outputs[8], outputs[12]]
+
+    resp = client.get('/phase9/outputs', headers={'Accept': columnar.MIMETYPE})
+    assert resp.mimetype == columnar.MIMETYPE
+    assert resp.data == (tmp_path / 'phase9_outputs.p9col').read_bytes()
+
+    resp = client.get('/phase9/outputs?format=columnar&risk_level=high&variant=live')
+    rows = columnar.ColumnarOutputs(resp.data).rows()
+    assert [r['project_id'] for r in rows] == [f"P{i}" for i in range(0, 30, 4)]
+    assert all(r['project_name'].endswith('(LIVE)') for r in rows)
+
+
+def test_metrics_endpoint(client):
+    if not main.METRICS_AVAILABLE:
+        pytest.skip('phase14_performance not importable')
+    before = main.render_metrics()
+    client.get('/health')
+    client.get('/health')
+    client.get('/no-such-route')
+    resp = client.get('/metrics')
+    assert resp.status_code == 200
+    assert resp.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+    text = resp.get_data(as_text=True)
+    assert '# TYPE http_requests_total counter' in text
+    assert 'http_requests_total{endpoint="unmatched",method="GET",status="404"}' in text
+    assert 'http_request_duration_seconds_bucket{endpoint="/health",method="GET",le="+Inf"}' in text
+    assert 'http_request_duration_seconds_quantiles{endpoint="/health",method="GET",quantile="0.99"}' in text
+    assert 'endpoint="/metrics"' not in text
+
+    def health_count(body):
+        for line in body.splitlines():
+            if line.startswith('http_requests_total{endpoint="/health",method="GET",status="200"}'):
+                return int(line.rsplit(' ', 1)[1])
+        return 0
+    assert health_count(text) == health_count(before) + 2
@@ -0,0 +1,64 @@
+import pytest
+
+from scripts.phase9 import columnar, output_writer
+from scripts.phase9.schema import SchemaValidationError
+from tests.unit.test_phase9_ndjson import _outputs
+
+np = pytest.importorskip("numpy")
+
+
+def _varied_outputs(n):
+    outputs = _outputs(n)
+    for i, obj in enumerate(outputs):
+        obj["risk_score"] = (i % 11) / 10
+        obj["predicted_delay_days"] = [None, 4, 2.5, True, -3][i % 5]
+        if i % 4 == 0:
+            obj["project_name"] = None
+        if i % 6 == 0:
+            obj["project_name"] = "Bâtiment Ω"
+            obj["primary_risk_factors"] = []
+        if i % 9 == 0:
+            obj["region"] = {"code": "NE", "sites": [i]}
+    return outputs
+
+
+def test_roundtrip_file_and_bytes(tmp_path):
+    outputs = _varied_outputs(40)
+    path = tmp_path / "out.p9col"
+    output_writer.write_phase9_outputs(path, outputs)
+    for source in (path, path.read_bytes()):
+        with columnar.ColumnarOutputs(source) as view:
+            assert len(view) == 40
+            rows = view.rows()
+        assert rows == outputs
+        assert [type(r["predicted_delay_days"]) for r in rows] == [type(o["predicted_delay_days"]) for o in outputs]
+    assert list(columnar.read(path)[9]) == list(outputs[9])
+    assert columnar.encode([]) and len(columnar.ColumnarOutputs(columnar.encode([]))) == 0
+
+
+def test_select_matches_python_filtering(tmp_path):
+    outputs = _varied_outputs(97)
+    path = tmp_path / "out.p9col"
+    columnar.write(path, outputs)
+    with columnar.ColumnarOutputs(path) as view:
+        assert view.column("risk_score").dtype == np.float64
+        for level in ["low", "medium", "high", "critical", "unknown", None]:
+            for min_score in (None, 0.5):
+                expected = [i for i, o in enumerate(outputs)
+                            if (level is None or o["risk_level"] == level)
+                            and (min_score is None or o["risk_score"] >= min_score)]
+                for offset, limit in [(0, None), (3, 5), (50, 100)]:
+                    got = view.select(risk_level=level, min_risk_score=min_score, offset=offset, limit=limit)
+                    assert got.tolist() == expected[offset:None if limit is None else offset + limit]
+        assert view.rows([5, 2]) == [outputs[5], outputs[2]]
+
+
+def test_writer_validates_and_rejects_foreign_files(tmp_path):
+    outputs = _varied_outputs(5)
+    outputs[3]["confidence_score"] = 7.0
+    path = tmp_path / "out.p9col"
+    with pytest.raises(SchemaValidationError):
+        output_writer.write_phase9_outputs(path, outputs)
+    assert not path.exists()
+    with pytest.raises(ValueError):
+        columnar.ColumnarOutputs(b"[{\"project_id\": 1}]")
@@ -31,3 +31,96 @@ def test_recommendations_and_explainability_deterministic():
     e1 = risk.explain_score(score_val, breakdown)
     e2 = risk.explain_score(score_val, breakdown)
     assert e1 == e2
+
+
+def _random_portfolio(n, seed):
+    import random
+    rng = random.Random(seed)
+    specials = [None, "", "n/a", "7", " 0.4 ", float("nan"), float("inf"), -float("inf"), -0.0, True, 1, 0, -3]
+    columns = {}
+    for feat in list(risk.WEIGHTS) + list(risk.IOT_AMPLIFIER_WEIGHTS):
+        if feat == "iot_activity_anomaly_score":
+            continue  # absent column: score() sees the key missing
+        col = []
+        for _ in range(n):
+            r = rng.random()
+            if r < 0.15:
+                col.append(rng.choice(specials))
+            elif r < 0.3:
+                col.append(rng.randint(0, 8))
+            else:
+                col.append(rng.uniform(-0.2, 1.3) * (30 if feat == "avg_delay_last_3_periods" else 1))
+        columns[feat] = col
+    return columns
+
+
+def test_score_batch_bit_identical_to_score():
+    columns = _random_portfolio(2000, seed=9)
+    numeric = {k: v for k, v in columns.items() if k.startswith("iot_") or k == "schedule_slippage_pct"}
+    numeric = {k: [risk._to_float(x) for x in v] for k, v in numeric.items()}
+    for batch in (columns, numeric):
+        scores, breakdowns = risk.score_batch(batch)
+        assert len(scores) == len(breakdowns) == 2000
+        for i in range(2000):
+            s, b = risk.score({k: v[i] for k, v in batch.items()})
+            assert float(scores[i]).hex() == s.hex()
+            assert [(e["factor"], e["weight"], e["value"].hex(), e["contribution"].hex()) for e in breakdowns[i]] == \
+                [(e["factor"], e["weight"], float(e["value"]).hex(), float(e["contribution"]).hex()) for e in b]
+
+
+def test_score_batch_top_k_and_numpy_columns():
+    import numpy as np
+    columns = {k: np.array([risk._to_float(x) for x in v]) for k, v in _random_portfolio(300, seed=4).items()}
+    scores, top = risk.score_batch(columns, top_k=3)
+    for i in range(300):
+        features = {k: v[i] for k, v in columns.items()}
+        s, b = risk.score(features)
+        assert scores[i] == s
+        assert top[i][:3] == b[:3]
+        assert top[i] == risk.score(features, top_k=3)[1]
+        other = top[i][3]
+        assert other["factor"] == risk.OTHER_FACTOR
+        assert other["value"] == len(b) - 3
+        assert abs(other["contribution"] - sum(e["contribution"] for e in b[3:])) < 1e-12
+    empty_scores, empty = risk.score_batch({})
+    assert len(empty_scores) == 0 and empty == []
+
+
+def test_top_k_breakdowns_match_scalar_path_with_ties():
+    columns = _random_portfolio(1500, seed=5)
+    for k in (0, 1, 2, 5, 11, 12, 13, 20):
+        _, batch = risk.score_batch(columns, top_k=k)
+        for i in range(0, 1500, 7):
+            _, expected = risk.score({c: v[i] for c, v in columns.items()}, top_k=k)
+            assert [(e["factor"], e["value"], float(e["contribution"]).hex()) for e in batch[i]] == \
+                [(e["factor"], e["value"], float(e["contribution"]).hex()) for e in expected]
+            full = risk.score({c: v[i] for c, v in columns.items()})[1]
+            assert risk.compact_breakdown(full, k)[:k] == expected[:k]
+
+
+def test_explain_skips_other_bucket():
+    features = {"schedule_slippage_pct": 0.9, "avg_delay_last_3_periods": 10, "subcontractor_changes": 3}
+    score_val, full = risk.score(features)
+    _, compact = risk.score(features, top_k=1)
+    assert compact[-1]["factor"] == risk.OTHER_FACTOR
+    assert risk.explain_score(score_val, compact) == full[0]["factor"] + f" (+{full[0]['contribution']:.2f})"
+
+
+def test_score_batch_dataframe_from_heterogeneous_records():
+    import pandas as pd
+    records = [
+        {"schedule_slippage_pct": 0.05, "avg_delay_last_3_periods": 1, "iot_weather_severity": 0.4},
+        {"subcontractor_changes": 1, "inspection_failure_rate": 0.1, "iot_environmental_hazard_index": 0.7},
+        {"schedule_slippage_pct": 0.02, "safety_incident_probability": 0.3},
+        {"avg_delay_last_3_periods": "n/a", "iot_weather_severity": 0.0, "iot_activity_anomaly_score": 0.9},
+        {},
+    ]
+    frame = pd.DataFrame(records)
+    assert frame.isna().any().any()
+    for top_k in (None, 2):
+        scores, breakdowns = risk.score_batch(frame, top_k=top_k)
+        for i, record in enumerate(records):
+            s, b = risk.score(record, top_k=top_k)
+            assert float(scores[i]).hex() == s.hex()
+            assert [(e["factor"], e["value"], float(e["contribution"]).hex()) for e in breakdowns[i]] == \
+                [(e["factor"], e["value"], float(e["contribution"]).hex()) for e in b]
@@ -0,0 +1,74 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from scripts.phase9 import output_reader, output_writer
+from scripts.phase9.schema import SchemaValidationError
+from tests.unit.test_phase9_output_writer import make_valid_output
+
+LEVELS = ["low", "medium", "high", "critical"]
+
+
+def _outputs(n):
+    base = make_valid_output(None)[0]
+    return [dict(base, project_id=f"P{i}", risk_level=LEVELS[(i * 7) % 5 % 4]) for i in range(n)]
+
+
+@pytest.mark.parametrize("name", ["out.ndjson", "out.ndjson.gz"])
+def test_roundtrip_paging_and_filter(tmp_path, name):
+    outputs = _outputs(103)
+    path = tmp_path / name
+    output_writer.write_phase9_outputs(path, iter(outputs), block_size=10)
+
+    index = output_reader.load_index(path)
+    assert index["count"] == 103 and len(index["blocks"]) == 11
+    assert index["compression"] == ("gzip" if name.endswith(".gz") else None)
+    if name.endswith(".gz"):
+        assert len(gzip.decompress(path.read_bytes()).splitlines()) == 103
+    assert output_reader.read_outputs(path) == outputs
+
+    for level in LEVELS + [None]:
+        expected = [o for o in outputs if level is None or o["risk_level"] == level]
+        assert output_reader.count_outputs(path, level) == len(expected)
+        for offset, limit in [(0, None), (5, 7), (19, 30), (len(expected) - 1, 5), (500, 3), (3, 0)]:
+            page = output_reader.read_outputs(path, offset=offset, limit=limit, risk_level=level)
+            assert page == expected[offset:None if limit is None else offset + limit]
+    raw = list(output_reader.iter_outputs(path, offset=11, limit=2, raw=True))
+    assert [json.loads(line) for line in raw] == outputs[11:13]
+
+
+def test_stale_index_falls_back_to_scan(tmp_path):
+    path = tmp_path / "out.ndjson"
+    output_writer.write_phase9_outputs(path, _outputs(25), block_size=4)
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(dict(_outputs(1)[0], project_id="extra")) + "\n")
+    assert output_reader.load_index(path) is None
+    assert output_reader.count_outputs(path) is None
+    assert [o["project_id"] for o in output_reader.read_outputs(path, offset=24)] == ["P24", "extra"]
+
+
+def test_invalid_block_keeps_previous_report(tmp_path):
+    path = tmp_path / "out.ndjson"
+    output_writer.write_phase9_outputs(path, _outputs(3))
+    before = path.read_bytes()
+    outputs = _outputs(30)
+    outputs[17]["risk_score"] = 2.0
+    with pytest.raises(SchemaValidationError) as ctx:
+        output_writer.write_phase9_outputs(path, outputs, block_size=8)
+    assert [(e.index, e.field) for e in ctx.value.errors] == [(17, "risk_score")]
+    assert path.read_bytes() == before
+    assert output_reader.count_outputs(path) == 3
+    assert sorted(os.listdir(tmp_path)) == ["out.ndjson", "out.ndjson.idx.json"]
+
+
+def test_writer_flushes_per_block(tmp_path):
+    path = tmp_path / "out.ndjson"
+    with output_writer.NDJSONOutputWriter(path, block_size=5) as writer:
+        writer.write_many(_outputs(12))
+        tmp = path.with_name(path.name + ".tmp")
+        assert len(tmp.read_bytes().splitlines()) == 10
+        assert not path.exists()
+    assert writer.count == 12
+    assert len(output_reader.read_outputs(path)) == 12
@@ -0,0 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from scripts.phase9 import risk, recommendations
+from tests.unit.test_phase9_determinism import _random_portfolio
+
+
+def _reference_score(features):
+    """score() as it was before RiskModel: tables re-read on every call"""
+    contributions = []
+    total_raw = 0.0
+    for feat, w in risk.WEIGHTS.items():
+        normalizer = risk.NORMALIZERS.get(feat, lambda x: 0.0)
+        norm = normalizer(features.get(feat, 0))
+        contrib = norm * w
+        contributions.append({"factor": feat, "weight": w, "value": norm, "contribution": contrib})
+        total_raw += contrib
+    weight_sum = sum(risk.WEIGHTS.values())
+    normalized = 0.0 if weight_sum <= 0 else max(0.0, min(1.0, total_raw / weight_sum))
+    base_normalized = normalized
+    iot_keys = ["iot_weather_severity", "iot_environmental_hazard_index", "iot_activity_anomaly_score"]
+    iot_weight_map = {"iot_weather_severity": 0.6, "iot_environmental_hazard_index": 0.3, "iot_activity_anomaly_score": 0.4}
+    iot_norm_total = 0.0
+    iot_weight_sum = 0.0
+    for k in iot_keys:
+        if k in features:
+            try:
+                v = float(features.get(k, 0))
+            except Exception:
+                v = 0.0
+            v = max(0.0, min(1.0, v))
+            w = iot_weight_map.get(k, 0.0)
+            iot_norm_total += v * w
+            iot_weight_sum += w
+            contributions.append({"factor": k, "weight": 0.0, "value": v, "contribution": 0.0})
+    if iot_weight_sum > 0 and iot_norm_total > 0:
+        iot_avg = iot_norm_total / iot_weight_sum
+        amplification = 1.0 + min(0.25, iot_avg * 0.25)
+        normalized = max(0.0, min(1.0, normalized * amplification))
+    else:
+        amplification = 1.0
+    iot_added = max(0.0, normalized - base_normalized)
+    if iot_added > 0:
+        contributions.append({"factor": "iot_amplification", "weight": 0.0, "value": amplification, "contribution": iot_added})
+    return normalized, sorted(contributions, key=lambda x: x["contribution"], reverse=True)
+
+
+def _rows(n, seed):
+    columns = _random_portfolio(n, seed)
+    return [{k: v[i] for k, v in columns.items()} for i in range(n)]
+
+
+def test_compiled_model_matches_reference():
+    for features in _rows(1000, seed=21):
+        s, b = risk.score(features)
+        ref_s, ref_b = _reference_score(features)
+        assert s.hex() == ref_s.hex()
+        assert b == ref_b
+
+
+def test_model_version_and_thresholds():
+    model = risk.RiskModel()
+    assert model.version == risk.DEFAULT_MODEL.version
+    assert model.version.startswith(f"{risk.RISK_MODEL_SPEC_VERSION}-")
+    assert risk.RiskModel(weights=dict(risk.WEIGHTS, schedule_slippage_pct=0.6)).version != model.version
+    for value, level in ((0.9, "critical"), (0.85, "critical"), (0.6, "high"), (0.3, "medium"), (0.1, "low"), (-1.0, "low")):
+        assert risk.risk_level_from_score(value) == level
+    assert model.threshold("high") == 0.6
+
+    # recommendations follow the model's thresholds
+    features = {"schedule_slippage_pct": 0.5}
+    s, b = risk.score(features)
+    strict = risk.RiskModel(thresholds=dict(risk.RISK_THRESHOLDS, critical=0.1))
+    ids = {r["id"] for r in recommendations.recommendations_from(features, s, b, model=strict)}
+    assert "expedite-mitigation" in ids
+    assert "expedite-mitigation" not in {r["id"] for r in recommendations.recommendations_from(features, s, b)}
+
+
+def test_model_shared_across_threads():
+    rows = _rows(400, seed=22)
+    expected = [risk.score(r) for r in rows]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert list(pool.map(risk.DEFAULT_MODEL.score, rows)) == expected
+
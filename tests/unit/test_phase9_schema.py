@@ -0,0 +1,109 @@
+import copy
+import random
+
+import pytest
+
+from scripts.phase9 import output_writer, schema
+from scripts.phase9.schema import SchemaValidationError
+from tests.unit.test_phase9_output_writer import make_valid_output
+
+
+def _mutations():
+    nan = float("nan")
+    return [
+        ("risk_score", 1.5), ("risk_score", nan), ("risk_score", 1), ("risk_score", -0.0),
+        ("confidence_score", nan), ("confidence_score", -0.1), ("confidence_score", True),
+        ("delay_probability", nan), ("delay_probability", 2.0), ("delay_probability", 1.0),
+        ("predicted_delay_days", None), ("predicted_delay_days", "3"), ("predicted_delay_days", False),
+        ("project_name", None), ("project_name", 7), ("schema_version", "phase9-v0"),
+        ("schema_version", ["phase9-v1"]), ("schema_version", {"version": "phase9-v1"}), ("generated_at", ["x"]),
+        ("generated_at", "2025-13-01"), ("generated_at", "2025-01-01T00:00:00+00:00"), ("generated_at", 3),
+        ("explanation", "  "), ("explanation", ""), ("recommended_actions", ()),
+        ("primary_risk_factors", [{"factor": "a", "contribution": "0.3"}]),
+        ("primary_risk_factors", [{"factor": "a", "contribution": nan}]),
+        ("primary_risk_factors", [{"factor": "a", "contribution": 1.2}, {"factor": "b"}]),
+        ("primary_risk_factors", [{"factor": "a", "contribution": "x"}, "y"]),
+        ("primary_risk_factors", []),
+    ]
+
+
+def _random_outputs(n, seed):
+    rng = random.Random(seed)
+    base = make_valid_output(None)[0]
+    mutations = _mutations()
+    outputs = []
+    for _ in range(n):
+        obj = copy.deepcopy(base)
+        for _ in range(rng.choice([0, 0, 1, 2])):
+            field, value = rng.choice(mutations)
+            obj[field] = value
+        if rng.random() < 0.05:
+            del obj[rng.choice(sorted(obj))]
+        outputs.append(obj)
+    return outputs + ["not a dict"]
+
+
+def _scalar_ok(obj):
+    try:
+        schema.validate_project_output(obj)
+        return True
+    except ValueError:
+        return False
+
+
+def test_batch_agrees_with_single_record_validation():
+    outputs = _random_outputs(600, seed=5)
+    errors = schema.DEFAULT_VALIDATOR.validate(outputs)
+    assert [e.index for e in errors] == sorted(e.index for e in errors)
+    flagged = {e.index for e in errors}
+    assert flagged == {i for i, obj in enumerate(outputs) if not _scalar_ok(obj)}
+    assert 0 < len(flagged) < len(outputs)
+
+    dicts = [o for o in outputs if isinstance(o, dict)]
+    names = {k for o in dicts for k in o}
+    columns = {k: [o.get(k, schema._MISSING) for o in dicts] for k in names}
+    assert {e.index for e in schema.DEFAULT_VALIDATOR.validate_columns(columns)} == \
+        {i for i, obj in enumerate(dicts) if not _scalar_ok(obj)}
+
+
+def test_all_errors_reported_with_indices():
+    outputs = make_valid_output(None) * 4
+    outputs = [dict(o) for o in outputs]
+    outputs[1]["risk_score"] = 1.5
+    outputs[1]["generated_at"] = "yesterday"
+    outputs[3]["primary_risk_factors"] = [{"factor": "a", "contribution": 0.1}, {"factor": "b", "contribution": -1}]
+    del outputs[3]["explanation"]
+    with pytest.raises(SchemaValidationError) as ctx:
+        schema.validate_many(outputs)
+    assert [(e.index, e.field) for e in ctx.value.errors] == [
+        (1, "risk_score"), (1, "generated_at"), (3, "explanation"), (3, "primary_risk_factors"),
+    ]
+    assert "[1].contribution must be between 0 and 1" in ctx.value.errors[3].message
+    assert "4 schema error(s)" in str(ctx.value)
+    schema.validate_many(make_valid_output(None) * 3)
+
+
+def test_validate_columns():
+    valid = make_valid_output(None)[0]
+    columns = {k: [v, v] for k, v in valid.items()}
+    schema.validate_columns(columns)
+    columns["risk_score"] = [0.2, float("nan")]
+    del columns["model_version"]
+    errors = schema.DEFAULT_VALIDATOR.validate_columns(columns)
+    assert [(e.index, e.field) for e in errors] == [(0, "model_version"), (1, "model_version"), (1, "risk_score")]
+    with pytest.raises(ValueError):
+        schema.validate_columns({"risk_score": [0.1], "project_id": ["a", "b"]})
+
+
+def test_writer_validates_once(tmp_path, monkeypatch):
+    calls = []
+    validate_many = schema.validate_many
+    monkeypatch.setattr(schema, "validate_many", lambda outputs: calls.append(len(outputs)) or validate_many(outputs))
+    output_writer.write_phase9_outputs(tmp_path / "out.json", make_valid_output(None) * 2)
+    assert calls == [2]
+
+    bad = make_valid_output(None)
+    bad[0]["confidence_score"] = 3.0
+    with pytest.raises(SchemaValidationError):
+        output_writer.write_phase9_outputs(tmp_path / "bad.json", bad)
+    assert not (tmp_path / "bad.json").exists()